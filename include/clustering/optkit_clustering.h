@@ -8,15 +8,83 @@
 extern "C" {
 #endif
 
+/*
+ * distances are formed over tiles of vectors, so that the k x tile block
+ * of the distance matrix stays resident in (L2) cache; tiles are at least
+ * OK_CLUSTER_TILE_MIN vectors wide, so that for large k the distances are
+ * still formed by gemm rather than a sequence of gemv-sized products.
+ * each thread forms its own tiles, in one of h->tile_slots tile buffers.
+ */
+#ifndef OK_CLUSTER_TILE_BYTES
+#define OK_CLUSTER_TILE_BYTES 262144
+#endif
+#ifndef OK_CLUSTER_TILE_MIN
+#define OK_CLUSTER_TILE_MIN 256
+#endif
+
+/*
+ * in automatic search mode, nearest centroids are found with a k-d tree
+ * for vectors of length at most OK_CLUSTER_KDTREE_MAX_DIM, and at least
+ * max(OK_CLUSTER_KDTREE_MIN_CLUSTERS, 2^(vec_length + 4)) centroids
+ * (the crossover is measured by python -m optkit.bench --kdtree)
+ */
+#ifndef OK_CLUSTER_KDTREE_MAX_DIM
+#define OK_CLUSTER_KDTREE_MAX_DIM 16
+#endif
+#ifndef OK_CLUSTER_KDTREE_MIN_CLUSTERS
+#define OK_CLUSTER_KDTREE_MIN_CLUSTERS 64
+#endif
+
+enum OPTKIT_KMEANS_ALGORITHM {
+	OkKmeansLloyd = 0,
+	OkKmeansHamerly = 1,
+	OkKmeansElkan = 2
+};
+
+enum OPTKIT_KMEANS_INIT {
+	OkKmeansInitAssignments = 0,
+	OkKmeansInitPlusPlus = 1,
+	OkKmeansInitParallel = 2
+};
+
+enum OPTKIT_CLUSTER_SEARCH {
+	OkClusterSearchAuto = 0,
+	OkClusterSearchDense = 1,
+	OkClusterSearchKDTree = 2
+};
+
 typedef struct cluster_aid {
 	int * indicator;
 	void * hdl; /* linalg handle */
 	upsamplingvec a2c_tentative_full, a2c_tentative;
 	vector d_min_full, d_min, c_squared_full, c_squared;
 	matrix D_full, D, A_reducible;
-	size_t reassigned;
+	size_t tile_size, tile_slots, reassigned, distance_evals;
+	enum OPTKIT_CLUSTER_SEARCH search;
+	/* k-means iterations and cumulative assignment/update times, seconds */
+	size_t iters;
+	ok_float assign_time, update_time;
 } cluster_aid;
 
+/*
+ * triangle inequality bounds for pruned k-means, relative to tentative
+ * assignments u(i):
+ *
+ *	upper_i >= ||a_i - c_u(i)||,
+ *	lower_i <= min_{k != u(i)} ||a_i - c_k||	(Hamerly), or
+ *	lower_ik <= ||a_i - c_k||			(Elkan),
+ *
+ *	separation_k = 1/2 min_{k' != k} ||c_k - c_k'||
+ *	drift_k = ||c_k - c_k^{prev}||
+ */
+typedef struct kmeans_bounds {
+	enum OPTKIT_KMEANS_ALGORITHM algorithm;
+	size_t n_vectors, n_clusters;
+	int initialized;
+	ok_float * upper, * lower, * drift, * separation, * centroid_dist;
+	matrix C_prev;
+} kmeans_bounds;
+
 typedef struct kmeans_work {
 	int * indicator;
 	size_t n_vectors, n_clusters, vec_length;
@@ -30,6 +98,11 @@ typedef struct kmeans_settings {
 	ok_float dist_reltol;
 	size_t change_abstol, maxiter;
 	uint verbose;
+	enum OPTKIT_KMEANS_ALGORITHM algorithm;
+	enum OPTKIT_KMEANS_INIT init;
+	size_t seed;
+	enum OPTKIT_CLUSTER_SEARCH search;
+	int num_threads; /* OpenMP/BLAS threads per run; 0: default */
 } kmeans_settings;
 
 typedef struct kmeans_io {
@@ -39,11 +112,55 @@ typedef struct kmeans_io {
 	size_t stride_a2c, stride_counts;
 } kmeans_io;
 
+/*
+ * mini-batch k-means: only the centroids C, counts, and one batch of
+ * (at most batch_size) vectors are resident
+ */
+typedef struct kmeans_minibatch_work {
+	size_t batch_size, n_clusters, vec_length;
+	matrix A, C, S;
+	upsamplingvec a2c;
+	vector counts, counts_batch;
+	cluster_aid h;
+} kmeans_minibatch_work;
+
+/*
+ * fitted k-means model: centroids C and squared centroid norms (held in
+ * h.c_squared) are resident; vectors are assigned in batches of (at most)
+ * batch_size vectors
+ */
+typedef struct kmeans_predict_work {
+	int * indicator;
+	size_t batch_size, n_clusters, vec_length;
+	matrix A, C;
+	upsamplingvec a2c;
+	cluster_aid h;
+	void * kdtree;
+} kmeans_predict_work;
+
 /* CPU/GPU-SPECIFIC IMPLEMENTATION */
 ok_status assign_clusters_l2(matrix * A, matrix * C,
 	upsamplingvec * a2c, cluster_aid * h);
 ok_status assign_clusters_l2_lInf_cap(matrix * A,
 	matrix * C, upsamplingvec * a2c, cluster_aid * h, ok_float maxdist);
+ok_status kmeans_bounds_alloc(kmeans_bounds * b, size_t n_vectors,
+	size_t n_clusters, size_t vec_length,
+	const enum OPTKIT_KMEANS_ALGORITHM algorithm);
+ok_status kmeans_bounds_free(kmeans_bounds * b);
+ok_status cluster_pruned(matrix * A, matrix * C, upsamplingvec * a2c,
+	cluster_aid * h, kmeans_bounds * b, ok_float maxdist);
+ok_status kmeans_bounds_update(kmeans_bounds * b, matrix * C,
+	cluster_aid * h);
+ok_status kmeans_seed(matrix * A, matrix * C, upsamplingvec * a2c,
+	const enum OPTKIT_KMEANS_INIT init, const size_t seed);
+int cluster_tile_threads(void);
+int cluster_kdtree_favored(const size_t vec_length, const size_t n_clusters);
+ok_status cluster_kdtree_alloc(void ** tree, const matrix * C);
+ok_status cluster_kdtree_free(void * tree);
+ok_status cluster_kdtree_search(matrix * A, matrix * C, upsamplingvec * a2c,
+	cluster_aid * h, ok_float maxdist, const void * tree);
+ok_status cluster_kdtree(matrix * A, matrix * C, upsamplingvec * a2c,
+	cluster_aid * h, ok_float maxdist);
 
 /* COMMON IMPLEMENTATION */
 ok_status cluster_aid_alloc(cluster_aid * h, size_t size_A, size_t size_C,
@@ -65,6 +182,11 @@ ok_status kmeans_work_load(kmeans_work * w, ok_float * A,
 ok_status kmeans_work_extract(ok_float * C,
 	const enum CBLAS_ORDER orderC, size_t * a2c, size_t stride_a2c,
 	ok_float * counts, size_t stride_counts, kmeans_work * w);
+ok_status kmeans_compact(ok_float * C, const enum CBLAS_ORDER orderC,
+	size_t n_clusters, size_t vec_length, size_t * a2c, size_t stride_a2c,
+	size_t n_vectors, ok_float * counts, size_t stride_counts,
+	size_t * n_nonempty);
+ok_status cluster_tentative(matrix * A, matrix * C, cluster_aid * h);
 ok_status cluster(matrix * A, matrix * C, upsamplingvec * a2c,
 	cluster_aid * helper, ok_float maxdist);
 ok_status calculate_centroids(matrix * A, matrix * C, upsamplingvec * a2c,
@@ -73,17 +195,70 @@ ok_status calculate_centroids(matrix * A, matrix * C, upsamplingvec * a2c,
 static void get_distance_tolerance(ok_float *tol, const ok_float * maxA,
 	const ok_float * reltol, const size_t * iter, const size_t * maxiter);
 static ok_status k_means_finish(cluster_aid * h);
+static ok_status k_means_(matrix * A, matrix * C, upsamplingvec * a2c,
+	vector * counts, cluster_aid * h, kmeans_bounds * b,
+	const ok_float dist_reltol, const size_t change_abstol,
+	const size_t maxiter, const uint verbose);
 
 ok_status k_means(matrix * A, matrix * C, upsamplingvec * a2c, vector * counts,
 	cluster_aid * h, const ok_float dist_reltol, const size_t change_abstol,
 	const size_t maxiter, const uint verbose);
+ok_status k_means_pruned(matrix * A, matrix * C, upsamplingvec * a2c,
+	vector * counts, cluster_aid * h, const ok_float dist_reltol,
+	const size_t change_abstol, const size_t maxiter, const uint verbose,
+	const enum OPTKIT_KMEANS_ALGORITHM algorithm);
 void * kmeans_easy_init(size_t n_vectors, size_t n_clusters, size_t vec_length);
 ok_status kmeans_easy_resize(const void * work, size_t n_vectors,
 	size_t n_clusters, size_t vec_length);
 ok_status kmeans_easy_run(const void * work, const kmeans_settings * const s,
 	const kmeans_io * io);
+ok_status kmeans_easy_compact(const void * work, const kmeans_io * io,
+	size_t * n_clusters);
 ok_status kmeans_easy_finish(void * work);
 
+static int kmeans_block_cost_compare(const void * a, const void * b);
+ok_status blockwise_kmeans(size_t n_blocks, const size_t * block_offsets,
+	const size_t * cluster_offsets, size_t vec_length, ok_float * A,
+	ok_float * C, size_t * a2c, ok_float * counts, size_t * n_clusters,
+	const kmeans_settings * s);
+
+ok_status kmeans_minibatch_update(matrix * A, matrix * C, upsamplingvec * a2c,
+	vector * counts, cluster_aid * h, matrix * S, vector * counts_batch);
+ok_status kmeans_minibatch_work_alloc(kmeans_minibatch_work * w,
+	size_t batch_size, size_t n_clusters, size_t vec_length);
+ok_status kmeans_minibatch_work_free(kmeans_minibatch_work * w);
+static ok_status kmeans_minibatch_work_load_batch(kmeans_minibatch_work * w,
+	const ok_float * A, const enum CBLAS_ORDER orderA, size_t n_vectors);
+
+void * kmeans_minibatch_easy_init(size_t batch_size, size_t n_clusters,
+	size_t vec_length);
+ok_status kmeans_minibatch_easy_load(const void * work, const ok_float * C,
+	const enum CBLAS_ORDER orderC, const ok_float * counts,
+	size_t stride_counts);
+ok_status kmeans_minibatch_easy_seed(const void * work, const ok_float * A,
+	const enum CBLAS_ORDER orderA, size_t n_vectors,
+	const enum OPTKIT_KMEANS_INIT init, const size_t seed);
+ok_status kmeans_minibatch_easy_update(const void * work, const ok_float * A,
+	const enum CBLAS_ORDER orderA, size_t n_vectors);
+ok_status kmeans_minibatch_easy_assign(const void * work, const ok_float * A,
+	const enum CBLAS_ORDER orderA, size_t n_vectors, size_t * a2c,
+	size_t stride_a2c);
+ok_status kmeans_minibatch_easy_extract(ok_float * C,
+	const enum CBLAS_ORDER orderC, ok_float * counts,
+	size_t stride_counts, const void * work);
+ok_status kmeans_minibatch_easy_finish(void * work);
+
+ok_status kmeans_predict_work_alloc(kmeans_predict_work * w,
+	size_t batch_size, size_t n_clusters, size_t vec_length);
+ok_status kmeans_predict_work_free(kmeans_predict_work * w);
+void * kmeans_predict_easy_init(const ok_float * C,
+	const enum CBLAS_ORDER orderC, size_t n_clusters, size_t vec_length,
+	size_t batch_size);
+ok_status kmeans_predict_easy_run(const void * work, const ok_float * A,
+	const enum CBLAS_ORDER orderA, size_t n_vectors, size_t * a2c,
+	size_t stride_a2c);
+ok_status kmeans_predict_easy_finish(void * work);
+
 #ifdef __cplusplus
 }
 #endif
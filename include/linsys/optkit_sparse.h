@@ -1,7 +1,9 @@
 #ifndef OPTKIT_LINSYS_SPARSE_H_
 #define OPTKIT_LINSYS_SPARSE_H_
 
+#include <stdint.h>
 #include "optkit_vector.h"
+#include "optkit_matrix.h"
 
 #ifdef __cplusplus
 extern "C" {
@@ -21,6 +23,25 @@ typedef enum SparseTransposeDirection {
 	Adjoint2Forward
 } SPARSE_TRANSPOSE_DIRECTION;
 
+typedef long long ok_int64;
+
+/*
+ * compressed column (row) index for a sparse matrix's nonzero pattern:
+ *	base: first index of each row/column of the forward and adjoint
+ *		copies (length size1 + size2 + 2)
+ *	offset: per-nonzero offset from the row/column base, stored as
+ *		16- or 32-bit unsigned integers (length 2 * nnz)
+ *	width: bits per offset (16 or 32)
+ *
+ * the index depends only on the sparsity pattern, so it remains valid
+ * across value updates and diagonal scalings of the source matrix.
+ */
+typedef struct sp_cindex {
+	size_t nnz, ptrlen, width;
+	size_t * base;
+	void * offset;
+} sp_cindex;
+
 #ifdef __cplusplus
 }
 #endif
@@ -33,6 +54,7 @@ public:
 	T * val;
 	I * ind, * ptr;
 	enum CBLAS_ORDER order;
+	int is_view;
 };
 
 template<typename T, typename I>
@@ -42,6 +64,9 @@ template<typename T, typename I>
 ok_status sp_matrix_calloc_(sp_matrix_<T, I> * A, size_t m, size_t n,
 	size_t nnz, enum CBLAS_ORDER order);
 template<typename T, typename I>
+ok_status sp_matrix_view_(sp_matrix_<T, I> * A, size_t m, size_t n,
+	size_t nnz, T * val, I * ind, I * ptr, enum CBLAS_ORDER order);
+template<typename T, typename I>
 ok_status sp_matrix_free_(sp_matrix_<T, I> * A);
 template<typename T, typename I>
 ok_status sp_matrix_memcpy_mm_(sp_matrix_<T, I> * A,
@@ -57,13 +82,23 @@ extern "C" {
 
 #ifdef __cplusplus
 typedef sp_matrix_<ok_float, ok_int> sp_matrix;
+typedef sp_matrix_<ok_float, ok_int64> sp_matrix64;
 #else
 typedef struct sp_matrix {
 	size_t size1, size2, nnz, ptrlen;
 	ok_float * val;
 	ok_int * ind, * ptr;
 	enum CBLAS_ORDER order;
+	int is_view;
 } sp_matrix;
+
+typedef struct sp_matrix64 {
+	size_t size1, size2, nnz, ptrlen;
+	ok_float * val;
+	ok_int64 * ind, * ptr;
+	enum CBLAS_ORDER order;
+	int is_view;
+} sp_matrix64;
 #endif
 
 /* memory management */
@@ -76,6 +111,19 @@ ok_status sp_matrix_calloc(sp_matrix * A, size_t m, size_t n, size_t nnz,
 	enum CBLAS_ORDER order);
 ok_status sp_matrix_free(sp_matrix * A);
 
+/*
+ * views wrap externally owned CSR (order = CblasRowMajor) or CSC
+ * (order = CblasColMajor) arrays of length nnz, nnz, ptrlen without
+ * copying. no adjoint copy is formed: adjoint products are computed by
+ * scattering along the stored orientation, in parallel into per-thread
+ * copies of the output. value-modifying calls (copy, abs, pow, scale)
+ * write through to the wrapped arrays, and sp_matrix_free() only
+ * detaches the view.
+ */
+ok_status sp_matrix_view_array(sp_matrix * A, size_t m, size_t n,
+	size_t nnz, ok_float * val, ok_int * ind, ok_int * ptr,
+	enum CBLAS_ORDER order);
+
 /* copy, I/O */
 ok_status sp_matrix_memcpy_mm(sp_matrix * A, const sp_matrix * B);
 ok_status sp_matrix_memcpy_ma(void * sparse_handle, sp_matrix * A,
@@ -104,6 +152,55 @@ ok_status sp_matrix_print_transpose(const sp_matrix * A);
 ok_status sp_blas_gemv(void * sparse_handle, enum CBLAS_TRANSPOSE transA,
 	ok_float alpha, sp_matrix * A, vector * x, ok_float beta, vector * y);
 
+/*
+ * Y = alpha * op(A) * X + beta * Y for dense blocks X, Y with the same
+ * layout (column-major only on the GPU); A is read once for all columns
+ */
+ok_status sp_blas_gemm(void * sparse_handle, enum CBLAS_TRANSPOSE transA,
+	ok_float alpha, sp_matrix * A, matrix * X, ok_float beta, matrix * Y);
+
+/* compressed index (width = 0 selects the narrowest width that fits) */
+ok_status sp_matrix_compress_index(sp_cindex * D, const sp_matrix * A,
+	size_t width);
+ok_status sp_cindex_free(sp_cindex * D);
+ok_status sp_blas_gemv_cindex(void * sparse_handle,
+	enum CBLAS_TRANSPOSE transA, ok_float alpha, sp_matrix * A,
+	sp_cindex * D, vector * x, ok_float beta, vector * y);
+
+/* 64-bit index sparse matrices */
+ok_status sp_matrix64_alloc(sp_matrix64 * A, size_t m, size_t n, size_t nnz,
+	enum CBLAS_ORDER order);
+ok_status sp_matrix64_calloc(sp_matrix64 * A, size_t m, size_t n, size_t nnz,
+	enum CBLAS_ORDER order);
+ok_status sp_matrix64_free(sp_matrix64 * A);
+ok_status sp_matrix64_view_array(sp_matrix64 * A, size_t m, size_t n,
+	size_t nnz, ok_float * val, ok_int64 * ind, ok_int64 * ptr,
+	enum CBLAS_ORDER order);
+ok_status sp_matrix64_memcpy_mm(sp_matrix64 * A, const sp_matrix64 * B);
+ok_status sp_matrix64_memcpy_ma(void * sparse_handle, sp_matrix64 * A,
+	const ok_float * val, const ok_int64 * ind, const ok_int64 * ptr);
+ok_status sp_matrix64_memcpy_am(ok_float * val, ok_int64 * ind,
+	ok_int64 * ptr, const sp_matrix64 * A);
+ok_status sp_matrix64_memcpy_vals_ma(void * sparse_handle, sp_matrix64 * A,
+	const ok_float * val);
+ok_status sp_matrix64_memcpy_vals_am(ok_float * val, const sp_matrix64 * A);
+ok_status sp_matrix64_abs(sp_matrix64 * A);
+ok_status sp_matrix64_pow(sp_matrix64 * A, const ok_float x);
+ok_status sp_matrix64_scale(sp_matrix64 * A, const ok_float alpha);
+ok_status sp_matrix64_scale_left(void * sparse_handle, sp_matrix64 * A,
+	const vector * v);
+ok_status sp_matrix64_scale_right(void * sparse_handle, sp_matrix64 * A,
+	const vector * v);
+ok_status sp_matrix64_compress_index(sp_cindex * D, const sp_matrix64 * A,
+	size_t width);
+ok_status sp_blas_gemv64(void * sparse_handle, enum CBLAS_TRANSPOSE transA,
+	ok_float alpha, sp_matrix64 * A, vector * x, ok_float beta, vector * y);
+ok_status sp_blas_gemm64(void * sparse_handle, enum CBLAS_TRANSPOSE transA,
+	ok_float alpha, sp_matrix64 * A, matrix * X, ok_float beta, matrix * Y);
+ok_status sp_blas_gemv64_cindex(void * sparse_handle,
+	enum CBLAS_TRANSPOSE transA, ok_float alpha, sp_matrix64 * A,
+	sp_cindex * D, vector * x, ok_float beta, vector * y);
+
 #ifdef __cplusplus
 }
 #endif
@@ -67,6 +67,16 @@ template<typename T>
 ok_status vector_min_(const vector_<T> * v, const T default_value, T * minval);
 template<typename T>
 ok_status vector_max_(const vector_<T> * v, const T default_value, T * maxval);
+template<typename T>
+ok_status vector_axpy_dot_(T alpha, const vector_<T> * x, vector_<T> * y,
+	T * x_dot_y);
+template<typename T>
+ok_status vector_xpby_sumsq_(const vector_<T> * x, T beta, vector_<T> * y,
+	T * sumsq);
+template<typename T>
+ok_status vector_axpy2_sumsq_(T alpha1, const vector_<T> * x1,
+	vector_<T> * y1, T alpha2, const vector_<T> * x2, vector_<T> * y2,
+	T * sumsq1, T * sumsq2);
 #endif
 
 #ifdef __cplusplus
@@ -111,6 +121,26 @@ ok_status vector_max(const vector * v, ok_float * maxval);
 ok_status vector_uniform_rand(vector * v, const ok_float minval,
 	const ok_float maxval);
 
+/*
+ * fused updates and reductions, one pass over the operands (reduction
+ * outputs may be OK_NULL):
+ *
+ *	vector_axpy_dot: 	y += alpha * x; x_dot_y = x'y
+ *	vector_xpby_sumsq:	y = x + beta * y; sumsq = ||y||_2^2
+ *	vector_axpy2_sumsq:	y1 += alpha1 * x1; y2 += alpha2 * x2;
+ *				sumsq1 = ||y1||_2^2, sumsq2 = ||y2||_2^2
+ *
+ * vector_axpy2_sumsq updates y1 and y2 element by element, so x2 may
+ * alias y1 (y2 is then updated with the new y1)
+ */
+ok_status vector_axpy_dot(ok_float alpha, const vector * x, vector * y,
+	ok_float * x_dot_y);
+ok_status vector_xpby_sumsq(const vector * x, ok_float beta, vector * y,
+	ok_float * sumsq);
+ok_status vector_axpy2_sumsq(ok_float alpha1, const vector * x1,
+	vector * y1, ok_float alpha2, const vector * x2, vector * y2,
+	ok_float * sumsq1, ok_float * sumsq2);
+
 #ifdef __cplusplus
 typedef vector_<size_t> indvector;
 #else
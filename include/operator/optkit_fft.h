@@ -0,0 +1,50 @@
+#ifndef OPTKIT_FFT_H_
+#define OPTKIT_FFT_H_
+
+#include "optkit_defs.h"
+#include "optkit_dense.h"
+
+#ifdef __cplusplus
+extern "C" {
+#endif
+
+/*
+ * radix-2 complex FFT over interleaved (re, im) host arrays of
+ * plan->size complex entries; plan->size must be a power of two.
+ */
+typedef struct fft_plan {
+	size_t size;
+	ok_float * twiddle;
+} fft_plan;
+
+size_t fft_next_pow2(size_t n);
+ok_status fft_plan_alloc(fft_plan * plan, size_t size);
+ok_status fft_plan_free(fft_plan * plan);
+ok_status fft_execute(const fft_plan * plan, ok_float * data, int inverse);
+
+/*
+ * real circulant matrix C of dimension size (a power of two), stored by
+ * the spectrum of its first column (pre-scaled by 1/size). multiplies
+ * the leading block C[:size1, :size2] (or its transpose) against
+ * vectors, staging through the host buffer.
+ */
+typedef struct fft_circulant {
+	size_t size;
+	fft_plan plan;
+	ok_float * spectrum;
+	ok_float * buffer;
+} fft_circulant;
+
+ok_status fft_circulant_alloc(fft_circulant * C, const ok_float * column,
+	size_t size);
+ok_status fft_circulant_free(fft_circulant * C);
+ok_status fft_circulant_scale(fft_circulant * C, const ok_float scaling);
+ok_status fft_circulant_mul(void * linalg_handle, fft_circulant * C,
+	int transpose, ok_float alpha, vector * input, ok_float beta,
+	vector * output, vector * work);
+
+#ifdef __cplusplus
+}
+#endif
+
+#endif /* OPTKIT_FFT_H_ */
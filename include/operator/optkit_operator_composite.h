@@ -0,0 +1,88 @@
+#ifndef OPTKIT_OPERATOR_COMPOSITE_H_
+#define OPTKIT_OPERATOR_COMPOSITE_H_
+
+#include "optkit_abstract_operator.h"
+
+#ifdef __cplusplus
+extern "C" {
+#endif
+
+/*
+ * composite operators built from borrowed sub-operators:
+ *
+ *	cat:	[A_0; A_1; ...; A_{k-1}] (vertical stack, common size2)
+ *	split:	[A_0, A_1, ..., A_{k-1}] (horizontal stack, common size1)
+ *	add:	A_0 + A_1 + ... + A_{k-1} (common shape)
+ *	neg:	-A_0
+ *
+ * blocks are applied into subvector views of the input/output vectors,
+ * without copies. the same sub-operator may appear in several blocks.
+ *
+ * the borrowed sub-operators are never modified: scaling a composite, or
+ * one of its blocks, updates the per-block scalars in scaling[].
+ *
+ * products that write disjoint output blocks (cat apply, split adjoint)
+ * run the blocks in parallel when built with OpenMP, but only if the
+ * blocks are distinct objects of kinds that keep no scratch space in
+ * their data (dense, sparse, diagonal); inner BLAS/OpenMP threads are
+ * capped to share the thread budget. otherwise the blocks run in
+ * sequence.
+ */
+typedef struct composite_operator_data{
+	size_t nops;
+	operator ** ops;
+	size_t * offsets;
+	ok_float * scaling;
+	ok_status * status;
+	int parallel;
+} composite_operator_data;
+
+void * composite_operator_data_alloc(operator ** ops, size_t nops,
+	OPTKIT_OPERATOR kind);
+ok_status composite_operator_data_free(void * data);
+
+ok_status cat_operator_mul(void * data, vector * input, vector * output);
+ok_status cat_operator_mul_t(void * data, vector * input, vector * output);
+ok_status cat_operator_mul_fused(void * data, ok_float alpha,
+	vector * input, ok_float beta, vector * output);
+ok_status cat_operator_mul_t_fused(void * data, ok_float alpha,
+	vector * input, ok_float beta, vector * output);
+
+ok_status split_operator_mul(void * data, vector * input, vector * output);
+ok_status split_operator_mul_t(void * data, vector * input, vector * output);
+ok_status split_operator_mul_fused(void * data, ok_float alpha,
+	vector * input, ok_float beta, vector * output);
+ok_status split_operator_mul_t_fused(void * data, ok_float alpha,
+	vector * input, ok_float beta, vector * output);
+
+ok_status add_operator_mul(void * data, vector * input, vector * output);
+ok_status add_operator_mul_t(void * data, vector * input, vector * output);
+ok_status add_operator_mul_fused(void * data, ok_float alpha,
+	vector * input, ok_float beta, vector * output);
+ok_status add_operator_mul_t_fused(void * data, ok_float alpha,
+	vector * input, ok_float beta, vector * output);
+
+ok_status neg_operator_mul(void * data, vector * input, vector * output);
+ok_status neg_operator_mul_t(void * data, vector * input, vector * output);
+ok_status neg_operator_mul_fused(void * data, ok_float alpha,
+	vector * input, ok_float beta, vector * output);
+ok_status neg_operator_mul_t_fused(void * data, ok_float alpha,
+	vector * input, ok_float beta, vector * output);
+
+operator * cat_operator_alloc(operator ** ops, size_t nops);
+operator * split_operator_alloc(operator ** ops, size_t nops);
+operator * add_operator_alloc(operator ** ops, size_t nops);
+operator * neg_operator_alloc(operator * A);
+
+ok_status composite_operator_get_nblocks(operator * A, size_t * nblocks);
+ok_status composite_operator_get_block(operator * A, size_t block,
+	operator ** op, size_t * offset);
+ok_status composite_operator_scale(operator * A, const ok_float scaling);
+ok_status composite_operator_scale_block(operator * A, size_t block,
+	const ok_float scaling);
+
+#ifdef __cplusplus
+}
+#endif
+
+#endif /* OPTKIT_OPERATOR_COMPOSITE_H_ */
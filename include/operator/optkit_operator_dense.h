@@ -21,6 +21,10 @@ ok_status dense_operator_mul_fused(void * data, ok_float alpha, vector * input,
 	ok_float beta, vector * output);
 ok_status dense_operator_mul_t_fused(void * data, ok_float alpha,
 	vector * input, ok_float beta, vector * output);
+ok_status dense_operator_mul_block(void * data, matrix * input,
+	matrix * output);
+ok_status dense_operator_mul_t_block(void * data, matrix * input,
+	matrix * output);
 
 operator * dense_operator_alloc(matrix * A);
 matrix * dense_operator_get_matrix_pointer(operator * A);
@@ -0,0 +1,42 @@
+#ifndef OPTKIT_OPERATOR_FOURIER_H_
+#define OPTKIT_OPERATOR_FOURIER_H_
+
+#include "optkit_abstract_operator.h"
+#include "optkit_fft.h"
+
+#ifdef __cplusplus
+extern "C" {
+#endif
+
+/*
+ * unitary discrete Fourier transform of real length-n signals, as the
+ * real 2n x n operator x -> [Re(Fx); Im(Fx)] / sqrt(n). arbitrary n is
+ * handled by Bluestein's algorithm on a power-of-two FFT.
+ */
+typedef struct fourier_operator_data{
+	void * dense_handle;
+	size_t n;
+	ok_float scaling;
+	fft_plan plan;
+	ok_float * chirp, * spectrum, * buffer;
+	vector work;
+} fourier_operator_data;
+
+void * fourier_operator_data_alloc(size_t n);
+ok_status fourier_operator_data_free(void * data);
+ok_status fourier_operator_mul(void * data, vector * input, vector * output);
+ok_status fourier_operator_mul_t(void * data, vector * input, vector * output);
+ok_status fourier_operator_mul_fused(void * data, ok_float alpha,
+	vector * input, ok_float beta, vector * output);
+ok_status fourier_operator_mul_t_fused(void * data, ok_float alpha,
+	vector * input, ok_float beta, vector * output);
+
+operator * fourier_operator_alloc(size_t n);
+
+ok_status fourier_operator_scale(operator * A, const ok_float scaling);
+
+#ifdef __cplusplus
+}
+#endif
+
+#endif /* OPTKIT_OPERATOR_FOURIER_H_ */
@@ -0,0 +1,40 @@
+#ifndef OPTKIT_OPERATOR_KRONECKER_H_
+#define OPTKIT_OPERATOR_KRONECKER_H_
+
+#include "optkit_abstract_operator.h"
+
+#ifdef __cplusplus
+extern "C" {
+#endif
+
+/*
+ * Kronecker product kron(A, B) of a p x q operator A and an r x s
+ * operator B, applied as vec(X) -> vec(B X A^T) for column-major X of
+ * shape s x q. the factors are borrowed, not owned.
+ */
+typedef struct kronecker_operator_data{
+	void * dense_handle;
+	operator * A, * B;
+	ok_float scaling;
+	vector BX, BtY, row_in, row_out, work;
+} kronecker_operator_data;
+
+void * kronecker_operator_data_alloc(operator * A, operator * B);
+ok_status kronecker_operator_data_free(void * data);
+ok_status kronecker_operator_mul(void * data, vector * input, vector * output);
+ok_status kronecker_operator_mul_t(void * data, vector * input,
+	vector * output);
+ok_status kronecker_operator_mul_fused(void * data, ok_float alpha,
+	vector * input, ok_float beta, vector * output);
+ok_status kronecker_operator_mul_t_fused(void * data, ok_float alpha,
+	vector * input, ok_float beta, vector * output);
+
+operator * kronecker_operator_alloc(operator * A, operator * B);
+
+ok_status kronecker_operator_scale(operator * A, const ok_float scaling);
+
+#ifdef __cplusplus
+}
+#endif
+
+#endif /* OPTKIT_OPERATOR_KRONECKER_H_ */
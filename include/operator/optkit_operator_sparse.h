@@ -9,12 +9,21 @@
 extern "C" {
 #endif
 
+/*
+ * cindex: optional compressed copy of the index pattern, built by
+ * sparse_operator_compress_index(); when set, matrix-vector products read
+ * it in place of the stored indices. transforms (abs, pow, scale, import)
+ * change values only, so the compressed index stays valid.
+ */
 typedef struct sparse_operator_data{
 	void * sparse_handle;
 	sp_matrix * A;
+	sp_matrix64 * A64;	/* set instead of A for 64-bit indices */
+	sp_cindex * cindex;
 } sparse_operator_data;
 
 void * sparse_operator_data_alloc(sp_matrix * A);
+void * sparse_operator64_data_alloc(sp_matrix64 * A);
 ok_status sparse_operator_data_free(void * data);
 ok_status sparse_operator_mul(void * data, vector * input, vector * output);
 ok_status sparse_operator_mul_t(void * data, vector * input, vector * output);
@@ -22,9 +31,16 @@ ok_status sparse_operator_mul_fused(void * data, ok_float alpha,
 	vector * input, ok_float beta, vector * output);
 ok_status sparse_operator_mul_t_fused(void * data, ok_float alpha,
 	vector * input, ok_float beta, vector * output);
+ok_status sparse_operator_mul_block(void * data, matrix * input,
+	matrix * output);
+ok_status sparse_operator_mul_t_block(void * data, matrix * input,
+	matrix * output);
 
 operator * sparse_operator_alloc(sp_matrix * A);
+operator * sparse_operator64_alloc(sp_matrix64 * A);
 sp_matrix * sparse_operator_get_matrix_pointer(operator * A);
+sp_matrix64 * sparse_operator_get_matrix64_pointer(operator * A);
+ok_status sparse_operator_compress_index(operator * A, size_t width);
 
 void * sparse_operator_export(operator * A);
 void * sparse_operator_import(operator * A, void * data);
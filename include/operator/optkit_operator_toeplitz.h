@@ -0,0 +1,45 @@
+#ifndef OPTKIT_OPERATOR_TOEPLITZ_H_
+#define OPTKIT_OPERATOR_TOEPLITZ_H_
+
+#include "optkit_abstract_operator.h"
+#include "optkit_fft.h"
+
+#ifdef __cplusplus
+extern "C" {
+#endif
+
+/*
+ * Toeplitz, circulant, convolution and circular convolution operators,
+ * each applied matrix-free as the leading block of a circulant embedding
+ */
+typedef struct toeplitz_operator_data{
+	void * dense_handle;
+	fft_circulant C;
+	vector work;
+} toeplitz_operator_data;
+
+void * toeplitz_operator_data_alloc(const ok_float * embedding,
+	size_t embedding_size, size_t work_size);
+ok_status toeplitz_operator_data_free(void * data);
+ok_status toeplitz_operator_mul(void * data, vector * input, vector * output);
+ok_status toeplitz_operator_mul_t(void * data, vector * input, vector * output);
+ok_status toeplitz_operator_mul_fused(void * data, ok_float alpha,
+	vector * input, ok_float beta, vector * output);
+ok_status toeplitz_operator_mul_t_fused(void * data, ok_float alpha,
+	vector * input, ok_float beta, vector * output);
+
+operator * toeplitz_operator_alloc(const ok_float * first_column, size_t m,
+	const ok_float * first_row, size_t n);
+operator * circulant_operator_alloc(const ok_float * first_column, size_t n);
+operator * convolution_operator_alloc(const ok_float * kernel,
+	size_t kernel_size, size_t n);
+operator * circular_convolution_operator_alloc(const ok_float * kernel,
+	size_t kernel_size, size_t n);
+
+ok_status toeplitz_operator_scale(operator * A, const ok_float scaling);
+
+#ifdef __cplusplus
+}
+#endif
+
+#endif /* OPTKIT_OPERATOR_TOEPLITZ_H_ */
@@ -3,30 +3,21 @@
 
 #include "optkit_abstract_operator.h"
 #include "optkit_operator_transforms.h"
+#include "optkit_operator_dense.h"
+#include "optkit_operator_sparse.h"
+#include "optkit_operator_diagonal.h"
+#include "optkit_operator_toeplitz.h"
+#include "optkit_operator_fourier.h"
+#include "optkit_operator_kronecker.h"
+#include "optkit_operator_composite.h"
 
 #ifdef __cplusplus
 extern "C" {
 #endif
 
-/* STUB */
-ok_status typesafe_operator_scale(operator * A, const ok_float scaling)
-{
-	return OPTKIT_ERROR;
-}
-
-/* STUB */
-ok_status typesafe_operator_scale_left(operator * A, const vector * v)
-{
-	return OPTKIT_ERROR;
-
-}
-
-/* STUB */
-ok_status typesafe_operator_scale_right(operator * A, const vector * v)
-{
-	return OPTKIT_ERROR;
-
-}
+ok_status typesafe_operator_scale(operator * A, const ok_float scaling);
+ok_status typesafe_operator_scale_left(operator * A, const vector * v);
+ok_status typesafe_operator_scale_right(operator * A, const vector * v);
 
 #ifdef __cplusplus
 }
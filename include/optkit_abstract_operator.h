@@ -54,6 +54,13 @@ typedef struct abstract_linear_operator {
 		ok_float beta, vector * output);
 	ok_status (* fused_adjoint)(void * data, ok_float alpha, vector * input,
 		ok_float beta, vector * output);
+	/*
+	 * optional (OK_NULL if unsupported): output = op(A) * input for a
+	 * column-major block of right-hand sides, reading A once
+	 */
+	ok_status (* apply_block)(void * data, matrix * input, matrix * output);
+	ok_status (* adjoint_block)(void * data, matrix * input,
+		matrix * output);
 	ok_status (* free)(void * data);
 	OPTKIT_OPERATOR kind;
 } operator;
@@ -83,6 +90,18 @@ static const char * optkit_op2str(OPTKIT_OPERATOR optype)
 		return "sparse COO operator";
 	case OkOperatorDiagonal:
 		return "diagonal operator";
+	case OkOperatorKronecker:
+		return "Kronecker product operator";
+	case OkOperatorToeplitz:
+		return "Toeplitz operator";
+	case OkOperatorCirculant:
+		return "circulant operator";
+	case OkOperatorConvolution:
+		return "convolution operator";
+	case OkOperatorCircularConvolution:
+		return "circular convolution operator";
+	case OkOperatorFourier:
+		return "Fourier operator";
 	default:
 		return "unknown operator";
 	}
@@ -0,0 +1,98 @@
+#ifndef OPTKIT_CBLAS_H_
+#define OPTKIT_CBLAS_H_
+
+/* included by optkit_defs.h, after the definitions of ok_float, ok_status */
+
+#ifdef __cplusplus
+extern "C" {
+#endif
+
+#define OK_CBLAS_PATHLEN 512
+
+/*
+ * CBLAS dispatch table
+ *
+ * CBLAS routines are bound at runtime, on first use, from the library
+ * named by the environment variable OPTKIT_BLAS:
+ *
+ *	(unset), "auto"		first of OpenBLAS, MKL, BLIS, reference CBLAS
+ *				or the system libblas found, else "builtin"
+ *	"openblas", "mkl",
+ *	"blis", "reference",
+ *	"accelerate", "system"	the named library family
+ *	"builtin"		optkit's portable (cache-blocked) routines
+ *	/path/to/libcblas.so	the given library
+ *
+ * The choice can be changed later with ok_blas_select(). Each optkit
+ * library holds its own table.
+ */
+typedef struct ok_cblas_table {
+	const char * name;
+	char library[OK_CBLAS_PATHLEN];
+
+	/* level 1 */
+	void (* axpy)(const int N, const ok_float alpha, const ok_float * X,
+		const int incX, ok_float * Y, const int incY);
+	ok_float (* nrm2)(const int N, const ok_float * X, const int incX);
+	void (* scal)(const int N, const ok_float alpha, ok_float * X,
+		const int incX);
+	ok_float (* asum)(const int N, const ok_float * X, const int incX);
+	ok_float (* dot)(const int N, const ok_float * X, const int incX,
+		const ok_float * Y, const int incY);
+	void (* copy)(const int N, const ok_float * X, const int incX,
+		ok_float * Y, const int incY);
+	CBLAS_INDEX (* iamax)(const int N, const ok_float * X, const int incX);
+
+	/* level 2 */
+	void (* gemv)(const enum CBLAS_ORDER order,
+		const enum CBLAS_TRANSPOSE TransA, const int M, const int N,
+		const ok_float alpha, const ok_float * A, const int lda,
+		const ok_float * X, const int incX, const ok_float beta,
+		ok_float * Y, const int incY);
+	void (* trsv)(const enum CBLAS_ORDER order, const enum CBLAS_UPLO Uplo,
+		const enum CBLAS_TRANSPOSE TransA, const enum CBLAS_DIAG Diag,
+		const int N, const ok_float * A, const int lda, ok_float * X,
+		const int incX);
+	void (* sbmv)(const enum CBLAS_ORDER order, const enum CBLAS_UPLO Uplo,
+		const int N, const int K, const ok_float alpha,
+		const ok_float * A, const int lda, const ok_float * X,
+		const int incX, const ok_float beta, ok_float * Y,
+		const int incY);
+
+	/* level 3 */
+	void (* syrk)(const enum CBLAS_ORDER Order, const enum CBLAS_UPLO Uplo,
+		const enum CBLAS_TRANSPOSE Trans, const int N, const int K,
+		const ok_float alpha, const ok_float * A, const int lda,
+		const ok_float beta, ok_float * C, const int ldc);
+	void (* gemm)(const enum CBLAS_ORDER Order,
+		const enum CBLAS_TRANSPOSE TransA,
+		const enum CBLAS_TRANSPOSE TransB, const int M, const int N,
+		const int K, const ok_float alpha, const ok_float * A,
+		const int lda, const ok_float * B, const int ldb,
+		const ok_float beta, ok_float * C, const int ldc);
+	void (* trsm)(const enum CBLAS_ORDER Order, const enum CBLAS_SIDE Side,
+		const enum CBLAS_UPLO Uplo, const enum CBLAS_TRANSPOSE TransA,
+		const enum CBLAS_DIAG Diag, const int M, const int N,
+		const ok_float alpha, const ok_float * A, const int lda,
+		ok_float * B, const int ldb);
+
+	/* thread control, if offered by the library (else NULL) */
+	int (* get_num_threads)(void);
+	void (* set_num_threads)(int);
+	/*
+	 * limit for the calling thread only, returning the previous one; 0
+	 * reverts to the process-wide limit (OpenBLAS >= 0.3.27, MKL)
+	 */
+	int (* set_num_threads_local)(int);
+} ok_cblas_table;
+
+const ok_cblas_table * ok_cblas(void);
+ok_status ok_blas_select(const char * name);
+const char * ok_blas_backend(void);
+const char * ok_blas_library(void);
+
+#ifdef __cplusplus
+}
+#endif
+
+#endif /* OPTKIT_CBLAS_H_ */
@@ -14,6 +14,7 @@ typedef struct cgls_helper{
 	ok_float norm_s, norm_s0, norm_x, xmax;
 	ok_float alpha, beta, delta, gamma, gamma_prev, shrink;
 	void * blas_handle;
+	uint iters, products; /* iterations and operator products, last solve */
 } cgls_helper;
 
 cgls_helper * cgls_helper_alloc(size_t m, size_t n);
@@ -31,6 +32,39 @@ typedef struct pcg_helper{
 pcg_helper * pcg_helper_alloc(size_t m, size_t n);
 ok_status pcg_helper_free(pcg_helper * helper);
 
+/*
+ * block CG helper structs: workspace for up to nrhs right-hand sides,
+ * stored column-major. columns [0, active) hold the right-hand sides
+ * still iterating, with right-hand side index[j] in column j; the
+ * per-column scalars move with their columns.
+ */
+typedef struct block_cgls_helper{
+	size_t nrhs, active;
+	matrix P, Q, R, S;
+	size_t * index;
+	ok_float * alpha, * gamma, * p_squared, * norm_s0, * norm_x, * xmax;
+	int * indefinite;
+	void * blas_handle;
+	uint * iters; /* iterations per right-hand side, last solve */
+	uint products; /* block products by A and A', last solve */
+} block_cgls_helper;
+
+block_cgls_helper * block_cgls_helper_alloc(size_t m, size_t n,
+	size_t nrhs);
+ok_status block_cgls_helper_free(block_cgls_helper * helper);
+
+typedef struct block_pcg_helper{
+	size_t nrhs, active;
+	matrix P, Q, R, Z, temp;
+	size_t * index;
+	ok_float * gamma, * norm_r;
+	void * blas_handle;
+	uint products; /* block products by A and A', last solve */
+} block_pcg_helper;
+
+block_pcg_helper * block_pcg_helper_alloc(size_t m, size_t n, size_t nrhs);
+ok_status block_pcg_helper_free(block_pcg_helper * helper);
+
 /* CGLS calls */
 /* core method */
 ok_status cgls_nonallocating(cgls_helper * helper, operator * op, vector * b,
@@ -66,6 +100,27 @@ ok_status pcg_solve(void * pcg_work, operator * op, operator * pre_cond,
 	const size_t maxiter, int quiet, uint * iters);
 ok_status pcg_finish(void * pcg_work);
 
+/*
+ * block CGLS and PCG calls: one solve per column of column-major B and X,
+ * with the products by A and A' formed a block at a time (see
+ * operator.apply_block) over the columns that have not converged; flag
+ * and iters have one entry per column
+ */
+ok_status block_cgls_nonallocating(block_cgls_helper * helper,
+	operator * op, matrix * B, matrix * X, const ok_float rho,
+	const ok_float tol, const size_t maxiter, int quiet, uint * flag);
+ok_status block_cgls(operator * op, matrix * B, matrix * X,
+	const ok_float rho, const ok_float tol, const size_t maxiter,
+	int quiet, uint * flag);
+
+/* warm starts from X */
+ok_status block_pcg_nonallocating(block_pcg_helper * helper, operator * op,
+	operator * pre_cond, matrix * B, matrix * X, const ok_float rho,
+	const ok_float tol, const size_t maxiter, int quiet, uint * iters);
+ok_status block_pcg(operator * op, operator * pre_cond, matrix * B,
+	matrix * X, const ok_float rho, const ok_float tol,
+	const size_t maxiter, int quiet, uint * iters);
+
 #ifdef __cplusplus
 }
 #endif
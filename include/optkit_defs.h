@@ -63,7 +63,8 @@ typedef enum optkit_status {
 	OPTKIT_ERROR_DIMENSION_MISMATCH = 101,
 	OPTKIT_ERROR_OUT_OF_BOUNDS = 102,
 	OPTKIT_ERROR_OVERWRITE = 1000,
-	OPTKIT_ERROR_UNALLOCATED = 1001
+	OPTKIT_ERROR_UNALLOCATED = 1001,
+	OPTKIT_ERROR_MEMORY = 1002
 } ok_status;
 
 #define OK_SCAN_ERR(err) ok_print_status(err, __FILE__, __LINE__, __func__)
@@ -102,16 +103,12 @@ enum OPTKIT_TRANSFORM {
 
 
 #ifndef FLOAT
-	#define CBLAS(x) cblas_d ## x
-	#define CBLASI(x) cblas_id ## x
 	#define MATH(x) x
 	typedef double ok_float;
 	#define MACHINETOL (double) 10e-10
 	#define OK_NAN ((double) 0x7ff8000000000000)
 	#define OK_FLOAT_MAX (double) DBL_MAX
 #else
-	#define CBLAS(x) cblas_s ## x
-	#define CBLASI(x) cblas_is ## x
 	#define MATH(x) x ## f
 	typedef float ok_float;
 	#define MACHINETOL (float) 10e-5
@@ -119,6 +116,10 @@ enum OPTKIT_TRANSFORM {
 	#define OK_FLOAT_MAX (float) FLT_MAX
 #endif
 
+/* CBLAS calls are dispatched at runtime, see optkit_cblas.h */
+#define CBLAS(x) (ok_cblas()->x)
+#define CBLASI(x) (ok_cblas()->i ## x)
+
 #define kZero (ok_float) 0
 #define kOne (ok_float) 1
 
@@ -133,8 +134,29 @@ enum OPTKIT_TRANSFORM {
 #endif
 
 void optkit_version(int * maj, int * min, int * change, int * status);
+/*
+ * OpenMP and BLAS thread limits, as saved by ok_threads_limit();
+ * blas_scope tells how the BLAS limit was applied (none, to the calling
+ * thread, or to the process, shared with overlapping calls)
+ */
+#define OK_THREADS_BLAS_NONE 0
+#define OK_THREADS_BLAS_LOCAL 1
+#define OK_THREADS_BLAS_SHARED 2
+
+typedef struct ok_threads {
+	int omp, blas, blas_scope;
+} ok_threads;
+
+ok_status ok_set_num_threads(int n_threads);
+int ok_get_max_threads(void);
+int ok_blas_get_num_threads(void);
+ok_status ok_blas_set_num_threads(int n_threads);
+ok_status ok_threads_limit(int n_threads, ok_threads * saved);
+ok_status ok_threads_restore(const ok_threads * saved);
 ok_status ok_device_reset(void);
 
+#include "optkit_cblas.h"
+
 static const char * ok_err2string(const ok_status error) {
 	switch(error) {
 	case OPTKIT_SUCCESS:
@@ -161,6 +183,8 @@ static const char * ok_err2string(const ok_status error) {
 		return "OPTKIT_ERROR_OVERWRITE";
 	case OPTKIT_ERROR_UNALLOCATED:
 		return "OPTKIT_ERROR_UNALLOCATED";
+	case OPTKIT_ERROR_MEMORY:
+		return "OPTKIT_ERROR_MEMORY";
 	default:
 		return "<unknown error>";
 	}
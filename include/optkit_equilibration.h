@@ -5,6 +5,7 @@
 #include "optkit_operator_transforms.h"
 #include "optkit_operator_dense.h"
 #include "optkit_operator_sparse.h"
+#include "optkit_operator_typesafe.h"
 
 #ifdef __cplusplus
 extern "C" {
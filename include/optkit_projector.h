@@ -35,6 +35,7 @@ typedef struct projector {
 
 ok_status projector_normalization(projector * P, int * normalized);
 ok_status projector_get_norm(projector * P, ok_float * norm);
+ok_status projector_get_work(projector * P, uint * products, uint * cg_iters);
 
 typedef struct direct_projector {
 	matrix * A;
@@ -48,6 +49,9 @@ ok_status direct_projector_initialize(void * linalg_handle,
 	direct_projector * P, const int normalize);
 ok_status direct_projector_project(void * linalg_handle, direct_projector * P,
 	vector * x_in, vector * y_in, vector * x_out, vector * y_out);
+ok_status direct_projector_project_batch(void * linalg_handle,
+	direct_projector * P, matrix * X_in, matrix * Y_in, matrix * X_out,
+	matrix * Y_out);
 ok_status direct_projector_free(direct_projector * P);
 
 typedef struct indirect_projector {
@@ -86,6 +90,7 @@ typedef struct indirect_projector_generic {
 	ok_float normA;
 	int normalized;
 	uint flag;
+	uint iters, products; /* CG iterations and operator products, last call */
 } indirect_projector_generic;
 
 void * indirect_projector_data_alloc(operator * A);
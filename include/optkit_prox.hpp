@@ -531,6 +531,215 @@ __DEVICE__ inline T FuncEval(const function_t_<T> * f_obj, T x)
 	return f_obj->c * x + dx + ex;
 }
 
+/*
+ * Asymptotic function evaluations, for infeasibility certificates.
+ *
+ * FuncSupportDomain evaluates the support function of the domain of
+ * x -> c * f(a * x - b) + dx + ex^2 at s,
+ *
+ *   sup { s * x : x in dom },
+ *
+ * and FuncRecession evaluates its recession function in the direction v,
+ *
+ *   lim_{t -> inf} (f(x + t * v) - f(x)) / t.
+ *
+ * Both return OK_FLOAT_MAX in place of +infinity. For FuncRecession,
+ * arguments within tol of the set where the value is finite are treated
+ * as belonging to it. FuncSupportDomain tests the sign of s strictly:
+ * when s is within tol of a direction in which the domain is bounded,
+ * the supremum is taken over the part of the domain with |x| <= bound,
+ * which exceeds the value for that direction by at most tol * bound
+ * (plus tol times the distance from the origin to the domain).
+*/
+template<typename T>
+__DEVICE__ inline T FuncSupportDomain(const function_t_<T> * f_obj, T s,
+	T tol, T bound)
+{
+	const T inf = static_cast<T>(OK_FLOAT_MAX);
+	T p, dir;
+
+	/* unrestricted domain: sup over |x| <= bound */
+	if (f_obj->a == 0 || f_obj->c == 0) {
+		if (s == 0)
+			return static_cast<T>(0);
+		return Abs(s) <= tol ? Abs(s) * bound : inf;
+	}
+
+	/* dom = {x : ax - b in dom h}, with p = b/a the image of u = 0 */
+	p = f_obj->b / f_obj->a;
+	switch ( f_obj->h ) {
+	case FnIndBox01:
+		return s * p + MaxPos<T>(s / f_obj->a);
+	case FnIndEq0:
+		return s * p;
+	case FnIndGe0:
+	case FnNegEntr:
+	case FnNegLog:
+	case FnRecipr:
+		/* half-line from p, unbounded in direction sign(a) */
+		dir = f_obj->a > 0 ? static_cast<T>(1) : static_cast<T>(-1);
+		break;
+	case FnIndLe0:
+		dir = f_obj->a > 0 ? static_cast<T>(-1) : static_cast<T>(1);
+		break;
+	default:
+		if (s == 0)
+			return static_cast<T>(0);
+		return Abs(s) <= tol ? Abs(s) * bound : inf;
+	}
+
+	/* sup over the half-line is s * p, or over its part in |x| <= bound */
+	if (s * dir <= 0)
+		return s * p;
+	return Abs(s) <= tol ? s * p + Abs(s) * MaxPos<T>(bound - dir * p) :
+		inf;
+}
+
+template<typename T>
+__DEVICE__ inline T FuncRecession(const function_t_<T> * f_obj, T v, T tol)
+{
+	const T inf = static_cast<T>(OK_FLOAT_MAX);
+	T u = f_obj->a * v, h = 0;
+
+	if (f_obj->e > 0 && Abs(v) > tol)
+		return inf;
+
+	if (f_obj->c != 0)
+		switch ( f_obj->h ) {
+		case FnAbs:
+		case FnHuber:
+			h = Abs(u);
+			break;
+		case FnIdentity:
+			h = u;
+			break;
+		case FnLogistic:
+		case FnMaxPos0:
+			h = MaxPos<T>(u);
+			break;
+		case FnMaxNeg0:
+			h = MaxNeg<T>(u);
+			break;
+		case FnExp:
+		case FnIndLe0:
+			if (u > tol)
+				return inf;
+			break;
+		case FnIndGe0:
+		case FnNegLog:
+		case FnRecipr:
+			if (u < -tol)
+				return inf;
+			break;
+		case FnIndBox01:
+		case FnIndEq0:
+		case FnNegEntr:
+		case FnSquare:
+			if (Abs(u) > tol)
+				return inf;
+			break;
+		default:
+			break;
+		}
+
+	return f_obj->c * h + f_obj->d * v;
+}
+
+/*
+ * Local model of x -> c * f(a * x - b) + dx + ex^2 at x, for solution
+ * polishing.
+ *
+ * If ax - b lies within tol of a kink of f or of the boundary of its
+ * domain, x is fixed there: *fixed = 1, and *x_fix holds the kink in
+ * terms of x. Otherwise *fixed = 0, *x_fix = x, and *w and *g hold the
+ * second and first derivatives at x: exact on the quadratic (or linear)
+ * piece of a piecewise-quadratic function containing x, a second-order
+ * Taylor model for the other smooth functions.
+ */
+template<typename T>
+__DEVICE__ inline void FuncPolish(const function_t_<T> * f_obj, T x, T tol,
+	T * x_fix, T * fixed, T * w, T * g)
+{
+	const T a = f_obj->a, c = f_obj->c;
+	T u = a * x - f_obj->b, h1 = 0, h2 = 0, kink = 0, s;
+	int at_kink = 0;
+
+	if (a != 0 && c != 0)
+		switch ( f_obj->h ) {
+		case FnAbs:
+			at_kink = Abs(u) <= tol;
+			h1 = Sign<T>(u);
+			break;
+		case FnExp:
+			h1 = h2 = Exp(u);
+			break;
+		case FnHuber:
+			h1 = Abs(u) <= 1 ? u : Sign<T>(u);
+			h2 = Abs(u) <= 1 ? 1 : 0;
+			break;
+		case FnIdentity:
+			h1 = 1;
+			break;
+		case FnIndBox01:
+			at_kink = u <= tol || u >= 1 - tol;
+			kink = u <= tol ? 0 : 1;
+			break;
+		case FnIndEq0:
+			at_kink = 1;
+			break;
+		case FnIndGe0:
+			at_kink = u <= tol;
+			break;
+		case FnIndLe0:
+			at_kink = u >= -tol;
+			break;
+		case FnLogistic:
+			s = static_cast<T>(1) / (1 + Exp(-u));
+			h1 = s;
+			h2 = s * (1 - s);
+			break;
+		case FnMaxNeg0:
+			at_kink = Abs(u) <= tol;
+			h1 = u < 0 ? -1 : 0;
+			break;
+		case FnMaxPos0:
+			at_kink = Abs(u) <= tol;
+			h1 = u > 0 ? 1 : 0;
+			break;
+		case FnNegEntr:
+			at_kink = u <= tol;
+			h1 = at_kink ? 0 : Log(u) + 1;
+			h2 = at_kink ? 0 : 1 / u;
+			break;
+		case FnNegLog:
+			h1 = -1 / u;
+			h2 = 1 / (u * u);
+			break;
+		case FnRecipr:
+			h1 = -1 / (u * u);
+			h2 = 2 / (u * u * u);
+			break;
+		case FnSquare:
+			h1 = u;
+			h2 = 1;
+			break;
+		default:
+			break;
+		}
+
+	if (at_kink) {
+		*fixed = 1;
+		*x_fix = (kink + f_obj->b) / a;
+		*w = 0;
+		*g = 0;
+	} else {
+		*fixed = 0;
+		*x_fix = x;
+		*w = c * a * a * h2 + f_obj->e;
+		*g = c * a * h1 + f_obj->d + f_obj->e * x;
+	}
+}
+
 template<typename T>
 ok_status function_vector_alloc(function_vector_<T> * f, size_t n);
 template<typename T>
@@ -558,6 +767,16 @@ ok_status prox_eval_vector_(const function_vector_<T> * f, T rho,
 template<typename T>
 ok_status function_eval_vector_(const function_vector_<T> * f,
 	const vector_<T> * x, T * fn_val);
+template<typename T>
+ok_status function_support_vector_(const function_vector_<T> * f,
+	const vector_<T> * s, T tol, T bound, T * val);
+template<typename T>
+ok_status function_recession_vector_(const function_vector_<T> * f,
+	const vector_<T> * v, T tol, T * val);
+template<typename T>
+ok_status function_polish_vector_(const function_vector_<T> * f,
+	const vector_<T> * x, T tol, vector_<T> * x_fix, vector_<T> * fixed,
+	vector_<T> * w, vector_<T> * g);
 #endif /* __cplusplus */
 
 #ifdef __cplusplus
@@ -577,6 +796,13 @@ ok_status prox_eval_vector(const function_vector * f, ok_float rho,
 	const vector * x_in, vector * x_out);
 ok_status function_eval_vector(const function_vector * f, const vector * x,
 	ok_float * fn_val);
+ok_status function_support_vector(const function_vector * f,
+	const vector * s, ok_float tol, ok_float bound, ok_float * val);
+ok_status function_recession_vector(const function_vector * f,
+	const vector * v, ok_float tol, ok_float * val);
+ok_status function_polish_vector(const function_vector * f,
+	const vector * x, ok_float tol, vector * x_fix, vector * fixed,
+	vector * w, vector * g);
 
 #ifdef __cplusplus
 }
@@ -3,6 +3,7 @@
 
 #include "optkit_defs.h"
 #include <unistd.h>
+#include <time.h>
 #include <sys/time.h>
 
 #ifdef __cplusplus
@@ -10,24 +11,56 @@ extern "C"{
 #endif
 
 typedef struct OK_TIMER{
-	struct timeval tv;
 	double tic, toc;
 } OK_TIMER;
 
-OK_TIMER tic(){
+/*
+ * seconds on the monotonic clock where available (translation units
+ * must define _POSIX_C_SOURCE >= 199309L before any system header),
+ * otherwise on the wall clock
+ */
+static double ok_clock(void)
+{
+#ifdef CLOCK_MONOTONIC
+	struct timespec ts;
+	clock_gettime(CLOCK_MONOTONIC, &ts);
+	return (double) ts.tv_sec + (double) ts.tv_nsec * 1e-9;
+#else
 	struct timeval tv;
-	OK_TIMER timer = (OK_TIMER){tv, 0, 0};
-	gettimeofday(&(timer.tv), OK_NULL);
-	timer.tic = (double) timer.tv.tv_sec + (double) timer.tv.tv_usec * 1e-6;
+	gettimeofday(&tv, OK_NULL);
+	return (double) tv.tv_sec + (double) tv.tv_usec * 1e-6;
+#endif
+}
+
+static OK_TIMER tic(void){
+	OK_TIMER timer = (OK_TIMER){0, 0};
+	timer.tic = ok_clock();
 	return timer;
 }
 
-ok_float toc(OK_TIMER timer){
-	gettimeofday(&(timer.tv), OK_NULL);
-	timer.toc = (double) timer.tv.tv_sec + (double) timer.tv.tv_usec * 1e-6;
+static ok_float toc(OK_TIMER timer){
+	timer.toc = ok_clock();
 	return (ok_float) (timer.toc - timer.tic);
 }
 
+/*
+ * solver profiling: OK_PROFILE_TOC adds the time elapsed since the last
+ * OK_PROFILE_TIC on the same timer to a total, OK_PROFILE_COUNT adds to a
+ * work counter; all compile to nothing with -DOK_NO_PROFILE, leaving the
+ * totals and counters zero
+ */
+#ifndef OK_NO_PROFILE
+#define OK_PROFILE_TIMER(t) OK_TIMER t = (OK_TIMER){0, 0}
+#define OK_PROFILE_TIC(t) t = tic()
+#define OK_PROFILE_TOC(t, total) total += toc(t)
+#define OK_PROFILE_COUNT(counter, n) counter += n
+#else
+#define OK_PROFILE_TIMER(t)
+#define OK_PROFILE_TIC(t)
+#define OK_PROFILE_TOC(t, total)
+#define OK_PROFILE_COUNT(counter, n)
+#endif
+
 #ifdef __cplusplus
 }
 #endif
@@ -39,6 +39,37 @@ typedef struct POGSSolver {
 	ok_float init_time;
 } pogs_solver;
 
+/*
+ * K problems with the same A, iterated together: column j of each
+ * column-major (m + n) x K block holds the block vector (y, x) of one
+ * problem, and z[j] views column j of every block.
+ * columns [0, active) hold the problems still iterating, with problem
+ * index[j] in column j.
+ */
+typedef struct POGSBatch {
+	size_t m, n, K, active;
+	matrix primal, primal12, dual, dual12, prev, temp;
+	pogs_variables * z;
+	block_vector * blocks;
+	vector * views;
+	size_t * index;
+} pogs_batch;
+
+/*
+ * workspace for solution polishing (see pogs_polish): the local model of
+ * f and g at the ADMM point (fix, fixed, curv, grad), the weights D of the
+ * reduced least-squares problem, its right-hand side h, the multipliers
+ * lambda of the fixed components, the polished point (primal, dual), and
+ * the scaled matrix diag(D_y)^1/2 A and the factorization of
+ * M = A'diag(D_y)A + diag(D_x) + delta I
+ */
+typedef struct POGSPolishWork {
+	size_t m, n;
+	block_vector * fix, * fixed, * curv, * grad, * D, * h, * lambda;
+	block_vector * primal, * dual, * temp;
+	matrix AD, M;
+} pogs_polish_work;
+
 int is_direct(void);
 
 POGS_PRIVATE ok_status pogs_matrix_alloc(pogs_matrix ** M, size_t m, size_t n,
@@ -65,11 +96,33 @@ POGS_PRIVATE int check_convergence(void * linalg_handle, pogs_solver * solver,
 POGS_PRIVATE ok_status project_primal(void * linalg_handle, projector_ * proj,
 	pogs_variables * z,  ok_float alpha);
 POGS_PRIVATE ok_status pogs_solver_loop(pogs_solver * solver, pogs_info * info);
+POGS_PRIVATE ok_status pogs_polish_work_alloc(pogs_polish_work ** work,
+	size_t m, size_t n, enum CBLAS_ORDER ord);
+POGS_PRIVATE ok_status pogs_polish_work_free(pogs_polish_work * work);
+POGS_PRIVATE ok_status polish_merit(void * linalg_handle,
+	pogs_solver * solver, block_vector * primal, block_vector * dual,
+	block_vector * temp, ok_float * merit);
+POGS_PRIVATE ok_status pogs_polish(pogs_solver * solver, pogs_info * info);
+POGS_PRIVATE ok_status pogs_batch_alloc(pogs_batch ** batch, size_t m,
+	size_t n, size_t K);
+POGS_PRIVATE ok_status pogs_batch_free(pogs_batch * batch);
+POGS_PRIVATE ok_status pogs_batch_retire(pogs_batch * batch, size_t j);
+POGS_PRIVATE ok_status project_primal_batch(void * linalg_handle,
+	projector_ * proj, pogs_batch * batch, ok_float alpha);
+POGS_PRIVATE ok_status update_residuals_batch(void * linalg_handle,
+	matrix * A, pogs_batch * batch, pogs_objectives * obj,
+	pogs_residuals * res);
+POGS_PRIVATE ok_status pogs_batch_loop(pogs_solver * solver,
+	pogs_batch * batch, function_vector * f, function_vector * g,
+	pogs_info * info, pogs_output * output);
 
 pogs_solver * pogs_init(ok_float * A, size_t m, size_t n, enum CBLAS_ORDER ord);
 ok_status pogs_solve(pogs_solver * solver, function_vector * f,
 	function_vector * g, const pogs_settings * settings, pogs_info * info,
 	pogs_output * output);
+ok_status pogs_solve_batch(pogs_solver * solver, size_t K,
+	function_vector * f, function_vector * g, const pogs_settings * settings,
+	pogs_info * info, pogs_output * output);
 ok_status pogs_finish(pogs_solver * solver, int reset);
 ok_status pogs(ok_float * A, function_vector * f, function_vector * g,
 	const pogs_settings * settings, pogs_info * info, pogs_output * output,
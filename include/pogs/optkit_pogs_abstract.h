@@ -26,6 +26,12 @@ typedef struct POGSWork {
 		vector * d, vector * e, const ok_float pnorm);
 	ok_float normA;
 	int skinny, normalized, equilibrated;
+	/*
+	 * sparse views: the caller's values, set aside while A refers to a
+	 * private copy that equilibration and normalization may rescale
+	 */
+	ok_float * view_val;
+	vector * view_copy;
 } pogs_work;
 
 typedef struct POGSSolver {
@@ -74,6 +80,19 @@ operator * pogs_dense_operator_gen(const ok_float * A, size_t m, size_t n,
 operator * pogs_sparse_operator_gen(const ok_float * val, const ok_int * ind,
 	const ok_int * ptr, size_t m, size_t n, size_t nnz,
 	enum CBLAS_ORDER order);
+operator * pogs_sparse_operator_gen64(const ok_float * val,
+	const ok_int64 * ind, const ok_int64 * ptr, size_t m, size_t n,
+	size_t nnz, enum CBLAS_ORDER order);
+/*
+ * wraps caller-owned CSR/CSC arrays without copying; the arrays must
+ * outlive the operator. the caller's arrays are not modified: a solver
+ * equilibrates a private copy of the values, held from pogs_init() to
+ * pogs_finish(), so one view operator serves one solver at a time
+ */
+operator * pogs_sparse_operator_view(ok_float * val, ok_int * ind,
+	ok_int * ptr, size_t m, size_t n, size_t nnz, enum CBLAS_ORDER order);
+operator * pogs_sparse_operator_view64(ok_float * val, ok_int64 * ind,
+	ok_int64 * ptr, size_t m, size_t n, size_t nnz, enum CBLAS_ORDER order);
 ok_status pogs_dense_operator_free(operator * A);
 ok_status pogs_sparse_operator_free(operator * A);
 // pogs_solver * pogs_load_solver(operator * op_equil,
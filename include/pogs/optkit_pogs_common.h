@@ -30,6 +30,11 @@ extern "C" {
 #define kVERBOSE 2u
 #define kSUPPRESS 0u
 #define kRESUME 0
+#define kNUMTHREADS 0
+#define kANDERSON 0u
+#define kINFEASTOL (ok_float) 1e-4
+#define kPOLISH 0
+#define kPOLISHREFINE 3u
 #define kRHOMAX (ok_float) 1e4
 #define kRHOMIN (ok_float) 1e-4
 #define kDELTAMAX (ok_float) 2.
@@ -37,8 +42,24 @@ extern "C" {
 #define kGAMMA (ok_float) 1.01
 #define kKAPPA (ok_float) 0.9
 #define kTAU (ok_float) 0.8
+#ifndef FLOAT
+#define kANDERSONREG (ok_float) 1e-10
+#define kPOLISHTOL (ok_float) 1e-9
+#define kPOLISHDELTA (ok_float) 1e-6
+#else
+#define kANDERSONREG (ok_float) 1e-5
+#define kPOLISHTOL (ok_float) 1e-5
+#define kPOLISHDELTA (ok_float) 1e-3
+#endif
 #endif /* POGS_CONSTANTS */
 
+enum OPTKIT_POGS_STATUS {
+	OkPogsUnconverged = 0,
+	OkPogsSolved = 1,
+	OkPogsPrimalInfeasible = 2,
+	OkPogsDualInfeasible = 3
+};
+
 typedef struct AdaptiveRhoParameters {
 	ok_float delta, l, u, xi;
 } adapt_params;
@@ -66,13 +87,24 @@ typedef struct POGSSettings {
 	uint maxiter, verbose, suppress;
 	int adaptiverho, gapstop, warmstart, resume;
 	ok_float * x0, * nu0;
+	int num_threads; /* OpenMP/BLAS threads per solve; 0: default */
+	uint anderson; /* Anderson acceleration memory depth; 0: off */
+	ok_float infeastol; /* infeasibility certificate tolerance; 0: off */
+	int polish; /* polish solution after convergence; 0: off */
 } pogs_settings;
 
 typedef struct POGSInfo {
 	int err;
 	int converged;
+	int status; /* enum OPTKIT_POGS_STATUS */
 	uint k;
 	ok_float obj, rho, setup_time, solve_time;
+	/* cumulative time per phase of the solver loop, in seconds */
+	ok_float prox_time, project_time, dual_time, check_time, adapt_time;
+	ok_float anderson_time, polish_time;
+	/* matrix-vector products by A or A^T, and CG iterations in projections */
+	uint gemv_count, cg_iters;
+	int polished; /* output replaced by polished solution */
 } pogs_info;
 
 typedef struct POGSOutput {
@@ -85,6 +117,29 @@ typedef struct POGSVariables {
 	size_t m, n;
 } pogs_variables;
 
+/*
+ * type-II Anderson acceleration of the ADMM iteration u^{k+1} = G(u^k),
+ * with iterate u = (z, zt) and residual f^k = G(u^k) - u^k.
+ *
+ * columns of dF and dG hold differences of the last (at most mem)
+ * successive residuals and map outputs; each step takes
+ *
+ *	gamma = argmin ||f^k - dF * gamma||_2,
+ *	u^{k+1} = G(u^k) - dG * gamma.
+ *
+ * an accelerated step is rejected when the residual at the next iterate
+ * exceeds the last residual: the iterate reverts to the unaccelerated
+ * G(u^k) and the memory is cleared. the memory is also cleared whenever
+ * rho changes, since the map G changes with it.
+ */
+typedef struct POGSAndersonWork {
+	size_t mem, size, n_cols, index;
+	int have_prev, accelerated;
+	ok_float norm_f;
+	vector u, g, f, g_prev, f_prev, gamma;
+	matrix dF, dG, gram;
+} anderson_work;
+
 int private_api_accessible(void);
 ok_status set_default_settings(pogs_settings * settings);
 
@@ -113,6 +168,20 @@ POGS_PRIVATE ok_status update_dual(void * linalg_handle, pogs_variables * z,
 POGS_PRIVATE ok_status adaptrho(pogs_variables * z,
 	const pogs_settings * settings, ok_float * rho, adapt_params * params,
 	const pogs_residuals * res, const pogs_tolerances * eps, const uint k);
+POGS_PRIVATE ok_status anderson_work_alloc(anderson_work ** aa, size_t m,
+	size_t n, size_t mem);
+POGS_PRIVATE ok_status anderson_work_free(anderson_work * aa);
+POGS_PRIVATE ok_status anderson_reset(anderson_work * aa);
+POGS_PRIVATE ok_status anderson_get_iterate(vector * u, pogs_variables * z);
+POGS_PRIVATE ok_status anderson_set_iterate(pogs_variables * z, vector * u);
+POGS_PRIVATE ok_status anderson_set_input(anderson_work * aa,
+	pogs_variables * z);
+POGS_PRIVATE ok_status anderson_step(void * linalg_handle,
+	anderson_work * aa, pogs_variables * z);
+POGS_PRIVATE ok_status check_infeasibility(void * linalg_handle,
+	const operator * A, const function_vector * f,
+	const function_vector * g, pogs_variables * z, ok_float alpha,
+	ok_float tol, int * status);
 POGS_PRIVATE ok_status copy_output(pogs_output * output,
 	const pogs_variables * z, const vector * d, const vector * e,
 	const ok_float rho, const uint suppress);
@@ -214,6 +283,10 @@ POGS_PRIVATE ok_status update_settings(pogs_settings * settings,
 	settings->resume = input->resume;
 	settings->x0 = input->x0;
 	settings->nu0 = input->nu0;
+	settings->num_threads = input->num_threads;
+	settings->anderson = input->anderson;
+	settings->infeastol = input->infeastol;
+	settings->polish = input->polish;
 	return OPTKIT_SUCCESS;
 }
 
@@ -389,6 +462,282 @@ POGS_PRIVATE ok_status adaptrho(pogs_variables * z,
 	return OPTKIT_SUCCESS;
 }
 
+POGS_PRIVATE ok_status anderson_work_alloc(anderson_work ** aa, size_t m,
+	size_t n, size_t mem)
+{
+	if (*aa != OK_NULL)
+		return OK_SCAN_ERR( OPTKIT_ERROR_OVERWRITE );
+	if (mem == 0)
+		return OK_SCAN_ERR( OPTKIT_ERROR_DOMAIN );
+
+	ok_status err = OPTKIT_SUCCESS;
+	anderson_work * aa_ = OK_NULL;
+	ok_alloc(aa_, sizeof(*aa_));
+	aa_->mem = mem;
+	aa_->size = 2 * (m + n);
+	OK_CHECK_ERR( err, vector_calloc(&aa_->u, aa_->size) );
+	OK_CHECK_ERR( err, vector_calloc(&aa_->g, aa_->size) );
+	OK_CHECK_ERR( err, vector_calloc(&aa_->f, aa_->size) );
+	OK_CHECK_ERR( err, vector_calloc(&aa_->g_prev, aa_->size) );
+	OK_CHECK_ERR( err, vector_calloc(&aa_->f_prev, aa_->size) );
+	OK_CHECK_ERR( err, vector_calloc(&aa_->gamma, mem) );
+	OK_CHECK_ERR( err, matrix_calloc(&aa_->dF, aa_->size, mem,
+		CblasColMajor) );
+	OK_CHECK_ERR( err, matrix_calloc(&aa_->dG, aa_->size, mem,
+		CblasColMajor) );
+	OK_CHECK_ERR( err, matrix_calloc(&aa_->gram, mem, mem,
+		CblasColMajor) );
+	OK_CHECK_ERR( err, anderson_reset(aa_) );
+	if (err)
+		OK_MAX_ERR( err, anderson_work_free(aa_) );
+	else
+		*aa = aa_;
+	return err;
+}
+
+POGS_PRIVATE ok_status anderson_work_free(anderson_work * aa)
+{
+	ok_status err = OPTKIT_SUCCESS;
+	OK_CHECK_PTR(aa);
+	OK_MAX_ERR( err, vector_free(&aa->u) );
+	OK_MAX_ERR( err, vector_free(&aa->g) );
+	OK_MAX_ERR( err, vector_free(&aa->f) );
+	OK_MAX_ERR( err, vector_free(&aa->g_prev) );
+	OK_MAX_ERR( err, vector_free(&aa->f_prev) );
+	OK_MAX_ERR( err, vector_free(&aa->gamma) );
+	OK_MAX_ERR( err, matrix_free(&aa->dF) );
+	OK_MAX_ERR( err, matrix_free(&aa->dG) );
+	OK_MAX_ERR( err, matrix_free(&aa->gram) );
+	ok_free(aa);
+	return err;
+}
+
+/* clear memory; the next step is unaccelerated */
+POGS_PRIVATE ok_status anderson_reset(anderson_work * aa)
+{
+	OK_CHECK_PTR(aa);
+	aa->n_cols = 0;
+	aa->index = 0;
+	aa->have_prev = 0;
+	aa->accelerated = 0;
+	aa->norm_f = OK_FLOAT_MAX;
+	return OPTKIT_SUCCESS;
+}
+
+/* u <- (z, zt) */
+POGS_PRIVATE ok_status anderson_get_iterate(vector * u, pogs_variables * z)
+{
+	vector u_primal, u_dual;
+	OK_CHECK_VECTOR(u);
+	OK_CHECK_PTR(z);
+	size_t size = z->primal->size;
+	OK_RETURNIF_ERR( vector_subvector(&u_primal, u, 0, size) );
+	OK_RETURNIF_ERR( vector_subvector(&u_dual, u, size, size) );
+	OK_RETURNIF_ERR( vector_memcpy_vv(&u_primal, z->primal->vec) );
+	return OK_SCAN_ERR( vector_memcpy_vv(&u_dual, z->dual->vec) );
+}
+
+/* (z, zt) <- u */
+POGS_PRIVATE ok_status anderson_set_iterate(pogs_variables * z, vector * u)
+{
+	vector u_primal, u_dual;
+	OK_CHECK_VECTOR(u);
+	OK_CHECK_PTR(z);
+	size_t size = z->primal->size;
+	OK_RETURNIF_ERR( vector_subvector(&u_primal, u, 0, size) );
+	OK_RETURNIF_ERR( vector_subvector(&u_dual, u, size, size) );
+	OK_RETURNIF_ERR( vector_memcpy_vv(z->primal->vec, &u_primal) );
+	return OK_SCAN_ERR( vector_memcpy_vv(z->dual->vec, &u_dual) );
+}
+
+/* record u^k = (z, zt) before an iteration */
+POGS_PRIVATE ok_status anderson_set_input(anderson_work * aa,
+	pogs_variables * z)
+{
+	OK_CHECK_PTR(aa);
+	return anderson_get_iterate(&aa->u, z);
+}
+
+/*
+ * given G(u^k) in (z, zt) after an iteration, overwrite (z, zt) with the
+ * accelerated iterate u^{k+1}
+ */
+POGS_PRIVATE ok_status anderson_step(void * linalg_handle,
+	anderson_work * aa, pogs_variables * z)
+{
+	ok_status err = OPTKIT_SUCCESS;
+	ok_float norm_f, trace;
+	vector col, diag, gamma;
+	matrix dF, dG, gram;
+	OK_CHECK_PTR(aa);
+	OK_CHECK_PTR(z);
+
+	/* g = G(u^k), f = g - u^k */
+	OK_RETURNIF_ERR( anderson_get_iterate(&aa->g, z) );
+	OK_RETURNIF_ERR( vector_memcpy_vv(&aa->f, &aa->g) );
+	OK_RETURNIF_ERR( blas_axpy(linalg_handle, -kOne, &aa->u, &aa->f) );
+	OK_RETURNIF_ERR( blas_nrm2(linalg_handle, &aa->f, &norm_f) );
+
+	/* safeguard: revert to G(u^{k-1}) if accelerating increased f */
+	if (aa->accelerated && norm_f > aa->norm_f) {
+		OK_RETURNIF_ERR( anderson_reset(aa) );
+		return anderson_set_iterate(z, &aa->g_prev);
+	}
+
+	/* dF[:, index] = f^k - f^{k-1}; dG[:, index] = g^k - g^{k-1} */
+	if (aa->have_prev) {
+		OK_RETURNIF_ERR( matrix_column(&col, &aa->dF, aa->index) );
+		OK_RETURNIF_ERR( vector_memcpy_vv(&col, &aa->f) );
+		OK_RETURNIF_ERR( blas_axpy(linalg_handle, -kOne, &aa->f_prev,
+			&col) );
+		OK_RETURNIF_ERR( matrix_column(&col, &aa->dG, aa->index) );
+		OK_RETURNIF_ERR( vector_memcpy_vv(&col, &aa->g) );
+		OK_RETURNIF_ERR( blas_axpy(linalg_handle, -kOne, &aa->g_prev,
+			&col) );
+		aa->index = (aa->index + 1) % aa->mem;
+		aa->n_cols += (aa->n_cols < aa->mem);
+	}
+	OK_RETURNIF_ERR( vector_memcpy_vv(&aa->f_prev, &aa->f) );
+	OK_RETURNIF_ERR( vector_memcpy_vv(&aa->g_prev, &aa->g) );
+	aa->have_prev = 1;
+	aa->norm_f = norm_f;
+	aa->accelerated = 0;
+
+	if (aa->n_cols == 0)
+		return OPTKIT_SUCCESS;
+
+	OK_CHECK_ERR( err, matrix_submatrix(&dF, &aa->dF, 0, 0, aa->size,
+		aa->n_cols) );
+	OK_CHECK_ERR( err, matrix_submatrix(&dG, &aa->dG, 0, 0, aa->size,
+		aa->n_cols) );
+	OK_CHECK_ERR( err, matrix_submatrix(&gram, &aa->gram, 0, 0, aa->n_cols,
+		aa->n_cols) );
+	OK_CHECK_ERR( err, vector_subvector(&gamma, &aa->gamma, 0,
+		aa->n_cols) );
+
+	/* (dF'dF + lambda I) gamma = dF'f, lambda relative to tr(dF'dF) */
+	OK_CHECK_ERR( err, blas_syrk(linalg_handle, CblasLower, CblasTrans,
+		kOne, &dF, kZero, &gram) );
+	OK_CHECK_ERR( err, matrix_diagonal(&diag, &gram) );
+	OK_CHECK_ERR( err, blas_asum(linalg_handle, &diag, &trace) );
+	OK_CHECK_ERR( err, vector_add_constant(&diag, kANDERSONREG *
+		(trace > 0 ? trace : kOne)) );
+	OK_CHECK_ERR( err, blas_gemv(linalg_handle, CblasTrans, kOne, &dF,
+		&aa->f, kZero, &gamma) );
+	OK_CHECK_ERR( err, linalg_cholesky_decomp(linalg_handle, &gram) );
+	OK_CHECK_ERR( err, linalg_cholesky_svx(linalg_handle, &gram, &gamma) );
+
+	/* u^{k+1} = g - dG * gamma, formed in f */
+	OK_CHECK_ERR( err, vector_memcpy_vv(&aa->f, &aa->g) );
+	OK_CHECK_ERR( err, blas_gemv(linalg_handle, CblasNoTrans, -kOne, &dG,
+		&gamma, kOne, &aa->f) );
+	OK_CHECK_ERR( err, anderson_set_iterate(z, &aa->f) );
+	if (!err)
+		aa->accelerated = 1;
+	return err;
+}
+
+/*
+ * infeasibility certificates from the last iteration's changes in the
+ * primal and dual variables:
+ *
+ *	dz = z^{k+1} - z^k
+ *	dzt = zt^{k+1} - zt^k = alpha * z^{k+1/2} + (1 - alpha) * z^k - z^{k+1}
+ *
+ * for an infeasible problem, dzt converges to a nonzero vector orthogonal
+ * to {y = Ax} that separates the subspace from dom f x dom g; for an
+ * unbounded problem, dz converges to a nonzero vector in {y = Ax} along
+ * which f + g decreases. with both directions normalized, report
+ *
+ *	primal infeasible, if sigma_{dom f}(-dyt) + sigma_{dom g}(-dxt) < -tol
+ *	dual infeasible, if f_inf(dy) + g_inf(dx) < -tol
+ *
+ * (sigma: support function, f_inf: recession function), and otherwise
+ * leave status at OkPogsUnconverged. tol <= 0 skips both tests.
+ *
+ * the support functions are evaluated over the part of each domain
+ * within the magnitude of z^{k+1/2}, which bounds their error in
+ * directions within tol of the finite ones.
+ *
+ * when the projection onto {y = Ax} is inexact (indirect projector), A
+ * is given, and each certificate additionally requires its direction to
+ * lie (within tol) in the right subspace,
+ *
+ *	||A'dyt + dxt|| <= tol * ||dzt||, or ||A dx - dy|| <= tol * ||dz||;
+ *
+ * otherwise A is OK_NULL.
+ */
+POGS_PRIVATE ok_status check_infeasibility(void * linalg_handle,
+	const operator * A, const function_vector * f,
+	const function_vector * g, pogs_variables * z, ok_float alpha,
+	ok_float tol, int * status)
+{
+	ok_float nrm, bound, val_f, val_g;
+	OK_CHECK_FNVECTOR(f);
+	OK_CHECK_FNVECTOR(g);
+	OK_CHECK_PTR(z);
+	OK_CHECK_PTR(status);
+
+	*status = OkPogsUnconverged;
+	if (tol <= 0)
+		return OPTKIT_SUCCESS;
+
+	OK_RETURNIF_ERR( blas_nrm2(linalg_handle, z->primal12->vec, &bound) );
+
+	/* -dzt */
+	OK_RETURNIF_ERR( vector_memcpy_vv(z->temp->vec, z->primal->vec) );
+	OK_RETURNIF_ERR( blas_axpy(linalg_handle, -alpha, z->primal12->vec,
+		z->temp->vec) );
+	OK_RETURNIF_ERR( blas_axpy(linalg_handle, alpha - kOne, z->prev->vec,
+		z->temp->vec) );
+	OK_RETURNIF_ERR( blas_nrm2(linalg_handle, z->temp->vec, &nrm) );
+	if (nrm > 0) {
+		OK_RETURNIF_ERR( vector_scale(z->temp->vec, kOne / nrm) );
+		OK_RETURNIF_ERR( function_support_vector(f, z->temp->y, tol,
+			bound, &val_f) );
+		OK_RETURNIF_ERR( function_support_vector(g, z->temp->x, tol,
+			bound, &val_g) );
+		if (val_f + val_g < -tol && A) {
+			/* -(A'dyt + dxt) */
+			OK_RETURNIF_ERR( A->fused_adjoint(A->data, kOne,
+				z->temp->y, kOne, z->temp->x) );
+			OK_RETURNIF_ERR( blas_nrm2(linalg_handle, z->temp->x,
+				&nrm) );
+			if (nrm > tol)
+				val_f = val_g = kZero;
+		}
+		if (val_f + val_g < -tol) {
+			*status = OkPogsPrimalInfeasible;
+			return OPTKIT_SUCCESS;
+		}
+	}
+
+	/* dz */
+	OK_RETURNIF_ERR( vector_memcpy_vv(z->temp->vec, z->primal->vec) );
+	OK_RETURNIF_ERR( blas_axpy(linalg_handle, -kOne, z->prev->vec,
+		z->temp->vec) );
+	OK_RETURNIF_ERR( blas_nrm2(linalg_handle, z->temp->vec, &nrm) );
+	if (nrm > 0) {
+		OK_RETURNIF_ERR( vector_scale(z->temp->vec, kOne / nrm) );
+		OK_RETURNIF_ERR( function_recession_vector(f, z->temp->y, tol,
+			&val_f) );
+		OK_RETURNIF_ERR( function_recession_vector(g, z->temp->x, tol,
+			&val_g) );
+		if (val_f + val_g < -tol && A) {
+			/* A dx - dy */
+			OK_RETURNIF_ERR( A->fused_apply(A->data, kOne,
+				z->temp->x, -kOne, z->temp->y) );
+			OK_RETURNIF_ERR( blas_nrm2(linalg_handle, z->temp->y,
+				&nrm) );
+			if (nrm > tol)
+				val_f = val_g = kZero;
+		}
+		if (val_f + val_g < -tol)
+			*status = OkPogsDualInfeasible;
+	}
+	return OPTKIT_SUCCESS;
+}
+
 /*
  * copy pogs variables to outputs:
  *
@@ -4,13 +4,13 @@ if int(getenv('OPTKIT_C_TESTING', 0)) == 0:
 	from optkit.api import OPTKIT_VERSION
 
 	# Backend
-	from optkit.api import set_backend
+	from optkit.api import set_backend, threadpool_limits
 	if int(getenv('OPTKIT_IMPORT_BACKEND', 0)) > 1:
 		from optkit.api import backend
 
 	# C implementations
 	from optkit.api import PogsSolver, PogsObjective
-	from optkit.api import Clustering, ClusteringSettings
+	from optkit.api import Clustering, ClusteringSettings, KMeansModel
 
 	del utils
 	del libs
@@ -1,11 +1,89 @@
 from optkit.backends import OKBackend
 from optkit.types import PogsTypes, ClusteringTypes
 from os import getenv
+from threading import Lock
+
+"""
+Lazy bindings
+
+Libraries are loaded, and Python types built around them, on first use of
+a binding rather than at import or backend switching.
+"""
+class LazyTypeMeta(type):
+	"""
+	metaclass of the public API classes, e.g. PogsSolver, which stand for
+	the class of the same name built for the current backend:
+
+	- calling a public class constructs an instance of the backend class,
+	- isinstance()/issubclass() checks against a public class defer to the
+	  backend class (without building it, if it does not exist yet), and
+	- a subclass of a public class is combined with the backend class
+	  when instantiated, so its methods can override and extend it.
+	"""
+	def lazy_resolve(cls, build=True):
+		for base in cls.__mro__:
+			if '_lazy_name' in base.__dict__:
+				types = base._lazy_types(build)
+				return getattr(types, base._lazy_name) if types else None
+
+	def __call__(cls, *args, **kwargs):
+		if cls.__dict__.get('_lazy_resolved', False):
+			return type.__call__(cls, *args, **kwargs)
+
+		resolved = cls.lazy_resolve()
+		if '_lazy_name' in cls.__dict__:
+			return resolved(*args, **kwargs)
+
+		combined = cls.__dict__.get('_lazy_combined', {})
+		if resolved not in combined:
+			combined[resolved] = LazyTypeMeta(cls.__name__, (cls, resolved),
+											  dict(_lazy_resolved=True,
+												   __module__=cls.__module__))
+			type.__setattr__(cls, '_lazy_combined', combined)
+		return combined[resolved](*args, **kwargs)
+
+	def __instancecheck__(cls, obj):
+		if type.__instancecheck__(cls, obj):
+			return True
+		if '_lazy_name' not in cls.__dict__:
+			return False
+		resolved = cls.lazy_resolve(build=False)
+		return resolved is not None and isinstance(obj, resolved)
+
+	def __subclasscheck__(cls, subclass):
+		if type.__subclasscheck__(cls, subclass):
+			return True
+		if '_lazy_name' not in cls.__dict__:
+			return False
+		resolved = cls.lazy_resolve(build=False)
+		return resolved is not None and issubclass(subclass, resolved)
+
+	def __getattr__(cls, attr):
+		if attr.startswith('__'):
+			raise AttributeError(attr)
+		return getattr(cls.lazy_resolve(), attr)
+
+class LazyVersion(object):
+	""" version string of the backend, queried on first use """
+	def __str__(self):
+		return str(backend.version)
+
+	def __repr__(self):
+		return repr(backend.version)
+
+	def __eq__(self, other):
+		return str(self) == other
+
+	def __ne__(self, other):
+		return not self.__eq__(other)
+
+	def __getattr__(self, attr):
+		return getattr(str(self), attr)
 
 """
 Version query
 """
-OPTKIT_VERSION = None
+OPTKIT_VERSION = LazyVersion()
 
 """
 Backend handle
@@ -16,12 +94,59 @@ backend = OKBackend()
 C implementations
 """
 pogs_types = None
-PogsSolver = None
-PogsObjective = None
-
 clustering_types = None
-ClusteringSettings = None
-Clustering = None
+types_lock = Lock()
+
+def get_pogs_types(build=True):
+	global pogs_types
+	with types_lock:
+		if pogs_types is None and build:
+			pogs_types = PogsTypes(backend)
+		return pogs_types
+
+def get_clustering_types(build=True):
+	global clustering_types
+	with types_lock:
+		if clustering_types is None and build:
+			clustering_types = ClusteringTypes(backend)
+		return clustering_types
+
+class PogsSolver(object):
+	""" POGS solver for the current backend """
+	__metaclass__ = LazyTypeMeta
+	_lazy_types = staticmethod(get_pogs_types)
+	_lazy_name = 'Solver'
+
+class PogsObjective(object):
+	""" POGS objective for the current backend """
+	__metaclass__ = LazyTypeMeta
+	_lazy_types = staticmethod(get_pogs_types)
+	_lazy_name = 'Objective'
+
+class ClusteringSettings(object):
+	""" k-means settings for the current backend """
+	__metaclass__ = LazyTypeMeta
+	_lazy_types = staticmethod(get_clustering_types)
+	_lazy_name = 'ClusteringSettings'
+
+class Clustering(object):
+	""" k-means clustering for the current backend """
+	__metaclass__ = LazyTypeMeta
+	_lazy_types = staticmethod(get_clustering_types)
+	_lazy_name = 'Clustering'
+
+class KMeansModel(object):
+	""" k-means model for batch prediction, for the current backend """
+	__metaclass__ = LazyTypeMeta
+	_lazy_types = staticmethod(get_clustering_types)
+	_lazy_name = 'KMeansModel'
+
+"""
+Thread control
+"""
+def threadpool_limits(n_threads):
+	""" context manager limiting OpenMP and BLAS threads to n_threads """
+	return backend.threadpool_limits(n_threads)
 
 """
 Backend switching
@@ -29,31 +154,19 @@ Backend switching
 def set_backend(gpu=False, double=True):
 
 	# Backend
-	global OPTKIT_VERSION
 	global backend
 
 	## C implementations
 	global pogs_types
-	global PogsSolver
-	global PogsObjective
-
 	global clustering_types
-	global ClusteringSettings
-	global Clustering
 
 	# change backend
 	backend_name=backend.change(gpu=gpu, double=double)
 
-	OPTKIT_VERSION = backend.version
-
-	## C implemenetations
-	pogs_types = PogsTypes(backend)
-	PogsSolver = pogs_types.Solver
-	PogsObjective = pogs_types.Objective
-
-	clustering_types = ClusteringTypes(backend)
-	ClusteringSettings = clustering_types.ClusteringSettings
-	Clustering = clustering_types.Clustering
+	## C implemenetations, rebuilt on next use
+	with types_lock:
+		pogs_types = None
+		clustering_types = None
 
 	print "optkit backend set to {}".format(backend.config)
 
@@ -65,4 +178,4 @@ default_device = getenv('OPTKIT_DEFAULT_DEVICE', 'cpu')
 default_precision = getenv('OPTKIT_DEFAULT_FLOATBITS', '64')
 
 set_backend(gpu=(default_device == 'gpu'),
-			double=(default_precision == '64'))
\ No newline at end of file
+			double=(default_precision == '64'))
@@ -1,5 +1,8 @@
-from os import getenv
+from os import getenv, environ
 import gc
+from contextlib import contextmanager
+from multiprocessing import cpu_count
+from threading import RLock, Condition, local
 from ctypes import c_int, c_void_p, byref, pointer, CDLL
 # from optkit.libs.linsys import DenseLinsysLibs, SparseLinsysLibs
 # from optkit.libs.prox import ProxLibs
@@ -11,7 +14,7 @@ from optkit.utils.pyutils import version_string
 # CPU32, CPU64, GPU32, GPU64
 class OKBackend(object):
 	def __init__(self, gpu=False, single_precision=False):
-		self.version = None
+		self.__version = None
 		self.__device = None
 		self.__precision = None
 		self.__config = "(No libraries selected)"
@@ -28,17 +31,45 @@ class OKBackend(object):
 		self.pogs_lib_loader = PogsLibs()
 		self.cluster_lib_loader = ClusteringLibs()
 
-		# library instances
+		# library instances, loaded on first access
 		# self.dense = None
 		# self.sparse = None
 		# self.prox = None
-		self.pogs = None
-		self.cluster = None
+		self.__libs = {'pogs': None, 'cluster': None}
 
+		# guards library loading and the counters below, which are shared
+		# by all Python threads
+		self.__lock = RLock()
+		self.__threads_free = Condition(self.__lock)
 		self.__LIBGUARD_ON = False
 		self.__COBJECT_COUNT = 0
+		self.__ACTIVE_CALLS = 0
+		self.__THREADS_HELD = 0
+		self.max_threads = cpu_count()
+		self.__local = local()
 		self.__set_lib()
 
+	@property
+	def pogs(self):
+		with self.__lock:
+			if self.__libs['pogs'] is None:
+				self.load_lib('pogs')
+			return self.__libs['pogs']
+
+	@property
+	def cluster(self):
+		with self.__lock:
+			if self.__libs['cluster'] is None:
+				self.load_lib('cluster')
+			return self.__libs['cluster']
+
+	@property
+	def version(self):
+		with self.__lock:
+			if self.__version is None:
+				self.__get_version()
+			return self.__version
+
 	@property
 	def config(self):
 		return self.__config
@@ -67,12 +98,124 @@ class OKBackend(object):
 		return self.__LIBGUARD_ON
 
 	def increment_cobject_count(self):
-		self.__COBJECT_COUNT += 1
-		self.__LIBGUARD_ON = True
+		with self.__lock:
+			self.__COBJECT_COUNT += 1
+			self.__LIBGUARD_ON = True
 
 	def decrement_cobject_count(self):
-		self.__COBJECT_COUNT -= 1
-		self.__LIBGUARD_ON = self.__COBJECT_COUNT == 0
+		with self.__lock:
+			self.__COBJECT_COUNT -= 1
+			self.__LIBGUARD_ON = self.__COBJECT_COUNT > 0
+
+	@property
+	def active_calls(self):
+		return self.__ACTIVE_CALLS
+
+	@property
+	def threads_held(self):
+		return self.__THREADS_HELD
+
+	@contextmanager
+	def thread_budget(self, lib=None):
+		"""
+		Share max_threads among concurrent C calls.
+
+		Yields the number of OpenMP threads given to a call entering now
+		and applies it to the calling thread with lib.ok_set_num_threads()
+		(lib defaults to the POGS library), restoring the previous setting
+		on exit. A call gets an even share of max_threads among the calls
+		in progress, limited to the threads the other calls do not hold,
+		and waits for a thread to free up if they hold all of them: the
+		budgets held at any time sum to at most max_threads. A budget
+		requested inside another on the same Python thread reuses it.
+		"""
+		outer = getattr(self.__local, 'budget', None)
+		if outer is not None:
+			yield outer
+			return
+
+		lib = self.pogs if lib is None else lib
+		limit = getattr(self.__local, 'limit', self.max_threads)
+		with self.__threads_free:
+			self.__ACTIVE_CALLS += 1
+			while self.__THREADS_HELD >= self.max_threads:
+				self.__threads_free.wait()
+			n_threads = max(1, min(self.max_threads // self.__ACTIVE_CALLS,
+								   self.max_threads - self.__THREADS_HELD,
+								   limit))
+			self.__THREADS_HELD += n_threads
+		n_threads_prev = lib.ok_get_max_threads()
+		lib.ok_set_num_threads(n_threads)
+		self.__local.budget = n_threads
+		try:
+			yield n_threads
+		finally:
+			del self.__local.budget
+			lib.ok_set_num_threads(n_threads_prev)
+			with self.__threads_free:
+				self.__ACTIVE_CALLS -= 1
+				self.__THREADS_HELD -= n_threads
+				self.__threads_free.notify_all()
+
+	@contextmanager
+	def threadpool_limits(self, n_threads):
+		"""
+		Limit OpenMP and BLAS threads to n_threads within the block.
+
+		The OpenMP limit applies to C calls made from the calling Python
+		thread. The BLAS limit (OpenBLAS or MKL, if linked) does too if the
+		library has a per-thread setter; otherwise it is process wide and
+		shared by overlapping blocks, holding the lowest limit requested
+		until the last block exits. Limits in effect on entry are restored
+		on exit.
+		"""
+		n_threads = int(n_threads)
+		if n_threads < 1:
+			raise ValueError('argument "n_threads" must be >= 1')
+		lib = self.pogs
+		saved = lib.ok_threads()
+		limit_prev = getattr(self.__local, 'limit', None)
+		if lib.ok_threads_limit(n_threads, saved):
+			raise RuntimeError('call to ok_threads_limit failed')
+		self.__local.limit = n_threads
+		try:
+			yield n_threads
+		finally:
+			if limit_prev is None:
+				del self.__local.limit
+			else:
+				self.__local.limit = limit_prev
+			lib.ok_threads_restore(saved)
+
+	def blas_info(self):
+		"""
+		Report the CBLAS library called by the backend's C libraries.
+
+		Returns a dict with keys 'backend' (library family, e.g.,
+		'openblas', 'mkl', or 'builtin' for optkit's own routines),
+		'library' (path of the loaded library, '' if builtin) and
+		'num_threads' (0 if the library offers no thread control).
+		"""
+		lib = self.pogs
+		return {'backend': lib.ok_blas_backend(),
+				'library': lib.ok_blas_library(),
+				'num_threads': lib.ok_blas_get_num_threads()}
+
+	def set_blas(self, name):
+		"""
+		Select the CBLAS library, by the names accepted by environment
+		variable OPTKIT_BLAS ('auto', 'openblas', 'mkl', 'blis',
+		'reference', 'builtin', or a library path).
+
+		Applies to the libraries already loaded and, through OPTKIT_BLAS,
+		to those loaded later.
+		"""
+		with self.__lock:
+			for lib in self.__libs.values():
+				if lib is not None and lib.ok_blas_select(name):
+					raise ValueError('CBLAS library "{}" could not be '
+									 'loaded'.format(name))
+			environ['OPTKIT_BLAS'] = name
 
 	def __get_version(self):
 		major = c_int()
@@ -83,28 +226,29 @@ class OKBackend(object):
 			self.pogs.optkit_version(byref(major), byref(minor), byref(change),
 									 byref(status))
 
-			self.version = "Optkit v{}".format(
+			self.__version = "Optkit v{}".format(
 					version_string(major.value, minor.value, change.value,
 								   status.value))
 		except:
-			self.version = "Optkit: version unknown"
+			self.__version = "Optkit: version unknown"
 
 	def load_lib(self, name, override=False):
 		if name not in ['pogs', 'cluster']:
 			raise ValueError('invalid library name')
-		elif self.__dict__[name] is not None:
+		elif self.__libs[name] is not None:
 			if not override:
 				print str('\nlibrary {} already loaded; call with keyword arg '
 					  '"override"=True to bypass this check\n'.format(name))
 
-		if name == 'pogs':
-			self.pogs = self.pogs_lib_loader.get(
-					single_precision=self.precision_is_32bit,
-					gpu=self.device_is_gpu)
-		elif name == 'cluster':
-			self.cluster = self.cluster_lib_loader.get(
-					single_precision=self.precision_is_32bit,
-					gpu=self.device_is_gpu)
+		with self.__lock:
+			if name == 'pogs':
+				self.__libs['pogs'] = self.pogs_lib_loader.get(
+						single_precision=self.precision_is_32bit,
+						gpu=self.device_is_gpu)
+			elif name == 'cluster':
+				self.__libs['cluster'] = self.cluster_lib_loader.get(
+						single_precision=self.precision_is_32bit,
+						gpu=self.device_is_gpu)
 
 	def load_libs(self, *names):
 		for name in names:
@@ -126,8 +270,9 @@ class OKBackend(object):
 					self.__device = dev
 					self.__precision = prec
 					self.__config = lib_key
-					self.load_lib('pogs', override=True)
-					self.load_lib('cluster', override=True)
+					# (re)load libraries on next access
+					self.__libs = {'pogs': None, 'cluster': None}
+					self.__version = None
 					# self.dense = self.dense_lib_loader.get(
 							# single_precision=single, gpu=gpu)
 					# self.prox = self.prox_lib_loader.get(
@@ -145,16 +290,16 @@ class OKBackend(object):
 	def change(self, gpu=False, double=True, checktypes=None, checkdims=None,
 			   checkdevices=None):
 
-		if self.__LIBGUARD_ON:
-			print str('Backend cannot be changed once C objects have been '
-					  'created.\n')
-			return
+		with self.__lock:
+			if self.__LIBGUARD_ON:
+				print str('Backend cannot be changed once C objects have '
+						  'been created.\n')
+				return
 
-		precision = '64' if double else '32'
-		device = 'gpu' if gpu else 'cpu'
+			precision = '64' if double else '32'
+			device = 'gpu' if gpu else 'cpu'
 
-		self.__set_lib(device=device, precision=precision)
-		self.__get_version()
+			self.__set_lib(device=device, precision=precision)
 
 		if checktypes is not None: self.typecheck = checktypes
 		if checkdims is not None: self.dimcheck = checkdims
@@ -162,10 +307,10 @@ class OKBackend(object):
 
 	def reset_device(self):
 		if self.device_reset_allowed:
-			for item in self.__dict__:
+			for item in self.__libs.values():
 				if isinstance(item, CDLL):
 					if 'ok_device_reset' in item.__dict__:
-						if self.pogs.ok_device_reset():
+						if item.ok_device_reset():
 							raise RuntimeError('device reset failed')
 						return
 			raise RuntimeError('device reset not possible: '
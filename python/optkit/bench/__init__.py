@@ -0,0 +1,6 @@
+from optkit.bench.problems import Problem, PROBLEMS, generate, lasso, \
+	logistic_regression, nonnegative_least_squares, huber_fitting, \
+	support_vector_machine
+from optkit.bench.runner import BACKENDS, SIZES, run_case, run_suite, save, \
+	load, compare
+from optkit.bench.clustering import kdtree_crossover
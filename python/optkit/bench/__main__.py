@@ -0,0 +1,69 @@
+import sys
+from argparse import ArgumentParser
+from optkit.bench.problems import PROBLEMS
+from optkit.bench.runner import BACKENDS, SIZES, run_suite, save, load, \
+	compare
+from optkit.bench.clustering import kdtree_crossover
+
+"""
+usage: python -m optkit.bench [-p PROBLEM ...] [-b BACKEND ...]
+	[-s SIZE ...] [-r REPEAT] [-o OUTPUT] [--baseline FILE]
+	[--threshold FRACTION] [--anderson MEM]
+       python -m optkit.bench --kdtree [-r REPEAT]
+
+Runs the benchmark suite, optionally saving results as JSON and checking
+them against a saved baseline; exits with status 1 on regression. With
+--anderson, solves use Anderson acceleration of memory MEM; comparing
+against a baseline run without it reports any cases it slows down.
+With --kdtree, prints the speedup of the k-d tree over the dense nearest
+centroid search in k-means instead.
+"""
+def parse_size(size):
+	if size in SIZES:
+		return size
+	m, n = size.lower().split('x')
+	return (int(m), int(n))
+
+def main(argv=None):
+	parser = ArgumentParser(prog='python -m optkit.bench',
+							description='optkit benchmark suite')
+	parser.add_argument('-p', '--problems', nargs='+',
+						choices=sorted(PROBLEMS.keys()))
+	parser.add_argument('-b', '--backends', nargs='+', choices=BACKENDS)
+	parser.add_argument('-s', '--sizes', nargs='+', type=parse_size,
+						help='{} or MxN'.format(', '.join(sorted(SIZES))))
+	parser.add_argument('-r', '--repeat', type=int, default=3,
+						help='runs per case; best times kept (default 3)')
+	parser.add_argument('-o', '--output', help='save results as JSON')
+	parser.add_argument('--baseline', help='JSON results to compare against')
+	parser.add_argument('--threshold', type=float, default=0.1,
+						help='tolerated fractional slowdown (default 0.1)')
+	parser.add_argument('--anderson', type=int, default=0, metavar='MEM',
+						help='Anderson acceleration memory (default 0: off)')
+	parser.add_argument('--kdtree', action='store_true',
+						help='time k-d tree vs. dense centroid search')
+	args = parser.parse_args(argv)
+
+	if args.kdtree:
+		kdtree_crossover(repeat=args.repeat)
+		return 0
+
+	results = run_suite(problems=args.problems, backends=args.backends,
+						sizes=args.sizes, repeat=args.repeat,
+						anderson=args.anderson)
+	if args.output:
+		save(results, args.output)
+
+	if args.baseline:
+		regressions = compare(results, load(args.baseline),
+							  threshold=args.threshold)
+		for r in regressions:
+			print str('REGRESSION {problem} {backend} {shape}: {metric} '
+					  '{baseline:.4g} -> {current:.4g} ({ratio:.2f}x)'.format(
+					  **r))
+		if regressions:
+			return 1
+	return 0
+
+if __name__ == '__main__':
+	sys.exit(main())
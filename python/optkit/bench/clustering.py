@@ -0,0 +1,97 @@
+import time
+import numpy as np
+from optkit.api import backend
+
+"""
+Nearest centroid search benchmark
+
+Times the assignment step of k-means, cluster(), with the dense
+(gemm-based) search and with the k-d tree search, over a grid of vector
+lengths and centroid counts. The speedup of the k-d tree over the dense
+search locates the crossover that cluster_kdtree_favored() encodes for
+the automatic search mode (OK_CLUSTER_KDTREE_MAX_DIM,
+OK_CLUSTER_KDTREE_MIN_CLUSTERS).
+"""
+VEC_LENGTHS = (2, 3, 4, 6, 8, 12, 16)
+CLUSTER_COUNTS = (16, 64, 256, 1024, 4096)
+
+def time_search(lib, A, C, a2c, search, repeat=1):
+	""" best time of repeat calls to cluster() with the given search """
+	m, k = A.size1, C.size1
+	h = lib.cluster_aid()
+	if lib.cluster_aid_alloc(h, m, k, A.order):
+		raise RuntimeError('cluster aid allocation failed')
+	h.search = search
+	try:
+		times = []
+		for _ in xrange(max(1, int(repeat))):
+			start = time.time()
+			if lib.cluster(A, C, a2c, h, 1e3):
+				raise RuntimeError('call to cluster failed')
+			times.append(time.time() - start)
+	finally:
+		lib.cluster_aid_free(h)
+	return min(times)
+
+def kdtree_crossover(n_vectors=10000, vec_lengths=VEC_LENGTHS,
+					 cluster_counts=CLUSTER_COUNTS, repeat=1, seed=0,
+					 verbose=True):
+	"""
+	Speedup of the k-d tree over the dense nearest centroid search.
+
+	For each vector length n and centroid count k, clusters n_vectors
+	random vectors to k random centroids with both searches. Returns a
+	list of dicts (vec_length, n_clusters, dense_time, kdtree_time,
+	speedup, kdtree_favored), the last flag marking the configurations
+	where the automatic search mode selects the k-d tree.
+	"""
+	lib = backend.cluster
+	if backend.device_is_gpu:
+		raise RuntimeError('k-d tree search not implemented on GPU')
+	order = lib.enums.CblasRowMajor
+	rng = np.random.RandomState(seed)
+	results = []
+
+	if verbose:
+		print '\nk-d tree speedup over dense search (* = auto selects k-d tree)'
+		print 'n \\ k\t' + '\t'.join(map(str, cluster_counts))
+	for n in vec_lengths:
+		row = []
+		for k in cluster_counts:
+			A_py = rng.rand(n_vectors, n).astype(lib.pyfloat)
+			C_py = rng.rand(k, n).astype(lib.pyfloat)
+			A = lib.matrix(0, 0, 0, None, order)
+			C = lib.matrix(0, 0, 0, None, order)
+			a2c = lib.upsamplingvec()
+			try:
+				if (lib.matrix_calloc(A, n_vectors, n, order) or
+					lib.matrix_calloc(C, k, n, order) or
+					lib.upsamplingvec_alloc(a2c, n_vectors, k)):
+					raise RuntimeError('benchmark allocation failed')
+				lib.matrix_memcpy_ma(A, A_py.ctypes.data_as(lib.ok_float_p),
+									 order)
+				lib.matrix_memcpy_ma(C, C_py.ctypes.data_as(lib.ok_float_p),
+									 order)
+				dense_time = time_search(lib, A, C, a2c,
+										 lib.enums.OkClusterSearchDense,
+										 repeat)
+				kdtree_time = time_search(lib, A, C, a2c,
+										  lib.enums.OkClusterSearchKDTree,
+										  repeat)
+			finally:
+				lib.matrix_free(A)
+				lib.matrix_free(C)
+				lib.upsamplingvec_free(a2c)
+
+			result = dict(vec_length=n, n_clusters=k, dense_time=dense_time,
+						  kdtree_time=kdtree_time,
+						  speedup=dense_time / max(kdtree_time, 1e-9),
+						  kdtree_favored=bool(
+								lib.cluster_kdtree_favored(n, k)))
+			results.append(result)
+			row.append('{:.2f}{}'.format(
+					result['speedup'], '*' if result['kdtree_favored'] else
+					''))
+		if verbose:
+			print '{}\t'.format(n) + '\t'.join(row)
+	return results
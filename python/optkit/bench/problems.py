@@ -0,0 +1,116 @@
+import numpy as np
+import scipy.sparse as sp
+from optkit.libs.enums import OKFunctionEnums
+
+"""
+Canonical problem generators
+
+Each generator returns a Problem in POGS graph form,
+
+	minimize f(y) + g(x) subject to y = Ax,
+
+with f and g given as keyword arguments of PogsObjective (h, a, b, c, d,
+e), h the name of a function in OKFunctionEnums. Matrices are dense
+unless density < 1, in which case a CSR matrix is built. Data depend
+only on the seed, so problems are identical across runs and versions.
+"""
+class Problem(object):
+	def __init__(self, name, A, f, g):
+		for obj in (f, g):
+			if obj['h'] not in OKFunctionEnums().dict:
+				raise ValueError('invalid function name: {}'.format(obj['h']))
+		self.name = name
+		self.A = A
+		self.f = f
+		self.g = g
+
+	@property
+	def shape(self):
+		return self.A.shape
+
+	@property
+	def nnz(self):
+		return self.A.nnz if sp.issparse(self.A) else self.A.size
+
+	def dense(self):
+		return self.A.toarray() if sp.issparse(self.A) else self.A
+
+	def sparse(self):
+		return sp.csr_matrix(self.A)
+
+	def __repr__(self):
+		return '<Problem {}: {}x{}, nnz={}>'.format(self.name, self.shape[0],
+													 self.shape[1], self.nnz)
+
+def random_matrix(m, n, density=1., seed=0):
+	rng = np.random.RandomState(seed)
+	if density >= 1:
+		return rng.randn(m, n)
+	A = sp.rand(m, n, density=density, format='csr', random_state=rng)
+	A.data = rng.randn(A.nnz)
+	return A
+
+def sparse_vector(n, density, rng):
+	x = rng.randn(n)
+	x[rng.rand(n) > density] = 0
+	return x
+
+def lasso(m, n, density=1., seed=0, lambda_frac=0.1):
+	""" minimize 1/2 ||Ax - b||_2^2 + lambda ||x||_1 """
+	rng = np.random.RandomState(seed)
+	A = random_matrix(m, n, density, seed)
+	b = A.dot(sparse_vector(n, 0.2, rng)) + 0.1 * rng.randn(m)
+	lambda_max = np.abs(A.T.dot(b)).max()
+	return Problem('lasso', A, dict(h='Square', b=b),
+				   dict(h='Abs', c=lambda_frac * lambda_max))
+
+def logistic_regression(m, n, density=1., seed=0, lambda_frac=0.1):
+	""" minimize sum_i log(1 + exp(a_i'x)) - y_i a_i'x + lambda ||x||_1 """
+	rng = np.random.RandomState(seed)
+	A = random_matrix(m, n, density, seed)
+	p = 1. / (1. + np.exp(-A.dot(sparse_vector(n, 0.2, rng))))
+	y = (rng.rand(m) < p).astype(float)
+	lambda_max = 0.5 * np.abs(A.T.dot(2 * y - 1)).max()
+	return Problem('logistic', A, dict(h='Logistic', d=-y),
+				   dict(h='Abs', c=lambda_frac * lambda_max))
+
+def nonnegative_least_squares(m, n, density=1., seed=0):
+	""" minimize 1/2 ||Ax - b||_2^2 subject to x >= 0 """
+	rng = np.random.RandomState(seed)
+	A = random_matrix(m, n, density, seed)
+	b = A.dot(np.abs(sparse_vector(n, 0.5, rng))) + 0.1 * rng.randn(m)
+	return Problem('nnls', A, dict(h='Square', b=b), dict(h='IndGe0'))
+
+def huber_fitting(m, n, density=1., seed=0, outlier_frac=0.05):
+	""" minimize sum_i huber(a_i'x - b_i) """
+	rng = np.random.RandomState(seed)
+	A = random_matrix(m, n, density, seed)
+	b = A.dot(rng.randn(n)) + 0.1 * rng.randn(m)
+	outliers = rng.rand(m) < outlier_frac
+	b[outliers] += 10 * rng.randn(outliers.sum())
+	return Problem('huber', A, dict(h='Huber', b=b), dict(h='Zero'))
+
+def support_vector_machine(m, n, density=1., seed=0, lambda_=1.):
+	""" minimize sum_i max(0, 1 - y_i a_i'x) + lambda/2 ||x||_2^2 """
+	rng = np.random.RandomState(seed)
+	A = random_matrix(m, n, density, seed)
+	y = np.sign(A.dot(rng.randn(n)) + 0.1 * rng.randn(m))
+	y[y == 0] = 1
+	# fold labels into the rows of A: f_i(z) = max(0, 1 - z)
+	A = sp.diags(y, 0).dot(A).tocsr() if sp.issparse(A) else y[:, None] * A
+	return Problem('svm', A, dict(h='MaxNeg0', b=1.),
+				   dict(h='Square', c=lambda_))
+
+PROBLEMS = {
+	'lasso': lasso,
+	'logistic': logistic_regression,
+	'nnls': nonnegative_least_squares,
+	'huber': huber_fitting,
+	'svm': support_vector_machine,
+}
+
+def generate(name, m, n, density=1., seed=0):
+	if name not in PROBLEMS:
+		raise ValueError('argument "name" must be one of {}'.format(
+						 sorted(PROBLEMS.keys())))
+	return PROBLEMS[name](m, n, density=density, seed=seed)
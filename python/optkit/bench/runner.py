@@ -0,0 +1,263 @@
+import gc
+import json
+import platform
+import resource
+import time
+import numpy as np
+from optkit.api import backend, PogsSolver, PogsObjective
+from optkit.libs.enums import OKFunctionEnums
+from optkit.libs.pogs import PogsAbstractLibs
+from optkit.types.sparse import SparseOperator
+from optkit.bench.problems import PROBLEMS, generate
+
+"""
+Benchmark runner
+
+Each case solves one generated problem with one backend:
+
+	'dense'		dense direct POGS (PogsSolver)
+	'sparse'	abstract POGS on a CSR operator, indirect projector
+	'operator'	abstract POGS on a dense operator, indirect projector
+
+and records setup time (operator construction, equilibration and, for
+'dense', factorization), solve time, time per iteration, iterations,
+peak memory and throughput, in matrix entries touched per second
+(2 * nnz(A) * iterations / solve time: one multiply each by A and A^T
+per iteration).
+"""
+BACKENDS = ('dense', 'sparse', 'operator')
+SIZES = {
+	'small': (200, 100),
+	'medium': (1000, 400),
+	'large': (4000, 1500),
+}
+SPARSE_DENSITY = 0.05
+SOLVER_DEFAULTS = dict(maxiter=2000, reltol=1e-3, abstol=1e-4)
+
+# metrics checked for regressions by compare(); larger is worse
+REGRESSION_METRICS = ('setup_time', 'time_per_iter', 'iterations')
+
+__abstract_loader = []
+
+def abstract_lib():
+	""" abstract-operator POGS library matching the backend, or None """
+	if not __abstract_loader:
+		try:
+			__abstract_loader.append(PogsAbstractLibs())
+		except ValueError:
+			__abstract_loader.append(None)
+	if __abstract_loader[0] is None:
+		return None
+	return __abstract_loader[0].get(
+			single_precision=backend.precision_is_32bit,
+			gpu=backend.device_is_gpu)
+
+def reset_peak_memory():
+	""" reset the process high-water mark where supported (Linux) """
+	try:
+		with open('/proc/self/clear_refs', 'w') as f:
+			f.write('5')
+	except IOError:
+		pass
+
+def peak_memory_mb():
+	""" process peak resident set size, in MB """
+	try:
+		with open('/proc/self/status') as f:
+			for line in f:
+				if line.startswith('VmHWM:'):
+					return int(line.split()[1]) / 1024.
+	except IOError:
+		pass
+	maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+	# bytes on Darwin, kB elsewhere
+	return maxrss / 1024.**(2 if platform.system() == 'Darwin' else 1)
+
+def function_vector(lib, size, objective):
+	""" C function vector for an objective given as PogsObjective kwargs """
+	f_py = np.zeros(size, dtype=lib.function)
+	f_py['h'] = OKFunctionEnums().dict[objective['h']]
+	for field, default in (('a', 1), ('b', 0), ('c', 1), ('d', 0), ('e', 0)):
+		f_py[field] = objective.get(field, default)
+	f = lib.function_vector(0, None)
+	if lib.function_vector_calloc(f, size):
+		raise RuntimeError('function vector allocation failed')
+	lib.function_vector_memcpy_va(f, f_py.ctypes.data_as(lib.function_p))
+	return f
+
+def run_dense(problem, options):
+	m, n = problem.shape
+	f = PogsObjective(m, **problem.f)
+	g = PogsObjective(n, **problem.g)
+	A = problem.dense()
+
+	start = time.time()
+	solver = PogsSolver(A)
+	setup_time = time.time() - start
+
+	start = time.time()
+	solver.solve(f, g, verbose=0, **options)
+	solve_time = time.time() - start
+
+	info = solver.info
+	result = dict(setup_time=setup_time, solve_time=solve_time,
+				  iterations=int(info.iters), converged=bool(info.converged),
+				  objective=float(info.objval), err=int(info.err))
+	del solver
+	return result
+
+def run_abstract(problem, options, operator):
+	lib = abstract_lib()
+	if lib is None:
+		raise RuntimeError('abstract POGS libraries not found')
+	m, n = problem.shape
+	f = function_vector(lib, m, problem.f)
+	g = function_vector(lib, n, problem.g)
+
+	settings = lib.pogs_settings()
+	lib.set_default_settings(settings)
+	settings.verbose = 0
+	for key, value in options.items():
+		setattr(settings, key, value)
+	info = lib.pogs_info()
+	x, y, mu, nu = [np.zeros(k, dtype=lib.pyfloat) for k in (n, m, n, m)]
+	output = lib.pogs_output(*[v.ctypes.data_as(lib.ok_float_p) for v in
+							   (x, y, mu, nu)])
+
+	start = time.time()
+	if operator == 'sparse':
+		# copies the CSR matrix whether scipy chose 32- or 64-bit indices
+		A = SparseOperator(lib, problem.sparse())
+		o = A.c_ptr
+		free_operator = lambda o: A.free()
+	else:
+		A = np.array(problem.dense(), dtype=lib.pyfloat, order='C')
+		o = lib.pogs_dense_operator_gen(A.ctypes.data_as(lib.ok_float_p), m,
+										n, lib.enums.CblasRowMajor)
+		free_operator = lib.pogs_dense_operator_free
+	solver = lib.pogs_init(o, 0, 1.)
+	setup_time = time.time() - start
+
+	start = time.time()
+	err = lib.pogs_solve(solver, f, g, settings, info, output)
+	solve_time = time.time() - start
+
+	lib.pogs_finish(solver, 0)
+	free_operator(o)
+	lib.function_vector_free(f)
+	lib.function_vector_free(g)
+	return dict(setup_time=setup_time, solve_time=solve_time,
+				iterations=int(info.k), converged=bool(info.converged),
+				objective=float(info.obj), err=int(err or info.err))
+
+def run_case(problem, backend_name, repeat=1, **options):
+	"""
+	Benchmark problem with backend_name ('dense', 'sparse' or 'operator');
+	timings are the best of repeat runs.
+	"""
+	if backend_name not in BACKENDS:
+		raise ValueError('argument "backend_name" must be one of {}'.format(
+						 BACKENDS))
+	solver_options = dict(SOLVER_DEFAULTS)
+	solver_options.update(options)
+
+	runs = []
+	gc.collect()
+	reset_peak_memory()
+	for _ in xrange(max(1, int(repeat))):
+		if backend_name == 'dense':
+			runs.append(run_dense(problem, solver_options))
+		else:
+			runs.append(run_abstract(problem, solver_options, backend_name))
+		gc.collect()
+
+	result = dict(runs[-1])
+	result['setup_time'] = min(r['setup_time'] for r in runs)
+	result['solve_time'] = min(r['solve_time'] for r in runs)
+	iters = max(result['iterations'], 1)
+	result['time_per_iter'] = result['solve_time'] / iters
+	result['throughput'] = 2. * problem.nnz * iters / max(
+			result['solve_time'], 1e-12)
+	result['peak_memory_mb'] = peak_memory_mb()
+	result.update(problem=problem.name, backend=backend_name,
+				  shape=list(problem.shape), nnz=int(problem.nnz))
+	return result
+
+def run_suite(problems=None, backends=None, sizes=None, repeat=1, seed=0,
+			  verbose=True, **options):
+	"""
+	Benchmark every combination of problem, backend and size.
+
+	sizes are keys of SIZES or (m, n) tuples. Backends whose libraries
+	are unavailable are skipped. Returns a results dictionary suitable
+	for save() and compare().
+	"""
+	problems = sorted(PROBLEMS.keys()) if problems is None else problems
+	backends = BACKENDS if backends is None else backends
+	sizes = ['small', 'medium'] if sizes is None else sizes
+	if abstract_lib() is None:
+		backends = [b for b in backends if b == 'dense']
+
+	# untimed solves load the libraries and start BLAS/OpenMP threads
+	for backend_name in backends:
+		run_case(generate('nnls', 20, 10, seed=seed), backend_name)
+
+	results = []
+	for size in sizes:
+		m, n = SIZES[size] if size in SIZES else size
+		for name in problems:
+			for backend_name in backends:
+				density = SPARSE_DENSITY if backend_name == 'sparse' else 1.
+				problem = generate(name, m, n, density=density, seed=seed)
+				result = run_case(problem, backend_name, repeat=repeat,
+								  **options)
+				results.append(result)
+				if verbose:
+					print format_result(result)
+
+	return dict(version=str(backend.version), config=backend.config,
+				blas=backend.blas_info(), host=platform.node(),
+				timestamp=time.strftime('%Y-%m-%dT%H:%M:%S'),
+				results=results)
+
+def format_result(result):
+	return str('{problem:>8} {backend:>8} {m:>6}x{n:<6} setup {setup_time:'
+			   '8.4f}s  solve {solve_time:8.4f}s  {iterations:5d} iters  '
+			   '{time_per_iter:.2e} s/iter  {peak_memory_mb:7.1f} MB'.format(
+			   m=result['shape'][0], n=result['shape'][1], **result))
+
+def save(results, filename):
+	with open(filename, 'w') as f:
+		json.dump(results, f, indent=1, sort_keys=True)
+
+def load(filename):
+	with open(filename) as f:
+		return json.load(f)
+
+def case_key(result):
+	return (result['problem'], result['backend'], tuple(result['shape']))
+
+def compare(results, baseline, threshold=0.1, metrics=REGRESSION_METRICS):
+	"""
+	Regressions of results relative to baseline.
+
+	A case regresses in a metric when its value exceeds the baseline's by
+	more than the fraction threshold. Cases absent from either run are
+	ignored. Returns a list of dicts (problem, backend, shape, metric,
+	baseline, current, ratio).
+	"""
+	reference = dict((case_key(r), r) for r in baseline['results'])
+	regressions = []
+	for result in results['results']:
+		base = reference.get(case_key(result), None)
+		if base is None:
+			continue
+		for metric in metrics:
+			current, previous = result[metric], base[metric]
+			if previous > 0 and current > previous * (1 + threshold):
+				regressions.append(dict(
+						problem=result['problem'], backend=result['backend'],
+						shape=result['shape'], metric=metric,
+						baseline=previous, current=current,
+						ratio=float(current) / previous))
+	return regressions
@@ -26,13 +26,15 @@ def attach_cg_ctypes(lib, single_precision=False):
 		attach_dense_linsys_ctypes(lib, single_precision)
 
 	ok_float = lib.ok_float
-	vector_p = lib.vector_p
+	ok_float_p = lib.ok_float_p
+	vector = lib.vector
+	matrix = lib.matrix
 
 	class cgls_helper(Structure):
-		_fields_ = [('p', vector_p),
-					('q', vector_p),
-					('r', vector_p),
-					('s', vector_p),
+		_fields_ = [('p', vector),
+					('q', vector),
+					('r', vector),
+					('s', vector),
 					('norm_s', ok_float),
 					('norm_s0', ok_float),
 					('norm_x', ok_float),
@@ -43,17 +45,19 @@ def attach_cg_ctypes(lib, single_precision=False):
 					('gamma', ok_float),
 					('gamma_prev', ok_float),
 					('shrink', ok_float),
-					('blas_handle', c_void_p)]
+					('blas_handle', c_void_p),
+					('iters', c_uint),
+					('products', c_uint)]
 
 	lib.cgls_helper = cgls_helper
 	lib.cgls_helper_p = POINTER(lib.cgls_helper)
 
 	class pcg_helper(Structure):
-		_fields_ = [('p', vector_p),
-					('q', vector_p),
-					('r', vector_p),
-					('z', vector_p),
-					('temp', vector_p),
+		_fields_ = [('p', vector),
+					('q', vector),
+					('r', vector),
+					('z', vector),
+					('temp', vector),
 					('norm_r', ok_float),
 					('alpha', ok_float),
 					('gamma', ok_float),
@@ -64,6 +68,45 @@ def attach_cg_ctypes(lib, single_precision=False):
 	lib.pcg_helper = pcg_helper
 	lib.pcg_helper_p = POINTER(lib.pcg_helper)
 
+	class block_cgls_helper(Structure):
+		_fields_ = [('nrhs', c_size_t),
+					('active', c_size_t),
+					('P', matrix),
+					('Q', matrix),
+					('R', matrix),
+					('S', matrix),
+					('index', POINTER(c_size_t)),
+					('alpha', ok_float_p),
+					('gamma', ok_float_p),
+					('p_squared', ok_float_p),
+					('norm_s0', ok_float_p),
+					('norm_x', ok_float_p),
+					('xmax', ok_float_p),
+					('indefinite', POINTER(c_int)),
+					('blas_handle', c_void_p),
+					('iters', POINTER(c_uint)),
+					('products', c_uint)]
+
+	lib.block_cgls_helper = block_cgls_helper
+	lib.block_cgls_helper_p = POINTER(lib.block_cgls_helper)
+
+	class block_pcg_helper(Structure):
+		_fields_ = [('nrhs', c_size_t),
+					('active', c_size_t),
+					('P', matrix),
+					('Q', matrix),
+					('R', matrix),
+					('Z', matrix),
+					('temp', matrix),
+					('index', POINTER(c_size_t)),
+					('gamma', ok_float_p),
+					('norm_r', ok_float_p),
+					('blas_handle', c_void_p),
+					('products', c_uint)]
+
+	lib.block_pcg_helper = block_pcg_helper
+	lib.block_pcg_helper_p = POINTER(lib.block_pcg_helper)
+
 def attach_cg_ccalls(lib, single_precision=False):
 	if not 'vector_p' in lib.__dict__:
 		attach_dense_linsys_ctypes(lib, single_precision)
@@ -77,6 +120,9 @@ def attach_cg_ccalls(lib, single_precision=False):
 	operator_p = lib.operator_p
 	cgls_helper_p = lib.cgls_helper_p
 	pcg_helper_p = lib.pcg_helper_p
+	matrix_p = lib.matrix_p
+	block_cgls_helper_p = lib.block_cgls_helper_p
+	block_pcg_helper_p = lib.block_pcg_helper_p
 
 	c_uint_p = POINTER(c_uint)
 
@@ -115,6 +161,25 @@ def attach_cg_ccalls(lib, single_precision=False):
 								   ok_float, c_size_t, c_int, c_uint_p]
 	lib.pcg_finish.argtypes = [c_void_p]
 
+	lib.block_cgls_helper_alloc.argtypes = [c_size_t, c_size_t, c_size_t]
+	lib.block_cgls_helper_free.argtypes = [block_cgls_helper_p]
+	lib.block_cgls_nonallocating.argtypes = [block_cgls_helper_p,
+											 operator_p, matrix_p,
+											 matrix_p, ok_float, ok_float,
+											 c_size_t, c_int, c_uint_p]
+	lib.block_cgls.argtypes = [operator_p, matrix_p, matrix_p, ok_float,
+							   ok_float, c_size_t, c_int, c_uint_p]
+
+	lib.block_pcg_helper_alloc.argtypes = [c_size_t, c_size_t, c_size_t]
+	lib.block_pcg_helper_free.argtypes = [block_pcg_helper_p]
+	lib.block_pcg_nonallocating.argtypes = [block_pcg_helper_p, operator_p,
+											operator_p, matrix_p, matrix_p,
+											ok_float, ok_float, c_size_t,
+											c_int, c_uint_p]
+	lib.block_pcg.argtypes = [operator_p, operator_p, matrix_p, matrix_p,
+							  ok_float, ok_float, c_size_t, c_int,
+							  c_uint_p]
+
 	# return types
 	lib.cgls_helper_alloc.restype = cgls_helper_p
 	lib.cgls_helper_free.retype = c_uint
@@ -134,4 +199,14 @@ def attach_cg_ccalls(lib, single_precision=False):
 	lib.pcg.restype = c_uint
 	lib.pcg_init.restype = c_void_p
 	lib.pcg_solve.restype = c_uint
-	lib.pcg_finish.restype = c_uint
\ No newline at end of file
+	lib.pcg_finish.restype = c_uint
+
+	lib.block_cgls_helper_alloc.restype = block_cgls_helper_p
+	lib.block_cgls_helper_free.restype = c_uint
+	lib.block_cgls_nonallocating.restype = c_uint
+	lib.block_cgls.restype = c_uint
+
+	lib.block_pcg_helper_alloc.restype = block_pcg_helper_p
+	lib.block_pcg_helper_free.restype = c_uint
+	lib.block_pcg_nonallocating.restype = c_uint
+	lib.block_pcg.restype = c_uint
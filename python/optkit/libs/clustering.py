@@ -50,7 +50,14 @@ def attach_clustering_ctypes(lib, single_precision=False):
 					('D_full', matrix),
 					('D', matrix),
 					('A_reducible', matrix),
-					('reassigned', c_size_t)]
+					('tile_size', c_size_t),
+					('tile_slots', c_size_t),
+					('reassigned', c_size_t),
+					('distance_evals', c_size_t),
+					('search', c_uint),
+					('iters', c_size_t),
+					('assign_time', ok_float),
+					('update_time', ok_float)]
 
 	lib.cluster_aid = cluster_aid
 	lib.cluster_aid_p = POINTER(lib.cluster_aid)
@@ -73,7 +80,12 @@ def attach_clustering_ctypes(lib, single_precision=False):
 		_fields_ = [('dist_reltol', ok_float),
 					('change_abstol', c_size_t),
 					('maxiter', c_size_t),
-					('verbose', c_uint)]
+					('verbose', c_uint),
+					('algorithm', c_uint),
+					('init', c_uint),
+					('seed', c_size_t),
+					('search', c_uint),
+					('num_threads', c_int)]
 
 	lib.kmeans_settings = kmeans_settings
 	lib.kmeans_settings_p = POINTER(lib.kmeans_settings)
@@ -91,6 +103,35 @@ def attach_clustering_ctypes(lib, single_precision=False):
 	lib.kmeans_io = kmeans_io
 	lib.kmeans_io_p = POINTER(lib.kmeans_io)
 
+	class kmeans_minibatch_work(Structure):
+		_fields_ = [('batch_size', c_size_t),
+					('n_clusters', c_size_t),
+					('vec_length', c_size_t),
+					('A', matrix),
+					('C', matrix),
+					('S', matrix),
+					('a2c', upsamplingvec),
+					('counts', vector),
+					('counts_batch', vector),
+					('h', cluster_aid)]
+
+	lib.kmeans_minibatch_work = kmeans_minibatch_work
+	lib.kmeans_minibatch_work_p = POINTER(lib.kmeans_minibatch_work)
+
+	class kmeans_predict_work(Structure):
+		_fields_ = [('indicator', POINTER(c_int)),
+					('batch_size', c_size_t),
+					('n_clusters', c_size_t),
+					('vec_length', c_size_t),
+					('A', matrix),
+					('C', matrix),
+					('a2c', upsamplingvec),
+					('h', cluster_aid),
+					('kdtree', c_void_p)]
+
+	lib.kmeans_predict_work = kmeans_predict_work
+	lib.kmeans_predict_work_p = POINTER(lib.kmeans_predict_work)
+
 def attach_clustering_ccalls(lib, single_precision=False):
 	if not 'matrix_p' in lib.__dict__:
 		attach_dense_linsys_ctypes(lib, single_precision)
@@ -108,6 +149,8 @@ def attach_clustering_ccalls(lib, single_precision=False):
 	kmeans_work_p = lib.kmeans_work_p
 	kmeans_settings_p = lib.kmeans_settings_p
 	kmeans_io_p = lib.kmeans_io_p
+	kmeans_minibatch_work_p = lib.kmeans_minibatch_work_p
+	kmeans_predict_work_p = lib.kmeans_predict_work_p
 
 	# argument types
 	lib.upsamplingvec_alloc.argtypes = [upsamplingvec_p, c_size_t,
@@ -139,6 +182,10 @@ def attach_clustering_ccalls(lib, single_precision=False):
 										c_size_t_p, c_size_t,
 										ok_float_p, c_size_t,
 										kmeans_work_p]
+	lib.kmeans_compact.argtypes = [ok_float_p, c_uint, c_size_t, c_size_t,
+								   c_size_t_p, c_size_t, c_size_t, ok_float_p,
+								   c_size_t, c_size_t_p]
+	lib.cluster_tentative.argtypes = [matrix_p, matrix_p, cluster_aid_p]
 	lib.cluster.argtypes = [matrix_p, matrix_p, upsamplingvec_p,
 							cluster_aid_p, ok_float]
 	lib.calculate_centroids.argtypes = [matrix_p, matrix_p,
@@ -147,12 +194,63 @@ def attach_clustering_ccalls(lib, single_precision=False):
 	lib.k_means.argtypes = [matrix_p, matrix_p, upsamplingvec_p,
 							vector_p, cluster_aid_p, ok_float,
 							c_size_t, c_size_t, c_uint]
+	lib.k_means_pruned.argtypes = [matrix_p, matrix_p, upsamplingvec_p,
+								   vector_p, cluster_aid_p, ok_float,
+								   c_size_t, c_size_t, c_uint, c_uint]
+	lib.kmeans_seed.argtypes = [matrix_p, matrix_p, upsamplingvec_p, c_uint,
+								c_size_t]
+	lib.cluster_kdtree_favored.argtypes = [c_size_t, c_size_t]
+	lib.cluster_kdtree_alloc.argtypes = [POINTER(c_void_p), matrix_p]
+	lib.cluster_kdtree_free.argtypes = [c_void_p]
+	lib.cluster_kdtree_search.argtypes = [matrix_p, matrix_p,
+										  upsamplingvec_p, cluster_aid_p,
+										  ok_float, c_void_p]
+	lib.cluster_kdtree.argtypes = [matrix_p, matrix_p, upsamplingvec_p,
+								   cluster_aid_p, ok_float]
 	lib.kmeans_easy_init.argtypes = [c_size_t, c_size_t, c_size_t]
 	lib.kmeans_easy_resize.argtypes = [c_void_p, c_size_t, c_size_t,
 										c_size_t]
 	lib.kmeans_easy_run.argtypes = [c_void_p, kmeans_settings_p,
 									 kmeans_io_p]
+	lib.kmeans_easy_compact.argtypes = [c_void_p, kmeans_io_p, c_size_t_p]
 	lib.kmeans_easy_finish.argtypes = [c_void_p]
+	lib.blockwise_kmeans.argtypes = [c_size_t, c_size_t_p, c_size_t_p,
+									 c_size_t, ok_float_p, ok_float_p,
+									 c_size_t_p, ok_float_p, c_size_t_p,
+									 kmeans_settings_p]
+	lib.kmeans_minibatch_update.argtypes = [matrix_p, matrix_p,
+											upsamplingvec_p, vector_p,
+											cluster_aid_p, matrix_p,
+											vector_p]
+	lib.kmeans_minibatch_work_alloc.argtypes = [kmeans_minibatch_work_p,
+												c_size_t, c_size_t,
+												c_size_t]
+	lib.kmeans_minibatch_work_free.argtypes = [kmeans_minibatch_work_p]
+	lib.kmeans_minibatch_easy_init.argtypes = [c_size_t, c_size_t,
+											   c_size_t]
+	lib.kmeans_minibatch_easy_load.argtypes = [c_void_p, ok_float_p,
+											   c_uint, ok_float_p,
+											   c_size_t]
+	lib.kmeans_minibatch_easy_seed.argtypes = [c_void_p, ok_float_p,
+											   c_uint, c_size_t, c_uint,
+											   c_size_t]
+	lib.kmeans_minibatch_easy_update.argtypes = [c_void_p, ok_float_p,
+												 c_uint, c_size_t]
+	lib.kmeans_minibatch_easy_assign.argtypes = [c_void_p, ok_float_p,
+												 c_uint, c_size_t,
+												 c_size_t_p, c_size_t]
+	lib.kmeans_minibatch_easy_extract.argtypes = [ok_float_p, c_uint,
+												  ok_float_p, c_size_t,
+												  c_void_p]
+	lib.kmeans_minibatch_easy_finish.argtypes = [c_void_p]
+	lib.kmeans_predict_work_alloc.argtypes = [kmeans_predict_work_p,
+											  c_size_t, c_size_t, c_size_t]
+	lib.kmeans_predict_work_free.argtypes = [kmeans_predict_work_p]
+	lib.kmeans_predict_easy_init.argtypes = [ok_float_p, c_uint, c_size_t,
+											 c_size_t, c_size_t]
+	lib.kmeans_predict_easy_run.argtypes = [c_void_p, ok_float_p, c_uint,
+											c_size_t, c_size_t_p, c_size_t]
+	lib.kmeans_predict_easy_finish.argtypes = [c_void_p]
 
 	# return types
 	lib.upsamplingvec_alloc.restype = c_uint
@@ -169,10 +267,36 @@ def attach_clustering_ccalls(lib, single_precision=False):
 	lib.kmeans_work_subselect.restype = c_uint
 	lib.kmeans_work_load.restype = c_uint
 	lib.kmeans_work_extract.restype = c_uint
+	lib.kmeans_compact.restype = c_uint
+	lib.cluster_tentative.restype = c_uint
 	lib.cluster.restype = c_uint
 	lib.calculate_centroids.restype = c_uint
 	lib.k_means.restype = c_uint
+	lib.k_means_pruned.restype = c_uint
+	lib.kmeans_seed.restype = c_uint
+	lib.cluster_kdtree_favored.restype = c_int
+	lib.cluster_kdtree_alloc.restype = c_uint
+	lib.cluster_kdtree_free.restype = c_uint
+	lib.cluster_kdtree_search.restype = c_uint
+	lib.cluster_kdtree.restype = c_uint
 	lib.kmeans_easy_init.restype = c_void_p
 	lib.kmeans_easy_resize.restype = c_uint
 	lib.kmeans_easy_run.restype = c_uint
+	lib.kmeans_easy_compact.restype = c_uint
 	lib.kmeans_easy_finish.restype = c_uint
+	lib.blockwise_kmeans.restype = c_uint
+	lib.kmeans_minibatch_update.restype = c_uint
+	lib.kmeans_minibatch_work_alloc.restype = c_uint
+	lib.kmeans_minibatch_work_free.restype = c_uint
+	lib.kmeans_minibatch_easy_init.restype = c_void_p
+	lib.kmeans_minibatch_easy_load.restype = c_uint
+	lib.kmeans_minibatch_easy_seed.restype = c_uint
+	lib.kmeans_minibatch_easy_update.restype = c_uint
+	lib.kmeans_minibatch_easy_assign.restype = c_uint
+	lib.kmeans_minibatch_easy_extract.restype = c_uint
+	lib.kmeans_minibatch_easy_finish.restype = c_uint
+	lib.kmeans_predict_work_alloc.restype = c_uint
+	lib.kmeans_predict_work_free.restype = c_uint
+	lib.kmeans_predict_easy_init.restype = c_void_p
+	lib.kmeans_predict_easy_run.restype = c_uint
+	lib.kmeans_predict_easy_finish.restype = c_uint
@@ -20,14 +20,41 @@ class OKEnums(object):
 	OkTransformIncrement = c_uint(2).value
 	OkTransformDecrement = c_uint(3).value
 
+	# Optkit k-means algorithms
+	OkKmeansLloyd = c_uint(0).value
+	OkKmeansHamerly = c_uint(1).value
+	OkKmeansElkan = c_uint(2).value
+	OkKmeansInitAssignments = c_uint(0).value
+	OkKmeansInitPlusPlus = c_uint(1).value
+	OkKmeansInitParallel = c_uint(2).value
+	OkClusterSearchAuto = c_uint(0).value
+	OkClusterSearchDense = c_uint(1).value
+	OkClusterSearchKDTree = c_uint(2).value
+
 	# Optkit Operators
 	NULL = 0
 	IDENTITY = 101
+	NEG = 102
+	ADD = 103
+	CAT = 104
+	SPLIT = 105
 	DENSE = 201
 	SPARSE_CSR = 301
 	SPARSE_CSC = 302
 	SPARSE_COO = 303
 	DIAGONAL = 401
+	KRONECKER = 404
+	TOEPLITZ = 405
+	CIRCULANT = 406
+	CONVOLUTION = 501
+	CIRCULAR_CONVOLUTION = 502
+	FOURIER = 503
+
+	# POGS status
+	OkPogsUnconverged = 0
+	OkPogsSolved = 1
+	OkPogsPrimalInfeasible = 2
+	OkPogsDualInfeasible = 3
 
 	# Optkit Projectors
 	DENSE_DIRECT = 101
@@ -47,6 +74,7 @@ class OKEnums(object):
 	OPTKIT_ERROR_OUT_OF_BOUNDS = 102
 	OPTKIT_ERROR_OVERWRITE = 1000
 	OPTKIT_ERROR_UNALLOCATED = 1001
+	OPTKIT_ERROR_MEMORY = 1002
 
 class OKFunctionEnums(object):
 	Zero = c_uint(0).value
@@ -26,6 +26,8 @@ def optkit_print_error(err, print_success=False):
 		print '\nOPTKIT ERROR OVERWRITE'
 	elif err == 1001L:
 		print '\nOPTKIT ERROR UNALLOCATED'
+	elif err == 1002L:
+		print '\nOPTKIT ERROR MEMORY'
 	else:
 		print '\nunrecognized error code: {}'.format(err)
 
@@ -1,6 +1,6 @@
 from numpy import float32, float64
-from ctypes import c_int, c_uint, c_size_t, c_void_p, c_float, c_double, \
-	POINTER, Structure
+from ctypes import c_int, c_int64, c_uint, c_size_t, c_void_p, c_float, \
+	c_double, c_char_p, POINTER, Structure
 from optkit.libs.loader import OptkitLibs
 
 class DenseLinsysLibs(OptkitLibs):
@@ -34,6 +34,14 @@ def attach_base_ctypes(lib, single_precision=False):
 	lib.ok_float_p = POINTER(lib.ok_float)
 	lib.ok_int_p = POINTER(lib.ok_int)
 
+	# saved OpenMP/BLAS thread limits
+	class ok_threads(Structure):
+		_fields_ = [('omp', c_int),
+					('blas', c_int),
+					('blas_scope', c_int)]
+	lib.ok_threads = ok_threads
+	lib.ok_threads_p = POINTER(lib.ok_threads)
+
 def attach_dense_linsys_ctypes(lib, single_precision=False):
 	if not 'ok_float' in lib.__dict__:
 		attach_base_ctypes(lib, single_precision)
@@ -84,11 +92,41 @@ def attach_sparse_linsys_ctypes(lib, single_precision=False):
 					('val', ok_float_p),
 					('ind', ok_int_p),
 					('ptr', ok_int_p),
-					('order', c_uint)]
+					('order', c_uint),
+					('is_view', c_int)]
 
 	lib.sparse_matrix = ok_sparse_matrix
 	lib.sparse_matrix_p = POINTER(lib.sparse_matrix)
 
+	# 64-bit index sparse matrix struct
+	lib.ok_int64 = c_int64
+	lib.ok_int64_p = POINTER(lib.ok_int64)
+
+	class ok_sparse_matrix64(Structure):
+		_fields_ = [('size1', c_size_t),
+					('size2', c_size_t),
+					('nnz', c_size_t),
+					('ptrlen', c_size_t),
+					('val', ok_float_p),
+					('ind', lib.ok_int64_p),
+					('ptr', lib.ok_int64_p),
+					('order', c_uint),
+					('is_view', c_int)]
+
+	lib.sparse_matrix64 = ok_sparse_matrix64
+	lib.sparse_matrix64_p = POINTER(lib.sparse_matrix64)
+
+	# compressed sparse index struct
+	class ok_sparse_cindex(Structure):
+		_fields_ = [('nnz', c_size_t),
+					('ptrlen', c_size_t),
+					('width', c_size_t),
+					('base', lib.c_size_t_p),
+					('offset', c_void_p)]
+
+	lib.sparse_cindex = ok_sparse_cindex
+	lib.sparse_cindex_p = POINTER(lib.sparse_cindex)
+
 
 def attach_base_ccalls(lib, single_precision=False):
 	if not 'c_int_p' in lib.__dict__:
@@ -99,6 +137,33 @@ def attach_base_ccalls(lib, single_precision=False):
 	lib.optkit_version.argtypes = [c_int_p, c_int_p, c_int_p, c_int_p]
 	lib.optkit_version.restype = c_uint
 
+	lib.ok_set_num_threads.argtypes = [c_int]
+	lib.ok_set_num_threads.restype = c_uint
+
+	lib.ok_get_max_threads.argtypes = []
+	lib.ok_get_max_threads.restype = c_int
+
+	lib.ok_blas_get_num_threads.argtypes = []
+	lib.ok_blas_get_num_threads.restype = c_int
+
+	lib.ok_blas_set_num_threads.argtypes = [c_int]
+	lib.ok_blas_set_num_threads.restype = c_uint
+
+	lib.ok_blas_select.argtypes = [c_char_p]
+	lib.ok_blas_select.restype = c_uint
+
+	lib.ok_blas_backend.argtypes = []
+	lib.ok_blas_backend.restype = c_char_p
+
+	lib.ok_blas_library.argtypes = []
+	lib.ok_blas_library.restype = c_char_p
+
+	lib.ok_threads_limit.argtypes = [c_int, lib.ok_threads_p]
+	lib.ok_threads_limit.restype = c_uint
+
+	lib.ok_threads_restore.argtypes = [lib.ok_threads_p]
+	lib.ok_threads_restore.restype = c_uint
+
 	lib.ok_device_reset.argtypes = []
 	lib.ok_device_reset.restype = c_uint
 
@@ -137,6 +202,12 @@ def attach_vector_ccalls(lib, single_precision=False):
 	lib.vector_indmin.argtypes = [vector_p, c_size_t_p]
 	lib.vector_min.argtypes = [vector_p, ok_float_p]
 	lib.vector_max.argtypes = [vector_p, ok_float_p]
+	lib.vector_axpy_dot.argtypes = [ok_float, vector_p, vector_p, ok_float_p]
+	lib.vector_xpby_sumsq.argtypes = [vector_p, ok_float, vector_p,
+									  ok_float_p]
+	lib.vector_axpy2_sumsq.argtypes = [ok_float, vector_p, vector_p,
+									   ok_float, vector_p, vector_p,
+									   ok_float_p, ok_float_p]
 
 	lib.indvector_alloc.argtypes = [indvector_p, c_size_t]
 	lib.indvector_calloc.argtypes = [indvector_p, c_size_t]
@@ -181,6 +252,9 @@ def attach_vector_ccalls(lib, single_precision=False):
 	lib.vector_indmin.restype = c_uint
 	lib.vector_min.restype = c_uint
 	lib.vector_max.restype = c_uint
+	lib.vector_axpy_dot.restype = c_uint
+	lib.vector_xpby_sumsq.restype = c_uint
+	lib.vector_axpy2_sumsq.restype = c_uint
 
 	lib.indvector_alloc.restype = c_uint
 	lib.indvector_calloc.restype = c_uint
@@ -324,6 +398,7 @@ def attach_sparse_linsys_ccalls(lib, single_precision=False):
 	ok_float_p = lib.ok_float_p
 	ok_int_p = lib.ok_int_p
 	vector_p = lib.vector_p
+	matrix_p = lib.matrix_p
 	sparse_matrix_p = lib.sparse_matrix_p
 
 	# Sparse Handle
@@ -344,6 +419,9 @@ def attach_sparse_linsys_ccalls(lib, single_precision=False):
 	lib.sp_matrix_calloc.argtypes = [sparse_matrix_p, c_size_t, c_size_t,
 									 c_size_t, c_uint]
 	lib.sp_matrix_free.argtypes = [sparse_matrix_p]
+	lib.sp_matrix_view_array.argtypes = [sparse_matrix_p, c_size_t, c_size_t,
+										 c_size_t, ok_float_p, ok_int_p,
+										 ok_int_p, c_uint]
 	lib.sp_matrix_memcpy_mm.argtypes = [sparse_matrix_p, sparse_matrix_p]
 	lib.sp_matrix_memcpy_ma.argtypes = [c_void_p, sparse_matrix_p,
 										ok_float_p, ok_int_p, ok_int_p]
@@ -365,6 +443,7 @@ def attach_sparse_linsys_ccalls(lib, single_precision=False):
 	lib.sp_matrix_alloc.restype = c_uint
 	lib.sp_matrix_calloc.restype = c_uint
 	lib.sp_matrix_free.restype = c_uint
+	lib.sp_matrix_view_array.restype = c_uint
 	lib.sp_matrix_memcpy_mm.restype = c_uint
 	lib.sp_matrix_memcpy_ma.restype = c_uint
 	lib.sp_matrix_memcpy_am.restype = c_uint
@@ -384,6 +463,84 @@ def attach_sparse_linsys_ccalls(lib, single_precision=False):
 	## arguments
 	lib.sp_blas_gemv.argtypes = [c_void_p, c_uint, ok_float, sparse_matrix_p,
 								 vector_p, ok_float, vector_p]
+	lib.sp_blas_gemm.argtypes = [c_void_p, c_uint, ok_float, sparse_matrix_p,
+								 matrix_p, ok_float, matrix_p]
+
+	## return values
+	lib.sp_blas_gemv.restype = c_uint
+	lib.sp_blas_gemm.restype = c_uint
+
+	# 64-bit index & compressed index formats (CPU libraries only)
+	# ------------------------------------------------------------
+	if not hasattr(lib, 'sp_matrix64_alloc'):
+		return
+
+	ok_int64_p = lib.ok_int64_p
+	sparse_matrix64_p = lib.sparse_matrix64_p
+	sparse_cindex_p = lib.sparse_cindex_p
+
+	## arguments
+	lib.sp_matrix64_alloc.argtypes = [sparse_matrix64_p, c_size_t, c_size_t,
+									  c_size_t, c_uint]
+	lib.sp_matrix64_calloc.argtypes = [sparse_matrix64_p, c_size_t, c_size_t,
+									   c_size_t, c_uint]
+	lib.sp_matrix64_free.argtypes = [sparse_matrix64_p]
+	lib.sp_matrix64_view_array.argtypes = [sparse_matrix64_p, c_size_t,
+										   c_size_t, c_size_t, ok_float_p,
+										   ok_int64_p, ok_int64_p, c_uint]
+	lib.sp_matrix64_memcpy_mm.argtypes = [sparse_matrix64_p,
+										  sparse_matrix64_p]
+	lib.sp_matrix64_memcpy_ma.argtypes = [c_void_p, sparse_matrix64_p,
+										  ok_float_p, ok_int64_p, ok_int64_p]
+	lib.sp_matrix64_memcpy_am.argtypes = [ok_float_p, ok_int64_p, ok_int64_p,
+										  sparse_matrix64_p]
+	lib.sp_matrix64_memcpy_vals_ma.argtypes = [c_void_p, sparse_matrix64_p,
+											   ok_float_p]
+	lib.sp_matrix64_memcpy_vals_am.argtypes = [ok_float_p, sparse_matrix64_p]
+	lib.sp_matrix64_abs.argtypes = [sparse_matrix64_p]
+	lib.sp_matrix64_pow.argtypes = [sparse_matrix64_p, ok_float]
+	lib.sp_matrix64_scale.argtypes = [sparse_matrix64_p, ok_float]
+	lib.sp_matrix64_scale_left.argtypes = [c_void_p, sparse_matrix64_p,
+										   vector_p]
+	lib.sp_matrix64_scale_right.argtypes = [c_void_p, sparse_matrix64_p,
+											vector_p]
+	lib.sp_matrix_compress_index.argtypes = [sparse_cindex_p, sparse_matrix_p,
+											 c_size_t]
+	lib.sp_matrix64_compress_index.argtypes = [sparse_cindex_p,
+											   sparse_matrix64_p, c_size_t]
+	lib.sp_cindex_free.argtypes = [sparse_cindex_p]
+	lib.sp_blas_gemv64.argtypes = [c_void_p, c_uint, ok_float,
+								   sparse_matrix64_p, vector_p, ok_float,
+								   vector_p]
+	lib.sp_blas_gemm64.argtypes = [c_void_p, c_uint, ok_float,
+								   sparse_matrix64_p, matrix_p, ok_float,
+								   matrix_p]
+	lib.sp_blas_gemv_cindex.argtypes = [c_void_p, c_uint, ok_float,
+										sparse_matrix_p, sparse_cindex_p,
+										vector_p, ok_float, vector_p]
+	lib.sp_blas_gemv64_cindex.argtypes = [c_void_p, c_uint, ok_float,
+										  sparse_matrix64_p, sparse_cindex_p,
+										  vector_p, ok_float, vector_p]
 
 	## return values
-	lib.sp_blas_gemv.restype = c_uint
\ No newline at end of file
+	lib.sp_matrix64_alloc.restype = c_uint
+	lib.sp_matrix64_calloc.restype = c_uint
+	lib.sp_matrix64_free.restype = c_uint
+	lib.sp_matrix64_view_array.restype = c_uint
+	lib.sp_matrix64_memcpy_mm.restype = c_uint
+	lib.sp_matrix64_memcpy_ma.restype = c_uint
+	lib.sp_matrix64_memcpy_am.restype = c_uint
+	lib.sp_matrix64_memcpy_vals_ma.restype = c_uint
+	lib.sp_matrix64_memcpy_vals_am.restype = c_uint
+	lib.sp_matrix64_abs.restype = c_uint
+	lib.sp_matrix64_pow.restype = c_uint
+	lib.sp_matrix64_scale.restype = c_uint
+	lib.sp_matrix64_scale_left.restype = c_uint
+	lib.sp_matrix64_scale_right.restype = c_uint
+	lib.sp_matrix_compress_index.restype = c_uint
+	lib.sp_matrix64_compress_index.restype = c_uint
+	lib.sp_cindex_free.restype = c_uint
+	lib.sp_blas_gemv64.restype = c_uint
+	lib.sp_blas_gemm64.restype = c_uint
+	lib.sp_blas_gemv_cindex.restype = c_uint
+	lib.sp_blas_gemv64_cindex.restype = c_uint
\ No newline at end of file
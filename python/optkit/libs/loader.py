@@ -1,9 +1,17 @@
 from os import path, uname, getenv
 from site import getsitepackages
 from ctypes import CDLL
+from threading import Lock
 from optkit.libs.enums import OKEnums
 
 def retrieve_libs(lib_prefix):
+	"""
+	Locate the library variants for lib_prefix, without loading them.
+
+	Returns (libs, search_results), with libs mapping each tag ('gpu32',
+	'cpu64', etc.) to a library path, or to None if no such variant was
+	found.
+	"""
 	libs = {}
 	local_c_build = path.abspath(path.join(path.dirname(__file__),
 		'..', '..', '..', 'build'))
@@ -23,8 +31,7 @@ def retrieve_libs(lib_prefix):
 				lib_path = path.join(local_c_build, lib_name)
 
 			if path.exists(lib_path):
-				libs[lib_tag] = CDLL(lib_path)
-				libs[lib_tag].INITIALIZED = False
+				libs[lib_tag] = lib_path
 			else:
 				msg = 'library {} not found at {}.\n'.format(lib_name, lib_path)
 				search_results += msg
@@ -40,6 +47,13 @@ class OptkitLibs(object):
 				search_results))
 
 		self.attach_calls = []
+		self.__loaded = {}
+		self.__lock = Lock()
+
+	@property
+	def loaded(self):
+		""" tags of the library variants loaded so far """
+		return sorted(self.__loaded.keys())
 
 	def get(self, single_precision=False, gpu=False):
 		device = 'gpu' if gpu else 'cpu'
@@ -50,16 +64,21 @@ class OptkitLibs(object):
 		elif self.libs[lib_key] is None:
 			return None
 
-		lib = self.libs[lib_key]
-		if lib.INITIALIZED:
+		# libraries are opened and bound on first use only; a library is
+		# published to other threads only once fully bound
+		lib = self.__loaded.get(lib_key, None)
+		if lib is not None:
 			return lib
-		else:
-			lib.enums = OKEnums()
 
-			for attach_call in self.attach_calls:
-				attach_call(lib, single_precision)
+		with self.__lock:
+			if lib_key not in self.__loaded:
+				lib = CDLL(self.libs[lib_key])
+				lib.enums = OKEnums()
+
+				for attach_call in self.attach_calls:
+					attach_call(lib, single_precision)
 
-			lib.FLOAT = single_precision
-			lib.GPU = gpu
-			lib.INITIALIZED = True
-			return lib
\ No newline at end of file
+				lib.FLOAT = single_precision
+				lib.GPU = gpu
+				self.__loaded[lib_key] = lib
+			return self.__loaded[lib_key]
@@ -23,6 +23,7 @@ def attach_operator_ctypes(lib, single_precision=False):
 
 	ok_float = lib.ok_float
 	vector_p = lib.vector_p
+	matrix_p = lib.matrix_p
 
 	class ok_operator(Structure):
 		_fields_ = [('size1', c_size_t),
@@ -34,6 +35,10 @@ def attach_operator_ctypes(lib, single_precision=False):
 											  vector_p, ok_float, vector_p)),
 					('fused_adjoint', CFUNCTYPE(c_uint, c_void_p, ok_float,
 												vector_p, ok_float, vector_p)),
+					('apply_block', CFUNCTYPE(c_uint, c_void_p, matrix_p,
+											  matrix_p)),
+					('adjoint_block', CFUNCTYPE(c_uint, c_void_p, matrix_p,
+												matrix_p)),
 					('free', CFUNCTYPE(c_uint, c_void_p)),
 					('kind', c_uint)]
 
@@ -47,6 +52,8 @@ def attach_operator_ccalls(lib, single_precision=False):
 		attach_operator_ctypes(lib, single_precision)
 
 	# check VECTORP, MATRIXP, SPARSEMATRIXP, OPERATORP exist
+	ok_float = lib.ok_float
+	ok_float_p = lib.ok_float_p
 	vector_p = lib.vector_p
 	matrix_p = lib.matrix_p
 	sparse_matrix_p = lib.sparse_matrix_p
@@ -55,9 +62,36 @@ def attach_operator_ccalls(lib, single_precision=False):
 	# argument types
 	lib.dense_operator_alloc.argtypes = [matrix_p]
 	lib.sparse_operator_alloc.argtypes = [sparse_matrix_p]
+	lib.sparse_operator_compress_index.argtypes = [operator_p, c_size_t]
 	lib.diagonal_operator_alloc.argtypes = [vector_p]
+	lib.toeplitz_operator_alloc.argtypes = [ok_float_p, c_size_t, ok_float_p,
+											c_size_t]
+	lib.circulant_operator_alloc.argtypes = [ok_float_p, c_size_t]
+	lib.convolution_operator_alloc.argtypes = [ok_float_p, c_size_t,
+											   c_size_t]
+	lib.circular_convolution_operator_alloc.argtypes = [ok_float_p,
+														c_size_t, c_size_t]
+	lib.fourier_operator_alloc.argtypes = [c_size_t]
+	lib.kronecker_operator_alloc.argtypes = [operator_p, operator_p]
+	lib.cat_operator_alloc.argtypes = [POINTER(operator_p), c_size_t]
+	lib.split_operator_alloc.argtypes = [POINTER(operator_p), c_size_t]
+	lib.add_operator_alloc.argtypes = [POINTER(operator_p), c_size_t]
+	lib.neg_operator_alloc.argtypes = [operator_p]
+	lib.typesafe_operator_scale.argtypes = [operator_p, ok_float]
 
 	# return types
 	lib.dense_operator_alloc.restype = operator_p
 	lib.sparse_operator_alloc.restype = operator_p
-	lib.diagonal_operator_alloc.restype = operator_p
\ No newline at end of file
+	lib.sparse_operator_compress_index.restype = c_uint
+	lib.diagonal_operator_alloc.restype = operator_p
+	lib.toeplitz_operator_alloc.restype = operator_p
+	lib.circulant_operator_alloc.restype = operator_p
+	lib.convolution_operator_alloc.restype = operator_p
+	lib.circular_convolution_operator_alloc.restype = operator_p
+	lib.fourier_operator_alloc.restype = operator_p
+	lib.kronecker_operator_alloc.restype = operator_p
+	lib.cat_operator_alloc.restype = operator_p
+	lib.split_operator_alloc.restype = operator_p
+	lib.add_operator_alloc.restype = operator_p
+	lib.neg_operator_alloc.restype = operator_p
+	lib.typesafe_operator_scale.restype = c_uint
@@ -108,7 +108,11 @@ def attach_pogs_common_ctypes(lib, single_precision=False):
 					('warmstart', c_int),
 					('resume', c_int),
 					('x0', ok_float_p),
-					('nu0', ok_float_p)]
+					('nu0', ok_float_p),
+					('num_threads', c_int),
+					('anderson', c_uint),
+					('infeastol', ok_float),
+					('polish', c_int)]
 
 	lib.pogs_settings = PogsSettings
 	lib.pogs_settings_p = POINTER(lib.pogs_settings)
@@ -116,19 +120,41 @@ def attach_pogs_common_ctypes(lib, single_precision=False):
 	class PogsInfo(Structure):
 		_fields_ = [('err', c_int),
 					('converged', c_int),
+					('status', c_int),
 					('k', c_uint),
 					('obj', ok_float),
 					('rho', ok_float),
 					('setup_time', ok_float),
-					('solve_time', ok_float)]
+					('solve_time', ok_float),
+					('prox_time', ok_float),
+					('project_time', ok_float),
+					('dual_time', ok_float),
+					('check_time', ok_float),
+					('adapt_time', ok_float),
+					('anderson_time', ok_float),
+					('polish_time', ok_float),
+					('gemv_count', c_uint),
+					('cg_iters', c_uint),
+					('polished', c_int)]
 		def __init__(self):
 			self.err = 0
 			self.converged = 0
+			self.status = 0
 			self.k = 0
 			self.obj = nan
 			self.rho = nan
 			self.setup_time = nan
 			self.solve_time = nan
+			self.prox_time = 0
+			self.project_time = 0
+			self.dual_time = 0
+			self.check_time = 0
+			self.adapt_time = 0
+			self.anderson_time = 0
+			self.polish_time = 0
+			self.gemv_count = 0
+			self.cg_iters = 0
+			self.polished = 0
 
 	lib.pogs_info = PogsInfo
 	lib.pogs_info_p =  POINTER(lib.pogs_info)
@@ -213,6 +239,27 @@ def attach_pogs_common_ctypes(lib, single_precision=False):
 	lib.pogs_variables = PogsVariables
 	lib.pogs_variables_p = POINTER(lib.pogs_variables)
 
+	class AndersonWork(Structure):
+		_fields_ = [('mem', c_size_t),
+					('size', c_size_t),
+					('n_cols', c_size_t),
+					('index', c_size_t),
+					('have_prev', c_int),
+					('accelerated', c_int),
+					('norm_f', ok_float),
+					('u', lib.vector),
+					('g', lib.vector),
+					('f', lib.vector),
+					('g_prev', lib.vector),
+					('f_prev', lib.vector),
+					('gamma', lib.vector),
+					('dF', lib.matrix),
+					('dG', lib.matrix),
+					('gram', lib.matrix)]
+
+	lib.anderson_work = AndersonWork
+	lib.anderson_work_p = POINTER(lib.anderson_work)
+
 def attach_pogs_ctypes(lib, single_precision=False):
 	if not 'matrix_p' in lib.__dict__:
 		attach_dense_linsys_ctypes(lib, single_precision)
@@ -284,6 +331,7 @@ def attach_pogs_common_ccalls(lib, single_precision=False):
 	pogs_tolerances_p = lib.pogs_tolerances_p
 	pogs_objectives_p = lib.pogs_objectives_p
 	pogs_variables_p = lib.pogs_variables_p
+	anderson_work_p = lib.anderson_work_p
 
 	lib.set_default_settings.argtypes = [pogs_settings_p]
 	lib.set_default_settings.restype = c_uint
@@ -305,6 +353,13 @@ def attach_pogs_common_ccalls(lib, single_precision=False):
 								 pogs_tolerances_p, c_uint]
 		lib.copy_output.argtypes = [pogs_output_p, pogs_variables_p, vector_p,
 									vector_p, ok_float, c_uint]
+		lib.anderson_work_alloc.argtypes = [POINTER(anderson_work_p),
+											c_size_t, c_size_t, c_size_t]
+		lib.anderson_work_free.argtypes = [anderson_work_p]
+		lib.anderson_reset.argtypes = [anderson_work_p]
+		lib.anderson_set_input.argtypes = [anderson_work_p, pogs_variables_p]
+		lib.anderson_step.argtypes = [c_void_p, anderson_work_p,
+									  pogs_variables_p]
 
 		## results
 		lib.initialize_conditions.restype = c_uint
@@ -313,6 +368,11 @@ def attach_pogs_common_ccalls(lib, single_precision=False):
 		lib.update_dual.restype = c_uint
 		lib.adaptrho.restype = c_uint
 		lib.copy_output.restype = c_uint
+		lib.anderson_work_alloc.restype = c_uint
+		lib.anderson_work_free.restype = c_uint
+		lib.anderson_reset.restype = c_uint
+		lib.anderson_set_input.restype = c_uint
+		lib.anderson_step.restype = c_uint
 	else:
 		lib.initialize_conditions = AttributeError()
 		lib.set_prev = AttributeError()
@@ -320,6 +380,11 @@ def attach_pogs_common_ccalls(lib, single_precision=False):
 		lib.update_dual = AttributeError()
 		lib.adaptrho = AttributeError()
 		lib.copy_output = AttributeError()
+		lib.anderson_work_alloc = AttributeError()
+		lib.anderson_work_free = AttributeError()
+		lib.anderson_reset = AttributeError()
+		lib.anderson_set_input = AttributeError()
+		lib.anderson_step = AttributeError()
 
 def attach_pogs_ccalls(lib, single_precision=False):
 	if not 'vector_p' in lib.__dict__:
@@ -351,6 +416,9 @@ def attach_pogs_ccalls(lib, single_precision=False):
 	lib.pogs_init.argtypes = [ok_float_p, c_size_t, c_size_t, c_uint]
 	lib.pogs_solve.argtypes = [c_void_p, function_vector_p, function_vector_p,
 							   pogs_settings_p, pogs_info_p, pogs_output_p]
+	lib.pogs_solve_batch.argtypes = [c_void_p, c_size_t, function_vector_p,
+									 function_vector_p, pogs_settings_p,
+									 pogs_info_p, pogs_output_p]
 	lib.pogs_finish.argtypes = [c_void_p, c_int]
 	lib.pogs.argtypes = [ok_float_p, function_vector_p, function_vector_p,
 						 pogs_settings_p, pogs_info_p, pogs_output_p, c_uint,
@@ -367,6 +435,7 @@ def attach_pogs_ccalls(lib, single_precision=False):
 	## return types
 	lib.pogs_init.restype = pogs_solver_p
 	lib.pogs_solve.restype = c_uint
+	lib.pogs_solve_batch.restype = c_uint
 	lib.pogs_finish.restype = c_uint
 	lib.pogs.restype = c_uint
 	lib.pogs_load_solver.restype = pogs_solver_p
@@ -497,8 +566,18 @@ def attach_pogs_abstract_ccalls(lib, single_precision=False):
 	lib.pogs_sparse_operator_gen.argtypes = [ok_float_p, ok_int_p, ok_int_p,
 											 c_size_t, c_size_t, c_size_t,
 											 c_uint]
+	lib.pogs_sparse_operator_gen64.argtypes = [ok_float_p, lib.ok_int64_p,
+											   lib.ok_int64_p, c_size_t,
+											   c_size_t, c_size_t, c_uint]
+	lib.pogs_sparse_operator_view.argtypes = [ok_float_p, ok_int_p, ok_int_p,
+											  c_size_t, c_size_t, c_size_t,
+											  c_uint]
+	lib.pogs_sparse_operator_view64.argtypes = [ok_float_p, lib.ok_int64_p,
+												lib.ok_int64_p, c_size_t,
+												c_size_t, c_size_t, c_uint]
 	lib.pogs_dense_operator_free.argtypes = [operator_p]
 	lib.pogs_sparse_operator_free.argtypes = [operator_p]
+	lib.sparse_operator_compress_index.argtypes = [operator_p, c_size_t]
 
 	# lib.pogs_load_solver.argtypes = [ok_float_p, ok_float_p,
 	# 								 ok_float_p, ok_float_p,
@@ -520,8 +599,12 @@ def attach_pogs_abstract_ccalls(lib, single_precision=False):
 	lib.pogs.restype = c_uint
 	lib.pogs_dense_operator_gen.restype = operator_p
 	lib.pogs_sparse_operator_gen.restype = operator_p
+	lib.pogs_sparse_operator_gen64.restype = operator_p
+	lib.pogs_sparse_operator_view.restype = operator_p
+	lib.pogs_sparse_operator_view64.restype = operator_p
 	lib.pogs_dense_operator_free.restype = c_uint
 	lib.pogs_sparse_operator_free.restype = c_uint
+	lib.sparse_operator_compress_index.restype = c_uint
 
 	# lib.pogs_load_solver.restype = c_void_p
 	# lib.pogs_extract_solver.restype = c_uint
@@ -88,16 +88,24 @@ def attach_projector_ccalls(lib, single_precision=False):
 												c_int]
 	lib.direct_projector_project.argtypes = [c_void_p,
 		direct_projector_p, vector_p, vector_p, vector_p, vector_p]
+	lib.direct_projector_project_batch.argtypes = [c_void_p,
+		direct_projector_p, matrix_p, matrix_p, matrix_p, matrix_p]
 	lib.direct_projector_free.argtypes = [direct_projector_p]
 	lib.dense_direct_projector_alloc.argtypes = [matrix_p]
+	# -generic
+	lib.projector_get_work.argtypes = [projector_p, POINTER(c_uint),
+									   POINTER(c_uint)]
 
 	# returns:
 	# -direct
 	lib.direct_projector_alloc.restype = c_uint
 	lib.direct_projector_initialize.restype = c_uint
 	lib.direct_projector_project.restype = c_uint
+	lib.direct_projector_project_batch.restype = c_uint
 	lib.direct_projector_free.restype = c_uint
 	lib.dense_direct_projector_alloc.restype = projector_p
+	# -generic
+	lib.projector_get_work.restype = c_uint
 
 def attach_operator_projector_ctypes_ccalls(lib, single_precision=False):
 	if 'ok_float' not in lib.__dict__:
@@ -128,7 +136,9 @@ def attach_operator_projector_ctypes_ccalls(lib, single_precision=False):
 					('linalg_handle', c_void_p),
 					('normA', ok_float),
 					('normalized', c_int),
-					('flag', c_uint)]
+					('flag', c_uint),
+					('iters', c_uint),
+					('products', c_uint)]
 
 	lib.indirect_projector_generic = indirect_projector_generic
 	lib.indirect_projector_generic_p = POINTER(lib.indirect_projector_generic)
@@ -84,7 +84,16 @@ def attach_prox_ccalls(lib, single_precision=False):
 									 vector_p]
 	lib.function_eval_vector.argtypes = [function_vector_p, vector_p,
 										 ok_float_p]
+	lib.function_support_vector.argtypes = [function_vector_p, vector_p,
+											ok_float, ok_float, ok_float_p]
+	lib.function_recession_vector.argtypes = [function_vector_p, vector_p,
+											  ok_float, ok_float_p]
+	lib.function_polish_vector.argtypes = [function_vector_p, vector_p,
+										   ok_float, vector_p, vector_p,
+										   vector_p, vector_p]
 
 	## return values
 	lib.prox_eval_vector.restype = c_uint
-	lib.function_eval_vector.restype = c_uint
\ No newline at end of file
+	lib.function_eval_vector.restype = c_uint
+	lib.function_support_vector.restype = c_uint
+	lib.function_recession_vector.restype = c_uint
\ No newline at end of file
@@ -15,6 +15,8 @@ WARMSTART_DEFAULT = 0
 VERBOSE_DEFAULT = 2
 SUPPRESS_DEFAULT = 0
 RESUME_DEFAULT = 0
+ANDERSON_DEFAULT = 0
+INFEASTOL_DEFAULT = 1e-4
 
 class OptkitCPogsTestCase(OptkitCTestCase):
 	class PogsVariablesLocal():
@@ -156,6 +158,8 @@ class OptkitCPogsTestCase(OptkitCTestCase):
 		self.assertScalarEqual(settings.warmstart, WARMSTART_DEFAULT,
 									 TOL )
 		self.assertScalarEqual(settings.resume, RESUME_DEFAULT, TOL )
+		self.assertScalarEqual(settings.anderson, ANDERSON_DEFAULT, TOL )
+		self.assertScalarEqual(settings.infeastol, INFEASTOL_DEFAULT, TOL )
 
 	def assert_pogs_scaling(self, lib, solver, f, f_py, g, g_py, local_vars):
 		m = len(f_py)
@@ -361,6 +365,28 @@ class OptkitCPogsTestCase(OptkitCTestCase):
 		self.assertVecEqual(A.dot(output.x), output.y, atolm, P * rtol)
 		self.assertVecEqual(A.T.dot(output.nu), -output.mu, atoln, D * rtol)
 
+	def assert_pogs_profile(self, info, direct=True):
+		"""pogs phase timers and work counters
+
+		per iteration, a direct projection and the residual calculation
+		each multiply by A and A^T once; an indirect projection makes two
+		products per CG iteration, plus three or four around the CGLS
+		solve
+		"""
+		phases = [info.prox_time, info.project_time, info.dual_time,
+				  info.check_time, info.adapt_time, info.anderson_time]
+		for t in phases:
+			self.assertTrue( t >= 0 )
+		self.assertTrue( sum(phases) <= info.solve_time * 1.01 + 1e-4 )
+
+		if direct:
+			self.assertEqual( info.cg_iters, 0 )
+			self.assertEqual( info.gemv_count, 4 * info.k )
+		else:
+			products_cg = 2 * info.cg_iters
+			self.assertTrue( info.gemv_count >= products_cg + 5 * info.k )
+			self.assertTrue( info.gemv_count <= products_cg + 6 * info.k )
+
 	def assert_pogs_unscaling(self, lib, output, solver, local_vars):
 		"""pogs unscaling test
 
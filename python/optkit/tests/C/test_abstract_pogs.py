@@ -1,9 +1,11 @@
 import os
 import numpy as np
 from scipy.sparse import csc_matrix, csr_matrix
+from scipy.linalg import toeplitz
 from ctypes import c_void_p, byref, cast, addressof
 from optkit.utils.proxutils import func_eval_python
 from optkit.libs.pogs import PogsAbstractLibs
+from optkit.types.sparse import SparseOperator
 from optkit.tests.defs import OptkitTestCase
 from optkit.tests.C.base import OptkitCOperatorTestCase
 from optkit.tests.C.pogs_base import OptkitCPogsTestCase
@@ -298,6 +300,214 @@ class PogsAbstractTestCases(OptkitCPogsTestCase, OptkitCOperatorTestCase):
 				self.assertEqual(type(o), lib.operator_p)
 				self.free_var('o')
 
+	def test_sparse_operator_view(self):
+		m, n = self.shape
+		x_rand = np.random.rand(n)
+		y_rand = np.random.rand(m)
+
+		for (gpu, single_precision) in self.CONDITIONS:
+			lib = self.libs.get(single_precision=single_precision, gpu=gpu)
+			if lib is None or gpu:
+				continue
+			self.register_exit(lib.ok_device_reset)
+
+			DIGITS = 7 - 2 * single_precision
+			RTOL = 10**(-DIGITS)
+			ATOLM = RTOL * m**0.5
+
+			for index_type in (np.int32, np.int64):
+				A_sp = csr_matrix(self.A_test_sparse.astype(lib.pyfloat))
+				A_sp.indptr = A_sp.indptr.astype(index_type)
+				A_sp.indices = A_sp.indices.astype(index_type)
+				if index_type == np.int64:
+					view = lib.pogs_sparse_operator_view64
+					index_p = lib.ok_int64_p
+				else:
+					view = lib.pogs_sparse_operator_view
+					index_p = lib.ok_int_p
+				A_ptr = A_sp.indptr.ctypes.data_as(index_p)
+				A_ind = A_sp.indices.ctypes.data_as(index_p)
+				A_val = A_sp.data.ctypes.data_as(lib.ok_float_p)
+				o = view(A_val, A_ind, A_ptr, m, n, A_sp.nnz,
+						 lib.enums.CblasRowMajor)
+				self.assertEqual(type(o), lib.operator_p)
+				self.register_var('o', o, lib.pogs_sparse_operator_free)
+
+				x, x_py, x_ptr = self.register_vector(lib, n, 'x')
+				y, y_py, y_ptr = self.register_vector(lib, m, 'y')
+				x_py[:] = x_rand
+				self.assertCall( lib.vector_memcpy_va(x, x_ptr, 1) )
+				self.assertCall( o.contents.apply(o.contents.data, x, y) )
+				self.assertCall( lib.vector_memcpy_av(y_ptr, y, 1) )
+				self.assertVecEqual( A_sp * x_rand, y_py, ATOLM, RTOL )
+
+				# adjoint: scatter along the stored rows
+				y_py[:] = y_rand
+				self.assertCall( lib.vector_memcpy_va(y, y_ptr, 1) )
+				self.assertCall( o.contents.adjoint(o.contents.data, y, x) )
+				self.assertCall( lib.vector_memcpy_av(x_ptr, x, 1) )
+				self.assertVecEqual( A_sp.T * y_rand, x_py, ATOLM, RTOL )
+
+				# equilibration rescales a private copy of the values
+				data_orig = np.copy(A_sp.data)
+				for _ in xrange(2):
+					solver = lib.pogs_init(o, 0, 1.)
+					self.assertEqual(
+							solver.contents.W.contents.equilibrated, 1 )
+					self.assertTrue( np.all(data_orig == A_sp.data) )
+					self.assertCall( lib.pogs_finish(solver, 0) )
+					self.assertTrue( np.all(data_orig == A_sp.data) )
+
+				# operator reads the caller's values again after the solve
+				self.assertCall( o.contents.apply(o.contents.data, x, y) )
+				self.assertCall( lib.vector_memcpy_av(y_ptr, y, 1) )
+				self.assertVecEqual( A_sp * x_py, y_py, ATOLM, RTOL )
+
+				self.free_vars('o', 'x', 'y')
+			self.assertCall( lib.ok_device_reset() )
+
+	def test_sparse_operator_compressed(self):
+		"""abstract operator pogs: copied sparse operator, compressed index
+
+			scipy CSR input with 32- or 64-bit indices; with index_width
+			set, the operator's products (and hence POGS) run through the
+			compressed index and must match the plain operator
+		"""
+		m, n = self.shape
+		x_rand = np.random.rand(n)
+		y_rand = np.random.rand(m)
+		b = np.random.rand(m)
+
+		for (gpu, single_precision) in self.CONDITIONS:
+			lib = self.libs.get(single_precision=single_precision, gpu=gpu)
+			if lib is None or gpu:
+				continue
+			self.register_exit(lib.ok_device_reset)
+
+			DIGITS = 7 - 2 * single_precision
+			RTOL = 10**(-DIGITS)
+			ATOLM = RTOL * m**0.5
+
+			# least squares + l1: y = Ax ~ b
+			f, f_py, f_ptr = self.register_fnvector(lib, m, 'f')
+			g, g_py, g_ptr = self.register_fnvector(lib, n, 'g')
+			f_py['h'] = lib.function_enums.Square
+			f_py['b'] = b
+			g_py['h'] = lib.function_enums.Abs
+			for fn in (f_py, g_py):
+				fn['a'] = 1
+				fn['c'] = 1
+			g_py['c'] = 0.1
+			self.assertCall( lib.function_vector_memcpy_va(f, f_ptr) )
+			self.assertCall( lib.function_vector_memcpy_va(g, g_ptr) )
+
+			x, x_py, x_ptr = self.register_vector(lib, n, 'x')
+			y, y_py, y_ptr = self.register_vector(lib, m, 'y')
+
+			for index_type in (np.int32, np.int64):
+				A_sp = csr_matrix(self.A_test_sparse)
+				A_sp.indptr = A_sp.indptr.astype(index_type)
+				A_sp.indices = A_sp.indices.astype(index_type)
+
+				objectives = []
+				for width in (None, 0, 16, 32):
+					A = SparseOperator(lib, A_sp, index_width=width)
+					self.assertEqual( A.index64, index_type == np.int64 )
+					o = A.c_ptr
+
+					x_py[:] = x_rand
+					self.assertCall( lib.vector_memcpy_va(x, x_ptr, 1) )
+					self.assertCall( o.contents.apply(o.contents.data, x, y) )
+					self.assertCall( lib.vector_memcpy_av(y_ptr, y, 1) )
+					self.assertVecEqual( A_sp * x_rand, y_py, ATOLM, RTOL )
+
+					y_py[:] = y_rand
+					self.assertCall( lib.vector_memcpy_va(y, y_ptr, 1) )
+					self.assertCall( o.contents.adjoint(o.contents.data, y, x) )
+					self.assertCall( lib.vector_memcpy_av(x_ptr, x, 1) )
+					self.assertVecEqual( A_sp.T * y_rand, x_py, ATOLM, RTOL )
+
+					# y = 2Ax - y
+					self.assertCall( lib.vector_memcpy_va(x, x_ptr, 1) )
+					self.assertCall( o.contents.fused_apply(
+							o.contents.data, 2, x, -1, y) )
+					self.assertCall( lib.vector_memcpy_av(y_ptr, y, 1) )
+					self.assertVecEqual( 2 * A_sp * x_py - y_rand, y_py,
+										 2 * ATOLM, RTOL )
+
+					# the index stays valid as equilibration rescales values
+					solver = lib.pogs_init(o, 0, 1.)
+					self.register_solver('solver', solver, lib.pogs_finish)
+					output, info, settings = self.gen_pogs_params(lib, m, n)
+					self.assertCall( lib.pogs_solve(solver, f, g, settings,
+													info, output.ptr) )
+					self.assertTrue( info.converged )
+					objectives.append(info.obj)
+					self.free_var('solver')
+					A.free()
+
+				for obj in objectives[1:]:
+					self.assertScalarEqual( obj, objectives[0], 10 * RTOL )
+
+			# views store no adjoint copy and cannot be compressed
+			A_sp = csr_matrix(self.A_test_sparse.astype(lib.pyfloat))
+			o = lib.pogs_sparse_operator_view(
+					A_sp.data.ctypes.data_as(lib.ok_float_p),
+					A_sp.indices.ctypes.data_as(lib.ok_int_p),
+					A_sp.indptr.ctypes.data_as(lib.ok_int_p), m, n,
+					A_sp.nnz, lib.enums.CblasRowMajor)
+			self.register_var('o', o, lib.pogs_sparse_operator_free)
+			self.assertEqual( lib.sparse_operator_compress_index(o, 0),
+							  lib.enums.OPTKIT_ERROR_LAYOUT_MISMATCH )
+
+			self.free_vars('o', 'x', 'y', 'f', 'g')
+			self.assertCall( lib.ok_device_reset() )
+
+	def test_structured_operator_pogs(self):
+		"""abstract operator pogs: matrix-free operator setup"""
+		m, n = self.shape
+		c = np.random.rand(m)
+		r = np.random.rand(n)
+		r[0] = c[0]
+		x_rand = np.random.rand(n)
+
+		for (gpu, single_precision) in self.CONDITIONS:
+			lib = self.libs.get(single_precision=single_precision, gpu=gpu)
+			if lib is None:
+				continue
+			self.register_exit(lib.ok_device_reset)
+
+			DIGITS = 7 - 2 * single_precision - 1 * gpu
+			RTOL = 10**(-DIGITS)
+			ATOLM = RTOL * m**0.5
+
+			c_ = c.astype(lib.pyfloat)
+			r_ = r.astype(lib.pyfloat)
+			o = lib.toeplitz_operator_alloc(c_.ctypes.data_as(lib.ok_float_p),
+											m, r_.ctypes.data_as(
+											lib.ok_float_p), n)
+			self.register_var('o', o.contents.data, o.contents.free)
+
+			solver = lib.pogs_init(o, 0, 1.)
+			self.register_solver('solver', solver, lib.pogs_finish)
+			W = solver.contents.W.contents
+			self.assertEqual( W.equilibrated, 1 )
+			self.assertEqual( W.normalized, 1 )
+			self.assertTrue( W.normA > 0 )
+
+			# operator normalized in place, A_equil = A / normA
+			x, x_py, x_ptr = self.register_vector(lib, n, 'x')
+			y, y_py, y_ptr = self.register_vector(lib, m, 'y')
+			x_py[:] = x_rand
+			self.assertCall( lib.vector_memcpy_va(x, x_ptr, 1) )
+			self.assertCall( o.contents.apply(o.contents.data, x, y) )
+			self.assertCall( lib.vector_memcpy_av(y_ptr, y, 1) )
+			self.assertVecEqual( toeplitz(c_, r_).dot(x_rand) / W.normA,
+								 y_py, ATOLM, RTOL )
+
+			self.free_vars('solver', 'o', 'x', 'y')
+			self.assertCall( lib.ok_device_reset() )
+
 	def test_pogs_init_finish(self):
 		for (gpu, single_precision) in self.CONDITIONS:
 			lib = self.libs.get(single_precision=single_precision, gpu=gpu)
@@ -428,6 +638,8 @@ class PogsAbstractTestCases(OptkitCPogsTestCase, OptkitCOperatorTestCase):
 						self.assertCall( lib.pogs_solve(solver, f, g, settings,
 														info, output.ptr) )
 						self.free_vars('solver', 'o')
+						self.assert_pogs_profile(
+								info, direct=DIRECT and optype == 'dense')
 
 						if info.converged:
 							self.assert_pogs_convergence(
@@ -533,4 +745,53 @@ class PogsAbstractTestCases(OptkitCPogsTestCase, OptkitCOperatorTestCase):
 												   info, output)
 
 					self.free_vars('solver', 'o', 'f', 'g')
-					self.assertCall( lib.ok_device_reset() )
\ No newline at end of file
+					self.assertCall( lib.ok_device_reset() )
+
+	def test_pogs_infeasibility(self):
+		"""abstract operator pogs: infeasibility with indirect projector
+
+			with inexact projections, a primal infeasibility certificate
+			is reported only once its direction is orthogonal (to within
+			tolerance) to the subspace {y = Ax}
+		"""
+		# tall A: b is almost surely outside A * [0, 1]^n
+		m, n = 100, 50
+		A_py = np.random.randn(m, n)
+		b = np.random.randn(m)
+
+		for (gpu, single_precision) in self.CONDITIONS:
+			lib = self.libs.get(single_precision=single_precision, gpu=gpu)
+			if lib is None:
+				continue
+			self.register_exit(lib.ok_device_reset)
+
+			A_ = A_py.astype(lib.pyfloat)
+			o = lib.pogs_dense_operator_gen(A_.ctypes.data_as(lib.ok_float_p),
+											m, n, lib.enums.CblasRowMajor)
+			self.register_var('o', o.contents.data, o.contents.free)
+
+			# infeasible: y = Ax = b, 0 <= x <= 1
+			f, f_py, f_ptr = self.register_fnvector(lib, m, 'f')
+			g, g_py, g_ptr = self.register_fnvector(lib, n, 'g')
+			f_py['h'] = lib.function_enums.IndEq0
+			f_py['b'] = b
+			g_py['h'] = lib.function_enums.IndBox01
+			for fn in (f_py, g_py):
+				fn['a'] = 1
+				fn['c'] = 1
+			self.assertCall( lib.function_vector_memcpy_va(f, f_ptr) )
+			self.assertCall( lib.function_vector_memcpy_va(g, g_ptr) )
+
+			DIRECT = 0
+			solver = lib.pogs_init(o, DIRECT, 1.)
+			self.register_solver('solver', solver, lib.pogs_finish)
+			output, info, settings = self.gen_pogs_params(lib, m, n)
+
+			self.assertCall( lib.pogs_solve(solver, f, g, settings, info,
+											output.ptr) )
+			self.assertEqual( info.status, lib.enums.OkPogsPrimalInfeasible )
+			self.assertFalse( info.converged )
+			self.assertTrue( info.k < settings.maxiter )
+
+			self.free_vars('solver', 'o', 'f', 'g')
+			self.assertCall( lib.ok_device_reset() )
@@ -72,10 +72,10 @@ class ConjugateGradientLibsTestCase(OptkitCOperatorTestCase):
 
 			h = lib.cgls_helper_alloc(self.shape[0], self.shape[1])
 			self.register_var('h', h, lib.cgls_helper_free)
-			self.assertTrue( isinstance(h.contents.p, lib.vector_p) )
-			self.assertTrue( isinstance(h.contents.q, lib.vector_p) )
-			self.assertTrue( isinstance(h.contents.r, lib.vector_p) )
-			self.assertTrue( isinstance(h.contents.s, lib.vector_p) )
+			self.assertTrue( isinstance(h.contents.p, lib.vector) )
+			self.assertTrue( isinstance(h.contents.q, lib.vector) )
+			self.assertTrue( isinstance(h.contents.r, lib.vector) )
+			self.assertTrue( isinstance(h.contents.s, lib.vector) )
 			self.assertCall( lib.cgls_helper_free(h) )
 			self.unregister_var('h')
 
@@ -133,6 +133,75 @@ class ConjugateGradientLibsTestCase(OptkitCOperatorTestCase):
 				self.free_vars('o', 'A', 'h', 'x', 'b')
 				self.assertCall( lib.ok_device_reset() )
 
+	def test_cgls_iterates(self):
+		"""
+		cgls iterates match the unfused CGLS recurrence
+
+		from x = 0, k iterations of cgls_nonallocating should reproduce
+		x_k of the reference below, which computes each inner product and
+		norm in a separate pass
+		"""
+		m, n = self.shape
+		rho = 1.
+		iters = 8
+
+		# well-conditioned data, so that rounding differences between the
+		# fused and unfused sequences stay at the level of machine precision
+		A_py = np.random.randn(m, n) / n**0.5
+
+		def cgls_reference(A, b, rho, k):
+			x = np.zeros(A.shape[1])
+			r = b.copy()
+			s = A.T.dot(r)
+			p = s.copy()
+			gamma = s.dot(s)
+			for _ in xrange(k):
+				q = A.dot(p)
+				alpha = gamma / (q.dot(q) + rho * p.dot(p))
+				x += alpha * p
+				r -= alpha * q
+				s = A.T.dot(r) - rho * x
+				gamma_prev, gamma = gamma, s.dot(s)
+				p = s + (gamma / gamma_prev) * p
+			return x
+
+		for (gpu, single_precision) in self.CONDITIONS:
+			lib = self.libs.get(single_precision=single_precision, gpu=gpu)
+			if lib is None:
+				continue
+			self.register_exit(lib.ok_device_reset)
+
+			RTOL = 10**(-5 + 3 * single_precision)
+			ATOLN = RTOL * n**0.5
+
+			for op_ in self.op_keys:
+				x, x_, x_ptr = self.register_vector(lib, n, 'x')
+				b, b_, b_ptr = self.register_vector(lib, m, 'b')
+				b_ += np.random.randn(m)
+				self.assertCall( lib.vector_memcpy_va(b, b_ptr, 1) )
+				if op_ == 'dense':
+					A_, A, o = self.register_dense_operator(lib, A_py)
+				else:
+					A_, A, o = self.register_sparse_operator(lib, A_py)
+				h = lib.cgls_helper_alloc(m, n)
+				self.register_var('h', h, lib.cgls_helper_free)
+
+				flag = np.zeros(1).astype(c_uint)
+				flag_p = flag.ctypes.data_as(POINTER(c_uint))
+				for k in xrange(1, iters + 1):
+					self.assertCall( lib.vector_scale(x, 0) )
+					self.assertCall( lib.cgls_nonallocating(
+							h, o, b, x, rho, 1e-15, k, CG_QUIET, flag_p) )
+					self.assertEqual( h.contents.iters, k )
+					self.assertCall( lib.vector_memcpy_av(x_ptr, x, 1) )
+					x_ref = cgls_reference(A_, b_, rho, k)
+					self.assertVecEqual( x_, x_ref, ATOLN, RTOL )
+					self.assertScalarEqual( h.contents.norm_x,
+											np.linalg.norm(x_ref), RTOL )
+
+				self.free_vars('o', 'A', 'h', 'x', 'b')
+				self.assertCall( lib.ok_device_reset() )
+
 	def test_cgls_allocating(self):
 		tol = self.tol_cg
 		maxiter = self.maxiter_cg
@@ -238,11 +307,11 @@ class ConjugateGradientLibsTestCase(OptkitCOperatorTestCase):
 
 			h = lib.pcg_helper_alloc(self.shape[0], self.shape[1])
 			self.register_var('h', h, lib.pcg_helper_free)
-			self.assertTrue( isinstance(h.contents.p, lib.vector_p) )
-			self.assertTrue( isinstance(h.contents.q, lib.vector_p) )
-			self.assertTrue( isinstance(h.contents.r, lib.vector_p) )
-			self.assertTrue( isinstance(h.contents.z, lib.vector_p) )
-			self.assertTrue( isinstance(h.contents.temp, lib.vector_p) )
+			self.assertTrue( isinstance(h.contents.p, lib.vector) )
+			self.assertTrue( isinstance(h.contents.q, lib.vector) )
+			self.assertTrue( isinstance(h.contents.r, lib.vector) )
+			self.assertTrue( isinstance(h.contents.z, lib.vector) )
+			self.assertTrue( isinstance(h.contents.temp, lib.vector) )
 			self.assertCall( lib.pcg_helper_free(h) )
 			self.unregister_var('h')
 
@@ -350,6 +419,73 @@ class ConjugateGradientLibsTestCase(OptkitCOperatorTestCase):
 				self.free_vars('p', 'p_vec', 'o', 'A', 'h', 'x', 'b')
 				self.assertCall( lib.ok_device_reset() )
 
+	def test_pcg_iterates(self):
+		"""
+		pcg iterates match the unfused PCG recurrence
+
+		k iterations of pcg_nonallocating from a fresh helper (x = 0)
+		should reproduce x_k of the reference below, which computes each
+		inner product and update in a separate pass
+		"""
+		m, n = self.shape
+		iters = 8
+		A_py = np.random.randn(m, n) / n**0.5
+
+		def pcg_reference(T, M, b, k):
+			x = np.zeros(T.shape[1])
+			r = b.copy()
+			p = M * r
+			gamma = r.dot(p)
+			for _ in xrange(k):
+				q = T.dot(p)
+				alpha = gamma / p.dot(q)
+				x += alpha * p
+				r -= alpha * q
+				z = M * r
+				gamma_prev, gamma = gamma, r.dot(z)
+				p = z + (gamma / gamma_prev) * p
+			return x
+
+		for (gpu, single_precision) in self.CONDITIONS:
+			lib = self.libs.get(single_precision=single_precision, gpu=gpu)
+			if lib is None:
+				continue
+			self.register_exit(lib.ok_device_reset)
+
+			RTOL = 10**(-5 + 3 * single_precision)
+			ATOLN = RTOL * n**0.5
+			RHO = 1.
+
+			for op_ in self.op_keys:
+				x, x_, x_ptr = self.register_vector(lib, n, 'x')
+				b, b_, b_ptr = self.register_vector(lib, n, 'b')
+				b_ += np.random.randn(n)
+				self.assertCall( lib.vector_memcpy_va(b, b_ptr, 1) )
+
+				if op_ == 'dense':
+					A_, A, o = self.register_dense_operator(lib, A_py)
+				else:
+					A_, A, o = self.register_sparse_operator(lib, A_py)
+				T = RHO * np.eye(n) + A_.T.dot(A_)
+				M, p_vec, p = self.register_preconditioning_operator(lib, T,
+																	 RHO)
+
+				iter_ = np.zeros(1).astype(c_uint)
+				iter_p = iter_.ctypes.data_as(POINTER(c_uint))
+				for k in xrange(1, iters + 1):
+					h = lib.pcg_helper_alloc(m, n)
+					self.register_var('h', h, lib.pcg_helper_free)
+					self.assertCall( lib.pcg_nonallocating(
+							h, o, p, b, x, RHO, 0, k, CG_QUIET, iter_p) )
+					self.assertEqual( iter_[0], k )
+					self.assertCall( lib.vector_memcpy_av(x_ptr, x, 1) )
+					self.assertVecEqual( x_, pcg_reference(T, M, b_, k), ATOLN,
+										 RTOL )
+					self.free_var('h')
+
+				self.free_vars('p', 'p_vec', 'o', 'A', 'x', 'b')
+				self.assertCall( lib.ok_device_reset() )
+
 	def test_pcg_nonallocating_warmstart(self):
 		"""TODO: DOCSTRING"""
 		tol = self.tol_cg
@@ -512,4 +648,184 @@ class ConjugateGradientLibsTestCase(OptkitCOperatorTestCase):
 				self.assertTrue(iters2 <= iters1)
 
 				self.free_vars('work', 'h', 'p', 'p_vec', 'o', 'A', 'x', 'b')
-				self.assertCall( lib.ok_device_reset() )
\ No newline at end of file
+				self.assertCall( lib.ok_device_reset() )
+
+	def test_block_cgls_helper_alloc_free(self):
+		m, n = self.shape
+		nrhs = 4
+
+		for (gpu, single_precision) in self.CONDITIONS:
+			lib = self.libs.get(single_precision=single_precision, gpu=gpu)
+			if lib is None:
+				continue
+
+			h = lib.block_cgls_helper_alloc(m, n, nrhs)
+			self.register_var('h', h, lib.block_cgls_helper_free)
+			self.assertEqual( h.contents.nrhs, nrhs )
+			for M in (h.contents.P, h.contents.Q, h.contents.R, h.contents.S):
+				self.assertTrue( isinstance(M, lib.matrix) )
+				self.assertEqual( M.size2, nrhs )
+				self.assertEqual( M.order, lib.enums.CblasColMajor )
+			self.assertEqual( h.contents.P.size1, n )
+			self.assertEqual( h.contents.Q.size1, m )
+			self.assertCall( lib.block_cgls_helper_free(h) )
+			self.unregister_var('h')
+
+	def test_block_cgls(self):
+		"""
+		block_cgls test
+
+		given operator A, column-major matrix B with columns b_j and scalar
+		rho, block CGLS solves
+
+			min. ||Ax_j - b_j||_2^2 + rho ||x_j||_2^2
+
+		for every column at once; each column should match the solution
+		of its regularized normal equations, a zero right-hand side should
+		drop out before the first iteration, and sharing the products by A
+		and A' should take fewer operator applications than solving the
+		columns one at a time
+		"""
+		m, n = self.shape
+		nrhs = 4
+		rho = 1.
+		maxiter = self.maxiter_cg
+
+		A_py = np.random.randn(m, n) / n**0.5
+
+		for (gpu, single_precision) in self.CONDITIONS:
+			lib = self.libs.get(single_precision=single_precision, gpu=gpu)
+			if lib is None:
+				continue
+			self.register_exit(lib.ok_device_reset)
+
+			TOL = 1e-10 * 10**(5 * single_precision)
+			RTOL = 10**(-5 + 3 * single_precision)
+			ATOLN = RTOL * n**0.5
+			order = lib.enums.CblasColMajor
+
+			for op_ in self.op_keys:
+				print "test block cgls, operator type:", op_
+				X, X_, X_ptr = self.register_matrix(lib, n, nrhs, order, 'X')
+				B, B_, B_ptr = self.register_matrix(lib, m, nrhs, order, 'B')
+				B_ += np.random.randn(m, nrhs)
+				B_[:, 1] = 0
+				self.assertCall( lib.matrix_memcpy_ma(B, B_ptr, order) )
+
+				if op_ == 'dense':
+					A_, A, o = self.register_dense_operator(lib, A_py)
+				else:
+					A_, A, o = self.register_sparse_operator(lib, A_py)
+
+				h = lib.block_cgls_helper_alloc(m, n, nrhs)
+				self.register_var('h', h, lib.block_cgls_helper_free)
+
+				flag = np.zeros(nrhs).astype(c_uint)
+				flag_p = flag.ctypes.data_as(POINTER(c_uint))
+				self.assertCall( lib.block_cgls_nonallocating(
+						h, o, B, X, rho, TOL, maxiter, CG_QUIET, flag_p) )
+				self.assertCall( lib.matrix_memcpy_am(X_ptr, X, order) )
+
+				T = rho * np.eye(n) + A_.T.dot(A_)
+				products = 0
+				for j in xrange(nrhs):
+					x_ref = np.linalg.solve(T, A_.T.dot(B_[:, j]))
+					self.assertVecEqual( X_[:, j], x_ref, ATOLN, RTOL )
+					products += 1 + 2 * h.contents.iters[j]
+
+				self.assertEqual( flag[1], 1 )
+				self.assertEqual( h.contents.iters[1], 0 )
+				for j in (0, 2, 3):
+					self.assertEqual( flag[j], 0 )
+					self.assertTrue( h.contents.iters[j] > 0 )
+				self.assertTrue( h.contents.products < products )
+
+				self.free_vars('h', 'o', 'A', 'X', 'B')
+				self.assertCall( lib.ok_device_reset() )
+
+	def test_block_pcg_helper_alloc_free(self):
+		m, n = self.shape
+		nrhs = 4
+
+		for (gpu, single_precision) in self.CONDITIONS:
+			lib = self.libs.get(single_precision=single_precision, gpu=gpu)
+			if lib is None:
+				continue
+
+			h = lib.block_pcg_helper_alloc(m, n, nrhs)
+			self.register_var('h', h, lib.block_pcg_helper_free)
+			self.assertEqual( h.contents.nrhs, nrhs )
+			for M in (h.contents.P, h.contents.Q, h.contents.R, h.contents.Z,
+					  h.contents.temp):
+				self.assertTrue( isinstance(M, lib.matrix) )
+				self.assertEqual( M.size2, nrhs )
+				self.assertEqual( M.order, lib.enums.CblasColMajor )
+			self.assertEqual( h.contents.temp.size1, m )
+			self.assertCall( lib.block_pcg_helper_free(h) )
+			self.unregister_var('h')
+
+	def test_block_pcg(self):
+		"""
+		block_pcg test
+
+		given operator A, preconditioner M, column-major matrix B and
+		scalar rho, block PCG solves
+
+			(rho I + A'A) x_j = b_j
+
+		for every column at once, with the same checks as test_block_cgls
+		"""
+		m, n = self.shape
+		nrhs = 4
+		rho = 1.
+		maxiter = self.maxiter_cg
+
+		A_py = np.random.randn(m, n) / n**0.5
+		T = rho * np.eye(n) + A_py.T.dot(A_py)
+
+		for (gpu, single_precision) in self.CONDITIONS:
+			lib = self.libs.get(single_precision=single_precision, gpu=gpu)
+			if lib is None:
+				continue
+			self.register_exit(lib.ok_device_reset)
+
+			TOL = 1e-10 * 10**(5 * single_precision)
+			RTOL = 10**(-5 + 3 * single_precision)
+			ATOLN = RTOL * n**0.5
+			order = lib.enums.CblasColMajor
+
+			for op_ in self.op_keys:
+				print "test block pcg, operator type:", op_
+				X, X_, X_ptr = self.register_matrix(lib, n, nrhs, order, 'X')
+				B, B_, B_ptr = self.register_matrix(lib, n, nrhs, order, 'B')
+				B_ += np.random.randn(n, nrhs)
+				B_[:, 1] = 0
+				self.assertCall( lib.matrix_memcpy_ma(B, B_ptr, order) )
+
+				if op_ == 'dense':
+					A_, A, o = self.register_dense_operator(lib, A_py)
+				else:
+					A_, A, o = self.register_sparse_operator(lib, A_py)
+				p_py, p_vec, p = self.register_preconditioning_operator(
+						lib, T, rho)
+
+				h = lib.block_pcg_helper_alloc(m, n, nrhs)
+				self.register_var('h', h, lib.block_pcg_helper_free)
+
+				iters = np.zeros(nrhs).astype(c_uint)
+				iters_p = iters.ctypes.data_as(POINTER(c_uint))
+				self.assertCall( lib.block_pcg_nonallocating(
+						h, o, p, B, X, rho, TOL, maxiter, CG_QUIET, iters_p) )
+				self.assertCall( lib.matrix_memcpy_am(X_ptr, X, order) )
+
+				for j in xrange(nrhs):
+					self.assertVecEqual( T.dot(X_[:, j]), B_[:, j], ATOLN,
+										 RTOL )
+
+				self.assertEqual( iters[1], 0 )
+				for j in (0, 2, 3):
+					self.assertTrue( 0 < iters[j] < maxiter )
+				self.assertTrue( h.contents.products < 2 * sum(iters) )
+
+				self.free_vars('h', 'p', 'p_vec', 'o', 'A', 'X', 'B')
+				self.assertCall( lib.ok_device_reset() )
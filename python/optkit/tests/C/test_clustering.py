@@ -243,6 +243,7 @@ class ClusterLibsTestCase(OptkitCTestCase):
 			self.assertCall( lib.indvector_memcpy_av(usub_ptr, usub.vec, 1) )
 			self.assertTrue( usub.size1 == msub )
 			self.assertTrue( usub.size2 == k )
+			self.assertTrue( usub.stride == u.stride )
 			self.assertTrue( sum(usub_py - u_py[offset : offset + msub]) == 0 )
 
 			self.assertCall( lib.upsamplingvec_subvector(usub, u, offset, msub,
@@ -369,6 +370,17 @@ class ClusterLibsTestCase(OptkitCTestCase):
 			self.assertCall( lib.vector_memcpy_av(nvec_ptr, nvec, 1) )
 			self.assertVecEqual( nvec_py, result_py, ATOLN, RTOL)
 
+			# transpose products are gathered per output row: repeated
+			# calls must agree exactly, regardless of thread count
+			self.assertCall( lib.upsamplingvec_mul_matrix(
+					hdl, T, N, N, alpha, u, A, 0, C) )
+			self.assertCall( lib.matrix_memcpy_am(C_ptr, C, rowmajor) )
+			C_first = np.copy(C_py)
+			self.assertCall( lib.upsamplingvec_mul_matrix(
+					hdl, T, N, N, alpha, u, A, 0, C) )
+			self.assertCall( lib.matrix_memcpy_am(C_ptr, C, rowmajor) )
+			self.assertTrue( np.array_equal(C_py, C_first) )
+
 			# reject: dimension mismatch
 			print '\nexpect dimension mismatch error:'
 			err = lib.upsamplingvec_mul_matrix(
@@ -441,15 +453,26 @@ class ClusterLibsTestCase(OptkitCTestCase):
 			self.assertEqual( h.d_min.size, m )
 			self.assertEqual( h.c_squared_full.size, k )
 			self.assertEqual( h.c_squared.size, k )
+			self.assertTrue( 0 < h.tile_size <= m )
+			self.assertTrue( 0 < h.tile_slots )
+			self.assertTrue( (h.tile_slots - 1) * h.tile_size < m )
 			self.assertEqual( h.D_full.size1, k )
-			self.assertEqual( h.D_full.size2, m )
+			self.assertEqual( h.D_full.size2, h.tile_size * h.tile_slots )
 			self.assertEqual( h.D.size1, k )
-			self.assertEqual( h.D.size2, m )
+			self.assertEqual( h.D.size2, h.D_full.size2 )
 			self.assertEqual( h.reassigned, 0 )
 
 			self.assertCall( lib.cluster_aid_free(h) )
 			self.unregister_var('h')
 
+			# many clusters: tiles no narrower than OK_CLUSTER_TILE_MIN
+			self.assertCall( lib.cluster_aid_alloc(h, m, 4096,
+							 		lib.enums.CblasRowMajor) )
+			self.register_var('h', h, lib.cluster_aid_free)
+			self.assertEqual( h.tile_size, min(m, 256) )
+			self.assertCall( lib.cluster_aid_free(h) )
+			self.unregister_var('h')
+
 			self.assertEqual( h.a2c_tentative_full.size1, 0 )
 			self.assertEqual( h.a2c_tentative_full.size2, 0 )
 			self.assertEqual( h.d_min_full.size, 0 )
@@ -617,9 +640,13 @@ class ClusterLibsTestCase(OptkitCTestCase):
 
 			let D be the matrix of pairwise distances and dmin be the
 			column-wise minima of D:
-				-compare D * xrand in Python vs. C
+				-compare D * xrand in Python vs. C, for the last tile
+				 of distances formed in C
 				-compare dmin in Python vs. C
 
+			repeat with the default tile size and a tile size that
+			does not divide the number of vectors
+
 		"""
 		m, n = self.shape
 		k = self.k
@@ -630,7 +657,7 @@ class ClusterLibsTestCase(OptkitCTestCase):
 				continue
 			self.register_exit(lib.ok_device_reset)
 
-			for MAXDIST in [1e3, 0.2]:
+			for MAXDIST, TILE in [(1e3, 0), (0.2, 0), (1e3, 64), (0.2, 64)]:
 
 				DIGITS = 7 - 2 * single_precision - 1 * gpu
 				RTOL = 10**(-DIGITS)
@@ -655,6 +682,10 @@ class ClusterLibsTestCase(OptkitCTestCase):
 				D, dmin, reassigned = self.cluster(A_py, C_py, a2c_py, MAXDIST)
 
 				h = self.register_cluster_aid(lib, m, k, orderA, 'h')
+				if TILE:
+					# TILE-wide tile buffers carved from D: parallel tiles
+					h.tile_size = TILE
+					h.tile_slots = h.D_full.size2 / TILE
 				self.assertCall( lib.cluster(A, C, a2c, h, MAXDIST) )
 
 				# compare number of reassignments, C vs Py
@@ -667,18 +698,26 @@ class ClusterLibsTestCase(OptkitCTestCase):
 				self.assertCall( lib.indvector_memcpy_av(a2c_ptr, a2c.vec, 1) )
 				self.assertEqual( h.reassigned, sum(a2c_py != a2c_orig) )
 
-				# verify all distances
-				mvec, mvec_py, mvec_ptr = self.register_vector(lib, m, 'mvec')
+				# verify distances in last tile, held in buffer (slot)
+				# n_tiles - 1 mod n_slots
+				tile = h.tile_size
+				offset = tile * ((m - 1) / tile)
+				n_tiles = (m + tile - 1) / tile
+				n_slots = min(h.D.size2 / tile, h.tile_slots, n_tiles)
+				slot = (n_tiles - 1) % n_slots
+				mvec, mvec_py, mvec_ptr = self.register_vector(
+						lib, h.D_full.size2, 'mvec')
 				kvec, kvec_py, kvec_ptr = self.register_vector(lib, k, 'kvec')
 
-				mvec_py += np.random.rand(m)
+				mvec_py[slot * tile:slot * tile + m - offset] += np.random.rand(
+						m - offset)
 
 				self.assertCall( lib.vector_memcpy_va(mvec, mvec_ptr, 1) )
 				self.assertCall( lib.blas_gemv(hdl, lib.enums.CblasNoTrans, 1,
 							   				   h.D_full, mvec, 0, kvec) )
 				self.assertCall( lib.vector_memcpy_av(kvec_ptr, kvec, 1) )
 
-				Dmvec = D.dot(mvec_py)
+				Dmvec = D[:, offset:].dot(mvec_py[:m - offset])
 				self.assertVecEqual( Dmvec, kvec_py, ATOLK, RTOL)
 
 				# verify min distances
@@ -693,6 +732,84 @@ class ClusterLibsTestCase(OptkitCTestCase):
 				self.free_vars('A', 'C', 'a2c', 'mvec', 'kvec', 'hdl')
 				self.assertCall( lib.ok_device_reset() )
 
+	def test_cluster_kdtree(self):
+		""" cluster with nearest centroid search in a k-d tree
+
+			for low-dimensional vectors and many centroids, the
+			automatic search mode uses the k-d tree; tentative
+			assignments match a brute force search and the dense search,
+			with fewer distance evaluations
+		"""
+		m = self.shape[0]
+		n = 3
+		k = 300
+
+		for (gpu, single_precision) in self.CONDITIONS:
+			lib = self.libs.get(single_precision=single_precision, gpu=gpu)
+			if lib is None:
+				continue
+			self.register_exit(lib.ok_device_reset)
+
+			# GPU: automatic search mode always uses the dense search
+			self.assertEqual( lib.cluster_kdtree_favored(n, k), not gpu )
+			self.assertFalse( lib.cluster_kdtree_favored(self.shape[1], k) )
+			self.assertFalse( lib.cluster_kdtree_favored(n, 16) )
+			if gpu:
+				continue
+
+			for orderA in (lib.enums.CblasRowMajor, lib.enums.CblasColMajor):
+				orderC = orderA
+				A, A_py, A_ptr = self.register_matrix(lib, m, n, orderA, 'A',
+													  random=True)
+				C, C_py, C_ptr = self.register_matrix(lib, k, n, orderC, 'C',
+													  random=True)
+				a2c, a2c_py, a2c_ptr = self.register_upsamplingvec(
+						lib, m, k, 'a2c', random=True)
+
+				D = ((A_py.reshape((m, 1, n)) -
+					  C_py.reshape((1, k, n)))**2).sum(axis=2)
+				nearest = D.argmin(axis=1)
+
+				a2c_by_search = {}
+				for search in (lib.enums.OkClusterSearchAuto,
+							   lib.enums.OkClusterSearchDense):
+					h = self.register_cluster_aid(lib, m, k, orderA, 'h')
+					h.search = search
+					self.assertCall( lib.cluster(A, C, a2c, h, 1e3) )
+					self.assertCall( lib.indvector_memcpy_av(
+							a2c_ptr, a2c.vec, 1) )
+					a2c_by_search[search] = np.copy(a2c_py)
+					if search == lib.enums.OkClusterSearchAuto:
+						self.assertTrue( h.distance_evals < m * k / 4 )
+					else:
+						self.assertEqual( h.distance_evals, m * k )
+					self.assertCall( lib.cluster_aid_free(h) )
+					self.unregister_var('h')
+
+				a2c_kd = a2c_by_search[lib.enums.OkClusterSearchAuto]
+				a2c_dense = a2c_by_search[lib.enums.OkClusterSearchDense]
+				self.assertTrue( np.array_equal(a2c_kd, nearest) )
+				self.assertTrue( sum(a2c_kd != a2c_dense) <= 1 + m / 100 )
+
+				# tree built once, searched repeatedly
+				tree = c_void_p()
+				self.assertCall( lib.cluster_kdtree_alloc(byref(tree), C) )
+				self.register_var('tree', tree, lib.cluster_kdtree_free)
+				self.assertNotEqual( lib.cluster_kdtree_alloc(
+						byref(tree), C), 0 )
+				h = self.register_cluster_aid(lib, m, k, orderA, 'h')
+				for rep in xrange(2):
+					self.assertCall( lib.cluster_kdtree_search(
+							A, C, a2c, h, 1e3, tree) )
+					self.assertCall( lib.indvector_memcpy_av(
+							a2c_ptr, a2c.vec, 1) )
+					self.assertTrue( np.array_equal(a2c_py, nearest) )
+				self.assertCall( lib.cluster_aid_free(h) )
+				self.unregister_var('h')
+
+				self.free_vars('A', 'C', 'a2c', 'tree')
+			self.assertCall( lib.ok_device_reset() )
+
 	def test_calculate_centroids(self):
 		""" calculate centroids
 
@@ -802,10 +919,209 @@ class ClusterLibsTestCase(OptkitCTestCase):
 			self.assertCall( lib.k_means(A, C, a2c, counts, h, DIST_RELTOL,
 										 CHANGE_TOL, MAXITER, VERBOSE) )
 
+			# iteration count and phase timers
+			self.assertTrue( 0 < h.iters <= MAXITER )
+			self.assertTrue( h.assign_time > 0 )
+			self.assertTrue( h.update_time > 0 )
+
 			self.free_vars('h', 'A', 'C', 'a2c', 'counts', 'nvec', 'kvec',
 						   'hdl')
 			self.assertCall( lib.ok_device_reset() )
 
+	def test_kmeans_pruned(self):
+		""" pruned k-means
+
+			given matrix A, cluster # k, initial assignments a2c,
+
+			cluster A by Lloyd, Hamerly, and Elkan k-means from the
+			same starting point; compare the assignments and centroids
+			and report the distance evaluations saved by pruning
+		"""
+		m, n = self.shape
+		k = self.k
+
+		for (gpu, single_precision) in self.CONDITIONS:
+			lib = self.libs.get(single_precision=single_precision, gpu=gpu)
+			if lib is None:
+				continue
+			self.register_exit(lib.ok_device_reset)
+
+			DIGITS = 7 - 2 * single_precision - 1 * gpu
+			RTOL = 10**(-DIGITS)
+			ATOLKN = RTOL * (k * n)**0.5
+
+			DIST_RELTOL = 0.1
+			CHANGE_TOL = int(1 + 0.01 * m)
+			MAXITER = 500
+			VERBOSE = 0
+
+			orderA = orderC = lib.enums.CblasRowMajor
+			A_py = np.zeros((m, n)).astype(lib.pyfloat)
+			A_py += self.A_test
+			A_ptr = A_py.ctypes.data_as(lib.ok_float_p)
+			a2c_init = (k * np.random.rand(m)).astype(c_size_t)
+
+			results = {}
+			for algorithm in ('Lloyd', 'Hamerly', 'Elkan'):
+				A, _, _ = self.register_matrix(lib, m, n, orderA, 'A')
+				C, C_py, C_ptr = self.register_matrix(lib, k, n, orderC, 'C')
+				a2c, a2c_py, a2c_ptr = self.register_upsamplingvec(
+						lib, m, k, 'a2c')
+				counts, _, _ = self.register_vector(lib, k, 'counts')
+				h = self.register_cluster_aid(lib, m, k, orderA, 'h')
+
+				a2c_py += a2c_init
+				self.assertCall( lib.matrix_memcpy_ma(A, A_ptr, orderA) )
+				self.assertCall( lib.indvector_memcpy_va(a2c.vec, a2c_ptr, 1) )
+				self.assertCall( lib.k_means_pruned(
+						A, C, a2c, counts, h, DIST_RELTOL, CHANGE_TOL,
+						MAXITER, VERBOSE,
+						getattr(lib.enums, 'OkKmeans' + algorithm)) )
+
+				self.assertCall( lib.matrix_memcpy_am(C_ptr, C, orderC) )
+				self.assertCall( lib.indvector_memcpy_av(a2c_ptr, a2c.vec, 1) )
+				results[algorithm] = (a2c_py.copy(), C_py.copy(),
+									  h.distance_evals)
+
+				self.free_vars('h', 'A', 'C', 'a2c', 'counts')
+
+			a2c_lloyd, C_lloyd, evals_lloyd = results['Lloyd']
+			for algorithm in ('Hamerly', 'Elkan'):
+				a2c_pruned, C_pruned, evals = results[algorithm]
+				self.assertTrue( all(a2c_pruned == a2c_lloyd) )
+				self.assertVecEqual( C_pruned, C_lloyd, ATOLKN, RTOL )
+				if not gpu:
+					self.assertTrue( evals < evals_lloyd )
+				print '{}: {} of {} distance evaluations saved'.format(
+						algorithm, evals_lloyd - evals, evals_lloyd)
+
+			self.assertCall( lib.ok_device_reset() )
+
+	def test_kmeans_seed(self):
+		""" k-means++ and k-means|| seeding
+
+			given matrix A, cluster # k, seed,
+
+			seed centroids C with rows of A; verify that each vector is
+			assigned to its nearest seed, that draws are reproducible for
+			a fixed seed, and that the seeds cover most of the
+			(well-separated) clusters underlying A
+		"""
+		m, n = self.shape
+		k = self.k
+
+		for (gpu, single_precision) in self.CONDITIONS:
+			lib = self.libs.get(single_precision=single_precision, gpu=gpu)
+			if lib is None or gpu:
+				continue
+			self.register_exit(lib.ok_device_reset)
+
+			orderA = orderC = lib.enums.CblasRowMajor
+			A, A_py, A_ptr = self.register_matrix(lib, m, n, orderA, 'A')
+			C, C_py, C_ptr = self.register_matrix(lib, k, n, orderC, 'C')
+			a2c, a2c_py, a2c_ptr = self.register_upsamplingvec(
+					lib, m, k, 'a2c')
+
+			A_py += self.A_test
+			self.assertCall( lib.matrix_memcpy_ma(A, A_ptr, orderA) )
+
+			for init in (lib.enums.OkKmeansInitPlusPlus,
+						 lib.enums.OkKmeansInitParallel):
+				SEED = np.random.randint(2**31)
+				self.assertCall( lib.kmeans_seed(A, C, a2c, init, SEED) )
+				self.assertCall( lib.matrix_memcpy_am(C_ptr, C, orderC) )
+				self.assertCall( lib.indvector_memcpy_av(a2c_ptr, a2c.vec, 1) )
+				C_first = C_py.copy()
+				a2c_first = a2c_py.copy()
+
+				# seeds are rows of A
+				seeds = [int(np.abs(A_py - c).sum(1).argmin()) for c in C_py]
+				self.assertTrue( np.allclose(A_py[seeds, :], C_py) )
+
+				# seeds cover most clusters
+				self.assertTrue( len(set([s % k for s in seeds])) >= k / 2 )
+
+				# vectors assigned to nearest seed
+				D = ((A_py[:, None, :] - C_py[None, :, :])**2).sum(2)
+				self.assertTrue( all(D[xrange(m), a2c_py] <=
+									 D.min(1) * (1 + 1e-5)) )
+
+				# reproducible
+				self.assertCall( lib.kmeans_seed(A, C, a2c, init, SEED) )
+				self.assertCall( lib.matrix_memcpy_am(C_ptr, C, orderC) )
+				self.assertCall( lib.indvector_memcpy_av(a2c_ptr, a2c.vec, 1) )
+				self.assertTrue( all(C_py.ravel() == C_first.ravel()) )
+				self.assertTrue( all(a2c_py == a2c_first) )
+
+			self.free_vars('A', 'C', 'a2c')
+			self.assertCall( lib.ok_device_reset() )
+
+	def test_kmeans_minibatch_update(self):
+		""" mini-batch k-means update
+
+			given batch A, centroids C, counts,
+
+			assign each vector in A to its nearest centroid, and move
+			each centroid c_k towards the batch vectors assigned to it
+			with learning rate 1 / counts_k. compare Python vs. C
+		"""
+		m, n = self.shape
+		k = self.k
+
+		for (gpu, single_precision) in self.CONDITIONS:
+			lib = self.libs.get(single_precision=single_precision, gpu=gpu)
+			if lib is None:
+				continue
+			self.register_exit(lib.ok_device_reset)
+
+			DIGITS = 7 - 2 * single_precision - 1 * gpu
+			RTOL = 10**(-DIGITS)
+			ATOLKN = RTOL * (k * n)**0.5
+			ATOLK = RTOL * k**0.5
+
+			orderA = orderC = lib.enums.CblasRowMajor
+			A, A_py, A_ptr = self.register_matrix(lib, m, n, orderA, 'A')
+			C, C_py, C_ptr = self.register_matrix(lib, k, n, orderC, 'C')
+			S, _, _ = self.register_matrix(lib, k, n, orderC, 'S')
+			a2c, a2c_py, a2c_ptr = self.register_upsamplingvec(
+					lib, m, k, 'a2c')
+			counts, counts_py, counts_ptr = self.register_vector(
+					lib, k, 'counts')
+			counts_batch, _, _ = self.register_vector(lib, k, 'counts_batch')
+			h = self.register_cluster_aid(lib, m, k, orderA, 'h')
+
+			A_py += self.A_test
+			C_py += self.C_test + 0.1 * np.random.rand(k, n)
+			counts_py += (10 * np.random.rand(k)).astype(int)
+			self.assertCall( lib.matrix_memcpy_ma(A, A_ptr, orderA) )
+			self.assertCall( lib.matrix_memcpy_ma(C, C_ptr, orderC) )
+			self.assertCall( lib.vector_memcpy_va(counts, counts_ptr, 1) )
+
+			# Python: mini-batch update
+			D = ((A_py[:, None, :] - C_py[None, :, :])**2).sum(2)
+			a2c_expect = D.argmin(1)
+			b = np.bincount(a2c_expect, minlength=k)
+			counts_expect = counts_py + b
+			C_expect = C_py.copy()
+			for j in xrange(k):
+				if b[j] > 0:
+					C_expect[j, :] += (A_py[a2c_expect == j, :] -
+									   C_py[j, :]).sum(0) / counts_expect[j]
+
+			self.assertCall( lib.kmeans_minibatch_update(
+					A, C, a2c, counts, h, S, counts_batch) )
+			self.assertCall( lib.matrix_memcpy_am(C_ptr, C, orderC) )
+			self.assertCall( lib.vector_memcpy_av(counts_ptr, counts, 1) )
+			self.assertCall( lib.indvector_memcpy_av(a2c_ptr, a2c.vec, 1) )
+
+			self.assertTrue( all(a2c_py == a2c_expect) )
+			self.assertVecEqual( counts_py, counts_expect, ATOLK, RTOL )
+			self.assertVecEqual( C_py, C_expect, ATOLKN, RTOL )
+
+			self.free_vars('h', 'A', 'C', 'S', 'a2c', 'counts',
+						   'counts_batch')
+			self.assertCall( lib.ok_device_reset() )
+
 	def test_kmeans_easy_init_free(self):
 		m, n = self.shape
 		k = self.k
@@ -892,4 +1208,174 @@ class ClusterLibsTestCase(OptkitCTestCase):
 			self.assertCall( lib.kmeans_easy_run(work, settings, io) )
 
 			self.free_var('work')
-			self.assertCall( lib.ok_device_reset() )
\ No newline at end of file
+			self.assertCall( lib.ok_device_reset() )
+
+	def test_kmeans_compact(self):
+		""" drop empty clusters, relabel contiguously, count in C
+		"""
+		m, n = self.shape
+		k = self.k
+
+		for (gpu, single_precision) in self.CONDITIONS:
+			lib = self.libs.get(single_precision=single_precision, gpu=gpu)
+			if lib is None:
+				continue
+
+			for order in (lib.enums.CblasRowMajor, lib.enums.CblasColMajor):
+				C, C_ptr = self.gen_py_matrix(lib, k, n, order, random=True)
+				a2c, a2c_ptr = self.gen_py_upsamplingvec(lib, m, k,
+														 random=True)
+				counts, counts_ptr = self.gen_py_vector(lib, k)
+
+				# empty every third cluster
+				a2c[a2c % 3 == 1] -= 1
+				labels = np.unique(a2c)
+				k_nonempty = len(labels)
+				C_orig = np.copy(C)
+				a2c_orig = np.copy(a2c)
+				k_out = c_size_t()
+
+				self.assertCall( lib.kmeans_compact(C_ptr, order, k, n,
+													a2c_ptr, 1, m, counts_ptr,
+													1, byref(k_out)) )
+				self.assertEqual( k_out.value, k_nonempty )
+				self.assertTrue( np.array_equal(labels[a2c], a2c_orig) )
+				self.assertTrue( np.array_equal(C[:k_nonempty, :],
+												C_orig[labels, :]) )
+				self.assertTrue( np.all(C[k_nonempty:, :] == 0) )
+				self.assertTrue( np.array_equal(counts[:k_nonempty],
+						np.bincount(a2c.astype(int), minlength=k)[
+									:k_nonempty]) )
+				self.assertTrue( np.all(counts[k_nonempty:] == 0) )
+
+				# reject: out of bounds
+				a2c[0] = k
+				print '\nexpect out of bounds error:'
+				err = lib.kmeans_compact(C_ptr, order, k, n, a2c_ptr, 1, m,
+										 counts_ptr, 1, byref(k_out))
+				self.assertEqual( err, lib.enums.OPTKIT_ERROR_OUT_OF_BOUNDS )
+
+	def test_blockwise_kmeans(self):
+		""" parallel k-means over blocks matches block-by-block k-means
+		"""
+		m, n = self.shape
+		k = self.k
+		sizes = [m / 2, 0, m / 5, m - m / 2 - m / 5]
+		clusters = [k, 0, k / 2, k]
+		offsets = np.zeros(len(sizes) + 1, dtype=c_size_t)
+		offsets[1:] = np.cumsum(sizes)
+		coffsets = np.zeros(len(sizes) + 1, dtype=c_size_t)
+		coffsets[1:] = np.cumsum(clusters)
+
+		for (gpu, single_precision) in self.CONDITIONS:
+			lib = self.libs.get(single_precision=single_precision, gpu=gpu)
+			if lib is None:
+				continue
+			self.register_exit(lib.ok_device_reset)
+
+			orderA = orderC = lib.enums.CblasRowMajor
+			A, A_ptr = self.gen_py_matrix(lib, m, n, orderA)
+			C, C_ptr = self.gen_py_matrix(lib, coffsets[-1], n, orderC)
+			a2c, a2c_ptr = self.gen_py_upsamplingvec(lib, m, k)
+			counts, counts_ptr = self.gen_py_vector(lib, coffsets[-1])
+			n_clusters = np.zeros(len(sizes), dtype=c_size_t)
+			A += self.A_test
+			for b in xrange(len(sizes)):
+				if sizes[b] > 0:
+					a2c[offsets[b] : offsets[b + 1]] = (clusters[b] *
+							np.random.rand(sizes[b])).astype(c_size_t)
+			a2c_orig = np.copy(a2c)
+
+			settings = (lib.kmeans_settings * len(sizes))(*[
+					lib.kmeans_settings(0.1, int(1 + 0.01 * max(size, 1)),
+										100, 0, 0, 0, 0) for size in sizes])
+
+			self.assertCall( lib.blockwise_kmeans(len(sizes),
+					offsets.ctypes.data_as(lib.c_size_t_p),
+					coffsets.ctypes.data_as(lib.c_size_t_p), n, A_ptr, C_ptr,
+					a2c_ptr, counts_ptr,
+					n_clusters.ctypes.data_as(lib.c_size_t_p), settings) )
+			self.assertEqual( n_clusters[1], 0 )
+
+			work = lib.kmeans_easy_init(max(sizes), max(clusters), n)
+			self.register_var('work', work, lib.kmeans_easy_finish)
+			for b in [0, 2, 3]:
+				A_b, A_b_ptr = self.gen_py_matrix(lib, sizes[b], n, orderA)
+				C_b, C_b_ptr = self.gen_py_matrix(lib, clusters[b], n, orderC)
+				a2c_b, a2c_b_ptr = self.gen_py_upsamplingvec(
+						lib, sizes[b], clusters[b])
+				counts_b, counts_b_ptr = self.gen_py_vector(lib, clusters[b])
+				A_b += A[offsets[b] : offsets[b + 1]]
+				a2c_b += a2c_orig[offsets[b] : offsets[b + 1]]
+				io = lib.kmeans_io(A_b_ptr, C_b_ptr, counts_b_ptr, a2c_b_ptr,
+								   orderA, orderC, 1, 1)
+				k_b = c_size_t()
+				self.assertCall( lib.kmeans_easy_resize(work, sizes[b],
+														clusters[b], n) )
+				self.assertCall( lib.kmeans_easy_run(work, settings[b], io) )
+				self.assertCall( lib.kmeans_easy_compact(work, io,
+														 byref(k_b)) )
+
+				self.assertEqual( n_clusters[b], k_b.value )
+				self.assertTrue( np.array_equal(
+						a2c[offsets[b] : offsets[b + 1]], a2c_b) )
+				self.assertTrue( np.array_equal(
+						C[coffsets[b] : coffsets[b + 1]], C_b) )
+				self.assertTrue( np.array_equal(
+						counts[coffsets[b] : coffsets[b + 1]], counts_b) )
+
+			self.free_var('work')
+			self.assertCall( lib.ok_device_reset() )
+
+	def test_kmeans_predict_easy(self):
+		""" nearest centroid assignment with a fitted k-means model
+
+			centroids are loaded once; batches of vectors (of size at
+			most batch_size) are assigned to their nearest centroids,
+			for both dense and k-d tree searches; the k-d tree is built
+			once, with the centroids, and reused by every batch
+		"""
+		m, n = self.shape
+		batch_size = 1 + m / 3
+
+		for (gpu, single_precision) in self.CONDITIONS:
+			lib = self.libs.get(single_precision=single_precision, gpu=gpu)
+			if lib is None:
+				continue
+			self.register_exit(lib.ok_device_reset)
+
+			for (k, vec_length) in ((self.k, n), (300, 3)):
+				order = lib.enums.CblasRowMajor
+				A, A_ptr = self.gen_py_matrix(lib, m, vec_length, order,
+											  random=True)
+				C, C_ptr = self.gen_py_matrix(lib, k, vec_length, order,
+											  random=True)
+				a2c, a2c_ptr = self.gen_py_upsamplingvec(lib, m, k)
+
+				work = lib.kmeans_predict_easy_init(C_ptr, order, k,
+													vec_length, batch_size)
+				self.assertNotEqual( work, None )
+				self.register_var('work', work, lib.kmeans_predict_easy_finish)
+				w = cast(work, lib.kmeans_predict_work_p).contents
+				tree = w.kdtree
+				self.assertEqual( tree is not None,
+								  lib.cluster_kdtree_favored(vec_length, k) )
+
+				for offset in xrange(0, m, batch_size):
+					size = min(batch_size, m - offset)
+					self.assertCall( lib.kmeans_predict_easy_run(
+							work, A[offset:].ctypes.data_as(lib.ok_float_p),
+							order, size,
+							a2c[offset:].ctypes.data_as(lib.c_size_t_p), 1) )
+					self.assertEqual( w.kdtree, tree )
+
+				self.assertNotEqual( lib.kmeans_predict_easy_run(
+						work, A_ptr, order, batch_size + 1, a2c_ptr, 1), 0 )
+
+				D = ((A.reshape((m, 1, vec_length)) -
+					  C.reshape((1, k, vec_length)))**2).sum(axis=2)
+				nearest = D.argmin(axis=1)
+				self.assertTrue( sum(a2c != nearest) <= 1 + m / 100 )
+
+				self.free_var('work')
+			self.assertCall( lib.ok_device_reset() )
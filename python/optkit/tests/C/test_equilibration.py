@@ -192,15 +192,86 @@ class EquilLibsTestCase(OptkitCOperatorTestCase):
 				self.assertCall( lib.vector_memcpy_av(y_ptr, y, 1) )
 				A_eqx = y_py
 
-				# TODO: REPLACE THIS WITH THE REAL TEST BELOW
-				self.assertEqual(status, 1)
-
-				# REAL TEST:
-				# self.assertEqual( status, 0 )
-				# self.assertVecEqual( A_eqx, DAEx, ATOLN, RTOL )
+				self.assertEqual( status, 0 )
+				self.assertVecEqual( A_eqx, DAEx, ATOLN, RTOL )
 				self.free_vars('A', 'o', 'x', 'y', 'd', 'e', 'hdl')
 				self.assertCall( lib.ok_device_reset() )
 
+	def test_composite_operator_equil(self):
+		m, n = self.shape
+		m1 = m / 2
+
+		for (gpu, single_precision) in self.CONDITIONS:
+			lib = self.libs.get(single_precision=single_precision, gpu=gpu)
+			if lib is None:
+				continue
+			self.register_exit(lib.ok_device_reset)
+
+			DIGITS = 7 - 2 * single_precision - 2 * gpu
+			RTOL = 10**(-DIGITS)
+			ATOLM = RTOL * m**0.5
+
+			# badly scaled row blocks [A1; 100 * A2]
+			order = lib.enums.CblasRowMajor
+			A_py = np.copy(self.A_test)
+			A_py[m1:, :] *= 100
+			hdl = self.register_blas_handle(lib, 'hdl')
+			A1, A1_, A1_ptr = self.register_matrix(lib, m1, n, order, 'A1')
+			A1_ += A_py[:m1, :]
+			self.assertCall( lib.matrix_memcpy_ma(A1, A1_ptr, order) )
+			A2, A2_, A2_ptr = self.register_matrix(lib, m - m1, n, order,
+												   'A2')
+			A2_ += A_py[m1:, :]
+			self.assertCall( lib.matrix_memcpy_ma(A2, A2_ptr, order) )
+			op1 = lib.dense_operator_alloc(A1)
+			self.register_var('op1', op1.contents.data, op1.contents.free)
+			op2 = lib.dense_operator_alloc(A2)
+			self.register_var('op2', op2.contents.data, op2.contents.free)
+			o = lib.cat_operator_alloc((lib.operator_p * 2)(op1, op2), 2)
+			self.register_var('o', o.contents.data, o.contents.free)
+
+			x, x_py, x_ptr = self.register_vector(lib, n, 'x')
+			y, y_py, y_ptr = self.register_vector(lib, m, 'y')
+			d, d_py, d_ptr = self.register_vector(lib, m, 'd')
+			e, e_py, e_ptr = self.register_vector(lib, n, 'e')
+			x_py += self.x_test
+
+			self.assertCall( lib.operator_equilibrate(hdl, o, d, e, 1.) )
+			self.assertCall( lib.vector_memcpy_av(d_ptr, d, 1) )
+			self.assertCall( lib.vector_memcpy_av(e_ptr, e, 1) )
+
+			# blockwise-constant row scaling balances the blocks
+			self.assertTrue( np.allclose(d_py[:m1], d_py[0]) )
+			self.assertTrue( np.allclose(d_py[m1:], d_py[-1]) )
+			self.assertTrue( 50 < d_py[0] / d_py[-1] < 200 )
+			self.assertTrue( np.allclose(e_py, 1) )
+
+			self.assertCall( lib.vector_memcpy_va(x, x_ptr, 1) )
+			self.assertCall( o.contents.apply(o.contents.data, x, y) )
+			self.assertCall( lib.vector_memcpy_av(y_ptr, y, 1) )
+			DAEx = d_py * A_py.dot(e_py * self.x_test)
+			self.assertVecEqual( y_py, DAEx, ATOLM, RTOL )
+
+			# shared block [A1; A1]: each block scaled once, as recorded
+			o2 = lib.cat_operator_alloc((lib.operator_p * 2)(op1, op1), 2)
+			self.register_var('o2', o2.contents.data, o2.contents.free)
+			d2, d2_py, d2_ptr = self.register_vector(lib, 2 * m1, 'd2')
+			y2, y2_py, y2_ptr = self.register_vector(lib, 2 * m1, 'y2')
+			self.assertCall( lib.operator_equilibrate(hdl, o2, d2, e, 1.) )
+			self.assertCall( lib.vector_memcpy_av(d2_ptr, d2, 1) )
+			self.assertTrue( np.allclose(d2_py, d2_py[0]) )
+			self.assertTrue( np.allclose(d2_py[0], d_py[0], rtol=1e-2) )
+
+			self.assertCall( o2.contents.apply(o2.contents.data, x, y2) )
+			self.assertCall( lib.vector_memcpy_av(y2_ptr, y2, 1) )
+			A1x = A_py[:m1, :].dot(self.x_test)
+			DAEx = d2_py * np.hstack((A1x, A1x))
+			self.assertVecEqual( y2_py, DAEx, ATOLM, RTOL )
+
+			self.free_vars('o2', 'd2', 'y2', 'o', 'op1', 'op2', 'A1', 'A2',
+						   'x', 'y', 'd', 'e', 'hdl')
+			self.assertCall( lib.ok_device_reset() )
+
 	def test_operator_norm(self):
 		m, n = self.shape
 
@@ -1,5 +1,6 @@
 import os
 import numpy as np
+from threading import Thread, Event
 from ctypes import c_float, c_int, c_size_t, c_void_p, Structure, byref
 from optkit.libs.linsys import DenseLinsysLibs
 from optkit.tests.defs import OptkitTestCase
@@ -89,6 +90,110 @@ class DenseLibsTestCase(OptkitCTestCase):
 			if self.VERBOSE_TEST:
 				print("denselib version", version)
 
+	def test_threads_limit(self):
+		for (gpu, single_precision) in self.CONDITIONS:
+			lib = self.libs.get(single_precision=single_precision, gpu=gpu)
+			if lib is None:
+				continue
+
+			omp = lib.ok_get_max_threads()
+			blas = lib.ok_blas_get_num_threads()
+			self.assertTrue( omp >= 1 )
+			self.assertTrue( blas >= 0 )
+			self.assertNotEqual( lib.ok_set_num_threads(0), 0 )
+			self.assertNotEqual( lib.ok_blas_set_num_threads(-1), 0 )
+
+			# no-op limit
+			saved = lib.ok_threads()
+			self.assertCall( lib.ok_threads_limit(0, saved) )
+			self.assertEqual( (saved.omp, saved.blas), (0, 0) )
+			self.assertEqual( saved.blas_scope, 0 )
+			self.assertCall( lib.ok_threads_restore(saved) )
+
+			# limit to one thread, then restore
+			self.assertCall( lib.ok_threads_limit(1, saved) )
+			self.assertEqual( saved.omp, omp )
+			if saved.blas_scope == 2:
+				self.assertEqual( saved.blas, blas )
+			self.assertEqual( lib.ok_get_max_threads(), 1 )
+			if blas > 0:
+				self.assertEqual( lib.ok_blas_get_num_threads(), 1 )
+			self.assertCall( lib.ok_threads_restore(saved) )
+			self.assertEqual( lib.ok_get_max_threads(), omp )
+			self.assertEqual( lib.ok_blas_get_num_threads(), blas )
+
+	def test_threads_limit_concurrent(self):
+		""" overlapping limits from two threads restore the settings """
+		for (gpu, single_precision) in self.CONDITIONS:
+			lib = self.libs.get(single_precision=single_precision, gpu=gpu)
+			if lib is None:
+				continue
+
+			blas = lib.ok_blas_get_num_threads()
+			first_in, second_in, first_out = Event(), Event(), Event()
+			errors = []
+			omp_after = [None, None]
+			blas_overlap = [None]
+
+			def first():
+				omp = lib.ok_get_max_threads()
+				saved = lib.ok_threads()
+				errors.append(lib.ok_threads_limit(2, saved))
+				first_in.set()
+				second_in.wait()
+				errors.append(lib.ok_threads_restore(saved))
+				omp_after[0] = lib.ok_get_max_threads() == omp
+				first_out.set()
+
+			def second():
+				omp = lib.ok_get_max_threads()
+				saved = lib.ok_threads()
+				first_in.wait()
+				errors.append(lib.ok_threads_limit(1, saved))
+				second_in.set()
+				first_out.wait()
+				blas_overlap[0] = lib.ok_get_max_threads() == 1
+				if saved.blas_scope == 2:
+					blas_overlap[0] &= lib.ok_blas_get_num_threads() == 1
+				errors.append(lib.ok_threads_restore(saved))
+				omp_after[1] = lib.ok_get_max_threads() == omp
+
+			threads = [Thread(target=first), Thread(target=second)]
+			for t in threads:
+				t.start()
+			for t in threads:
+				t.join()
+
+			self.assertEqual( errors, [0, 0, 0, 0] )
+			self.assertEqual( omp_after, [True, True] )
+			self.assertTrue( blas_overlap[0] )
+			self.assertEqual( lib.ok_blas_get_num_threads(), blas )
+
+	def test_blas_select(self):
+		for (gpu, single_precision) in self.CONDITIONS:
+			lib = self.libs.get(single_precision=single_precision, gpu=gpu)
+			if lib is None or gpu:
+				continue
+
+			backend = lib.ok_blas_backend()
+			library = lib.ok_blas_library()
+			self.assertTrue( len(backend) > 0 )
+
+			# failed selection leaves current library in use
+			self.assertNotEqual( lib.ok_blas_select('nonexistent.so'), 0 )
+			self.assertNotEqual( lib.ok_blas_select('nonexistent'), 0 )
+			self.assertEqual( lib.ok_blas_backend(), backend )
+
+			self.assertCall( lib.ok_blas_select('builtin') )
+			self.assertEqual( lib.ok_blas_backend(), 'builtin' )
+			self.assertEqual( lib.ok_blas_library(), '' )
+			self.assertEqual( lib.ok_blas_get_num_threads(), 0 )
+
+			# restore selection from environment
+			self.assertCall( lib.ok_blas_select(None) )
+			self.assertEqual( lib.ok_blas_backend(), backend )
+			self.assertEqual( lib.ok_blas_library(), library )
+
 class DenseBLASTestCase(OptkitCTestCase):
 	@classmethod
 	def setUpClass(self):
@@ -588,6 +693,24 @@ class DenseBLASTestCase(OptkitCTestCase):
 				self.free_vars('A', 'L', 'hdl')
 				self.assertCall( lib.ok_device_reset() )
 
+class BuiltinBLASTestCase(DenseBLASTestCase):
+	""" repeat BLAS tests with optkit's builtin CBLAS routines """
+	@classmethod
+	def setUpClass(self):
+		super(BuiltinBLASTestCase, self).setUpClass()
+		for (gpu, single_precision) in self.CONDITIONS:
+			lib = self.libs.get(single_precision=single_precision, gpu=gpu)
+			if lib is not None and not gpu:
+				lib.ok_blas_select('builtin')
+
+	@classmethod
+	def tearDownClass(self):
+		for (gpu, single_precision) in self.CONDITIONS:
+			lib = self.libs.get(single_precision=single_precision, gpu=gpu)
+			if lib is not None and not gpu:
+				lib.ok_blas_select(None)
+		super(BuiltinBLASTestCase, self).tearDownClass()
+
 class DenseLinalgTestCase(OptkitCTestCase):
 	@classmethod
 	def setUpClass(self):
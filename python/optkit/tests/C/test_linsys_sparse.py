@@ -291,6 +291,196 @@ class SparseMatrixTestCase(OptkitCTestCase):
 				self.free_vars('x', 'y', 'A', 'hdl')
 				self.assertCall( lib.ok_device_reset() )
 
+	def test_view(self):
+		shape = (m, n) = self.shape
+		x_rand = np.random.rand(n)
+		d_rand = np.random.rand(m)
+
+		for (gpu, single_precision) in self.CONDITIONS:
+			lib = self.libs.get(single_precision=single_precision, gpu=gpu)
+			if lib is None or gpu:
+				continue
+			self.register_exit(lib.ok_device_reset)
+
+			DIGITS = 7 - 2 * single_precision
+			RTOL = 10**(-DIGITS)
+			ATOLM = RTOL * m**0.5
+			ATOLN = RTOL * n**0.5
+
+			for order in (lib.enums.CblasRowMajor, lib.enums.CblasColMajor):
+				hdl = self.register_sparse_handle(lib, 'hdl')
+
+				A_py = np.zeros(shape).astype(lib.pyfloat)
+				A_py += self.A_test_sparse
+				A_sp = sp.csr_matrix(A_py) if order == \
+					   lib.enums.CblasRowMajor else sp.csc_matrix(A_py)
+				A_val = A_sp.data.ctypes.data_as(lib.ok_float_p)
+				A_ind = A_sp.indices.ctypes.data_as(lib.ok_int_p)
+				A_ptr = A_sp.indptr.ctypes.data_as(lib.ok_int_p)
+
+				A = lib.sparse_matrix(0, 0, 0, 0, None, None, None, order)
+				self.assertCall( lib.sp_matrix_view_array(
+						A, m, n, A_sp.nnz, A_val, A_ind, A_ptr, order) )
+				self.register_var('A', A, lib.sp_matrix_free)
+				self.assertEqual( A.is_view, 1 )
+				x, x_py, x_ptr = self.register_vector(lib, n, 'x')
+				y, y_py, y_ptr = self.register_vector(lib, m, 'y')
+				d, d_py, d_ptr = self.register_vector(lib, m, 'd')
+
+				x_py[:] = x_rand[:]
+				d_py[:] = d_rand[:]
+				self.assertCall( lib.vector_memcpy_va(x, x_ptr, 1) )
+				self.assertCall( lib.vector_memcpy_va(d, d_ptr, 1) )
+
+				# y = Ax, Py vs. C
+				self.assertCall( lib.sp_blas_gemv(hdl, lib.enums.CblasNoTrans,
+												  1, A, x, 0, y) )
+				self.assertCall( lib.vector_memcpy_av(y_ptr, y, 1) )
+				Ax = A_sp * x_rand
+				self.assertVecEqual( Ax, y_py, ATOLM, RTOL )
+
+				# x = alpha A'y + beta x, Py vs. C
+				alpha = np.random.rand()
+				beta = np.random.rand()
+				result = alpha * A_sp.T * Ax + beta * x_py
+				self.assertCall( lib.sp_blas_gemv(hdl, lib.enums.CblasTrans,
+												  alpha, A, y, beta, x) )
+				self.assertCall( lib.vector_memcpy_av(x_ptr, x, 1) )
+				self.assertVecEqual( result, x_py, ATOLN, RTOL )
+
+				# scaling writes through to the wrapped arrays
+				A_ref = sp.diags(d_rand).dot(A_sp.toarray())
+				self.assertCall( lib.sp_matrix_scale_left(hdl, A, d) )
+				self.assertVecEqual( A_ref, A_sp.toarray(), ATOLM, RTOL )
+
+				# freeing a view leaves the wrapped arrays intact
+				self.free_var('A')
+				self.assertEqual( A.is_view, 0 )
+				self.assertVecEqual( A_ref, A_sp.toarray(), ATOLM, RTOL )
+
+				self.free_vars('x', 'y', 'd', 'hdl')
+				self.assertCall( lib.ok_device_reset() )
+
+	def test_multiply_index64(self):
+		shape = (m, n) = self.shape
+		x_rand = np.random.rand(n)
+
+		for (gpu, single_precision) in self.CONDITIONS:
+			lib = self.libs.get(single_precision=single_precision, gpu=gpu)
+			if lib is None or not 'sp_matrix64_calloc' in lib.__dict__:
+				continue
+			self.register_exit(lib.ok_device_reset)
+
+			DIGITS = 7 - 2 * single_precision
+			RTOL = 10**(-DIGITS)
+			ATOLM = RTOL * m**0.5
+			ATOLN = RTOL * n**0.5
+
+			for order in (lib.enums.CblasRowMajor, lib.enums.CblasColMajor):
+				hdl = self.register_sparse_handle(lib, 'hdl')
+
+				A_py = np.zeros(shape).astype(lib.pyfloat)
+				A_py += self.A_test_sparse
+				A_sp = sp.csr_matrix(A_py) if order == \
+					   lib.enums.CblasRowMajor else sp.csc_matrix(A_py)
+				A_ind_py = A_sp.indices.astype(np.int64)
+				A_ptr_py = A_sp.indptr.astype(np.int64)
+				A_val = A_sp.data.ctypes.data_as(lib.ok_float_p)
+				A_ind = A_ind_py.ctypes.data_as(lib.ok_int64_p)
+				A_ptr = A_ptr_py.ctypes.data_as(lib.ok_int64_p)
+
+				A = lib.sparse_matrix64(0, 0, 0, 0, None, None, None, order)
+				self.assertCall( lib.sp_matrix64_calloc(A, m, n, A_sp.nnz,
+														order) )
+				self.register_var('A', A, lib.sp_matrix64_free)
+				x, x_py, x_ptr = self.register_vector(lib, n, 'x')
+				y, y_py, y_ptr = self.register_vector(lib, m, 'y')
+
+				x_py[:] = x_rand[:]
+				self.assertCall( lib.sp_matrix64_memcpy_ma(hdl, A, A_val,
+														   A_ind, A_ptr) )
+				self.assertCall( lib.vector_memcpy_va(x, x_ptr, 1) )
+
+				# y = Ax, Py vs. C
+				self.assertCall( lib.sp_blas_gemv64(
+						hdl, lib.enums.CblasNoTrans, 1, A, x, 0, y) )
+				self.assertCall( lib.vector_memcpy_av(y_ptr, y, 1) )
+				Ax = A_sp * x_rand
+				self.assertVecEqual( Ax, y_py, ATOLM, RTOL )
+
+				# x = A'y, Py vs. C
+				self.assertCall( lib.sp_blas_gemv64(
+						hdl, lib.enums.CblasTrans, 1, A, y, 0, x) )
+				self.assertCall( lib.vector_memcpy_av(x_ptr, x, 1) )
+				self.assertVecEqual( A_sp.T * Ax, x_py, ATOLN, RTOL )
+
+				# round trip optkit->python
+				A_ind_py *= 0
+				A_ptr_py *= 0
+				self.assertCall( lib.sp_matrix64_memcpy_am(A_val, A_ind,
+														   A_ptr, A) )
+				self.assertTrue( np.all(A_ind_py == A_sp.indices) )
+				self.assertTrue( np.all(A_ptr_py == A_sp.indptr) )
+
+				self.free_vars('x', 'y', 'A', 'hdl')
+				self.assertCall( lib.ok_device_reset() )
+
+	def test_multiply_compressed_index(self):
+		shape = (m, n) = self.shape
+		x_rand = np.random.rand(n)
+
+		for (gpu, single_precision) in self.CONDITIONS:
+			lib = self.libs.get(single_precision=single_precision, gpu=gpu)
+			if lib is None or not 'sp_matrix_compress_index' in lib.__dict__:
+				continue
+			self.register_exit(lib.ok_device_reset)
+
+			DIGITS = 7 - 2 * single_precision
+			RTOL = 10**(-DIGITS)
+			ATOLM = RTOL * m**0.5
+			ATOLN = RTOL * n**0.5
+
+			for order in (lib.enums.CblasRowMajor, lib.enums.CblasColMajor):
+				for width in (0, 16, 32):
+					hdl = self.register_sparse_handle(lib, 'hdl')
+
+					A, A_, A_py, A_val, A_ind, A_ptr = self.register_sparsemat(
+							lib, self.A_test_sparse, order, 'A')
+
+					# indices need not be sorted within rows (columns)
+					for i in xrange(len(A_py.indptr) - 1):
+						row = slice(A_py.indptr[i], A_py.indptr[i + 1])
+						A_py.indices[row] = A_py.indices[row][::-1]
+						A_py.data[row] = A_py.data[row][::-1]
+					x, x_py, x_ptr = self.register_vector(lib, n, 'x')
+					y, y_py, y_ptr = self.register_vector(lib, m, 'y')
+					D = lib.sparse_cindex(0, 0, 0, None, None)
+
+					x_py[:] = x_rand[:]
+					self.assertCall( lib.sp_matrix_memcpy_ma(hdl, A, A_val,
+															 A_ind, A_ptr) )
+					self.assertCall( lib.sp_matrix_compress_index(D, A,
+																  width) )
+					self.register_var('D', D, lib.sp_cindex_free)
+					self.assertEqual( D.width, 32 if width == 32 else 16 )
+					self.assertCall( lib.vector_memcpy_va(x, x_ptr, 1) )
+
+					# y = Ax, Py vs. C
+					self.assertCall( lib.sp_blas_gemv_cindex(
+							hdl, lib.enums.CblasNoTrans, 1, A, D, x, 0, y) )
+					self.assertCall( lib.vector_memcpy_av(y_ptr, y, 1) )
+					Ax = A_py.dot(x_rand)
+					self.assertVecEqual( Ax, y_py, ATOLM, RTOL )
+
+					# x = A'y, Py vs. C
+					self.assertCall( lib.sp_blas_gemv_cindex(
+							hdl, lib.enums.CblasTrans, 1, A, D, y, 0, x) )
+					self.assertCall( lib.vector_memcpy_av(x_ptr, x, 1) )
+					self.assertVecEqual( A_py.T.dot(Ax), x_py, ATOLN, RTOL )
+
+					self.free_vars('D', 'x', 'y', 'A', 'hdl')
+					self.assertCall( lib.ok_device_reset() )
+
 	def test_elementwise_transformations(self):
 		shape = (m, n) = self.shape
 
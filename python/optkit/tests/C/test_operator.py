@@ -1,6 +1,7 @@
 import os
 import numpy as np
 from scipy.sparse import csr_matrix, csc_matrix
+from scipy.linalg import toeplitz, circulant
 from ctypes import c_void_p, byref, CFUNCTYPE
 from optkit.libs.operator import OperatorLibs
 from optkit.tests.C.base import OptkitCTestCase
@@ -85,6 +86,34 @@ class OperatorLibsTestCase(OptkitCTestCase):
 
 		self.free_vars('x', 'y')
 
+	def exercise_block_products(self, lib, operator_, A_py, TOL, orders):
+		o = operator_
+		m, n = A_py.shape
+		k = 3
+		RTOL = TOL
+		ATOLMK = TOL * (m * k)**0.5
+		ATOLNK = TOL * (n * k)**0.5
+
+		for order in orders:
+			X, X_, X_ptr = self.register_matrix(lib, n, k, order, 'X')
+			Y, Y_, Y_ptr = self.register_matrix(lib, m, k, order, 'Y')
+			X_ += np.random.rand(n, k)
+			self.assertCall( lib.matrix_memcpy_ma(X, X_ptr, order) )
+
+			# test AX
+			AX = A_py.dot(X_)
+			self.assertCall( o.apply_block(o.data, X, Y) )
+			self.assertCall( lib.matrix_memcpy_am(Y_ptr, Y, order) )
+			self.assertVecEqual( Y_, AX, ATOLMK, RTOL )
+
+			# test A'Y
+			AtY = A_py.T.dot(Y_)
+			self.assertCall( o.adjoint_block(o.data, Y, X) )
+			self.assertCall( lib.matrix_memcpy_am(X_ptr, X, order) )
+			self.assertVecEqual( X_, AtY, ATOLNK, RTOL )
+
+			self.free_vars('X', 'Y')
+
 	def test_libs_exist(self):
 		libs = []
 		for (gpu, single_precision) in self.CONDITIONS:
@@ -135,6 +164,8 @@ class OperatorLibsTestCase(OptkitCTestCase):
 				self.register_var('o', o.contents.data, o.contents.free)
 
 				self.exercise_operator(lib, o.contents, A_, TOL)
+				self.exercise_block_products(lib, o.contents, A_, TOL, (
+						lib.enums.CblasRowMajor, lib.enums.CblasColMajor))
 
 				self.free_vars('o', 'A')
 				self.assertCall( lib.ok_device_reset() )
@@ -190,6 +221,13 @@ class OperatorLibsTestCase(OptkitCTestCase):
 
 				self.exercise_operator(lib, o.contents, A_, TOL)
 
+				# block products: column-major blocks only on the GPU
+				block_orders = [lib.enums.CblasColMajor]
+				if not gpu:
+					block_orders.append(lib.enums.CblasRowMajor)
+				self.exercise_block_products(lib, o.contents, A_, TOL,
+											 block_orders)
+
 				self.free_vars('o', 'A', 'hdl')
 				self.assertCall( lib.ok_device_reset() )
 
@@ -238,4 +276,225 @@ class OperatorLibsTestCase(OptkitCTestCase):
 				self.exercise_operator(lib, o.contents, np.diag(d_), TOL)
 
 				self.free_vars('o', 'd')
-				self.assertCall( lib.ok_device_reset() )
\ No newline at end of file
+				self.assertCall( lib.ok_device_reset() )
+
+	def test_toeplitz_operators(self):
+		m, n = self.shape
+		kernel_size = min(5, n)
+
+		for (gpu, single_precision) in self.CONDITIONS:
+			lib = self.libs.get(single_precision=single_precision, gpu=gpu)
+			if lib is None:
+				continue
+			self.register_exit(lib.ok_device_reset)
+
+			DIGITS = 7 - 2 * single_precision - 1 * gpu
+			TOL = 10**(-DIGITS)
+
+			c = np.random.rand(m).astype(lib.pyfloat)
+			r = np.random.rand(n).astype(lib.pyfloat)
+			r[0] = c[0]
+			h = np.random.rand(kernel_size).astype(lib.pyfloat)
+			h_pad = np.zeros(n).astype(lib.pyfloat)
+			h_pad[:kernel_size] = h
+			conv = np.vstack([np.convolve(h, e) for e in np.eye(n)]).T
+
+			cases = [
+				(lib.toeplitz_operator_alloc(
+					c.ctypes.data_as(lib.ok_float_p), m,
+					r.ctypes.data_as(lib.ok_float_p), n),
+				 lib.enums.TOEPLITZ, toeplitz(c, r)),
+				(lib.circulant_operator_alloc(
+					r.ctypes.data_as(lib.ok_float_p), n),
+				 lib.enums.CIRCULANT, circulant(r)),
+				(lib.convolution_operator_alloc(
+					h.ctypes.data_as(lib.ok_float_p), kernel_size, n),
+				 lib.enums.CONVOLUTION, conv),
+				(lib.circular_convolution_operator_alloc(
+					h.ctypes.data_as(lib.ok_float_p), kernel_size, n),
+				 lib.enums.CIRCULAR_CONVOLUTION, circulant(h_pad)),
+			]
+
+			for o, kind, A_py in cases:
+				self.register_var('o', o.contents.data, o.contents.free)
+				self.validate_operator(o.contents, A_py.shape[0],
+									   A_py.shape[1], kind)
+				self.exercise_operator(lib, o.contents, A_py, TOL)
+
+				self.assertCall( lib.typesafe_operator_scale(o, 0.5) )
+				self.exercise_operator(lib, o.contents, 0.5 * A_py, TOL)
+				self.free_var('o')
+
+			self.assertCall( lib.ok_device_reset() )
+
+	def test_fourier_operator(self):
+		m, n = self.shape
+
+		for (gpu, single_precision) in self.CONDITIONS:
+			lib = self.libs.get(single_precision=single_precision, gpu=gpu)
+			if lib is None:
+				continue
+			self.register_exit(lib.ok_device_reset)
+
+			DIGITS = 7 - 2 * single_precision - 1 * gpu
+			TOL = 10**(-DIGITS)
+
+			# power-of-two and general (Bluestein) lengths
+			for size in (n, 2**int(np.log2(n))):
+				F = np.fft.fft(np.eye(size)) / size**0.5
+				A_py = np.vstack((F.real, F.imag))
+
+				o = lib.fourier_operator_alloc(size)
+				self.register_var('o', o.contents.data, o.contents.free)
+				self.validate_operator(o.contents, 2 * size, size,
+									   lib.enums.FOURIER)
+
+				self.x_test = np.random.rand(size)
+				self.exercise_operator(lib, o.contents, A_py, TOL)
+
+				self.assertCall( lib.typesafe_operator_scale(o, 2.) )
+				self.exercise_operator(lib, o.contents, 2 * A_py, TOL)
+				self.free_var('o')
+
+			self.assertCall( lib.ok_device_reset() )
+
+	def test_kronecker_operator(self):
+		p, q, r, s = 3, 4, 5, 2
+
+		for (gpu, single_precision) in self.CONDITIONS:
+			lib = self.libs.get(single_precision=single_precision, gpu=gpu)
+			if lib is None:
+				continue
+			self.register_exit(lib.ok_device_reset)
+
+			DIGITS = 7 - 2 * single_precision - 1 * gpu
+			TOL = 10**(-DIGITS)
+
+			order = lib.enums.CblasRowMajor
+			A, A_, A_ptr = self.register_matrix(lib, p, q, order, 'A')
+			A_ += np.random.rand(p, q)
+			self.assertCall( lib.matrix_memcpy_ma(A, A_ptr, order) )
+			B, B_, B_ptr = self.register_matrix(lib, r, s, order, 'B')
+			B_ += np.random.rand(r, s)
+			self.assertCall( lib.matrix_memcpy_ma(B, B_ptr, order) )
+
+			opA = lib.dense_operator_alloc(A)
+			self.register_var('opA', opA.contents.data, opA.contents.free)
+			opB = lib.dense_operator_alloc(B)
+			self.register_var('opB', opB.contents.data, opB.contents.free)
+
+			o = lib.kronecker_operator_alloc(opA, opB)
+			self.register_var('o', o.contents.data, o.contents.free)
+			self.validate_operator(o.contents, p * r, q * s,
+								   lib.enums.KRONECKER)
+
+			self.x_test = np.random.rand(q * s)
+			self.exercise_operator(lib, o.contents, np.kron(A_, B_), TOL)
+
+			self.assertCall( lib.typesafe_operator_scale(o, 0.5) )
+			self.exercise_operator(lib, o.contents, 0.5 * np.kron(A_, B_),
+								   TOL)
+
+			self.free_vars('o', 'opA', 'opB', 'A', 'B')
+			self.assertCall( lib.ok_device_reset() )
+
+	def test_composite_operators(self):
+		m, n = self.shape
+		m1 = m / 2
+
+		for (gpu, single_precision) in self.CONDITIONS:
+			lib = self.libs.get(single_precision=single_precision, gpu=gpu)
+			if lib is None:
+				continue
+			self.register_exit(lib.ok_device_reset)
+
+			DIGITS = 7 - 2 * single_precision - 1 * gpu
+			TOL = 10**(-DIGITS)
+
+			# blocks: dense A1 (m1 x n), sparse A2 (m - m1 x n), diagonal D
+			order = lib.enums.CblasRowMajor
+			A1, A1_, A1_ptr = self.register_matrix(lib, m1, n, order, 'A1')
+			A1_ += self.A_test[:m1, :]
+			self.assertCall( lib.matrix_memcpy_ma(A1, A1_ptr, order) )
+			hdl = self.register_sparse_handle(lib, 'hdl')
+			A2, A2_, _, A2_val, A2_ind, A2_ptr = self.register_sparsemat(
+					lib, self.A_test_sparse[m1:, :], order, 'A2')
+			self.assertCall( lib.sp_matrix_memcpy_ma(hdl, A2, A2_val, A2_ind,
+													 A2_ptr) )
+			d, d_, d_ptr = self.register_vector(lib, n, 'd')
+			d_ += self.A_test[0, :]
+			self.assertCall( lib.vector_memcpy_va(d, d_ptr, 1) )
+
+			op1 = lib.dense_operator_alloc(A1)
+			self.register_var('op1', op1.contents.data, op1.contents.free)
+			op2 = lib.sparse_operator_alloc(A2)
+			self.register_var('op2', op2.contents.data, op2.contents.free)
+			opD = lib.diagonal_operator_alloc(d)
+			self.register_var('opD', opD.contents.data, opD.contents.free)
+
+			def ops_array(*ops):
+				return (lib.operator_p * len(ops))(*ops)
+
+			cat = lib.cat_operator_alloc(ops_array(op1, op2, opD), 3)
+			self.register_var('cat', cat.contents.data, cat.contents.free)
+			self.validate_operator(cat.contents, m + n, n, lib.enums.CAT)
+			self.exercise_operator(lib, cat.contents,
+								   np.vstack((A1_, A2_, np.diag(d_))), TOL)
+
+			# incompatible blocks: n x n, m1 x n do not share row dimension
+			self.assertFalse( lib.split_operator_alloc(ops_array(opD, op1),
+													   2) )
+
+			neg = lib.neg_operator_alloc(op1)
+			self.register_var('neg', neg.contents.data, neg.contents.free)
+			self.validate_operator(neg.contents, m1, n, lib.enums.NEG)
+			self.exercise_operator(lib, neg.contents, -A1_, TOL)
+
+			add = lib.add_operator_alloc(ops_array(opD, opD), 2)
+			self.register_var('add', add.contents.data, add.contents.free)
+			self.validate_operator(add.contents, n, n, lib.enums.ADD)
+			self.exercise_operator(lib, add.contents, 2 * np.diag(d_), TOL)
+
+			# split [A1, A3]: common row dimension
+			A3, A3_, A3_ptr = self.register_matrix(lib, m1, n, order, 'A3')
+			A3_ += self.A_test[:m1, :]
+			self.assertCall( lib.matrix_memcpy_ma(A3, A3_ptr, order) )
+			op3 = lib.dense_operator_alloc(A3)
+			self.register_var('op3', op3.contents.data, op3.contents.free)
+			split = lib.split_operator_alloc(ops_array(op1, op3), 2)
+			self.register_var('split', split.contents.data,
+							  split.contents.free)
+			self.validate_operator(split.contents, m1, 2 * n,
+								   lib.enums.SPLIT)
+			self.x_test = np.random.rand(2 * n)
+			self.exercise_operator(lib, split.contents, np.hstack((A1_, A3_)),
+								   TOL)
+
+			# scaling a composite scales its blocks
+			self.assertCall( lib.typesafe_operator_scale(cat, 0.5) )
+			self.x_test = np.random.rand(n)
+			self.exercise_operator(lib, cat.contents, 0.5 * np.vstack(
+								   (A1_, A2_, np.diag(d_))), TOL)
+
+			# shared blocks are scaled once per composite, and the borrowed
+			# blocks are left unchanged
+			self.assertCall( lib.typesafe_operator_scale(add, 0.5) )
+			self.exercise_operator(lib, add.contents, np.diag(d_), TOL)
+
+			cat2 = lib.cat_operator_alloc(ops_array(op1, op1), 2)
+			self.register_var('cat2', cat2.contents.data, cat2.contents.free)
+			self.assertCall( lib.typesafe_operator_scale(cat2, 3) )
+			self.exercise_operator(lib, cat2.contents, 3 * np.vstack(
+								   (A1_, A1_)), TOL)
+
+			add2 = lib.add_operator_alloc(ops_array(op1, op1, neg), 3)
+			self.register_var('add2', add2.contents.data, add2.contents.free)
+			self.assertCall( lib.typesafe_operator_scale(add2, 3) )
+			self.exercise_operator(lib, add2.contents, 3 * A1_, TOL)
+
+			self.exercise_operator(lib, op1.contents, A1_, TOL)
+			self.exercise_operator(lib, opD.contents, np.diag(d_), TOL)
+
+			self.free_vars('add2', 'cat2', 'split', 'add', 'neg', 'cat', 'op1',
+						   'op2', 'op3', 'opD', 'A1', 'A2', 'A3', 'd', 'hdl')
+			self.assertCall( lib.ok_device_reset() )
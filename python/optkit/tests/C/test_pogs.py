@@ -291,6 +291,115 @@ class PogsTestCase(OptkitCPogsTestCase):
 				self.free_vars('solver', 'f', 'g', 'hdl')
 				self.assertCall( lib.ok_device_reset() )
 
+	def test_anderson_private_api(self):
+		m, n = self.shape
+		mem = 3
+
+		for (gpu, single_precision) in self.CONDITIONS:
+			lib = self.libs.get(single_precision=single_precision, gpu=gpu)
+			if lib is None:
+				continue
+			elif not lib.full_api_accessible:
+				continue
+			self.register_exit(lib.ok_device_reset)
+
+			TOL = 1e-4 if lib.FLOAT else 1e-10
+			REG = 1e-5 if lib.FLOAT else 1e-10 # kANDERSONREG
+			order = lib.enums.CblasRowMajor
+			hdl = self.register_blas_handle(lib, 'hdl')
+			A, A_ptr = self.gen_py_matrix(lib, m, n, order)
+			A += self.A_test
+			solver = lib.pogs_init(A_ptr, m, n, order)
+			self.register_solver('solver', solver, lib.pogs_finish)
+			z = solver.contents.z
+
+			aa = lib.anderson_work_p()
+			self.assertCall( lib.anderson_work_alloc(byref(aa), m, n, mem) )
+			self.register_var('aa', aa, lib.anderson_work_free)
+			work = aa.contents
+			self.assertEqual( work.size, 2 * (m + n) )
+			self.assertEqual( work.n_cols, 0 )
+			self.assertEqual( work.have_prev, 0 )
+
+			# u = (z, zt) as a single python vector
+			size = m + n
+			z_py = np.zeros(size).astype(lib.pyfloat)
+			zt_py = np.zeros(size).astype(lib.pyfloat)
+
+			def set_iterate(u):
+				u = u.astype(lib.pyfloat)
+				self.assertCall( lib.vector_memcpy_va(
+						z.contents.primal.contents.vec,
+						u[:size].ctypes.data_as(lib.ok_float_p), 1) )
+				self.assertCall( lib.vector_memcpy_va(
+						z.contents.dual.contents.vec,
+						u[size:].ctypes.data_as(lib.ok_float_p), 1) )
+
+			def get_iterate():
+				self.load_to_local(lib, z_py, z.contents.primal.contents.vec)
+				self.load_to_local(lib, zt_py, z.contents.dual.contents.vec)
+				return np.hstack((z_py, zt_py))
+
+			def step(u, g):
+				set_iterate(u)
+				self.assertCall( lib.anderson_set_input(aa, z) )
+				set_iterate(g)
+				self.assertCall( lib.anderson_step(hdl, aa, z) )
+				return get_iterate()
+
+			u0 = np.random.rand(2 * size)
+			g0 = np.random.rand(2 * size)
+			u1 = g0
+			g1 = u1 + 0.5 * (g0 - u0)
+
+			# first step: no memory, iterate is G(u^0)
+			u_next = step(u0, g0)
+			self.assertVecEqual( u_next, g0, TOL, TOL )
+			self.assertEqual( work.have_prev, 1 )
+			self.assertEqual( work.accelerated, 0 )
+			self.assertEqual( work.n_cols, 0 )
+			self.assertScalarEqual( work.norm_f, np.linalg.norm(g0 - u0),
+									TOL )
+
+			# second step: one column, u^2 = G(u^1) - dG * gamma
+			u_next = step(u1, g1)
+			self.assertEqual( work.accelerated, 1 )
+			self.assertEqual( work.n_cols, 1 )
+			dF = (g1 - u1) - (g0 - u0)
+			dG = g1 - g0
+			gamma = np.dot(dF, g1 - u1) / (np.dot(dF, dF) * (1 + REG))
+			self.assertVecEqual( u_next, g1 - gamma * dG, TOL, TOL )
+
+			# safeguard: residual increases after an accelerated step,
+			# iterate reverts to G(u^1) and memory is cleared
+			u2 = u_next
+			g2 = u2 + 10 * (g1 - u1)
+			u_next = step(u2, g2)
+			self.assertVecEqual( u_next, g1, TOL, TOL )
+			self.assertEqual( work.n_cols, 0 )
+			self.assertEqual( work.have_prev, 0 )
+			self.assertEqual( work.accelerated, 0 )
+
+			# rebuild memory, then reset as the solver loop does when rho
+			# changes: the next step is unaccelerated
+			step(u0, g0)
+			step(u1, g1)
+			self.assertEqual( work.n_cols, 1 )
+			self.assertCall( lib.anderson_reset(aa) )
+			self.assertEqual( work.n_cols, 0 )
+			self.assertEqual( work.index, 0 )
+			self.assertEqual( work.have_prev, 0 )
+			self.assertEqual( work.accelerated, 0 )
+			self.assertTrue( work.norm_f > 1e30 )
+
+			u_next = step(u2, g2)
+			self.assertVecEqual( u_next, g2, TOL, TOL )
+			self.assertEqual( work.n_cols, 0 )
+			self.assertEqual( work.have_prev, 1 )
+
+			self.free_vars('aa', 'solver', 'hdl')
+			self.assertCall( lib.ok_device_reset() )
+
 	def test_pogs_call(self):
 		m, n = self.shape
 
@@ -315,6 +424,7 @@ class PogsTestCase(OptkitCPogsTestCase):
 				self.assertCall( lib.pogs_solve(solver, f, g, settings, info,
 												output.ptr) )
 				self.free_var('solver')
+				self.assert_pogs_profile(info)
 
 				if info.converged:
 					self.assert_pogs_convergence(
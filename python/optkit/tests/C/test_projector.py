@@ -1,6 +1,6 @@
 import os
 import numpy as np
-from ctypes import c_void_p, byref, cast
+from ctypes import c_void_p, c_uint, byref, cast
 from optkit.libs.projector import ProjectorLibs
 from optkit.tests.defs import OptkitTestCase
 from optkit.tests.C.base import OptkitCTestCase, OptkitCOperatorTestCase
@@ -136,6 +136,83 @@ class DirectProjectorTestCase(OptkitCTestCase):
 								   'hdl')
 					self.assertCall( lib.ok_device_reset() )
 
+	def test_batch_projection(self):
+		"""batch projection test
+
+			project the K columns of (X, Y) onto the graph y = Ax at
+			once; each column should match the projection of that
+			column alone, for skinny and fat A, with the columns stored
+			in either order
+		"""
+		K = 5
+		for (gpu, single_precision) in self.CONDITIONS:
+			lib = self.libs.get(single_precision=single_precision, gpu=gpu)
+			if lib is None:
+				continue
+			self.register_exit(lib.ok_device_reset)
+
+			DIGITS = 5 - 2 * single_precision
+			RTOL = 10**(-DIGITS)
+
+			for (m, n) in (self.shape, self.shape[::-1]):
+				ATOLM = RTOL * m**0.5
+				ATOLN = RTOL * n**0.5
+				orders = (lib.enums.CblasRowMajor, lib.enums.CblasColMajor)
+				for (order, order_X) in [(o1, o2) for o1 in orders
+										 for o2 in orders]:
+					hdl = self.register_blas_handle(lib, 'hdl')
+
+					x_in, xi_, xi_ptr = self.register_vector(lib, n, 'x_in')
+					x_out, xo_, xo_ptr = self.register_vector(lib, n, 'x_out')
+					y_in, yi_, yi_ptr = self.register_vector(lib, m, 'y_in')
+					y_out, yo_, yo_ptr = self.register_vector(lib, m, 'y_out')
+					A, A_, A_ptr = self.register_matrix(lib, m, n, order, 'A')
+					X_in, Xi_, Xi_ptr = self.register_matrix(
+							lib, n, K, order_X, 'X_in')
+					Y_in, Yi_, Yi_ptr = self.register_matrix(
+							lib, m, K, order_X, 'Y_in')
+					X_out, Xo_, Xo_ptr = self.register_matrix(
+							lib, n, K, order_X, 'X_out')
+					Y_out, Yo_, Yo_ptr = self.register_matrix(
+							lib, m, K, order_X, 'Y_out')
+
+					A_ += np.random.rand(m, n)
+					Xi_ += np.random.rand(n, K)
+					Yi_ += np.random.rand(m, K)
+					self.assertCall( lib.matrix_memcpy_ma(A, A_ptr, order) )
+					self.assertCall( lib.matrix_memcpy_ma(X_in, Xi_ptr,
+															 order_X) )
+					self.assertCall( lib.matrix_memcpy_ma(Y_in, Yi_ptr,
+															 order_X) )
+
+					P = lib.direct_projector(None, None, 0, 0, 0)
+					self.register_var('P', P, lib.direct_projector_free)
+					self.assertCall( lib.direct_projector_alloc(P, A) )
+					self.assertCall( lib.direct_projector_initialize(
+							hdl, P, 1) )
+					self.assertCall( lib.direct_projector_project_batch(
+							hdl, P, X_in, Y_in, X_out, Y_out) )
+					self.assertCall( lib.matrix_memcpy_am(Xo_ptr, X_out,
+														  order_X) )
+					self.assertCall( lib.matrix_memcpy_am(Yo_ptr, Y_out,
+														  order_X) )
+
+					for j in xrange(K):
+						xi_[:] = Xi_[:, j]
+						yi_[:] = Yi_[:, j]
+						self.assertCall( lib.vector_memcpy_va(x_in, xi_ptr, 1) )
+						self.assertCall( lib.vector_memcpy_va(y_in, yi_ptr, 1) )
+						self.assertCall( lib.direct_projector_project(
+								hdl, P, x_in, y_in, x_out, y_out) )
+						self.assertCall( lib.vector_memcpy_av(xo_ptr, x_out, 1) )
+						self.assertCall( lib.vector_memcpy_av(yo_ptr, y_out, 1) )
+						self.assertVecEqual( Xo_[:, j], xo_, ATOLN, RTOL )
+						self.assertVecEqual( Yo_[:, j], yo_, ATOLM, RTOL )
+
+					self.free_vars('P', 'A', 'X_in', 'Y_in', 'X_out', 'Y_out',
+								   'x_in', 'y_in', 'x_out', 'y_out', 'hdl')
+					self.assertCall( lib.ok_device_reset() )
+
 class IndirectProjectorTestCase(OptkitCOperatorTestCase):
 
 	@classmethod
@@ -416,6 +493,14 @@ class GenericIndirectProjectorTestCase(OptkitCOperatorTestCase):
 				self.register_var('p', p.contents.data, p.contents.free)
 				self.assertCall( p.contents.project(
 						p.contents.data, x, y, x_out, y_out, TOL_CG) )
+
+				# CGLS from x_out = 0: one product by A^T, two per
+				# iteration; the projection adds one each by A and A^T
+				products, cg_iters = c_uint(0), c_uint(0)
+				self.assertCall( lib.projector_get_work(
+						p, byref(products), byref(cg_iters)) )
+				self.assertTrue( cg_iters.value > 0 )
+				self.assertEqual( products.value, 2 * cg_iters.value + 3 )
 				self.free_var('p')
 
 				self.assertCall( lib.vector_memcpy_av(x_p_ptr, x_out, 1) )
@@ -343,4 +343,120 @@ class ProxTestCase(OptkitCTestCase):
 				self.assertVecEqual( xout_py, prox_py, ATOLM, RTOL )
 
 			self.free_vars('f', 'x', 'xout')
-			self.assertCall( lib.ok_device_reset() )
\ No newline at end of file
+			self.assertCall( lib.ok_device_reset() )
+
+	def test_asymptotic_eval(self):
+		m, n = self.shape
+		TOL = 1e-4
+		BOUND = 10.
+
+		# (function, direction, support of domain, recession function)
+		# per element, for functions (h, a, b, c, d, e); directions
+		# within TOL of a finite support are evaluated over |x| <= BOUND
+		cases = [
+			(('IndBox01', 2, 1, 1, 0, 0), 1, 1., np.inf),
+			(('IndBox01', 2, 1, 1, 0, 0), -1, -0.5, np.inf),
+			(('IndGe0', 1, 1, 1, 0, 0), -1, -1., np.inf),
+			(('IndGe0', 1, 1, 1, 0, 0), 1, np.inf, 0),
+			(('IndLe0', -1, 1, 1, 0, 0), 1, np.inf, 0),
+			(('IndEq0', 1, 2, 1, 0, 0), 3, 6., np.inf),
+			(('Square', 1, 0, 1, 0, 0), 1, np.inf, np.inf),
+			(('Square', 1, 0, 1, 0, 0), 0, 0., 0),
+			(('Abs', 1, 0, 2, 1, 0), -1, np.inf, 1.),
+			(('Identity', 1, 0, 1, 0, 0), -1, np.inf, -1.),
+			(('MaxPos0', 1, 0, 1, -2, 0), 1, np.inf, -1.),
+			(('Zero', 1, 0, 1, 0, 1), 1, np.inf, np.inf),
+			(('IndGe0', 1, 1, 1, 0, 0), TOL / 2, TOL / 2 * BOUND, 0),
+			(('IndGe0', 1, 1, 1, 0, 0), 2 * TOL, np.inf, 0),
+			(('IndLe0', 2, 4, 1, 0, 0), -TOL / 2, TOL / 2 * BOUND, 0),
+			(('Square', 1, 0, 1, 0, 0), -TOL / 2, TOL / 2 * BOUND, 0),
+		]
+
+		for (gpu, single_precision) in self.CONDITIONS:
+			lib = self.libs.get(single_precision=single_precision, gpu=gpu)
+			if lib is None:
+				continue
+			self.register_exit(lib.ok_device_reset)
+
+			f, f_py, f_ptr = self.register_fnvector(lib, m, 'f')
+			v, v_py, v_ptr = self.register_vector(lib, m, 'v')
+			val = np.zeros(1).astype(lib.pyfloat)
+			val_ptr = val.ctypes.data_as(lib.ok_float_p)
+
+			for (h, a, b, c, d, e), direction, support, recession in cases:
+				f_py['h'] = lib.function_enums.dict[h]
+				for field, value in zip('abcde', (a, b, c, d, e)):
+					f_py[field] = value
+				self.assertCall( lib.function_vector_memcpy_va(f, f_ptr) )
+				v_py.fill(direction)
+				self.assertCall( lib.vector_memcpy_va(v, v_ptr, 1) )
+
+				support_call = lambda f, v, tol, val: \
+						lib.function_support_vector(f, v, tol, BOUND, val)
+				for call, expect in ((support_call, support),
+									 (lib.function_recession_vector,
+									  recession)):
+					self.assertCall( call(f, v, TOL, val_ptr) )
+					if np.isinf(expect):
+						self.assertTrue( val[0] >= np.finfo(lib.pyfloat).max )
+					else:
+						self.assertScalarEqual( val[0], m * expect, TOL )
+
+			self.free_vars('f', 'v')
+			self.assertCall( lib.ok_device_reset() )
+
+	def test_polish_eval(self):
+		m, n = self.shape
+		TOL = 1e-4
+
+		# (function, point, fixed, x_fix, w, g) per element, for
+		# functions (h, a, b, c, d, e)
+		cases = [
+			(('Abs', 2, 1, 1, 0, 0), 0.5, 1, 0.5, 0, 0),
+			(('Abs', 2, 1, 3, 1, 0), 1., 0, 1., 0, 7.),
+			(('IndGe0', 1, 1, 1, 0, 0), 1., 1, 1., 0, 0),
+			(('IndGe0', 1, 1, 1, 0, 2), 3., 0, 3., 2., 6.),
+			(('IndLe0', 1, 0, 1, 0, 0), -2., 0, -2., 0, 0),
+			(('IndEq0', 2, 4, 1, 0, 0), 0.3, 1, 2., 0, 0),
+			(('IndBox01', 1, 0, 1, 0, 0), 1., 1, 1., 0, 0),
+			(('IndBox01', 1, 0, 1, 0, 0), 0.5, 0, 0.5, 0, 0),
+			(('MaxPos0', 1, 0, 1, 0, 0), 2., 0, 2., 0, 1.),
+			(('MaxNeg0', 1, 0, 1, 0, 0), 0., 1, 0., 0, 0),
+			(('Huber', 1, 0, 1, 0, 0), 0.5, 0, 0.5, 1., 0.5),
+			(('Huber', 1, 0, 1, 0, 0), -3., 0, -3., 0, -1.),
+			(('Square', 2, 1, 1, 1, 0), 1., 0, 1., 4., 3.),
+			(('Exp', 1, 0, 1, 0, 0), 0., 0, 0., 1., 1.),
+			(('Zero', 1, 0, 1, 1, 1), 2., 0, 2., 1., 3.),
+		]
+
+		for (gpu, single_precision) in self.CONDITIONS:
+			lib = self.libs.get(single_precision=single_precision, gpu=gpu)
+			if lib is None:
+				continue
+			self.register_exit(lib.ok_device_reset)
+
+			f, f_py, f_ptr = self.register_fnvector(lib, m, 'f')
+			x, x_py, x_ptr = self.register_vector(lib, m, 'x')
+			xf, xf_py, xf_ptr = self.register_vector(lib, m, 'xf')
+			fix, fix_py, fix_ptr = self.register_vector(lib, m, 'fix')
+			w, w_py, w_ptr = self.register_vector(lib, m, 'w')
+			g, g_py, g_ptr = self.register_vector(lib, m, 'g')
+
+			for (h, a, b, c, d, e), point, fixed, x_fix, w_, g_ in cases:
+				f_py['h'] = lib.function_enums.dict[h]
+				for field, value in zip('abcde', (a, b, c, d, e)):
+					f_py[field] = value
+				self.assertCall( lib.function_vector_memcpy_va(f, f_ptr) )
+				x_py.fill(point)
+				self.assertCall( lib.vector_memcpy_va(x, x_ptr, 1) )
+
+				self.assertCall( lib.function_polish_vector(f, x, TOL, xf, fix,
+															w, g) )
+				for vec, vec_py, vec_ptr, expect in (
+						(xf, xf_py, xf_ptr, x_fix), (fix, fix_py, fix_ptr, fixed),
+						(w, w_py, w_ptr, w_), (g, g_py, g_ptr, g_)):
+					self.assertCall( lib.vector_memcpy_av(vec_ptr, vec, 1) )
+					self.assertVecEqual( vec_py, expect * np.ones(m), TOL, TOL )
+
+			self.free_vars('f', 'x', 'xf', 'fix', 'w', 'g')
+			self.assertCall( lib.ok_device_reset() )
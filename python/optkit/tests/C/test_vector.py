@@ -259,6 +259,66 @@ class VectorTestCase(OptkitCTestCase):
 			self.free_vars('v', 'w')
 			self.assertCall( lib.ok_device_reset() )
 
+	def test_fused_math(self):
+		for (gpu, single_precision) in self.CONDITIONS:
+			lib = self.libs.get(single_precision=single_precision, gpu=gpu)
+			if lib is None:
+				continue
+			self.register_exit(lib.ok_device_reset)
+
+			len_v = 10 + int(1000 * np.random.rand())
+			DIGITS = 7 - 2 * lib.FLOAT - 1 * lib.GPU
+			RTOL = 10**(-DIGITS)
+			ATOL = RTOL * len_v**0.5
+			alpha, beta = np.random.randn(2)
+
+			vecs = {}
+			for name in ('v', 'w', 'x', 'y'):
+				vecs[name] = self.register_vector(lib, len_v, name)
+				vecs[name][1][:] = np.random.randn(len_v)
+				self.assertCall( lib.vector_memcpy_va(vecs[name][0],
+													  vecs[name][2], 1) )
+			v, v_py, v_ptr = vecs['v']
+			w, w_py, w_ptr = vecs['w']
+			x, x_py, x_ptr = vecs['x']
+			y, y_py, y_ptr = vecs['y']
+			result = np.zeros(2).astype(lib.pyfloat)
+			res1_ptr = result[:1].ctypes.data_as(lib.ok_float_p)
+			res2_ptr = result[1:].ctypes.data_as(lib.ok_float_p)
+
+			# w += alpha * v, v'w
+			w_expect = w_py + alpha * v_py
+			self.assertCall( lib.vector_axpy_dot(alpha, v, w, res1_ptr) )
+			self.assertCall( lib.vector_memcpy_av(w_ptr, w, 1) )
+			self.assertVecEqual( w_py, w_expect, ATOL, RTOL )
+			self.assertScalarEqual( result[0], v_py.dot(w_expect), RTOL )
+
+			# w = v + beta * w, ||w||^2
+			w_expect = v_py + beta * w_py
+			self.assertCall( lib.vector_xpby_sumsq(v, beta, w, res1_ptr) )
+			self.assertCall( lib.vector_memcpy_av(w_ptr, w, 1) )
+			self.assertVecEqual( w_py, w_expect, ATOL, RTOL )
+			self.assertScalarEqual( result[0], np.sum(w_expect**2), RTOL )
+
+			# x += alpha * v, y += beta * x (new x), ||x||^2, ||y||^2
+			x_expect = x_py + alpha * v_py
+			y_expect = y_py + beta * x_expect
+			self.assertCall( lib.vector_axpy2_sumsq(alpha, v, x, beta, x, y,
+													res1_ptr, res2_ptr) )
+			self.assertCall( lib.vector_memcpy_av(x_ptr, x, 1) )
+			self.assertCall( lib.vector_memcpy_av(y_ptr, y, 1) )
+			self.assertVecEqual( x_py, x_expect, ATOL, RTOL )
+			self.assertVecEqual( y_py, y_expect, ATOL, RTOL )
+			self.assertScalarEqual( result[0], np.sum(x_expect**2), RTOL )
+			self.assertScalarEqual( result[1], np.sum(y_expect**2), RTOL )
+
+			# reductions are optional
+			self.assertCall( lib.vector_axpy2_sumsq(alpha, v, x, beta, w, y,
+													None, None) )
+
+			self.free_vars('v', 'w', 'x', 'y')
+			self.assertCall( lib.ok_device_reset() )
+
 	def test_indvector_math(self):
 		for (gpu, single_precision) in self.CONDITIONS:
 			lib = self.libs.get(single_precision=single_precision, gpu=gpu)
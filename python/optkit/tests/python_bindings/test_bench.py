@@ -0,0 +1,94 @@
+import numpy as np
+import scipy.sparse as sp
+import copy
+import os
+import tempfile
+from optkit.api import backend
+from optkit.bench import PROBLEMS, BACKENDS, generate, run_case, run_suite, \
+	save, load, compare, kdtree_crossover
+from optkit.bench.runner import abstract_lib
+from optkit.tests.defs import OptkitTestCase
+
+class BenchTestCase(OptkitTestCase):
+	@classmethod
+	def setUpClass(self):
+		self.env_orig = os.getenv('OPTKIT_USE_LOCALLIBS', '0')
+		os.environ['OPTKIT_USE_LOCALLIBS'] = '1'
+
+	@classmethod
+	def tearDownClass(self):
+		os.environ['OPTKIT_USE_LOCALLIBS'] = self.env_orig
+
+	def test_problems(self):
+		m, n = 40, 20
+		for name in PROBLEMS:
+			p = generate(name, m, n, seed=1)
+			self.assertEqual( p.shape, (m, n) )
+			self.assertTrue( isinstance(p.A, np.ndarray) )
+			self.assertEqual( p.nnz, m * n )
+
+			# same seed, same data
+			self.assertTrue( np.allclose(generate(name, m, n, seed=1).A, p.A) )
+
+			p_sparse = generate(name, m, n, density=0.2, seed=1)
+			self.assertTrue( sp.isspmatrix_csr(p_sparse.A) )
+			self.assertTrue( p_sparse.nnz < m * n )
+			self.assertEqual( p_sparse.dense().shape, (m, n) )
+
+		with self.assertRaises(ValueError):
+			generate('nonexistent', m, n)
+
+	def test_run_case(self):
+		backends = BACKENDS if abstract_lib() is not None else ('dense',)
+		for backend_name in backends:
+			for name in PROBLEMS:
+				p = generate(name, 60, 30, seed=0)
+				result = run_case(p, backend_name, repeat=2)
+				self.assertEqual( result['err'], 0 )
+				self.assertEqual( result['problem'], name )
+				self.assertEqual( result['backend'], backend_name )
+				self.assertEqual( result['shape'], [60, 30] )
+				self.assertTrue( result['iterations'] > 0 )
+				for key in ('setup_time', 'solve_time', 'time_per_iter',
+							'throughput', 'peak_memory_mb'):
+					self.assertTrue( result[key] > 0 )
+
+		with self.assertRaises(ValueError):
+			run_case(generate('lasso', 60, 30), 'nonexistent')
+
+	def test_save_compare(self):
+		results = run_suite(problems=['nnls', 'lasso'], backends=['dense'],
+							sizes=[(60, 30)], verbose=False)
+		self.assertEqual( len(results['results']), 2 )
+		self.assertTrue( 'blas' in results )
+
+		tmpdir = tempfile.mkdtemp()
+		filename = os.path.join(tmpdir, 'bench.json')
+		save(results, filename)
+		baseline = load(filename)
+		os.remove(filename)
+		os.rmdir(tmpdir)
+		self.assertEqual( compare(results, baseline), [] )
+
+		# slower setup and more iterations than baseline
+		current = copy.deepcopy(baseline)
+		current['results'][0]['setup_time'] *= 2
+		current['results'][1]['iterations'] += 100
+		regressions = compare(current, baseline, threshold=0.1)
+		self.assertEqual( sorted(r['metric'] for r in regressions),
+						  ['iterations', 'setup_time'] )
+		self.assertEqual( compare(current, baseline, threshold=100.), [] )
+		self.assertEqual( compare(current, baseline,
+								  metrics=('time_per_iter',)), [] )
+
+	def test_kdtree_crossover(self):
+		if backend.device_is_gpu:
+			return
+		results = kdtree_crossover(n_vectors=200, vec_lengths=(2, 8),
+								   cluster_counts=(16, 256), verbose=False)
+		self.assertEqual( len(results), 4 )
+		for r in results:
+			self.assertTrue( r['dense_time'] > 0 )
+			self.assertTrue( r['kdtree_time'] > 0 )
+			self.assertEqual( r['kdtree_favored'],
+							  (r['vec_length'], r['n_clusters']) == (2, 256) )
@@ -1,6 +1,8 @@
 import numpy as np
 import gc
 import os
+import tempfile
+import time
 from os import path
 from ctypes import CDLL, c_size_t
 # from optkit import *
@@ -66,6 +68,63 @@ class ClusteringBindingsTestCase(OptkitTestCase):
 		# assign at most <block_size> units to a block index
 		self.assertTrue( counts.max() <= x_blk * y_blk * z_blk )
 
+		# compare with block index formula
+		i, j, k = np.unravel_index(np.arange(len(assignments)), full_size)
+		x_blocks = int(np.ceil(float(x_full) / x_blk))
+		y_blocks = int(np.ceil(float(y_full) / y_blk))
+		self.assertTrue( np.array_equal(assignments, i / x_blk +
+				(j / y_blk) * x_blocks + (k / z_blk) * x_blocks * y_blocks) )
+
+		perm, block_sizes = regcluster_permutation(block_size, full_size)
+		self.assertTrue( np.array_equal(block_sizes, counts) )
+		self.assertTrue( np.all(np.diff(assignments[perm]) >= 0) )
+
+	def test_geometric_cluster(self):
+		dims = (20, 30, 17)
+		factor = 8
+		block_dims = (10, 15, 9)
+		n_geom = dims[0] * dims[1] * dims[2]
+
+		# working set: a random subset of the voxels
+		perm_geom2working = np.random.permutation(n_geom)
+		n_working = n_geom / 2
+
+		a2c, cluster_sizes, g2w, w2s, block_sizes = geometric_cluster(
+				*dims, downsampling_factor=factor,
+				perm_geom2working=perm_geom2working, n_working=n_working,
+				block_dims=block_dims)
+
+		self.assertEqual( len(a2c), n_working )
+		self.assertEqual( sum(block_sizes), n_working )
+		self.assertEqual( len(cluster_sizes), len(block_sizes) )
+		self.assertTrue( np.array_equal(g2w, perm_geom2working[:n_working]) )
+
+		# sorted order groups working voxels by block
+		blocks = regcluster(block_dims, dims)[g2w][w2s]
+		self.assertTrue( np.array_equal(np.repeat(
+				np.arange(len(block_sizes)), block_sizes), blocks) )
+
+		# labels are contiguous within each block, and follow the grid
+		fine = regcluster(nearest_triple(factor), dims)[g2w][w2s]
+		offset = 0
+		for b, size in enumerate(block_sizes):
+			a2c_b = a2c[offset : offset + size]
+			fine_b = fine[offset : offset + size]
+			if size > 0:
+				self.assertEqual( a2c_b.max() + 1, cluster_sizes[b] )
+				self.assertEqual( len(np.unique(a2c_b)), cluster_sizes[b] )
+				self.assertTrue( np.array_equal(
+						np.unique(fine_b)[a2c_b.astype(int)], fine_b) )
+			offset += size
+
+		# feeds blockwise k-means directly
+		A = np.random.rand(n_working, 3)
+		clu = ClusteringTypes(backend).Clustering()
+		C, a2c_out, counts = clu.kmeans_blocks(
+				A, block_sizes, a2c, cluster_sizes=cluster_sizes)
+		self.assertEqual( len(C), len(block_sizes) )
+		self.assertEqual( sum([sum(c) for c in counts]), n_working )
+
 	def test_upsampling_vector(self):
 		m = 200
 		k = 20
@@ -209,6 +268,93 @@ class ClusteringBindingsTestCase(OptkitTestCase):
 									   self.assignments_test)
 		self.assertTrue( sum(counts) == self.shape[0] )
 
+		profile = clu.kmeans_work.profile
+		self.assertTrue( profile['iters'] > 0 )
+		self.assertTrue( profile['assign_time'] > 0 )
+		self.assertTrue( profile['update_time'] > 0 )
+
+	def test_kmeans_inplace_compact(self):
+		ct = ClusteringTypes(backend)
+		clu = ct.Clustering()
+		m, n = self.shape
+
+		# caller-owned buffers of library type are written in place
+		A = self.A_test.astype(backend.cluster.pyfloat)
+		C = np.zeros((2 * self.k, n), dtype=backend.cluster.pyfloat)
+		a2c = (2 * self.assignments_test).astype(c_size_t)
+
+		C_out, a2c_out, counts = clu.kmeans_inplace(A, C, a2c)
+		k_out = C_out.shape[0]
+		self.assertTrue( np.may_share_memory(C_out, C) )
+		self.assertTrue( a2c_out is a2c )
+		self.assertTrue( k_out <= self.k )
+
+		# contiguous labels, exact counts, centroids are cluster means
+		self.assertEqual( a2c.max() + 1, k_out )
+		self.assertTrue( np.array_equal(
+				counts, np.bincount(a2c.astype(int), minlength=k_out)) )
+		C_py = np.zeros((k_out, n))
+		np.add.at(C_py, a2c.astype(int), A)
+		C_py /= counts.reshape((k_out, 1))
+		self.assertTrue( np.allclose(C_out, C_py) )
+
+	def test_kmeans_seeded(self):
+		ct = ClusteringTypes(backend)
+		clu = ct.Clustering()
+
+		for init in ('k-means++', 'k-means||'):
+			C, a2c, counts = clu.kmeans(self.A_test, self.k, init=init,
+										seed=1)
+			self.assertTrue( sum(counts) == self.shape[0] )
+			C2, a2c2, counts2 = clu.kmeans(self.A_test, self.k, init=init,
+										   seed=1)
+			self.assertTrue( all(a2c == a2c2) )
+			self.assertTrue( np.allclose(C, C2) )
+
+		C, a2c, counts = clu.kmeans(self.A_test, self.k)
+		self.assertTrue( sum(counts) == self.shape[0] )
+
+	def test_minibatch_kmeans(self):
+		ct = ClusteringTypes(backend)
+		m, n = self.shape
+		k = self.k
+		BATCH = 128
+		EPOCHS = 5
+
+		tmpdir = tempfile.mkdtemp()
+		filename = path.join(tmpdir, 'A.npy')
+		np.save(filename, self.A_test.astype(backend.cluster.pyfloat))
+		A_mm = np.load(filename, mmap_mode='r')
+
+		clu = ct.MiniBatchClustering(batch_size=BATCH)
+		C, a2c, counts = clu.kmeans(A_mm, k, n, epochs=EPOCHS, seed=1)
+
+		self.assertEqual( clu.vectors_processed, EPOCHS * m )
+		self.assertEqual( len(a2c), m )
+		self.assertEqual( sum(counts), m )
+
+		# within-cluster scatter small relative to total scatter
+		inertia = ((self.A_test - C[a2c, :])**2).sum()
+		total = ((self.A_test - self.A_test.mean(0))**2).sum()
+		self.assertTrue( inertia < 0.5 * total )
+
+		# chunked input gives the same result as the memory map
+		def chunks(A=A_mm):
+			for i in xrange(0, m, 3 * BATCH):
+				yield A[i : i + 3 * BATCH]
+
+		C2, a2c2, counts2 = clu.kmeans(chunks, k, n, epochs=EPOCHS, seed=1)
+		self.assertTrue( np.allclose(C, C2) )
+		self.assertTrue( all(a2c == a2c2) )
+
+		_, a2c3, counts3 = clu.kmeans(A_mm, k, n, C=C, assign=False)
+		self.assertTrue( a2c3 is None )
+		self.assertEqual( sum(counts3), m )
+
+		del A_mm
+		os.remove(filename)
+		os.rmdir(tmpdir)
+
 	def test_blockwise_kmeans_inplace(self):
 		ct = ClusteringTypes(backend)
 		clu = ct.Clustering()
@@ -246,3 +392,62 @@ class ClusteringBindingsTestCase(OptkitTestCase):
 			self.assertTrue( sum(counts[i]) == self.shape[0] )
 
 
+
+	def test_kmeans_model(self):
+		ct = ClusteringTypes(backend)
+		m, n = self.shape
+		BATCH = 100
+
+		C, a2c, _ = ct.Clustering().kmeans(self.A_test, self.k)
+		model = ct.KMeansModel(C, batch_size=BATCH)
+		self.assertEqual( (model.k, model.n), C.shape )
+
+		tmpdir = tempfile.mkdtemp()
+		filename = path.join(tmpdir, 'A.npy')
+		np.save(filename, self.A_test.astype(backend.cluster.pyfloat))
+		A_mm = np.load(filename, mmap_mode='r')
+
+		D = ((self.A_test.reshape((m, 1, n)) -
+			  model.C.reshape((1, self.k, n)))**2).sum(axis=2)
+		nearest = D.argmin(axis=1)
+
+		start = time.time()
+		a2c_mm = model.predict(A_mm)
+		elapsed = time.time() - start
+		print 'k-means predict: {:.3g} vectors/s'.format(m / elapsed)
+		self.assertEqual( len(a2c_mm), m )
+		self.assertTrue( sum(a2c_mm != nearest) <= 1 + m / 100 )
+		self.assertTrue( all(model.predict(self.A_test) == a2c_mm) )
+
+		with self.assertRaises(ValueError):
+			model.predict(self.A_test[:, :-1])
+
+		# save/load round trip
+		model_file = path.join(tmpdir, 'model.npz')
+		model.save(model_file)
+		model2 = ct.KMeansModel.load(model_file)
+		self.assertEqual( model2.batch_size, BATCH )
+		self.assertTrue( np.array_equal(model2.C, model.C) )
+		self.assertTrue( all(model2.predict(A_mm) == a2c_mm) )
+
+		# 32-bit centroids
+		lib32 = backend.cluster_lib_loader.get(
+				single_precision=True, gpu=backend.device_is_gpu)
+		if lib32 is not None:
+			model32 = ct.KMeansModel(C, batch_size=BATCH,
+									 single_precision=True)
+			self.assertTrue( model32.single_precision )
+			self.assertEqual( model32.C.dtype, np.float32 )
+			a2c32 = model32.predict(A_mm)
+			self.assertTrue( sum(a2c32 != nearest) <= 1 + m / 100 )
+			model32.save(model_file)
+			self.assertTrue( ct.KMeansModel.load(
+					model_file).single_precision )
+			model32.free()
+
+		model.free()
+		model2.free()
+		del A_mm
+		os.remove(filename)
+		os.remove(model_file)
+		os.rmdir(tmpdir)
@@ -0,0 +1,237 @@
+import numpy as np
+import gc
+import os
+import time
+from threading import Thread, Event, Lock
+from optkit import *
+from optkit.api import backend
+from optkit.libs.pogs import PogsLibs
+from optkit.tests.defs import OptkitTestCase
+
+def run_threads(target, n_threads):
+	""" call target(i) in n_threads threads; re-raise the first error """
+	errors = []
+	def wrapped(i):
+		try:
+			target(i)
+		except Exception as e:
+			errors.append(e)
+
+	threads = [Thread(target=wrapped, args=(i,)) for i in xrange(n_threads)]
+	for t in threads:
+		t.start()
+	for t in threads:
+		t.join()
+	if errors:
+		raise errors[0]
+
+class ConcurrencyTestCase(OptkitTestCase):
+	N_THREADS = 8
+
+	@classmethod
+	def setUpClass(self):
+		self.env_orig = os.getenv('OPTKIT_USE_LOCALLIBS', '0')
+		os.environ['OPTKIT_USE_LOCALLIBS'] = '1'
+
+	@classmethod
+	def tearDownClass(self):
+		os.environ['OPTKIT_USE_LOCALLIBS'] = self.env_orig
+
+	def test_concurrent_library_load(self):
+		loader = PogsLibs()
+		libs = [None] * self.N_THREADS
+
+		def get(i):
+			libs[i] = loader.get(single_precision=False, gpu=False)
+
+		run_threads(get, self.N_THREADS)
+		if libs[0] is None:
+			return
+		self.assertTrue( all([lib is libs[0] for lib in libs]) )
+		self.assertEqual( loader.loaded, ['cpu64'] )
+
+	def test_cobject_count(self):
+		m, n = 30, 20
+		A = np.random.rand(m, n)
+
+		def churn(i):
+			for _ in xrange(10):
+				s = PogsSolver(A)
+				del s
+
+		run_threads(churn, self.N_THREADS)
+		gc.collect()
+		self.assertTrue( backend.device_reset_allowed )
+		self.assertFalse( backend.libguard_active )
+
+	def test_thread_budget(self):
+		""" concurrent budgets sum to at most max_threads """
+		lib = backend.pogs
+		omp = lib.ok_get_max_threads()
+		budgets = [[] for _ in xrange(self.N_THREADS)]
+		totals = []
+		lock = Lock()
+
+		def hold(i):
+			for _ in xrange(20):
+				with backend.thread_budget() as n_threads:
+					self.assertEqual( lib.ok_get_max_threads(), n_threads )
+					with backend.thread_budget() as n_nested:
+						self.assertEqual( n_nested, n_threads )
+					with lock:
+						totals.append(backend.threads_held)
+					budgets[i].append(n_threads)
+					time.sleep(1e-3)
+
+		run_threads(hold, self.N_THREADS)
+		self.assertEqual( backend.active_calls, 0 )
+		self.assertEqual( backend.threads_held, 0 )
+		self.assertEqual( lib.ok_get_max_threads(), omp )
+		self.assertTrue( max(totals) <= backend.max_threads )
+		for b in budgets:
+			self.assertEqual( len(b), 20 )
+			self.assertTrue( all([1 <= n <= backend.max_threads for n in b]) )
+
+	def test_concurrent_solves(self):
+		""" concurrent solves reproduce the results of serial solves """
+		m, n = 150, 100
+		problems = []
+		for i in xrange(self.N_THREADS):
+			A = np.random.rand(m, n)
+			b = A.dot(np.random.rand(n))
+			problems.append((A, b))
+
+		def solve(A, b):
+			s = PogsSolver(A)
+			f = PogsObjective(m, h='Square', b=b)
+			g = PogsObjective(n, h='IndGe0')
+			s.solve(f, g, verbose=0, maxiter=2000)
+			self.assertEqual( s.info.err, 0 )
+			x = np.copy(s.output.x)
+			del s
+			return x
+
+		start = time.time()
+		x_serial = [solve(A, b) for (A, b) in problems]
+		t_serial = time.time() - start
+
+		x_threaded = [None] * self.N_THREADS
+		def solve_i(i):
+			x_threaded[i] = solve(*problems[i])
+
+		start = time.time()
+		run_threads(solve_i, self.N_THREADS)
+		t_threaded = time.time() - start
+		print '{} solves: serial {:.3g} s, threaded {:.3g} s'.format(
+				self.N_THREADS, t_serial, t_threaded)
+
+		atol = 1e-3 if backend.precision_is_32bit else 1e-6
+		for i in xrange(self.N_THREADS):
+			self.assertTrue( np.allclose(x_threaded[i], x_serial[i],
+										 atol=atol) )
+		gc.collect()
+		self.assertTrue( backend.device_reset_allowed )
+
+	def test_threadpool_limits(self):
+		lib = backend.pogs
+		omp = lib.ok_get_max_threads()
+		blas = lib.ok_blas_get_num_threads()
+
+		with threadpool_limits(1):
+			self.assertEqual( lib.ok_get_max_threads(), 1 )
+			if blas > 0:
+				self.assertEqual( lib.ok_blas_get_num_threads(), 1 )
+			with backend.thread_budget() as n_threads:
+				self.assertEqual( n_threads, 1 )
+		self.assertEqual( lib.ok_get_max_threads(), omp )
+		self.assertEqual( lib.ok_blas_get_num_threads(), blas )
+
+		with self.assertRaises(ValueError):
+			with threadpool_limits(0):
+				pass
+
+	def test_threadpool_limits_overlap(self):
+		""" overlapping limits in several threads restore the settings """
+		lib = backend.pogs
+		blas = lib.ok_blas_get_num_threads()
+		entered = [Event() for _ in xrange(self.N_THREADS)]
+		omp_restored = [None] * self.N_THREADS
+
+		def hold(i):
+			omp = lib.ok_get_max_threads()
+			with threadpool_limits(1 + i % 2):
+				entered[i].set()
+				for e in entered:
+					e.wait()
+			omp_restored[i] = lib.ok_get_max_threads() == omp
+
+		run_threads(hold, self.N_THREADS)
+		self.assertTrue( all(omp_restored) )
+		self.assertEqual( lib.ok_blas_get_num_threads(), blas )
+
+	def test_solve_num_threads(self):
+		m, n = 150, 100
+		A = np.random.rand(m, n)
+		b = A.dot(np.random.rand(n))
+		f = PogsObjective(m, h='Square', b=b)
+		g = PogsObjective(n, h='IndGe0')
+		blas = backend.pogs.ok_blas_get_num_threads()
+
+		s = PogsSolver(A)
+		s.solve(f, g, verbose=0)
+		x = np.copy(s.output.x)
+		self.assertEqual( s.settings.num_threads, 0 )
+		del s
+
+		s = PogsSolver(A)
+		s.solve(f, g, verbose=0, num_threads=1)
+		self.assertEqual( s.settings.num_threads, 1 )
+		self.assertEqual( s.info.err, 0 )
+		self.assertEqual( backend.pogs.ok_blas_get_num_threads(), blas )
+		atol = 1e-3 if backend.precision_is_32bit else 1e-6
+		self.assertTrue( np.allclose(s.output.x, x, atol=atol) )
+
+		with self.assertRaises(ValueError):
+			s.settings.num_threads = -1
+		del s
+
+	def test_blas_info(self):
+		info = backend.blas_info()
+		self.assertEqual( sorted(info.keys()),
+						  ['backend', 'library', 'num_threads'] )
+		if backend.device_is_gpu:
+			return
+
+		m, n = 150, 100
+		A = np.random.rand(m, n)
+		b = A.dot(np.random.rand(n))
+		f = PogsObjective(m, h='Square', b=b)
+		g = PogsObjective(n, h='IndGe0')
+
+		def solve():
+			s = PogsSolver(A)
+			s.solve(f, g, verbose=0)
+			self.assertEqual( s.info.err, 0 )
+			x = np.copy(s.output.x)
+			del s
+			return x
+
+		x = solve()
+		env_orig = os.environ.pop('OPTKIT_BLAS', None)
+		try:
+			backend.set_blas('builtin')
+			self.assertEqual( backend.blas_info()['backend'], 'builtin' )
+			self.assertEqual( os.environ['OPTKIT_BLAS'], 'builtin' )
+			x_builtin = solve()
+
+			with self.assertRaises(ValueError):
+				backend.set_blas('nonexistent')
+			self.assertEqual( backend.blas_info()['backend'], 'builtin' )
+		finally:
+			backend.set_blas('auto' if env_orig is None else env_orig)
+			if env_orig is None:
+				del os.environ['OPTKIT_BLAS']
+
+		self.assertEqual( backend.blas_info(), info )
+		atol = 1e-3 if backend.precision_is_32bit else 1e-6
+		self.assertTrue( np.allclose(x_builtin, x, atol=atol) )
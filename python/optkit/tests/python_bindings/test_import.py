@@ -0,0 +1,91 @@
+import os
+import sys
+import time
+import subprocess
+import numpy as np
+import optkit
+from optkit.tests.defs import OptkitTestCase
+
+class ImportTestCase(OptkitTestCase):
+	"""
+	Libraries are located, but not loaded, at import; a library variant
+	is opened and bound on first use.
+	"""
+	LOADED = str(
+			'api = sys.modules[\'optkit.api\']\n'
+			'print api.backend.pogs_lib_loader.loaded, '
+			'api.backend.cluster_lib_loader.loaded\n')
+
+	@classmethod
+	def setUpClass(self):
+		self.env = dict(os.environ)
+		self.env['OPTKIT_USE_LOCALLIBS'] = '1'
+		self.env['PYTHONPATH'] = os.pathsep.join(sys.path)
+
+	def run_python(self, code):
+		start = time.time()
+		out = subprocess.check_output([sys.executable, '-c', code],
+									  env=self.env)
+		return out.strip().split('\n')[-1], time.time() - start
+
+	def test_import_is_lazy(self):
+		out, t_import = self.run_python('import sys, optkit\n' + self.LOADED)
+		self.assertEqual( out, '[] []' )
+
+		out, t_use = self.run_python(
+				'import sys, optkit\n'
+				'f = optkit.PogsObjective(5, h=\'Abs\')\n' + self.LOADED)
+		config = out.split()[0]
+		self.assertNotEqual( config, '[]' )
+		self.assertTrue( out.endswith('[]') )
+
+		out, _ = self.run_python(
+				'import sys, optkit\n'
+				'v = str(optkit.OPTKIT_VERSION)\n' + self.LOADED)
+		self.assertTrue( out.endswith('[]') )
+
+		# type checks against the API classes load nothing
+		out, _ = self.run_python(
+				'import sys, optkit\n'
+				'assert not isinstance(1, optkit.PogsSolver)\n'
+				'assert not issubclass(int, optkit.KMeansModel)\n' +
+				self.LOADED)
+		self.assertEqual( out, '[] []' )
+
+		print 'import optkit: {:.3g} s; import + first use: {:.3g} s'.format(
+				t_import, t_use)
+
+	def test_api_classes(self):
+		for cls in (optkit.PogsSolver, optkit.PogsObjective,
+					optkit.Clustering, optkit.ClusteringSettings,
+					optkit.KMeansModel):
+			self.assertTrue( isinstance(cls, type) )
+
+		A = np.random.rand(30, 20)
+		s = optkit.PogsSolver(A)
+		self.assertTrue( isinstance(s, optkit.PogsSolver) )
+		self.assertTrue( issubclass(type(s), optkit.PogsSolver) )
+		self.assertFalse( isinstance(s, optkit.PogsObjective) )
+		f = optkit.PogsObjective(30, h='Square', b=1)
+		g = optkit.PogsObjective(20, h='IndGe0')
+		self.assertTrue( isinstance(f, optkit.PogsObjective) )
+		del s
+
+		class LoggingSolver(optkit.PogsSolver):
+			def __init__(self, A):
+				super(LoggingSolver, self).__init__(A)
+				self.solves = 0
+
+			def solve(self, f, g, **options):
+				self.solves += 1
+				super(LoggingSolver, self).solve(f, g, **options)
+
+		s = LoggingSolver(A)
+		self.assertTrue( isinstance(s, LoggingSolver) )
+		self.assertTrue( isinstance(s, optkit.PogsSolver) )
+		self.assertTrue( issubclass(LoggingSolver, optkit.PogsSolver) )
+		s.solve(f, g, verbose=0)
+		self.assertEqual( s.solves, 1 )
+		self.assertEqual( s.info.err, 0 )
+		self.assertTrue( type(LoggingSolver(A)) is type(s) )
+		del s
@@ -0,0 +1,106 @@
+import numpy as np
+import scipy.sparse as sp
+import gc
+import os
+import tempfile
+from ctypes import c_void_p, byref
+from optkit.libs.linsys import SparseLinsysLibs
+from optkit.types.sparse import SparseMatrixView, sparse_view_arrays
+from optkit.tests.defs import OptkitTestCase
+
+class SparseViewBindingsTestCase(OptkitTestCase):
+	@classmethod
+	def setUpClass(self):
+		self.env_orig = os.getenv('OPTKIT_USE_LOCALLIBS', '0')
+		os.environ['OPTKIT_USE_LOCALLIBS'] = '1'
+		self.libs = SparseLinsysLibs()
+
+	@classmethod
+	def tearDownClass(self):
+		os.environ['OPTKIT_USE_LOCALLIBS'] = self.env_orig
+
+	def gemv(self, lib, view, x_py):
+		m, n = view.shape
+		x = lib.vector(0, 0, None)
+		y = lib.vector(0, 0, None)
+		y_py = np.zeros(m).astype(lib.pyfloat)
+		x_py = x_py.astype(lib.pyfloat)
+		lib.vector_calloc(x, n)
+		lib.vector_calloc(y, m)
+		lib.vector_memcpy_va(x, x_py.ctypes.data_as(lib.ok_float_p), 1)
+		hdl = c_void_p()
+		lib.sp_make_handle(byref(hdl))
+		gemv = lib.sp_blas_gemv64 if view.index64 else lib.sp_blas_gemv
+		err = gemv(hdl, lib.enums.CblasNoTrans, 1, view.c, x, 0, y)
+		lib.vector_memcpy_av(y_py.ctypes.data_as(lib.ok_float_p), y, 1)
+		lib.sp_destroy_handle(hdl)
+		lib.vector_free(x)
+		lib.vector_free(y)
+		self.assertEqual( err, 0 )
+		return y_py
+
+	def test_view_arrays(self):
+		lib = self.libs.get(single_precision=False, gpu=False)
+		if lib is None:
+			return
+
+		A = sp.rand(*self.shape, density=0.1, format='csr')
+		data, indices, indptr, shape, order = sparse_view_arrays(lib, A)
+		self.assertTrue( data is A.data )
+		self.assertTrue( indices is A.indices )
+		self.assertEqual( shape, A.shape )
+		self.assertEqual( order, lib.enums.CblasRowMajor )
+
+		with self.assertRaises(TypeError):
+			sparse_view_arrays(lib, A.astype(np.float32))
+		with self.assertRaises(ValueError):
+			sparse_view_arrays(lib, (A.data, A.indices, A.indptr))
+		with self.assertRaises(ValueError):
+			sparse_view_arrays(lib, (A.data, A.indices, A.indptr),
+							   shape=A.shape, order=lib.enums.CblasColMajor)
+
+	def test_view_keepalive(self):
+		lib = self.libs.get(single_precision=False, gpu=False)
+		if lib is None:
+			return
+
+		x = np.random.rand(self.shape[1])
+		A = sp.rand(*self.shape, density=0.1, format='csc')
+		Ax = A.dot(x)
+
+		view = SparseMatrixView(lib, A)
+		del A
+		gc.collect()
+		self.assertTrue( np.allclose(self.gemv(lib, view, x), Ax) )
+		view.free()
+		self.assertTrue( view.c is None )
+		self.assertTrue( view.arrays is None )
+
+	def test_view_memmap(self):
+		lib = self.libs.get(single_precision=False, gpu=False)
+		if lib is None:
+			return
+
+		x = np.random.rand(self.shape[1])
+		A = sp.rand(*self.shape, density=0.1, format='csr')
+		tmpdir = tempfile.mkdtemp()
+		arrays = []
+		for name, arr in (('data', A.data), ('indices', A.indices.astype(
+						  np.int64)), ('indptr', A.indptr.astype(np.int64))):
+			filename = os.path.join(tmpdir, name)
+			mm = np.memmap(filename, dtype=arr.dtype, mode='w+',
+						   shape=arr.shape)
+			mm[:] = arr
+			mm.flush()
+			arrays.append(np.memmap(filename, dtype=arr.dtype, mode='r',
+									shape=arr.shape))
+
+		view = SparseMatrixView(lib, tuple(arrays), shape=A.shape,
+								order=lib.enums.CblasRowMajor)
+		self.assertTrue( view.index64 )
+		self.assertTrue( np.allclose(self.gemv(lib, view, x), A.dot(x)) )
+		view.free()
+		del arrays
+		for name in ('data', 'indices', 'indptr'):
+			os.remove(os.path.join(tmpdir, name))
+		os.rmdir(tmpdir)
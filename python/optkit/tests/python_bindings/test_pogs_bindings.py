@@ -73,6 +73,172 @@ class PogsBindingsTestCase(OptkitTestCase):
 		s.solve(f, g)
 		self.assertEqual(s.info.err, 0)
 		self.assertTrue(s.info.converged or s.info.k == s.settings.maxiter)
+		if s.info.converged:
+			self.assertEqual(s.info.status, 'solved')
+
+		phase_times = s.info.phase_times
+		self.assertEqual(sorted(phase_times.keys()),
+						 ['adapt', 'anderson', 'check', 'dual', 'polish',
+						  'project', 'prox'])
+		self.assertTrue(all(t >= 0 for t in phase_times.values()))
+		self.assertTrue(sum(phase_times.values()) <=
+						s.info.solve_time * 1.01 + 1e-4)
+		self.assertEqual(s.info.gemv_count, 4 * s.info.iters)
+		self.assertEqual(s.info.cg_iters, 0)
+		del s
+
+	def test_anderson(self):
+		# nonnegative least squares with tall A: unique solution, so both
+		# solves should reach the same x
+		m, n = 100, 50
+		A = np.random.rand(m, n)
+		f = PogsObjective(m, h='Square', b=1)
+		g = PogsObjective(n, h='IndGe0')
+		tols = dict(reltol=1e-5, abstol=1e-6, maxiter=20000)
+
+		s = PogsSolver(A)
+		s.solve(f, g, anderson=0, **tols)
+		self.assertEqual(s.info.err, 0)
+		self.assertTrue(s.info.converged)
+		self.assertEqual(s.info.phase_times['anderson'], 0)
+		x, objval = np.copy(s.output.x), s.info.objval
+		del s
+
+		s = PogsSolver(A)
+		s.solve(f, g, anderson=5, **tols)
+		self.assertEqual(s.settings.anderson, 5)
+		self.assertEqual(s.info.err, 0)
+		self.assertTrue(s.info.converged)
+		self.assertTrue(s.info.phase_times['anderson'] >= 0)
+		self.assertTrue(np.linalg.norm(s.output.x - x) <=
+						1e-2 * (1 + np.linalg.norm(x)))
+		self.assertTrue(abs(s.info.objval - objval) <=
+						1e-2 * (1 + abs(objval)))
+
+		with self.assertRaises(TypeError):
+			s.settings.anderson = 1.5
+		with self.assertRaises(ValueError):
+			s.settings.anderson = -1
+		del s
+
+	def test_infeasibility(self):
+		# tall A: b is almost surely outside range(A)
+		m, n = 100, 50
+		A = np.random.randn(m, n)
+
+		# infeasible: y = Ax = b
+		s = PogsSolver(A)
+		b = np.random.randn(m)
+		s.solve(PogsObjective(m, h='IndEq0', b=b), PogsObjective(n, h='Zero'))
+		self.assertEqual(s.info.err, 0)
+		self.assertEqual(s.info.status, 'primal infeasible')
+		self.assertFalse(s.info.converged)
+		self.assertTrue(s.info.iters < s.settings.maxiter)
+
+		# detection off: runs to maxiter
+		s.solve(PogsObjective(m, h='IndEq0', b=b), PogsObjective(n, h='Zero'),
+				infeastol=0, maxiter=200, resume=0)
+		self.assertEqual(s.info.status, 'unconverged')
+		self.assertEqual(s.info.iters, 200)
+		del s
+
+		# unbounded: minimize sum(x)
+		s = PogsSolver(A)
+		s.solve(PogsObjective(m, h='Zero'), PogsObjective(n, h='Identity'))
+		self.assertEqual(s.info.err, 0)
+		self.assertEqual(s.info.status, 'dual infeasible')
+		self.assertTrue(s.info.iters < s.settings.maxiter)
+
+		with self.assertRaises(ValueError):
+			s.settings.infeastol = -1
+		del s
+
+	def test_polish(self):
+		# lasso: minimize 1/2||Ax - b||_2^2 + lambda ||x||_1
+		m, n = 100, 50
+		A = np.random.randn(m, n)
+		b = A.dot(np.random.randn(n) * (np.random.rand(n) > 0.7))
+		b += 0.1 * np.random.randn(m)
+		lambda_ = 0.1 * np.abs(A.T.dot(b)).max()
+		f = PogsObjective(m, h='Square', b=b)
+		g = PogsObjective(n, h='Abs', c=lambda_)
+		tol = 1e-2 if backend.precision_is_32bit else 1e-6
+
+		s = PogsSolver(A)
+		s.solve(f, g, polish=0)
+		self.assertFalse(s.info.polished)
+		self.assertEqual(s.info.phase_times['polish'], 0)
+		res_admm = np.linalg.norm(A.dot(s.output.x) - s.output.y)
+		del s
+
+		s = PogsSolver(A)
+		s.solve(f, g, polish=1)
+		self.assertEqual(s.info.err, 0)
+		self.assertTrue(s.info.converged)
+		self.assertTrue(s.info.polished)
+		self.assertTrue(s.info.phase_times['polish'] >= 0)
+		x, y, mu, nu = s.output.x, s.output.y, s.output.mu, s.output.nu
+		self.assertTrue(np.linalg.norm(A.dot(x) - y) < res_admm)
+
+		# reported objective is that of the polished point
+		obj = 0.5 * np.sum((y - b)**2) + lambda_ * np.sum(np.abs(x))
+		self.assertTrue(np.abs(s.info.objval - obj) <=
+						tol * (1 + np.abs(obj)))
+
+		# optimality: nu = y - b, mu = -A'nu in lambda * d|x|
+		scale = tol * (1 + np.linalg.norm(b))
+		self.assertTrue(np.linalg.norm(A.dot(x) - y) <= scale)
+		self.assertTrue(np.linalg.norm(nu - (y - b)) <= scale)
+		self.assertTrue(np.linalg.norm(A.T.dot(nu) + mu) <= scale)
+		support = np.abs(x) > scale
+		self.assertTrue(np.linalg.norm(mu[support] - lambda_ *
+						np.sign(x[support])) <= scale)
+		self.assertTrue(np.all(np.abs(mu) <= lambda_ + scale))
+
+		with self.assertRaises(ValueError):
+			s.settings.polish = 2
+		del s
+
+	def test_solve_batch(self):
+		m, n = 100, 50
+		A = np.random.randn(m, n)
+		f_list = [PogsObjective(m, h='Abs', b=np.random.randn(m))
+				  for _ in xrange(3)]
+		g_list = [PogsObjective(n, h='IndGe0') for _ in xrange(3)]
+
+		# infeasible problem retires early, the others run on
+		f_list.append(PogsObjective(m, h='IndEq0', b=np.random.randn(m)))
+		g_list.append(PogsObjective(n, h='Zero'))
+
+		s = PogsSolver(A)
+		infos, outputs = s.solve_batch(f_list, g_list)
+		self.assertEqual(len(infos), 4)
+		self.assertEqual(len(outputs), 4)
+		self.assertEqual([i.status for i in infos],
+						 3 * ['solved'] + ['primal infeasible'])
+		self.assertTrue(infos[3].iters < max(i.iters for i in infos[:3]))
+		del s
+
+		# same iterates as separate solves
+		for f, g, info, output in zip(f_list, g_list, infos, outputs):
+			s = PogsSolver(A)
+			s.solve(f, g)
+			self.assertEqual(info.err, 0)
+			self.assertEqual(info.status, s.info.status)
+			self.assertTrue(abs(info.iters - s.info.iters) <= 2)
+			self.assertEqual(info.gemv_count, 4 * info.iters)
+			if info.converged:
+				self.assertTrue(abs(info.objval - s.info.objval) <=
+								1e-2 * (1 + abs(s.info.objval)))
+				self.assertTrue(np.linalg.norm(output.x - s.output.x) <=
+								1e-2 * (1 + np.linalg.norm(s.output.x)))
+			del s
+
+		s = PogsSolver(A)
+		with self.assertRaises(ValueError):
+			s.solve_batch(f_list, g_list[:2])
+		with self.assertRaises(ValueError):
+			s.solve_batch([PogsObjective(n, h='Zero')], g_list[:1])
 		del s
 
 	def test_solver_io(self):
@@ -1,5 +1,7 @@
-from numpy import array, ndarray, zeros, ceil
-from ctypes import c_size_t
+from numpy import array, ndarray, zeros, ceil, ascontiguousarray, bincount, \
+		  concatenate, unique, cumsum, arange, repeat, savez, load as load_npz
+from numpy.random import randint
+from ctypes import c_size_t, cast, byref
 
 def nearest_triple(factor):
 	if not isinstance(factor, int):
@@ -36,46 +38,88 @@ def regcluster(sample_dims, full_dims):
 
 	x_blocks = int((xmax % nx)!=0) + xmax / nx
 	y_blocks = int((ymax % ny)!=0) + ymax / ny
-	z_blocks = int((zmax % nz)!=0) + zmax / nz
 
-	xceil = nx * x_blocks
-	yceil = ny * y_blocks
-	zceil = nz * z_blocks
-
-	grid = zeros((xceil, yceil, zceil), dtype=int)
-
-	for k in xrange(zceil):
-		for j in xrange(yceil):
-			for i in xrange(xceil):
-				grid[i, j, k] = (i / nx) * 1
-				grid[i, j, k] += (j / ny) * x_blocks
-				grid[i, j, k] += (k / nz) * y_blocks * x_blocks
-
-	return grid[:xmax, :ymax, :zmax].reshape(xmax * ymax * zmax)
-
-def geometric_cluster(dimx, dimy, dimz, downsampling_factor, perm_geom2working,
-					  n_working, perm_working2sorted, block_sizes):
-
-	geom = tuple(dimx, dimy, dimz)
-	assignments = regcluster(nearest_triple(downsampling_factor),  geom)
-	assignments = assignments[perm_geom2working.indices][:n_working]
-	assignments = assignments[perm_working2sorted]
-
-	entry_offset = 0
-
-	assignment_blocks = []
-
-	for b in xrange(block_sizes):
-		size_b = block_sizes[b]
-		assignments_b = UpsamplingVector(
-				indices=assignments[entry_offset : entry_offset + size_b])
-		assignments_b.rebase()
-		assignments_b.clean_assignments()
-
-		assignment_blocks.append(assignments_b)
-		entry_offset += size_b
-
-	return assignment_blocks
+	# block index of voxel (i, j, k), flattened in C order
+	grid = (arange(xmax) / nx).reshape((xmax, 1, 1))
+	grid = grid + ((arange(ymax) / ny) * x_blocks).reshape((1, ymax, 1))
+	grid = grid + ((arange(zmax) / nz) * y_blocks * x_blocks).reshape(
+			(1, 1, zmax))
+
+	return grid.reshape(xmax * ymax * zmax)
+
+def regcluster_permutation(sample_dims, full_dims, indices=None):
+	"""
+	Sort voxels of a regular grid (or the subset given by indices) by
+	regcluster block.
+
+	Returns (perm, block_sizes), so that voxels perm[:block_sizes[0]]
+	form the first block, and so on; voxels keep their relative order
+	within each block.
+	"""
+	assignments = regcluster(sample_dims, full_dims)
+	if indices is not None:
+		assignments = assignments[indices]
+	perm = assignments.argsort(kind='mergesort')
+	return perm, bincount(assignments, minlength=assignments.max() + 1)
+
+def geometric_cluster(dimx, dimy, dimz, downsampling_factor,
+					  perm_geom2working=None, n_working=None,
+					  perm_working2sorted=None, block_sizes=None,
+					  block_dims=None):
+	"""
+	Regular-grid clustering of a dimx x dimy x dimz volume, with about
+	downsampling_factor voxels per cluster, for blockwise k-means.
+
+	The first n_working voxels under perm_geom2working (by default, all
+	voxels in C order) form the working set, ordered by block with
+	perm_working2sorted and block_sizes. If these are not given, blocks
+	are the regcluster blocks of size block_dims (by default, a single
+	block).
+
+	Returns (assignments, cluster_sizes, perm_geom2working,
+	perm_working2sorted, block_sizes): assignments are given in sorted
+	order, with block-local labels 0, ..., cluster_sizes[b] - 1 in
+	block b, matching the arguments of Clustering.kmeans_blocks.
+	"""
+	geom = (int(dimx), int(dimy), int(dimz))
+	n_geom = geom[0] * geom[1] * geom[2]
+
+	if perm_geom2working is None:
+		perm_geom2working = arange(n_geom)
+	perm_geom2working = getattr(perm_geom2working, 'indices',
+								perm_geom2working)
+	if n_working is None:
+		n_working = len(perm_geom2working)
+	perm_geom2working = perm_geom2working[:n_working]
+
+	if perm_working2sorted is None:
+		if block_dims is None:
+			perm_working2sorted = arange(n_working)
+			block_sizes = array([n_working])
+		else:
+			perm_working2sorted, block_sizes = regcluster_permutation(
+					block_dims, geom, indices=perm_geom2working)
+	perm_working2sorted = getattr(perm_working2sorted, 'indices',
+								  perm_working2sorted)
+	block_sizes = array(block_sizes, dtype=int)
+	if block_sizes.sum() != n_working:
+		raise ValueError('block sizes must sum to number of working '
+						 'voxels, {}'.format(n_working))
+
+	assignments = regcluster(nearest_triple(downsampling_factor), geom)
+	assignments = assignments[perm_geom2working][perm_working2sorted]
+
+	# relabel clusters contiguously within each block, ordered by label
+	block_ids = repeat(arange(len(block_sizes)), block_sizes)
+	n_labels = int(assignments.max()) + 1
+	keys, labels = unique(block_ids * n_labels + assignments,
+						  return_inverse=True)
+	cluster_sizes = bincount(keys / n_labels, minlength=len(block_sizes))
+	cluster_offsets = concatenate(([0], cumsum(cluster_sizes)[:-1]))
+	assignments = (labels - cluster_offsets[block_ids]).astype(c_size_t)
+
+	return (assignments, cluster_sizes, perm_geom2working,
+			perm_working2sorted, block_sizes)
 
 class UpsamplingVector(object):
 	def __init__(self, size1=None, size2=None, indices=None):
@@ -135,28 +179,34 @@ class UpsamplingVector(object):
 	def clean_assignments(self):
 		""" eliminate non-contiguous assignments
 		"""
-		idx_order = self.indices.argsort()
-
-		unit_incr = 0
-		curr = self.min_assignment
-
-		for idx in idx_order:
-			if self.indices[idx] != curr:
-				unit_incr += 1
-				curr = self.indices[idx]
-
-			self.indices[idx] = unit_incr
+		self.__indices[:] = unique(self.__indices, return_inverse=True)[1]
 
 	def recalculate_size(self):
 		self.__size2 = self.max_assignment + 1
 
 	@property
 	def counts(self):
-		self.__counts *= 0
-		for idx in self.__indices:
-			self.__counts[idx] += 1
+		self.__counts = bincount(self.__indices, minlength=self.__size2)
 		return self.__counts
 
+def row_batches(A, batch_size, dtype):
+	"""
+	Iterate over C-contiguous batches of at most batch_size rows.
+
+	A is either a 2-D array (e.g., a numpy.memmap), sliced batchwise so
+	that only one batch is read into memory at a time, or a callable
+	returning an iterator over 2-D row chunks, which are split into
+	batches as needed.
+	"""
+	if callable(A):
+		chunks = A()
+	else:
+		chunks = (A[i : i + batch_size] for i in xrange(
+				  0, A.shape[0], batch_size))
+	for chunk in chunks:
+		for i in xrange(0, chunk.shape[0], batch_size):
+			yield ascontiguousarray(chunk[i : i + batch_size], dtype=dtype)
+
 class ClusteringTypes(object):
 	def __init__(self, backend):
 		if backend.cluster is None:
@@ -168,18 +218,54 @@ class ClusteringTypes(object):
 			REASSIGN_RTOL_DEFAULT = 1e-2
 			MAXITER_DEFAULT = 500
 			VERBOSE_DEFAULT = 1
+			ALGORITHMS = {
+				'lloyd': lib.enums.OkKmeansLloyd,
+				'hamerly': lib.enums.OkKmeansHamerly,
+				'elkan': lib.enums.OkKmeansElkan,
+			}
+			INITS = {
+				None: lib.enums.OkKmeansInitAssignments,
+				'k-means++': lib.enums.OkKmeansInitPlusPlus,
+				'k-means||': lib.enums.OkKmeansInitParallel,
+			}
+			SEARCHES = {
+				'auto': lib.enums.OkClusterSearchAuto,
+				'dense': lib.enums.OkClusterSearchDense,
+				'kdtree': lib.enums.OkClusterSearchKDTree,
+			}
 
 			def __init__(self, m, distance_tol=2e-2, assignment_tol=1e-2,
-						 maxiter=500, verbose=1):
+						 maxiter=500, verbose=1, algorithm='lloyd',
+						 init=None, seed=None, search='auto', num_threads=0):
 				self.distance_tol = float(distance_tol)
 				self.assignment_tol = int(ceil(assignment_tol * m))
 				self.maxiter = int(maxiter)
 				self.verbose = abs(int(verbose))
+				if algorithm not in self.ALGORITHMS:
+					raise ValueError('argument "algorithm" must be one of '
+									 '{}'.format(self.ALGORITHMS.keys()))
+				self.algorithm = algorithm
+				if init not in self.INITS:
+					raise ValueError('argument "init" must be one of '
+									 '{}'.format(self.INITS.keys()))
+				self.init = init
+				self.seed = randint(2**31) if seed is None else int(seed)
+				if search not in self.SEARCHES:
+					raise ValueError('argument "search" must be one of '
+									 '{}'.format(self.SEARCHES.keys()))
+				self.search = search
+				self.num_threads = int(num_threads)
+				if self.num_threads < 0:
+					raise ValueError('argument "num_threads" must be >= 0')
 
 			@property
 			def pointer(self):
 				return lib.kmeans_settings(self.distance_tol, self.assignment_tol,
-										   self.maxiter, self.verbose)
+										   self.maxiter, self.verbose,
+										   self.ALGORITHMS[self.algorithm],
+										   self.INITS[self.init], self.seed,
+										   self.SEARCHES[self.search],
+										   self.num_threads)
 
 		self.ClusteringSettings = ClusteringSettings
 
@@ -212,6 +298,27 @@ class ClusteringTypes(object):
 			def pointer(self):
 				return self.__kmeans_work
 
+			@property
+			def distance_evals(self):
+				""" vector-centroid distances evaluated by the last run """
+				if self.pointer is None:
+					return 0
+				return cast(self.pointer,
+							lib.kmeans_work_p).contents.h.distance_evals
+
+			@property
+			def profile(self):
+				"""
+				iterations and cumulative assignment/centroid update times
+				of the last run
+				"""
+				if self.pointer is None:
+					return dict(iters=0, assign_time=0., update_time=0.)
+				h = cast(self.pointer, lib.kmeans_work_p).contents.h
+				return dict(iters=int(h.iters),
+							assign_time=float(h.assign_time),
+							update_time=float(h.update_time))
+
 			def resize(self, m, k, n=None):
 				n = self.n if n is None else n
 				M = self.m_max
@@ -229,6 +336,35 @@ class ClusteringTypes(object):
 
 		self.ClusteringWork = ClusteringWork
 
+		class MiniBatchWork(object):
+			def __init__(self, batch_size, k, n):
+				self.batch_size = batch_size
+				self.k = k
+				self.n = n
+				self.__work = None
+				backend.increment_cobject_count()
+				self.__work = lib.kmeans_minibatch_easy_init(batch_size, k, n)
+				if self.__work is None:
+					backend.decrement_cobject_count()
+					raise RuntimeError('mini-batch k-means work '
+									   'initialization failed')
+
+			def __del__(self):
+				self.free()
+
+			@property
+			def pointer(self):
+				return self.__work
+
+			def free(self):
+				if self.pointer is None:
+					return
+				lib.kmeans_minibatch_easy_finish(self.pointer)
+				self.__work = None
+				backend.decrement_cobject_count()
+
+		self.MiniBatchWork = MiniBatchWork
+
 		class Clustering(object):
 
 			def __init__(self):
@@ -252,6 +388,15 @@ class ClusteringTypes(object):
 				else:
 					return lib.enums.CblasColMajor
 
+			def __as_buffer(self, array_, dtype):
+				""" contiguous array of type dtype, sharing memory with
+					array_ if possible
+				"""
+				if array_.dtype == dtype and (array_.flags.c_contiguous or
+											  array_.flags.f_contiguous):
+					return array_
+				return ascontiguousarray(array_, dtype=dtype)
+
 			@property
 			def kmeans_work(self):
 				return self.__kmeans_work
@@ -273,7 +418,7 @@ class ClusteringTypes(object):
 				if not isinstance(A, ndarray) and len(A.shape) != 2:
 					raise ValueError('argument "A" must be a 2-D {}'.format(
 						ndarray))
-				self.__A = A.astype(lib.pyfloat)
+				self.__A = self.__as_buffer(A, lib.pyfloat)
 				self.__A_ptr = self.A.ctypes.data_as(lib.ok_float_p)
 				self.__order_A = self.__get_order(self.A)
 
@@ -295,7 +440,7 @@ class ClusteringTypes(object):
 					raise ValueError('argument "C" must be a 2-D {}'.format(
 						ndarray))
 
-				self.__C = C.astype(lib.pyfloat)
+				self.__C = self.__as_buffer(C, lib.pyfloat)
 				self.__C_ptr = self.C.ctypes.data_as(lib.ok_float_p)
 				self.__order_C = self.__get_order(self.C)
 				self.__counts = zeros(self.C.shape[0], dtype=lib.pyfloat)
@@ -316,7 +461,7 @@ class ClusteringTypes(object):
 			@a2c.setter
 			def a2c(self, assignments):
 				if isinstance(assignments, ndarray) and len(assignments.shape) == 1:
-					self.__a2c = assignments.astype(c_size_t)
+					self.__a2c = self.__as_buffer(assignments, c_size_t)
 					self.__a2c_ptr = self.a2c.ctypes.data_as(lib.c_size_t_p)
 
 			@property
@@ -344,6 +489,17 @@ class ClusteringTypes(object):
 									 stride_a2c, stride_counts)
 
 			def kmeans_inplace(self, A, C, assignments, settings=None):
+				"""
+				k-means clustering of the rows of A, starting from centroids
+				C and assignments.
+
+				Empty clusters are dropped and the remaining clusters
+				relabeled contiguously in C, so that the returned centroids,
+				assignments, and counts are views of (at most) the leading
+				rows of C, of assignments, and of the counts buffer. When C
+				has the library's float type and assignments has type
+				c_size_t, both are written in place without copies.
+				"""
 				# TODO: check dimension compatibility
 				self.A = A
 				self.C = C
@@ -359,70 +515,336 @@ class ClusteringTypes(object):
 				if settings is None:
 					settings = ClusteringSettings(m)
 
-				lib.kmeans_easy_run(self.kmeans_work.pointer, settings.pointer,
-									self.io)
-
-				u = UpsamplingVector(indices=self.a2c)
-				u.clean_assignments()
-				k_out = u.max_assignment + 1
-
-				C *= 0
-				for idx_a, idx_c in enumerate(u.indices):
-					C[idx_c, :] += A[idx_a, :]
-
-				for i, ct in enumerate(u.counts[:k_out]):
-					C[i, :] *= 1. / ct
-
-				return C[:k_out, :], u.indices, u.counts[:k_out]
-
-			def kmeans(self, A, k, assignments, settings=None):
+				io = self.io
+				k_out = c_size_t()
+				with backend.thread_budget(lib):
+					err = lib.kmeans_easy_run(self.kmeans_work.pointer,
+											  settings.pointer, io)
+				if err:
+					raise RuntimeError('call to {} failed with error {}'
+									   ''.format('kmeans_easy_run', err))
+				err = lib.kmeans_easy_compact(self.kmeans_work.pointer, io,
+											  byref(k_out))
+				if err:
+					raise RuntimeError('call to {} failed with error {}'
+									   ''.format('kmeans_easy_compact', err))
+				k_out = k_out.value
+
+				return self.C[:k_out, :], self.a2c, self.counts[:k_out]
+
+			def kmeans(self, A, k, assignments=None, settings=None,
+					   init=None, seed=None):
+				"""
+				k-means clustering of the rows of A into k clusters.
+
+				Clustering starts from the given assignments, or, if
+				init='k-means++' or init='k-means||' (the default when no
+				assignments are given), from seeds drawn in C with the
+				optional reproducible seed.
+				"""
+				if assignments is None and init is None:
+					init = 'k-means++'
+				if assignments is None:
+					assignments = zeros(A.shape[0], dtype=c_size_t)
+				if settings is None:
+					settings = ClusteringSettings(A.shape[0])
+				if init is not None:
+					settings.init = init
+				if seed is not None:
+					settings.seed = int(seed)
 				C = zeros((k, A.shape[1]), dtype=lib.pyfloat)
 				return self.kmeans_inplace(A, C, assignments,
 										   settings=settings)
 
-			def blockwise_kmeans_inplace(self, A_blocks, C_blocks,
-										 assignment_blocks, settings_blocks=None):
-
-				max_A = array([A.shape[0] for A in A_blocks]).max()
-				max_C = array([C.shape[0] for C in C_blocks]).max()
+			def kmeans_blocks(self, A, block_sizes, assignments,
+							  cluster_sizes=None, C=None,
+							  settings_blocks=None):
+				"""
+				k-means over independent blocks of consecutive rows of A,
+				run in parallel in C.
+
+				Block b consists of the next block_sizes[b] rows of A and
+				entries of assignments (block-local cluster labels), and
+				has cluster_sizes[b] clusters (by default, one more than
+				its largest label) with initial centroids given by the
+				corresponding rows of C, if provided.
+
+				Centroids, assignments, and counts are compacted per block
+				in C, and returned as lists of per-block views of one
+				centroid buffer, of assignments, and of one counts buffer;
+				assignments of type c_size_t are written in place.
+				"""
+				A = ascontiguousarray(A, dtype=lib.pyfloat)
+				a2c = self.__as_buffer(assignments, c_size_t)
 				n = A.shape[1]
 
+				block_offsets = zeros(len(block_sizes) + 1, dtype=c_size_t)
+				block_offsets[1:] = cumsum(block_sizes)
+				if block_offsets[-1] != A.shape[0] or \
+						block_offsets[-1] != a2c.shape[0]:
+					raise ValueError('block sizes inconsistent with '
+									 'arguments "A" and "assignments"')
+
+				if cluster_sizes is None:
+					cluster_sizes = [
+							int(a2c[block_offsets[b] : block_offsets[b + 1]
+							].max()) + 1 if block_sizes[b] > 0 else 0
+							for b in xrange(len(block_sizes))]
+				cluster_offsets = zeros(len(block_sizes) + 1, dtype=c_size_t)
+				cluster_offsets[1:] = cumsum(cluster_sizes)
+
+				if C is None:
+					C = zeros((int(cluster_offsets[-1]), n),
+							  dtype=lib.pyfloat)
+				C = ascontiguousarray(C, dtype=lib.pyfloat)
+				counts = zeros(C.shape[0], dtype=lib.pyfloat)
+				n_clusters = zeros(len(block_sizes), dtype=c_size_t)
+
+				if settings_blocks is None:
+					settings_blocks = [ClusteringSettings(max(size, 1))
+									   for size in block_sizes]
+				settings = (lib.kmeans_settings * len(block_sizes))(
+						*[sb.pointer for sb in settings_blocks])
+
+				with backend.thread_budget(lib):
+					err = lib.blockwise_kmeans(
+							len(block_sizes),
+							block_offsets.ctypes.data_as(lib.c_size_t_p),
+							cluster_offsets.ctypes.data_as(lib.c_size_t_p),
+							n, A.ctypes.data_as(lib.ok_float_p),
+							C.ctypes.data_as(lib.ok_float_p),
+							a2c.ctypes.data_as(lib.c_size_t_p),
+							counts.ctypes.data_as(lib.ok_float_p),
+							n_clusters.ctypes.data_as(lib.c_size_t_p),
+							settings)
+				if err:
+					raise RuntimeError('call to {} failed with error {}'
+									   ''.format('blockwise_kmeans', err))
+
+				C_final = []
 				assignments_final = []
 				counts_final = []
-				C_final = []
+				for b in xrange(len(block_sizes)):
+					offset_c, k_b = int(cluster_offsets[b]), int(n_clusters[b])
+					C_final.append(C[offset_c : offset_c + k_b, :])
+					assignments_final.append(
+							a2c[block_offsets[b] : block_offsets[b + 1]])
+					counts_final.append(counts[offset_c : offset_c + k_b])
 
-				self.kmeans_work_init(max_A, max_C, n)
-
-				if settings_blocks is None:
-					settings_blocks = [ClusteringSettings(A.shape[0]) for A in A_blocks]
+				return (C_final, assignments_final, counts_final)
 
-				for b in xrange(len(A_blocks)):
-					A = A_blocks[b]
-					C = C_blocks[b]
-					assignments = assignment_blocks[b]
+			def blockwise_kmeans_inplace(self, A_blocks, C_blocks,
+										 assignment_blocks, settings_blocks=None):
+				return self.kmeans_blocks(
+						concatenate(A_blocks),
+						[A.shape[0] for A in A_blocks],
+						concatenate(assignment_blocks).astype(c_size_t),
+						cluster_sizes=[C.shape[0] for C in C_blocks],
+						C=concatenate(C_blocks),
+						settings_blocks=settings_blocks)
 
-					self.kmeans_work.resize(A.shape[0], C.shape[0])
+			def blockwise_kmeans(self, A_blocks, assignment_blocks,
+								 settings_blocks=None):
+				return self.kmeans_blocks(
+						concatenate(A_blocks),
+						[A.shape[0] for A in A_blocks],
+						concatenate(assignment_blocks).astype(c_size_t),
+						settings_blocks=settings_blocks)
 
-					C_out, a2c_out, counts_out = self.kmeans_inplace(
-							A, C, assignments, settings=settings_blocks[b])
+		self.Clustering = Clustering
 
-					assignments_final.append(a2c_out)
-					counts_final.append(counts_out)
-					C_final.append(C_out)
+		class MiniBatchClustering(object):
+			"""
+			Mini-batch k-means over data streamed in batches.
+
+			Only the centroids, counts, and one batch of vectors are
+			resident: A may be a numpy.memmap (e.g., from numpy.load with
+			mmap_mode='r'), or a callable returning a fresh iterator of
+			row chunks for each pass over the data.
+			"""
+			def __init__(self, batch_size=1024):
+				self.batch_size = int(batch_size)
+				self.vectors_processed = 0
+
+			def __call(self, call, *args):
+				err = call(*args)
+				if err:
+					raise RuntimeError('call to {} failed with error {}'
+									   ''.format(call.__name__, err))
+
+			def kmeans(self, A, k, n, epochs=1, C=None, init='k-means++',
+					   seed=None, assign=True):
+				"""
+				Cluster the rows of A (length n) into k clusters.
+
+				Centroids start from C if given, or are seeded from the
+				first batch by init='k-means++' or init='k-means||'. Each
+				epoch streams over A once, updating the centroids per
+				batch. If assign is True, a final pass streams over A
+				again to assign every vector to its nearest centroid.
+
+				Returns (C, assignments, counts); assignments is None if
+				assign is False, and counts tallies the vectors seen per
+				cluster during the updates (or in the final assignment).
+				"""
+				order = lib.enums.CblasRowMajor
+				work = MiniBatchWork(self.batch_size, k, n)
+				C_out = zeros((k, n), dtype=lib.pyfloat)
+				counts = zeros(k, dtype=lib.pyfloat)
+				C_ptr = C_out.ctypes.data_as(lib.ok_float_p)
+				counts_ptr = counts.ctypes.data_as(lib.ok_float_p)
+				self.vectors_processed = 0
+
+				try:
+					if C is not None:
+						C_out[:] = C
+						self.__call(lib.kmeans_minibatch_easy_load,
+									work.pointer, C_ptr, order, counts_ptr,
+									1)
+
+					for epoch in xrange(int(epochs)):
+						for batch in row_batches(A, self.batch_size,
+												 lib.pyfloat):
+							batch_ptr = batch.ctypes.data_as(lib.ok_float_p)
+							if C is None and self.vectors_processed == 0:
+								s = ClusteringSettings(1, init=init,
+													   seed=seed)
+								self.__call(lib.kmeans_minibatch_easy_seed,
+											work.pointer, batch_ptr, order,
+											batch.shape[0],
+											s.INITS[s.init], s.seed)
+							self.__call(lib.kmeans_minibatch_easy_update,
+										work.pointer, batch_ptr, order,
+										batch.shape[0])
+							self.vectors_processed += batch.shape[0]
+
+					self.__call(lib.kmeans_minibatch_easy_extract, C_ptr,
+								order, counts_ptr, 1, work.pointer)
+
+					assignments = None
+					if assign:
+						assignment_batches = []
+						for batch in row_batches(A, self.batch_size,
+												 lib.pyfloat):
+							a2c = zeros(batch.shape[0], dtype=c_size_t)
+							self.__call(lib.kmeans_minibatch_easy_assign,
+										work.pointer,
+										batch.ctypes.data_as(lib.ok_float_p),
+										order, batch.shape[0],
+										a2c.ctypes.data_as(lib.c_size_t_p),
+										1)
+							assignment_batches.append(a2c)
+						assignments = concatenate(assignment_batches)
+						counts = bincount(assignments.astype(int),
+										  minlength=k).astype(lib.pyfloat)
+				finally:
+					work.free()
+
+				return C_out, assignments, counts
+
+		self.MiniBatchClustering = MiniBatchClustering
+
+		class KMeansModel(object):
+			"""
+			Fitted k-means model: nearest-centroid assignment of new data.
+
+			The centroids C (k x n) and their squared norms are loaded into
+			a C work object once, at construction; predict() then streams
+			A_new in batches of batch_size rows (A_new may be a
+			numpy.memmap, or a callable returning an iterator of row
+			chunks, as for MiniBatchClustering).
+
+			If single_precision is True, centroids and batches are held in
+			32-bit floats (requires the single precision library build).
+			"""
+			BATCH_SIZE_DEFAULT = 4096
+
+			def __init__(self, C, batch_size=BATCH_SIZE_DEFAULT,
+						 single_precision=False):
+				self.__work = None
+				self.lib = lib
+				if bool(single_precision) != bool(lib.FLOAT):
+					self.lib = backend.cluster_lib_loader.get(
+							single_precision=bool(single_precision),
+							gpu=backend.device_is_gpu)
+					if self.lib is None:
+						raise ValueError('no clustering library found for '
+										 'single_precision={}'.format(
+										 single_precision))
+				if not isinstance(C, ndarray) or len(C.shape) != 2:
+					raise TypeError('argument "C" must be a 2-D {}'.format(
+									ndarray))
+
+				self.C = ascontiguousarray(C, dtype=self.lib.pyfloat)
+				self.k, self.n = self.C.shape
+				self.batch_size = int(batch_size)
+
+				backend.increment_cobject_count()
+				self.__work = self.lib.kmeans_predict_easy_init(
+						self.C.ctypes.data_as(self.lib.ok_float_p),
+						self.lib.enums.CblasRowMajor, self.k, self.n,
+						self.batch_size)
+				if self.__work is None:
+					backend.decrement_cobject_count()
+					raise RuntimeError('k-means model initialization failed')
 
-				return (C_final, assignments_final, counts_final)
+			def __del__(self):
+				self.free()
 
-			def blockwise_kmeans(self, A_blocks, assignment_blocks,
-								 settings_blocks=None):
+			@property
+			def pointer(self):
+				return self.__work
 
-				C_blocks = []
-				for b in xrange(len(A_blocks)):
-					size1 = assignment_blocks[b].max() + 1
-					size2 = A_blocks[b].shape[1]
-					C_blocks.append(zeros((size1, size2), dtype=lib.pyfloat))
+			@property
+			def single_precision(self):
+				return bool(self.lib.FLOAT)
 
-				return self.blockwise_kmeans_inplace(
-						A_blocks, C_blocks, assignment_blocks,
-						settings_blocks=settings_blocks)
+			def free(self):
+				if self.pointer is None:
+					return
+				self.lib.kmeans_predict_easy_finish(self.pointer)
+				self.__work = None
+				backend.decrement_cobject_count()
 
-		self.Clustering = Clustering
+			def predict(self, A_new):
+				""" index of nearest centroid for each row of A_new """
+				if self.pointer is None:
+					raise RuntimeError('k-means model has been freed')
+				assignment_batches = []
+				for batch in row_batches(A_new, self.batch_size,
+										 self.lib.pyfloat):
+					if batch.shape[1] != self.n:
+						raise ValueError('vectors in argument "A_new" must '
+										 'have length {}'.format(self.n))
+					a2c = zeros(batch.shape[0], dtype=c_size_t)
+					with backend.thread_budget(self.lib):
+						err = self.lib.kmeans_predict_easy_run(
+								self.pointer,
+								batch.ctypes.data_as(self.lib.ok_float_p),
+								self.lib.enums.CblasRowMajor, batch.shape[0],
+								a2c.ctypes.data_as(self.lib.c_size_t_p), 1)
+					if err:
+						raise RuntimeError('call to kmeans_predict_easy_run '
+										   'failed with error {}'.format(err))
+					assignment_batches.append(a2c)
+				if len(assignment_batches) == 0:
+					return zeros(0, dtype=c_size_t)
+				return concatenate(assignment_batches)
+
+			def save(self, file):
+				""" write centroids (in the model's precision) to .npz """
+				savez(file, C=self.C, batch_size=self.batch_size)
+
+			@classmethod
+			def load(cls, file, batch_size=None, single_precision=None):
+				""" restore a model written by save() """
+				data = load_npz(file)
+				C = data['C']
+				if batch_size is None:
+					batch_size = int(data['batch_size'])
+				if single_precision is None:
+					single_precision = C.dtype.itemsize == 4
+				return cls(C, batch_size=batch_size,
+						   single_precision=single_precision)
+
+		self.KMeansModel = KMeansModel
@@ -184,7 +184,7 @@ class PogsTypes(object):
 		class SolverSettings(object):
 			def __init__(self, **options):
 				self.c = PogsSettings(0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, None,
-									  None)
+									  None, 0)
 				lib.set_default_settings(self.c)
 				self.update(**options)
 
@@ -213,6 +213,14 @@ class PogsTypes(object):
 					self.x0 = options['x0'].ctypes.data_as(lib.ok_float_p)
 				if 'nu0' in options:
 					self.nu0 = options['nu0'].ctypes.data_as(ib.ok_float_p)
+				if 'num_threads' in options:
+					self.num_threads = options['num_threads']
+				if 'anderson' in options:
+					self.anderson = options['anderson']
+				if 'infeastol' in options:
+					self.infeastol = options['infeastol']
+				if 'polish' in options:
+					self.polish = options['polish']
 
 			@property
 			def alpha(self):
@@ -380,6 +388,62 @@ class PogsTypes(object):
 					self._n0py = nu0.astype(lib.pyfloat)
 					self.c.nu0 = self._n0py.ctypes.data_as(lib.ok_float_p)
 
+			@property
+			def num_threads(self):
+				return self.c.num_threads
+
+			@num_threads.setter
+			def num_threads(self, num_threads):
+				if not isinstance(num_threads, int):
+					raise TypeError('argument "num_threads" must be of '
+									'type {}'.format(int))
+				elif num_threads < 0:
+					raise ValueError('argument "num_threads" must be >= 0')
+				else:
+					self.c.num_threads = num_threads
+
+			@property
+			def anderson(self):
+				return self.c.anderson
+
+			@anderson.setter
+			def anderson(self, anderson):
+				if not isinstance(anderson, int):
+					raise TypeError('argument "anderson" must be of '
+									'type {}'.format(int))
+				elif anderson < 0:
+					raise ValueError('argument "anderson" must be >= 0')
+				else:
+					self.c.anderson = anderson
+
+			@property
+			def infeastol(self):
+				return self.c.infeastol
+
+			@infeastol.setter
+			def infeastol(self, infeastol):
+				if not isinstance(infeastol, (float, int)):
+					raise TypeError('argument "infeastol" must be {} or '
+									'{}'.format(float, int))
+				elif infeastol < 0:
+					raise ValueError('argument "infeastol" must be >= 0')
+				else:
+					self.c.infeastol = infeastol
+
+			@property
+			def polish(self):
+				return self.c.polish
+
+			@polish.setter
+			def polish(self, polish):
+				if not isinstance(polish, (int, bool)):
+					raise TypeError('argument "polish" must be of '
+									'type {} or {}'.format(int, bool))
+				elif polish not in (0, 1, True, False):
+					raise ValueError('argument "polish" must be 0 or 1')
+				else:
+					self.c.polish = int(polish)
+
 			def __str__(self):
 				return str(
 						'alpha: {}\n'.format(self.alpha).join(
@@ -424,6 +488,17 @@ class PogsTypes(object):
 			def converged(self):
 			    return self.c.converged
 
+			@property
+			def status(self):
+				"""
+				'solved', 'primal infeasible', 'dual infeasible' or
+				'unconverged'
+				"""
+				return {lib.enums.OkPogsSolved: 'solved',
+						lib.enums.OkPogsPrimalInfeasible: 'primal infeasible',
+						lib.enums.OkPogsDualInfeasible: 'dual infeasible'}.get(
+						self.c.status, 'unconverged')
+
 			@property
 			def objval(self):
 			    return self.c.obj
@@ -432,6 +507,30 @@ class PogsTypes(object):
 			def rho(self):
 				return self.c.rho
 
+			@property
+			def phase_times(self):
+				""" cumulative time in each phase of the solver loop """
+				return dict(prox=self.c.prox_time,
+							project=self.c.project_time,
+							dual=self.c.dual_time,
+							check=self.c.check_time,
+							adapt=self.c.adapt_time,
+							anderson=self.c.anderson_time,
+							polish=self.c.polish_time)
+
+			@property
+			def polished(self):
+				""" whether the output is the polished solution """
+				return bool(self.c.polished)
+
+			@property
+			def gemv_count(self):
+				return self.c.gemv_count
+
+			@property
+			def cg_iters(self):
+				return self.c.cg_iters
+
 			def __str__(self):
 				return str(
 						'error: {}\n'.format(self.err).join(
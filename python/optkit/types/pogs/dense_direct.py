@@ -64,13 +64,9 @@ class PogsDenseDirectTypes(PogsTypes):
 
 
 			def __update_function_vectors(self, f, g):
-				for i in xrange(f.size):
-					self.__f[i] = lib.function(f.h[i], f.a[i], f.b[i],
-												   f.c[i], f.d[i], f.e[i])
-
-				for j in xrange(g.size):
-					self.__g[j] = lib.function(g.h[j], g.a[j], g.b[j],
-												   g.c[j], g.d[j], g.e[j])
+				for field in ('h', 'a', 'b', 'c', 'd', 'e'):
+					self.__f[field] = getattr(f, field)
+					self.__g[field] = getattr(g, field)
 
 			def solve(self, f, g, **options):
 				if self.c_solver is None:
@@ -93,10 +89,70 @@ class PogsDenseDirectTypes(PogsTypes):
 
 				self.__update_function_vectors(f, g)
 				self.settings.update(**options)
-				lib.pogs_solve(self.c_solver, self.__f_c, self.__g_c,
-								   self.settings.c, self.info.c, self.output.c)
+				with self.__backend.thread_budget(lib):
+					lib.pogs_solve(self.c_solver, self.__f_c, self.__g_c,
+								   self.settings.c, self.info.c,
+								   self.output.c)
 				self.first_run = False
 
+			def solve_batch(self, f_list, g_list, **options):
+				"""
+				Solve one problem per pair of objectives (f, g) from f_list
+				and g_list, iterating all of them together with
+				matrix-matrix products; every problem starts cold.
+
+				Returns lists of SolverInfo and SolverOutput, one per
+				problem.
+				"""
+				if self.c_solver is None:
+					raise ValueError(
+							'No solver intialized, solve_batch() call invalid')
+
+				if len(f_list) != len(g_list):
+					raise ValueError('inputs f_list, g_list must have the '
+									 'same length')
+
+				K = len(f_list)
+				f_py, g_py = [], []
+				f_c = (lib.function_vector * K)()
+				g_c = (lib.function_vector * K)()
+				for k, (f, g) in enumerate(zip(f_list, g_list)):
+					if not (isinstance(f, Objective) and
+							isinstance(g, Objective)):
+						raise TypeError(
+							'inputs f, g must be of type {} \nprovided: {}, '
+							'{}'.format(Objective, type(f), type(g)))
+
+					if not (f.size == self.m and g.size == self.n):
+						raise ValueError(
+							'inputs f, g not compatibly sized with solver'
+							'\nsolver dimensions ({}, {})\n provided: '
+							'({}{})'.format(self.m, self.n, f.size, g.size))
+
+					f_py.append(zeros(self.m).astype(lib.function))
+					g_py.append(zeros(self.n).astype(lib.function))
+					for field in ('h', 'a', 'b', 'c', 'd', 'e'):
+						f_py[k][field] = getattr(f, field)
+						g_py[k][field] = getattr(g, field)
+					f_c[k] = lib.function_vector(self.m,
+							f_py[k].ctypes.data_as(lib.function_p))
+					g_c[k] = lib.function_vector(self.n,
+							g_py[k].ctypes.data_as(lib.function_p))
+
+				infos = [SolverInfo() for _ in xrange(K)]
+				outputs = [SolverOutput(self.m, self.n) for _ in xrange(K)]
+				info_c = (PogsInfo * K)()
+				output_c = (PogsOutput * K)(*[o.c for o in outputs])
+
+				self.settings.update(**options)
+				with self.__backend.thread_budget(lib):
+					lib.pogs_solve_batch(self.c_solver, K, f_c, g_c,
+										 self.settings.c, info_c, output_c)
+
+				for k, info in enumerate(infos):
+					info.c = info_c[k]
+				return infos, outputs
+
 			def load(self, directory, name):
 				filename = path.join(directory, name)
 				if not '.npz' in name:
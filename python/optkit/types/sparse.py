@@ -0,0 +1,225 @@
+from numpy import ndarray, int32, int64
+from scipy.sparse import csr_matrix, csc_matrix
+
+def sparse_view_arrays(lib, A, shape=None, order=None):
+	"""
+	Validate buffers for a zero-copy sparse view.
+
+	A is either a scipy.sparse CSR/CSC matrix or a tuple of 1-D arrays
+	(data, indices, indptr), e.g., numpy.memmap's, in which case
+	keyword arguments shape and order (lib.enums.CblasRowMajor for CSR,
+	lib.enums.CblasColMajor for CSC) are required.
+
+	Returns (data, indices, indptr, shape, order). No conversion is
+	performed: the arrays must already have the library's float type and
+	a common 32- or 64-bit integer index type, since a converted copy
+	would not alias the caller's storage.
+	"""
+	if isinstance(A, (csr_matrix, csc_matrix)):
+		data, indices, indptr = A.data, A.indices, A.indptr
+		shape = A.shape
+		order = lib.enums.CblasRowMajor if isinstance(A, csr_matrix) else \
+				lib.enums.CblasColMajor
+	elif isinstance(A, tuple) and len(A) == 3:
+		data, indices, indptr = A
+		if shape is None or order is None:
+			raise ValueError('keyword arguments "shape" and "order" required '
+							 'when argument "A" is a tuple of arrays')
+	else:
+		raise TypeError('argument "A" must be a {}, a {}, or a tuple of '
+						'arrays (data, indices, indptr)'.format(
+						csr_matrix, csc_matrix))
+
+	if not all([isinstance(arr, ndarray) for arr in (data, indices, indptr)]):
+		raise TypeError('sparse view buffers must be of type {}'.format(
+						ndarray))
+	if not all([arr.flags.c_contiguous for arr in (data, indices, indptr)]):
+		raise ValueError('sparse view buffers must be contiguous')
+	if data.dtype != lib.pyfloat:
+		raise TypeError('sparse view values must have dtype {}'.format(
+						lib.pyfloat))
+	if indices.dtype != indptr.dtype or indices.dtype not in (int32, int64):
+		raise TypeError('sparse view indices and pointers must share dtype '
+						'{} or {}'.format(int32, int64))
+
+	m, n = shape = (int(shape[0]), int(shape[1]))
+	ptrlen = m + 1 if order == lib.enums.CblasRowMajor else n + 1
+	if len(indptr) != ptrlen or len(indices) < indptr[-1] or \
+	   len(data) < indptr[-1]:
+		raise ValueError('sparse view buffer lengths inconsistent with '
+						 'shape {}'.format(shape))
+
+	return data, indices, indptr, shape, order
+
+class SparseMatrixView(object):
+	"""
+	C sparse matrix wrapping caller-owned CSR/CSC buffers without copies.
+
+	The view holds references to the wrapped arrays until it is freed, so
+	the caller's matrix (or memory map) stays alive at least as long as
+	the C object. Value-modifying C calls write through to the arrays.
+	"""
+	def __init__(self, lib, A, shape=None, order=None):
+		self.__lib = lib
+		self.__c = None
+		self.__arrays = None
+		data, indices, indptr, self.shape, self.order = sparse_view_arrays(
+				lib, A, shape=shape, order=order)
+		m, n = self.shape
+		nnz = int(indptr[-1])
+
+		if indices.dtype == int64:
+			c = lib.sparse_matrix64(0, 0, 0, 0, None, None, None, self.order,
+									0)
+			err = lib.sp_matrix64_view_array(
+					c, m, n, nnz, data.ctypes.data_as(lib.ok_float_p),
+					indices.ctypes.data_as(lib.ok_int64_p),
+					indptr.ctypes.data_as(lib.ok_int64_p), self.order)
+			self.__free = lib.sp_matrix64_free
+		else:
+			c = lib.sparse_matrix(0, 0, 0, 0, None, None, None, self.order, 0)
+			err = lib.sp_matrix_view_array(
+					c, m, n, nnz, data.ctypes.data_as(lib.ok_float_p),
+					indices.ctypes.data_as(lib.ok_int_p),
+					indptr.ctypes.data_as(lib.ok_int_p), self.order)
+			self.__free = lib.sp_matrix_free
+
+		if err:
+			raise RuntimeError('sparse matrix view construction failed')
+
+		self.__c = c
+		self.__arrays = (data, indices, indptr)
+		self.index64 = indices.dtype == int64
+
+	def __del__(self):
+		self.free()
+
+	@property
+	def c(self):
+		return self.__c
+
+	@property
+	def arrays(self):
+		return self.__arrays
+
+	def free(self):
+		if self.__c is None:
+			return
+		self.__free(self.__c)
+		self.__c = None
+		self.__arrays = None
+
+class SparseOperatorView(object):
+	"""
+	POGS sparse operator wrapping caller-owned CSR/CSC buffers.
+
+	The buffers are not modified: solvers equilibrate a private copy of
+	the values, so read-only arrays (e.g., memory maps opened with mode
+	'r') can be wrapped. Indices may be 32- or 64-bit.
+	"""
+	def __init__(self, lib, A, shape=None, order=None):
+		self.__lib = lib
+		self.__c_ptr = None
+		self.__arrays = None
+		data, indices, indptr, self.shape, self.order = sparse_view_arrays(
+				lib, A, shape=shape, order=order)
+		m, n = self.shape
+
+		if indices.dtype == int64:
+			c_ptr = lib.pogs_sparse_operator_view64(
+					data.ctypes.data_as(lib.ok_float_p),
+					indices.ctypes.data_as(lib.ok_int64_p),
+					indptr.ctypes.data_as(lib.ok_int64_p), m, n,
+					int(indptr[-1]), self.order)
+		else:
+			c_ptr = lib.pogs_sparse_operator_view(
+					data.ctypes.data_as(lib.ok_float_p),
+					indices.ctypes.data_as(lib.ok_int_p),
+					indptr.ctypes.data_as(lib.ok_int_p), m, n,
+					int(indptr[-1]), self.order)
+		if not c_ptr:
+			raise RuntimeError('sparse operator view construction failed')
+
+		self.__c_ptr = c_ptr
+		self.__arrays = (data, indices, indptr)
+
+	def __del__(self):
+		self.free()
+
+	@property
+	def c_ptr(self):
+		return self.__c_ptr
+
+	@property
+	def arrays(self):
+		return self.__arrays
+
+	def free(self):
+		if self.__c_ptr is None:
+			return
+		self.__lib.pogs_sparse_operator_free(self.__c_ptr)
+		self.__c_ptr = None
+		self.__arrays = None
+
+class SparseOperator(object):
+	"""
+	POGS sparse operator holding a C copy of a scipy CSR/CSC matrix.
+
+	Values are converted to the library's float type; 32- and 64-bit
+	index arrays (e.g., scipy's int64 indices for large matrices) are
+	copied as is. If index_width is given, the operator also builds a
+	compressed index with offsets of that many bits (16 or 32, or 0 for
+	the narrowest that fits), which its matrix-vector products then use;
+	this is CPU-only.
+	"""
+	def __init__(self, lib, A, index_width=None):
+		self.__lib = lib
+		self.__c_ptr = None
+		if not isinstance(A, (csr_matrix, csc_matrix)):
+			raise TypeError('argument "A" must be a {} or a {}'.format(
+							csr_matrix, csc_matrix))
+		self.shape = m, n = A.shape
+		self.order = lib.enums.CblasRowMajor if isinstance(A, csr_matrix) \
+					 else lib.enums.CblasColMajor
+
+		data = A.data.astype(lib.pyfloat)
+		indices, indptr = A.indices, A.indptr
+		if indices.dtype == int64 or indptr.dtype == int64:
+			indices = indices.astype(int64)
+			indptr = indptr.astype(int64)
+			c_ptr = lib.pogs_sparse_operator_gen64(
+					data.ctypes.data_as(lib.ok_float_p),
+					indices.ctypes.data_as(lib.ok_int64_p),
+					indptr.ctypes.data_as(lib.ok_int64_p), m, n, A.nnz,
+					self.order)
+		else:
+			indices = indices.astype(int32)
+			indptr = indptr.astype(int32)
+			c_ptr = lib.pogs_sparse_operator_gen(
+					data.ctypes.data_as(lib.ok_float_p),
+					indices.ctypes.data_as(lib.ok_int_p),
+					indptr.ctypes.data_as(lib.ok_int_p), m, n, A.nnz,
+					self.order)
+		if not c_ptr:
+			raise RuntimeError('sparse operator construction failed')
+		self.__c_ptr = c_ptr
+		self.index64 = indices.dtype == int64
+
+		if index_width is not None:
+			if lib.sparse_operator_compress_index(c_ptr, int(index_width)):
+				self.free()
+				raise RuntimeError('sparse operator index compression '
+								   'failed')
+
+	def __del__(self):
+		self.free()
+
+	@property
+	def c_ptr(self):
+		return self.__c_ptr
+
+	def free(self):
+		if self.__c_ptr is None:
+			return
+		self.__lib.pogs_sparse_operator_free(self.__c_ptr)
+		self.__c_ptr = None
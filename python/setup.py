@@ -144,7 +144,8 @@ setup(
               'optkit.libs',
               'optkit.utils',
               'optkit.types',
-              'optkit.types.pogs'],
+              'optkit.types.pogs',
+              'optkit.bench'],
     license='GPLv3',
     zip_safe=False,
     description='Python optimization toolkit',
@@ -1,5 +1,9 @@
 #include "optkit_clustering.h"
 
+#ifdef _OPENMP
+#include <omp.h>
+#endif
+
 #ifdef __cplusplus
 extern "C" {
 #endif
@@ -21,22 +25,22 @@ ok_status assign_clusters_l2(matrix * A, matrix * C,
 	OK_CHECK_UPSAMPLINGVEC(a2c);
 	OK_CHECK_PTR(h);
 
-	size_t i;
+	size_t i, reassigned = 0;
 	upsamplingvec * u = &h->a2c_tentative;
 
 	if (A->size1 != a2c->size1 || a2c->size2 > C->size1 ||
 		A->size2 != C->size2)
 		return OK_SCAN_ERR( OPTKIT_ERROR_DIMENSION_MISMATCH );
 
-	h->reassigned = 0;
 	#ifdef _OPENMP
-	#pragma omp parallel for
+	#pragma omp parallel for reduction(+:reassigned)
 	#endif
 	for (i = 0; i < A->size1; ++i)
 		if (a2c->indices[i] != u->indices[i]) {
 			a2c->indices[i] = u->indices[i];
-			++h->reassigned;
+			++reassigned;
 		}
+	h->reassigned = reassigned;
 	return OPTKIT_SUCCESS;
 }
 
@@ -85,7 +89,8 @@ ok_status assign_clusters_l2_lInf_cap(matrix * A, matrix * C,
 		A->size2 != C->size2)
 		return OK_SCAN_ERR( OPTKIT_ERROR_DIMENSION_MISMATCH );
 
-	size_t i, block, row_stride, idx_stride, row_strideA, row_strideC;
+	size_t i, block, end, row_stride, idx_stride, row_strideA, row_strideC;
+	size_t reassigned = 0;
 	int strideA, strideC;
 	matrix * A_blk;
 	upsamplingvec * u = &h->a2c_tentative;
@@ -103,12 +108,13 @@ ok_status assign_clusters_l2_lInf_cap(matrix * A, matrix * C,
 	row_strideC = (C->order == CblasRowMajor) ? C->ld : 1;
 	strideC = (C->order == CblasRowMajor) ? 1 : (int) C->ld;
 
-	h->reassigned = 0;
-	for (block = 0; block < A->size1; block += kBlockSize)
+	for (block = 0; block < A->size1; block += kBlockSize) {
+		end = block + kBlockSize < A->size1 ? block + kBlockSize :
+			A->size1;
 		#ifdef _OPENMP
-		#pragma omp parallel for
+		#pragma omp parallel for reduction(+:reassigned)
 		#endif
-		for (i = block; i < block + kBlockSize && i < A->size1; ++i) {
+		for (i = block; i < end; ++i) {
 			if (a2c->indices[i] == u->indices[i]) {
 				continue;
 			} else if (maxdist >= __dist_lInf_A_minus_UC_i(A->data,
@@ -118,9 +124,942 @@ ok_status assign_clusters_l2_lInf_cap(matrix * A, matrix * C,
 				(const int *) &A->size2)) {
 
 				a2c->indices[i] = u->indices[i];
-				++h->reassigned;
+				++reassigned;
+			}
+		}
+	}
+	h->reassigned = reassigned;
+	return err;
+}
+
+/*
+ * squared Euclidean distance between row i of matrix A and row j of
+ * matrix B
+ */
+static ok_float __dist_l2sq_rows(const matrix * A, const size_t i,
+	const matrix * B, const size_t j)
+{
+	size_t idx;
+	size_t strideA = (A->order == CblasRowMajor) ? 1 : A->ld;
+	size_t strideB = (B->order == CblasRowMajor) ? 1 : B->ld;
+	const ok_float * a = A->data + i * ((A->order == CblasRowMajor) ?
+		A->ld : 1);
+	const ok_float * b = B->data + j * ((B->order == CblasRowMajor) ?
+		B->ld : 1);
+	ok_float diff, sum = kZero;
+
+	for (idx = 0; idx < A->size2; ++idx) {
+		diff = a[idx * strideA] - b[idx * strideB];
+		sum += diff * diff;
+	}
+	return sum;
+}
+
+/*
+ * Euclidean distance between row i of matrix A and row j of matrix B
+ */
+static ok_float __dist_l2_rows(const matrix * A, const size_t i,
+	const matrix * B, const size_t j)
+{
+	return MATH(sqrt)(__dist_l2sq_rows(A, i, B, j));
+}
+
+ok_status kmeans_bounds_alloc(kmeans_bounds * b, size_t n_vectors,
+	size_t n_clusters, size_t vec_length,
+	const enum OPTKIT_KMEANS_ALGORITHM algorithm)
+{
+	ok_status err = OPTKIT_SUCCESS;
+	size_t n_lower;
+	OK_CHECK_PTR(b);
+
+	if (algorithm != OkKmeansHamerly && algorithm != OkKmeansElkan)
+		return OK_SCAN_ERR( OPTKIT_ERROR_DOMAIN );
+
+	memset(b, 0, sizeof(*b));
+	b->algorithm = algorithm;
+	b->n_vectors = n_vectors;
+	b->n_clusters = n_clusters;
+	n_lower = (algorithm == OkKmeansElkan) ? n_vectors * n_clusters :
+		n_vectors;
+
+	ok_alloc(b->upper, n_vectors * sizeof(ok_float));
+	ok_alloc(b->lower, n_lower * sizeof(ok_float));
+	ok_alloc(b->drift, n_clusters * sizeof(ok_float));
+	ok_alloc(b->separation, n_clusters * sizeof(ok_float));
+	if (algorithm == OkKmeansElkan)
+		ok_alloc(b->centroid_dist,
+			n_clusters * n_clusters * sizeof(ok_float));
+
+	if (!b->upper || !b->lower || !b->drift || !b->separation ||
+		(algorithm == OkKmeansElkan && !b->centroid_dist))
+		err = OK_SCAN_ERR( OPTKIT_ERROR_UNALLOCATED );
+	OK_CHECK_ERR( err, matrix_calloc(&b->C_prev, n_clusters, vec_length,
+		CblasRowMajor) );
+	if (err)
+		OK_MAX_ERR( err, kmeans_bounds_free(b) );
+	return err;
+}
+
+ok_status kmeans_bounds_free(kmeans_bounds * b)
+{
+	ok_status err = OPTKIT_SUCCESS;
+	OK_CHECK_PTR(b);
+	if (b->C_prev.data)
+		err = matrix_free(&b->C_prev);
+	ok_free(b->upper);
+	ok_free(b->lower);
+	ok_free(b->drift);
+	ok_free(b->separation);
+	ok_free(b->centroid_dist);
+	memset(b, 0, sizeof(*b));
+	return err;
+}
+
+/*
+ * set separation_k = 1/2 min_{k' != k} ||c_k - c_k'||, and for Elkan
+ * bounds, store all pairwise centroid distances
+ */
+static void __kmeans_centroid_separation(kmeans_bounds * b, const matrix * C)
+{
+	size_t j, l;
+	size_t k = C->size1;
+	ok_float dist;
+
+	for (j = 0; j < k; ++j)
+		b->separation[j] = OK_FLOAT_MAX;
+
+	for (j = 0; j < k; ++j) {
+		if (b->centroid_dist)
+			b->centroid_dist[j * k + j] = kZero;
+		for (l = j + 1; l < k; ++l) {
+			dist = __dist_l2_rows(C, j, C, l);
+			if (b->centroid_dist) {
+				b->centroid_dist[j * k + l] = dist;
+				b->centroid_dist[l * k + j] = dist;
+			}
+			if (dist < b->separation[j])
+				b->separation[j] = dist;
+			if (dist < b->separation[l])
+				b->separation[l] = dist;
+		}
+	}
+	for (j = 0; j < k; ++j)
+		b->separation[j] *= (ok_float) 0.5;
+}
+
+/*
+ * evaluate distances from vector i to all centroids, set the tentative
+ * assignment of vector i to the (first) nearest centroid and initialize
+ * the bounds for vector i
+ */
+static void __kmeans_bounds_reset_row(kmeans_bounds * b, const matrix * A,
+	const matrix * C, upsamplingvec * u, const size_t i)
+{
+	size_t j, jmin = 0;
+	size_t k = C->size1;
+	ok_float dist, dmin = OK_FLOAT_MAX, dmin2 = OK_FLOAT_MAX;
+
+	for (j = 0; j < k; ++j) {
+		dist = __dist_l2_rows(A, i, C, j);
+		if (b->algorithm == OkKmeansElkan)
+			b->lower[i * k + j] = dist;
+		if (dist < dmin) {
+			dmin2 = dmin;
+			dmin = dist;
+			jmin = j;
+		} else if (dist < dmin2) {
+			dmin2 = dist;
+		}
+	}
+	u->indices[i * u->stride] = jmin;
+	b->upper[i] = dmin;
+	if (b->algorithm == OkKmeansHamerly)
+		b->lower[i] = dmin2;
+}
+
+/*
+ * Hamerly's algorithm: one upper and one lower bound per vector; all
+ * k distances for vector i are evaluated only if
+ *
+ *	||a_i - c_u(i)|| > max(separation_u(i), lower_i).
+ */
+static size_t __cluster_hamerly(kmeans_bounds * b, const matrix * A,
+	const matrix * C, upsamplingvec * u)
+{
+	size_t i, a, evals = 0;
+	size_t k = C->size1;
+	ok_float bound;
+
+	#ifdef _OPENMP
+	#pragma omp parallel for private(a, bound) reduction(+:evals)
+	#endif
+	for (i = 0; i < A->size1; ++i) {
+		a = u->indices[i * u->stride];
+		bound = b->separation[a] > b->lower[i] ?
+			b->separation[a] : b->lower[i];
+		if (b->upper[i] <= bound)
+			continue;
+
+		/* tighten upper bound */
+		b->upper[i] = __dist_l2_rows(A, i, C, a);
+		++evals;
+		if (b->upper[i] <= bound)
+			continue;
+
+		__kmeans_bounds_reset_row(b, A, C, u, i);
+		evals += k;
+	}
+	return evals;
+}
+
+/*
+ * Elkan's algorithm: one upper bound and k lower bounds per vector; the
+ * distance from vector i to centroid k is evaluated only if
+ *
+ *	upper_i > lower_ik and upper_i > 1/2 ||c_u(i) - c_k||.
+ */
+static size_t __cluster_elkan(kmeans_bounds * b, const matrix * A,
+	const matrix * C, upsamplingvec * u)
+{
+	size_t i, j, a, evals = 0;
+	size_t k = C->size1;
+	ok_float dist, * lower, * cc;
+	int stale;
+
+	#ifdef _OPENMP
+	#pragma omp parallel for private(j, a, dist, lower, cc, stale) \
+		reduction(+:evals)
+	#endif
+	for (i = 0; i < A->size1; ++i) {
+		a = u->indices[i * u->stride];
+		if (b->upper[i] <= b->separation[a])
+			continue;
+
+		lower = b->lower + i * k;
+		stale = 1;
+		for (j = 0; j < k; ++j) {
+			cc = b->centroid_dist + a * k;
+			if (j == a || b->upper[i] <= lower[j] ||
+				b->upper[i] <= (ok_float) 0.5 * cc[j])
+				continue;
+
+			/* tighten upper bound */
+			if (stale) {
+				b->upper[i] = lower[a] = __dist_l2_rows(A, i, C, a);
+				++evals;
+				stale = 0;
+				if (b->upper[i] <= lower[j] ||
+					b->upper[i] <= (ok_float) 0.5 * cc[j])
+					continue;
+			}
+
+			dist = lower[j] = __dist_l2_rows(A, i, C, j);
+			++evals;
+			if (dist < b->upper[i] || (dist == b->upper[i] && j < a)) {
+				a = j;
+				b->upper[i] = dist;
+			}
+		}
+		u->indices[i * u->stride] = a;
+	}
+	return evals;
+}
+
+/*
+ * cluster with pruning: maintain tentative assignments in h with
+ * triangle inequality bounds, evaluating only those vector-centroid
+ * distances that may change the nearest centroid. tentative assignments
+ * are then finalized exactly as in cluster().
+ */
+ok_status cluster_pruned(matrix * A, matrix * C, upsamplingvec * a2c,
+	cluster_aid * h, kmeans_bounds * b, ok_float maxdist)
+{
+	size_t i, evals = 0;
+	upsamplingvec * u;
+	OK_CHECK_MATRIX(A);
+	OK_CHECK_MATRIX(C);
+	OK_CHECK_UPSAMPLINGVEC(a2c);
+	OK_CHECK_PTR(h);
+	OK_CHECK_PTR(b);
+
+	u = &h->a2c_tentative;
+	if (A->size1 != b->n_vectors || C->size1 != b->n_clusters ||
+		A->size2 != C->size2 || A->size2 != b->C_prev.size2 ||
+		u->size1 != A->size1)
+		return OK_SCAN_ERR( OPTKIT_ERROR_DIMENSION_MISMATCH );
+
+	__kmeans_centroid_separation(b, C);
+
+	if (!b->initialized) {
+		#ifdef _OPENMP
+		#pragma omp parallel for
+		#endif
+		for (i = 0; i < A->size1; ++i)
+			__kmeans_bounds_reset_row(b, A, C, u, i);
+		evals = A->size1 * C->size1;
+		b->initialized = 1;
+	} else if (b->algorithm == OkKmeansHamerly) {
+		evals = __cluster_hamerly(b, A, C, u);
+	} else {
+		evals = __cluster_elkan(b, A, C, u);
+	}
+	h->distance_evals += evals;
+
+	/* retain centroids to measure drift after the centroid update */
+	OK_RETURNIF_ERR( matrix_memcpy_mm(&b->C_prev, C) );
+
+	/* finalize cluster assignements */
+	if (maxdist == OK_INFINITY)
+		return OK_SCAN_ERR(
+			assign_clusters_l2(A, C, a2c, h) );
+	else
+		return OK_SCAN_ERR(
+			assign_clusters_l2_lInf_cap(A, C, a2c, h, maxdist) );
+}
+
+/*
+ * after centroids move by drift_k = ||c_k - c_k^{prev}||, relax bounds:
+ *
+ *	upper_i += drift_u(i),
+ *	lower_i -= max_{k != u(i)} drift_k		(Hamerly), or
+ *	lower_ik = max(lower_ik - drift_k, 0)	(Elkan).
+ */
+ok_status kmeans_bounds_update(kmeans_bounds * b, matrix * C,
+	cluster_aid * h)
+{
+	size_t i, j, a, jmax = 0;
+	size_t k;
+	ok_float rmax = kZero, rmax2 = kZero;
+	ok_float * lower;
+	upsamplingvec * u;
+	OK_CHECK_PTR(b);
+	OK_CHECK_MATRIX(C);
+	OK_CHECK_PTR(h);
+
+	if (!b->initialized)
+		return OPTKIT_SUCCESS;
+	if (C->size1 != b->n_clusters || C->size2 != b->C_prev.size2)
+		return OK_SCAN_ERR( OPTKIT_ERROR_DIMENSION_MISMATCH );
+
+	k = C->size1;
+	u = &h->a2c_tentative;
+	for (j = 0; j < k; ++j) {
+		b->drift[j] = __dist_l2_rows(C, j, &b->C_prev, j);
+		if (b->drift[j] > rmax) {
+			rmax2 = rmax;
+			rmax = b->drift[j];
+			jmax = j;
+		} else if (b->drift[j] > rmax2) {
+			rmax2 = b->drift[j];
+		}
+	}
+
+	#ifdef _OPENMP
+	#pragma omp parallel for private(j, a, lower)
+	#endif
+	for (i = 0; i < b->n_vectors; ++i) {
+		a = u->indices[i * u->stride];
+		b->upper[i] += b->drift[a];
+		if (b->algorithm == OkKmeansHamerly) {
+			b->lower[i] -= (a == jmax) ? rmax2 : rmax;
+		} else {
+			lower = b->lower + i * k;
+			for (j = 0; j < k; ++j) {
+				lower[j] -= b->drift[j];
+				lower[j] = lower[j] > kZero ? lower[j] : kZero;
+			}
+		}
+	}
+	return OPTKIT_SUCCESS;
+}
+
+/*
+ * counter-based uniform draws in [0, 1): for a given seed, the draw
+ * for (stream, counter) does not depend on the order, or the thread,
+ * in which draws are taken
+ */
+static unsigned long long __splitmix64(unsigned long long x)
+{
+	x += 0x9E3779B97F4A7C15ULL;
+	x = (x ^ (x >> 30)) * 0xBF58476D1CE4E5B9ULL;
+	x = (x ^ (x >> 27)) * 0x94D049BB133111EBULL;
+	return x ^ (x >> 31);
+}
+
+static double __uniform_rand(const size_t seed, const size_t stream,
+	const size_t counter)
+{
+	unsigned long long x = __splitmix64((unsigned long long) seed);
+	x = __splitmix64(x ^ (unsigned long long) stream);
+	x = __splitmix64(x ^ (unsigned long long) counter);
+	return (double) (x >> 11) * (1.0 / 9007199254740992.0);
+}
+
+/*
+ * draw index i with probability weights_i / sum(weights), given a
+ * uniform draw u in [0, 1). block sums over kBlockSize entries are
+ * formed in parallel; the selected block is then scanned.
+ */
+static size_t __sample_weighted(const double * weights, const size_t size,
+	const double u, double * block_sums)
+{
+	size_t b, i, end, last = size - 1;
+	size_t n_blocks = (size + kBlockSize - 1) / kBlockSize;
+	double total = 0, target;
+
+	#ifdef _OPENMP
+	#pragma omp parallel for private(i, end)
+	#endif
+	for (b = 0; b < n_blocks; ++b) {
+		block_sums[b] = 0;
+		end = (b + 1) * kBlockSize < size ? (b + 1) * kBlockSize : size;
+		for (i = b * kBlockSize; i < end; ++i)
+			block_sums[b] += weights[i];
+	}
+	for (b = 0; b < n_blocks; ++b)
+		total += block_sums[b];
+
+	if (total <= 0) {
+		i = (size_t) (u * (double) size);
+		return i < size ? i : last;
+	}
+
+	target = u * total;
+	for (b = 0; b < n_blocks; ++b) {
+		if (target < block_sums[b])
+			break;
+		target -= block_sums[b];
+	}
+	if (b == n_blocks)
+		b = n_blocks - 1;
+
+	end = (b + 1) * kBlockSize < size ? (b + 1) * kBlockSize : size;
+	for (i = b * kBlockSize; i < end; ++i) {
+		if (weights[i] > 0)
+			last = i;
+		if (target < weights[i])
+			return i;
+		target -= weights[i];
+	}
+	return last;
+}
+
+/*
+ * given new seeds, rows [first, last) of matrix S, update the squared
+ * distance d2_i from each vector a_i to its nearest seed, and the index
+ * (offset by label_offset) of that seed
+ */
+static void __seed_update_distances(const matrix * A, const matrix * S,
+	const size_t * rows, const size_t first, const size_t last,
+	const size_t label_offset, double * d2, size_t * nearest)
+{
+	size_t i, j;
+	double dist;
+
+	#ifdef _OPENMP
+	#pragma omp parallel for private(j, dist)
+	#endif
+	for (i = 0; i < A->size1; ++i)
+		for (j = first; j < last; ++j) {
+			dist = (double) __dist_l2sq_rows(A, i, S,
+				rows ? rows[j] : j);
+			if (dist < d2[i]) {
+				d2[i] = dist;
+				nearest[i] = j + label_offset;
+			}
+		}
+}
+
+static ok_status __seed_copy_row(matrix * C, const size_t row_C,
+	matrix * A, const size_t row_A)
+{
+	vector a, c;
+	OK_RETURNIF_ERR( matrix_row(&a, A, row_A) );
+	OK_RETURNIF_ERR( matrix_row(&c, C, row_C) );
+	return vector_memcpy_vv(&c, &a);
+}
+
+/*
+ * k-means++: choose the first seed uniformly at random, and each
+ * subsequent seed with probability proportional to its squared distance
+ * to the nearest seed chosen so far
+ */
+static ok_status __kmeans_plusplus(matrix * A, matrix * C, double * d2,
+	size_t * nearest, double * block_sums, const size_t seed)
+{
+	size_t i, j, row;
+
+	for (i = 0; i < A->size1; ++i)
+		d2[i] = DBL_MAX;
+
+	for (j = 0; j < C->size1; ++j) {
+		if (j == 0) {
+			row = (size_t) (__uniform_rand(seed, 0, 0) *
+				(double) A->size1);
+			row = row < A->size1 ? row : A->size1 - 1;
+		} else {
+			row = __sample_weighted(d2, A->size1,
+				__uniform_rand(seed, 0, j), block_sums);
+		}
+		__seed_update_distances(A, A, &row, 0, 1, j, d2, nearest);
+		OK_RETURNIF_ERR( __seed_copy_row(C, j, A, row) );
+	}
+	return OPTKIT_SUCCESS;
+}
+
+/*
+ * k-means|| (Bahmani et al., 2012): over kKmeansParallelRounds rounds,
+ * sample each vector independently with probability
+ *
+ *	min(1, l * d2_i / sum(d2)),
+ *
+ * for oversampling factor l = 2k, then reduce the candidates to k seeds
+ * by k-means++ weighted by the number of vectors nearest each candidate
+ */
+static ok_status __kmeans_parallel(matrix * A, matrix * C, double * d2,
+	size_t * nearest, double * block_sums, const size_t seed)
+{
+	ok_status err = OPTKIT_SUCCESS;
+	const size_t kKmeansParallelRounds = 5;
+	size_t i, j, r, row, first, n_cand = 0, n = A->size1, k = C->size1;
+	size_t * candidates = OK_NULL;
+	unsigned char * sampled = OK_NULL;
+	double * weights = OK_NULL, * d2_cand = OK_NULL, * pd2 = OK_NULL;
+	double dist, psi, oversampling = 2 * (double) k;
+
+	ok_alloc(candidates, n * sizeof(*candidates));
+	ok_alloc(sampled, n * sizeof(*sampled));
+	if (!candidates || !sampled)
+		err = OK_SCAN_ERR( OPTKIT_ERROR_UNALLOCATED );
+
+	/* first candidate uniformly at random */
+	if (!err) {
+		for (i = 0; i < n; ++i)
+			d2[i] = DBL_MAX;
+		row = (size_t) (__uniform_rand(seed, 0, 0) * (double) n);
+		candidates[n_cand++] = row < n ? row : n - 1;
+		__seed_update_distances(A, A, candidates, 0, 1, 0, d2,
+			nearest);
+	}
+
+	for (r = 1; r <= kKmeansParallelRounds && !err; ++r) {
+		psi = 0;
+		#ifdef _OPENMP
+		#pragma omp parallel for reduction(+:psi)
+		#endif
+		for (i = 0; i < n; ++i)
+			psi += d2[i];
+		if (psi <= 0)
+			break;
+
+		#ifdef _OPENMP
+		#pragma omp parallel for
+		#endif
+		for (i = 0; i < n; ++i)
+			sampled[i] = (unsigned char) (d2[i] > 0 &&
+				__uniform_rand(seed, r, i) <
+				oversampling * d2[i] / psi);
+
+		first = n_cand;
+		for (i = 0; i < n; ++i)
+			if (sampled[i])
+				candidates[n_cand++] = i;
+		__seed_update_distances(A, A, candidates, first, n_cand, 0, d2,
+			nearest);
+	}
+
+	/* too few candidates (e.g., many duplicate vectors) */
+	if (!err && n_cand < k) {
+		OK_CHECK_ERR( err, __kmeans_plusplus(A, C, d2, nearest,
+			block_sums, seed) );
+		ok_free(candidates);
+		ok_free(sampled);
+		return err;
+	}
+
+	if (!err) {
+		ok_alloc(weights, n_cand * sizeof(*weights));
+		ok_alloc(d2_cand, n_cand * sizeof(*d2_cand));
+		ok_alloc(pd2, n_cand * sizeof(*pd2));
+		if (!weights || !d2_cand || !pd2)
+			err = OK_SCAN_ERR( OPTKIT_ERROR_UNALLOCATED );
+	}
+
+	/* weight candidate c by # of vectors nearest c; weighted k-means++ */
+	if (!err) {
+		for (i = 0; i < n; ++i)
+			weights[nearest[i]] += 1;
+		for (i = 0; i < n_cand; ++i)
+			d2_cand[i] = DBL_MAX;
+
+		for (j = 0; j < k && !err; ++j) {
+			if (j == 0) {
+				row = __sample_weighted(weights, n_cand,
+					__uniform_rand(seed, r, 0), block_sums);
+			} else {
+				for (i = 0; i < n_cand; ++i)
+					pd2[i] = weights[i] * d2_cand[i];
+				row = __sample_weighted(pd2, n_cand,
+					__uniform_rand(seed, r, j), block_sums);
 			}
+			row = candidates[row];
+			#ifdef _OPENMP
+			#pragma omp parallel for private(dist)
+			#endif
+			for (i = 0; i < n_cand; ++i) {
+				dist = (double) __dist_l2sq_rows(A, candidates[i],
+					A, row);
+				d2_cand[i] = dist < d2_cand[i] ? dist : d2_cand[i];
+			}
+			err = __seed_copy_row(C, j, A, row);
+		}
+	}
+
+	/* assign each vector to its nearest seed */
+	if (!err) {
+		for (i = 0; i < n; ++i)
+			d2[i] = DBL_MAX;
+		__seed_update_distances(A, C, OK_NULL, 0, k, 0, d2, nearest);
+	}
+
+	ok_free(candidates);
+	ok_free(sampled);
+	ok_free(weights);
+	ok_free(d2_cand);
+	ok_free(pd2);
+	return err;
+}
+
+/*
+ * seed centroids C with rows of A by k-means++ or k-means||, and assign
+ * each vector to its nearest seed in a2c; draws are reproducible for a
+ * given seed, irrespective of the number of threads
+ */
+ok_status kmeans_seed(matrix * A, matrix * C, upsamplingvec * a2c,
+	const enum OPTKIT_KMEANS_INIT init, const size_t seed)
+{
+	ok_status err = OPTKIT_SUCCESS;
+	size_t i, * nearest = OK_NULL;
+	double * d2 = OK_NULL, * block_sums = OK_NULL;
+	OK_CHECK_MATRIX(A);
+	OK_CHECK_MATRIX(C);
+	OK_CHECK_UPSAMPLINGVEC(a2c);
+
+	if (init != OkKmeansInitPlusPlus && init != OkKmeansInitParallel)
+		return OK_SCAN_ERR( OPTKIT_ERROR_DOMAIN );
+	if (A->size2 != C->size2 || A->size1 != a2c->size1 ||
+		C->size1 > A->size1 || C->size1 == 0)
+		return OK_SCAN_ERR( OPTKIT_ERROR_DIMENSION_MISMATCH );
+
+	ok_alloc(d2, A->size1 * sizeof(*d2));
+	ok_alloc(nearest, A->size1 * sizeof(*nearest));
+	ok_alloc(block_sums, ((A->size1 + kBlockSize - 1) / kBlockSize) *
+		sizeof(*block_sums));
+	if (!d2 || !nearest || !block_sums)
+		err = OK_SCAN_ERR( OPTKIT_ERROR_UNALLOCATED );
+
+	if (!err && init == OkKmeansInitPlusPlus)
+		err = __kmeans_plusplus(A, C, d2, nearest, block_sums, seed);
+	else if (!err)
+		err = __kmeans_parallel(A, C, d2, nearest, block_sums, seed);
+
+	if (!err) {
+		for (i = 0; i < A->size1; ++i)
+			a2c->indices[i * a2c->stride] = nearest[i];
+		a2c->size2 = C->size1;
+	}
+
+	ok_free(d2);
+	ok_free(nearest);
+	ok_free(block_sums);
+	return err;
+}
+
+/*
+ * k-d tree over the centroids, stored implicitly: the subtree over
+ * positions [lo, hi) has its root at mid = (lo + hi) / 2, whose point is
+ * centroid perm[mid] (copied, row-major, to pts + mid * dim) and whose
+ * splitting dimension is split[mid]; positions [lo, mid) and [mid + 1, hi)
+ * hold the left and right subtrees.
+ */
+typedef struct kdtree {
+	size_t size, dim;
+	size_t * perm, * split;
+	ok_float * pts;
+} kdtree;
+
+static ok_float __kdtree_coord(const matrix * C, const size_t k,
+	const size_t j)
+{
+	return (C->order == CblasRowMajor) ? C->data[k * C->ld + j] :
+		C->data[k + j * C->ld];
+}
+
+static void __kdtree_build(kdtree * t, const matrix * C, size_t lo,
+	size_t hi)
+{
+	size_t i, j, mid, store, tmp, jmax = 0, left = lo, right = hi;
+	ok_float x, pivot, xmin, xmax, spread = -kOne;
+
+	if (hi - lo < 2) {
+		if (hi > lo)
+			t->split[lo] = 0;
+		return;
+	}
+
+	/* split along the dimension of largest spread */
+	for (j = 0; j < t->dim; ++j) {
+		xmin = xmax = __kdtree_coord(C, t->perm[lo], j);
+		for (i = lo + 1; i < hi; ++i) {
+			x = __kdtree_coord(C, t->perm[i], j);
+			xmin = x < xmin ? x : xmin;
+			xmax = x > xmax ? x : xmax;
 		}
+		if (xmax - xmin > spread) {
+			spread = xmax - xmin;
+			jmax = j;
+		}
+	}
+
+	/* quickselect the median along dimension jmax into position mid */
+	mid = lo + (hi - lo) / 2;
+	while (right - left > 1) {
+		i = left + (right - left) / 2;
+		pivot = __kdtree_coord(C, t->perm[i], jmax);
+		tmp = t->perm[i];
+		t->perm[i] = t->perm[right - 1];
+		t->perm[right - 1] = tmp;
+		for (store = left, i = left; i < right - 1; ++i)
+			if (__kdtree_coord(C, t->perm[i], jmax) < pivot) {
+				tmp = t->perm[i];
+				t->perm[i] = t->perm[store];
+				t->perm[store++] = tmp;
+			}
+		tmp = t->perm[store];
+		t->perm[store] = t->perm[right - 1];
+		t->perm[right - 1] = tmp;
+
+		if (store == mid)
+			break;
+		else if (store < mid)
+			left = store + 1;
+		else
+			right = store;
+	}
+
+	t->split[mid] = jmax;
+	__kdtree_build(t, C, lo, mid);
+	__kdtree_build(t, C, mid + 1, hi);
+}
+
+static ok_status __kdtree_alloc(kdtree * t, const matrix * C)
+{
+	size_t k, j;
+	memset(t, 0, sizeof(*t));
+	t->size = C->size1;
+	t->dim = C->size2;
+	t->perm = (size_t *) malloc(t->size * sizeof(*t->perm));
+	t->split = (size_t *) malloc(t->size * sizeof(*t->split));
+	t->pts = (ok_float *) malloc(t->size * t->dim * sizeof(*t->pts));
+	if (!t->perm || !t->split || !t->pts)
+		return OK_SCAN_ERR( OPTKIT_ERROR_MEMORY );
+
+	for (k = 0; k < t->size; ++k)
+		t->perm[k] = k;
+	__kdtree_build(t, C, 0, t->size);
+	for (k = 0; k < t->size; ++k)
+		for (j = 0; j < t->dim; ++j)
+			t->pts[k * t->dim + j] = __kdtree_coord(C, t->perm[k], j);
+	return OPTKIT_SUCCESS;
+}
+
+static void __kdtree_free(kdtree * t)
+{
+	ok_free(t->perm);
+	ok_free(t->split);
+	ok_free(t->pts);
+}
+
+/*
+ * exact nearest neighbor search for query a; ties are broken in favor of
+ * the lowest centroid index, as in the dense search
+ */
+static void __kdtree_nearest(const kdtree * t, const ok_float * a,
+	size_t lo, size_t hi, size_t * best, ok_float * best_dist,
+	size_t * evals)
+{
+	size_t j, mid;
+	ok_float diff, dist = kZero;
+	const ok_float * pt;
+
+	if (hi <= lo)
+		return;
+
+	mid = lo + (hi - lo) / 2;
+	pt = t->pts + mid * t->dim;
+	for (j = 0; j < t->dim; ++j) {
+		diff = a[j] - pt[j];
+		dist += diff * diff;
+	}
+	++(*evals);
+	if (dist < *best_dist || (dist == *best_dist && t->perm[mid] < *best)) {
+		*best_dist = dist;
+		*best = t->perm[mid];
+	}
+
+	diff = a[t->split[mid]] - pt[t->split[mid]];
+	if (diff < 0) {
+		__kdtree_nearest(t, a, lo, mid, best, best_dist, evals);
+		if (diff * diff <= *best_dist)
+			__kdtree_nearest(t, a, mid + 1, hi, best, best_dist,
+				evals);
+	} else {
+		__kdtree_nearest(t, a, mid + 1, hi, best, best_dist, evals);
+		if (diff * diff <= *best_dist)
+			__kdtree_nearest(t, a, lo, mid, best, best_dist, evals);
+	}
+}
+
+/*
+ * distance tiles formed concurrently: one per OpenMP thread, or one when
+ * called from a parallel region (e.g., blockwise k-means)
+ */
+int cluster_tile_threads(void)
+{
+	#ifdef _OPENMP
+	if (omp_in_parallel())
+		return 1;
+	#endif
+	return ok_get_max_threads();
+}
+
+/*
+ * the gemm-based search evaluates all k distances per vector, at cost
+ * O(k * vec_length); a k-d tree search visits O(log k) centroids when k
+ * is large relative to 2^vec_length, but at a higher cost per centroid
+ */
+int cluster_kdtree_favored(const size_t vec_length, const size_t n_clusters)
+{
+	return vec_length <= OK_CLUSTER_KDTREE_MAX_DIM &&
+		n_clusters >= OK_CLUSTER_KDTREE_MIN_CLUSTERS &&
+		n_clusters >= ((size_t) 1 << (vec_length + 4));
+}
+
+/* k-d tree over centroids C, for reuse by cluster_kdtree_search() */
+ok_status cluster_kdtree_alloc(void ** tree, const matrix * C)
+{
+	ok_status err = OPTKIT_SUCCESS;
+	kdtree * t = OK_NULL;
+	OK_CHECK_PTR(tree);
+	OK_CHECK_MATRIX(C);
+	if (*tree != OK_NULL)
+		return OK_SCAN_ERR( OPTKIT_ERROR_OVERWRITE );
+	if (C->size1 == 0)
+		return OK_SCAN_ERR( OPTKIT_ERROR_DIMENSION_MISMATCH );
+
+	t = (kdtree *) malloc(sizeof(*t));
+	if (!t)
+		return OK_SCAN_ERR( OPTKIT_ERROR_MEMORY );
+	OK_CHECK_ERR( err, __kdtree_alloc(t, C) );
+	if (err) {
+		__kdtree_free(t);
+		ok_free(t);
+	} else {
+		*tree = (void *) t;
+	}
+	return err;
+}
+
+ok_status cluster_kdtree_free(void * tree)
+{
+	OK_CHECK_PTR(tree);
+	__kdtree_free((kdtree *) tree);
+	ok_free(tree);
+	return OPTKIT_SUCCESS;
+}
+
+/*
+ * as cluster(), with tentative assignments given by exact nearest
+ * centroid searches in the k-d tree over C built by cluster_kdtree_alloc()
+ */
+ok_status cluster_kdtree_search(matrix * A, matrix * C, upsamplingvec * a2c,
+	cluster_aid * h, ok_float maxdist, const void * tree)
+{
+	ok_status err = OPTKIT_SUCCESS;
+	size_t i, j, best, evals = 0;
+	size_t strideA, row_strideA;
+	ok_float best_dist, * a = OK_NULL;
+	upsamplingvec * u;
+	const kdtree * t = (const kdtree *) tree;
+	OK_CHECK_MATRIX(A);
+	OK_CHECK_MATRIX(C);
+	OK_CHECK_UPSAMPLINGVEC(a2c);
+	OK_CHECK_PTR(h);
+	OK_CHECK_PTR(tree);
+
+	u = &h->a2c_tentative;
+	if (u->size1 != A->size1 || A->size2 != C->size2 || C->size1 == 0 ||
+		t->size != C->size1 || t->dim != C->size2)
+		return OK_SCAN_ERR( OPTKIT_ERROR_DIMENSION_MISMATCH );
+
+	strideA = (A->order == CblasRowMajor) ? 1 : A->ld;
+	row_strideA = (A->order == CblasRowMajor) ? A->ld : 1;
+	#ifdef _OPENMP
+	#pragma omp parallel if (!err) private(i, j, best, best_dist, a)
+	#endif
+	{
+		ok_status thread_err = OPTKIT_SUCCESS;
+		a = (ok_float *) malloc(A->size2 * sizeof(*a));
+		if (!a)
+			thread_err = OK_SCAN_ERR( OPTKIT_ERROR_MEMORY );
+
+		#ifdef _OPENMP
+		#pragma omp for reduction(+:evals) schedule(static)
+		#endif
+		for (i = 0; i < A->size1; ++i) {
+			if (thread_err)
+				continue;
+			for (j = 0; j < A->size2; ++j)
+				a[j] = A->data[i * row_strideA + j * strideA];
+			best = 0;
+			best_dist = OK_FLOAT_MAX;
+			__kdtree_nearest(t, a, 0, t->size, &best, &best_dist,
+				&evals);
+			u->indices[i * u->stride] = best;
+		}
+
+		free(a);
+
+		#ifdef _OPENMP
+		#pragma omp critical
+		#endif
+		err = err > thread_err ? err : thread_err;
+	}
+	if (err)
+		return err;
+	h->distance_evals += evals;
+
+	/* finalize cluster assignements */
+	if (maxdist == OK_INFINITY)
+		return OK_SCAN_ERR(
+			assign_clusters_l2(A, C, a2c, h) );
+	else
+		return OK_SCAN_ERR(
+			assign_clusters_l2_lInf_cap(A, C, a2c, h, maxdist) );
+}
+
+/*
+ * as cluster(), with tentative assignments given by exact nearest
+ * centroid searches in a k-d tree over C, rebuilt on each call
+ */
+ok_status cluster_kdtree(matrix * A, matrix * C, upsamplingvec * a2c,
+	cluster_aid * h, ok_float maxdist)
+{
+	ok_status err = OPTKIT_SUCCESS;
+	void * tree = OK_NULL;
+	OK_RETURNIF_ERR( cluster_kdtree_alloc(&tree, C) );
+	OK_CHECK_ERR( err, cluster_kdtree_search(A, C, a2c, h, maxdist, tree) );
+	OK_MAX_ERR( err, cluster_kdtree_free(tree) );
 	return err;
 }
 
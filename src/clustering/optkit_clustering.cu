@@ -181,6 +181,105 @@ ok_status assign_clusters_l2_lInf_cap(matrix * A, matrix * C,
 	return err;
 }
 
+/*
+ * pruned k-means is not implemented on the GPU: bounds are not
+ * maintained and cluster_pruned() falls back to dense assignment
+ */
+ok_status kmeans_bounds_alloc(kmeans_bounds * b, size_t n_vectors,
+	size_t n_clusters, size_t vec_length,
+	const enum OPTKIT_KMEANS_ALGORITHM algorithm)
+{
+	OK_CHECK_PTR(b);
+	if (algorithm != OkKmeansHamerly && algorithm != OkKmeansElkan)
+		return OK_SCAN_ERR( OPTKIT_ERROR_DOMAIN );
+
+	memset(b, 0, sizeof(*b));
+	b->algorithm = algorithm;
+	b->n_vectors = n_vectors;
+	b->n_clusters = n_clusters;
+	return OPTKIT_SUCCESS;
+}
+
+ok_status kmeans_bounds_free(kmeans_bounds * b)
+{
+	OK_CHECK_PTR(b);
+	memset(b, 0, sizeof(*b));
+	return OPTKIT_SUCCESS;
+}
+
+ok_status cluster_pruned(matrix * A, matrix * C, upsamplingvec * a2c,
+	cluster_aid * h, kmeans_bounds * b, ok_float maxdist)
+{
+	OK_CHECK_PTR(b);
+	return cluster(A, C, a2c, h, maxdist);
+}
+
+ok_status kmeans_bounds_update(kmeans_bounds * b, matrix * C,
+	cluster_aid * h)
+{
+	OK_CHECK_PTR(b);
+	return OPTKIT_SUCCESS;
+}
+
+/*
+ * k-means++/k-means|| seeding is not implemented on the GPU
+ */
+ok_status kmeans_seed(matrix * A, matrix * C, upsamplingvec * a2c,
+	const enum OPTKIT_KMEANS_INIT init, const size_t seed)
+{
+	OK_CHECK_MATRIX(A);
+	OK_CHECK_MATRIX(C);
+	OK_CHECK_UPSAMPLINGVEC(a2c);
+	return OK_SCAN_ERR( OPTKIT_ERROR_DOMAIN );
+}
+
+/*
+ * nearest centroid search with a k-d tree is not implemented on GPU: the
+ * automatic search mode always uses the dense search
+ */
+/* distance tiles are formed in sequence on the device */
+int cluster_tile_threads(void)
+{
+	return 1;
+}
+
+int cluster_kdtree_favored(const size_t vec_length, const size_t n_clusters)
+{
+	return 0;
+}
+
+ok_status cluster_kdtree_alloc(void ** tree, const matrix * C)
+{
+	OK_CHECK_PTR(tree);
+	OK_CHECK_MATRIX(C);
+	return OK_SCAN_ERR( OPTKIT_ERROR_DOMAIN );
+}
+
+ok_status cluster_kdtree_free(void * tree)
+{
+	OK_CHECK_PTR(tree);
+	return OK_SCAN_ERR( OPTKIT_ERROR_DOMAIN );
+}
+
+ok_status cluster_kdtree_search(matrix * A, matrix * C, upsamplingvec * a2c,
+	cluster_aid * h, ok_float maxdist, const void * tree)
+{
+	OK_CHECK_MATRIX(A);
+	OK_CHECK_MATRIX(C);
+	OK_CHECK_UPSAMPLINGVEC(a2c);
+	OK_CHECK_PTR(tree);
+	return OK_SCAN_ERR( OPTKIT_ERROR_DOMAIN );
+}
+
+ok_status cluster_kdtree(matrix * A, matrix * C, upsamplingvec * a2c,
+	cluster_aid * h, ok_float maxdist)
+{
+	OK_CHECK_MATRIX(A);
+	OK_CHECK_MATRIX(C);
+	OK_CHECK_UPSAMPLINGVEC(a2c);
+	return OK_SCAN_ERR( OPTKIT_ERROR_DOMAIN );
+}
+
 #ifdef __cplusplus
 }
 #endif
@@ -1,4 +1,9 @@
+#ifndef _POSIX_C_SOURCE
+#define _POSIX_C_SOURCE 200809L /* clock_gettime, CLOCK_MONOTONIC */
+#endif
+
 #include "optkit_clustering.h"
+#include "optkit_timer.h"
 
 #ifdef __cplusplus
 extern "C" {
@@ -8,11 +13,31 @@ ok_status cluster_aid_alloc(cluster_aid * h, size_t size_A, size_t size_C,
 	enum CBLAS_ORDER order)
 {
 	ok_status err = OPTKIT_SUCCESS;
+	size_t n_tiles;
+	int n_threads;
 	OK_CHECK_PTR(h);
 
 	/* clear h */
 	memset(h, 0, sizeof(*h));
 
+	/*
+	 * size distance tiles to OK_CLUSTER_TILE_BYTES, at least
+	 * OK_CLUSTER_TILE_MIN and at most size_A vectors
+	 */
+	h->tile_size = OK_CLUSTER_TILE_BYTES / (sizeof(ok_float) *
+		(size_C > 0 ? size_C : 1));
+	h->tile_size = h->tile_size > OK_CLUSTER_TILE_MIN ? h->tile_size :
+		OK_CLUSTER_TILE_MIN;
+	h->tile_size = h->tile_size < size_A ? h->tile_size : size_A;
+
+	/* one tile buffer per thread, at most one per tile */
+	n_threads = cluster_tile_threads();
+	n_tiles = h->tile_size > 0 ?
+		(size_A + h->tile_size - 1) / h->tile_size : 0;
+	h->tile_slots = n_threads > 1 ? (size_t) n_threads : 1;
+	h->tile_slots = h->tile_slots < n_tiles ? h->tile_slots : n_tiles;
+	h->tile_slots = h->tile_slots > 0 ? h->tile_slots : 1;
+
 	OK_CHECK_ERR( err,
 		upsamplingvec_alloc(&h->a2c_tentative_full, size_A, size_C) );
 	OK_CHECK_ERR( err,
@@ -20,7 +45,8 @@ ok_status cluster_aid_alloc(cluster_aid * h, size_t size_A, size_t size_C,
 	OK_CHECK_ERR( err,
 		vector_calloc(&h->d_min_full, size_A) );
 	OK_CHECK_ERR( err,
-		matrix_calloc(&h->D_full, size_C, size_A, order) );
+		matrix_calloc(&h->D_full, size_C, h->tile_size * h->tile_slots,
+			order) );
 	OK_CHECK_ERR( err,
 		blas_make_handle(&h->hdl) );
 	OK_CHECK_ERR( err,
@@ -62,8 +88,8 @@ static ok_status cluster_aid_subselect(cluster_aid * h, size_t offset_A,
 		offset_C, sub_size_C) );
 	OK_RETURNIF_ERR( vector_subvector(&h->d_min, &h->d_min_full, offset_A,
 		sub_size_A) );
-	return matrix_submatrix(&h->D, &h->D_full, offset_A, offset_C,
-		sub_size_C, sub_size_A);
+	return matrix_submatrix(&h->D, &h->D_full, offset_C, 0, sub_size_C,
+		h->D_full.size2);
 }
 
 ok_status kmeans_work_alloc(kmeans_work * w, size_t n_vectors,
@@ -153,6 +179,190 @@ ok_status kmeans_work_extract(ok_float * C,
 	return vector_memcpy_av(counts, &w->counts, stride_counts);
 }
 
+/*
+ * compact a clustering held in host arrays C (n_clusters x vec_length),
+ * a2c (n_vectors) and counts (n_clusters), in place:
+ *
+ *	- drop empty clusters, relabeling the remaining clusters
+ *	  0, ..., n_nonempty - 1 in order of their original labels,
+ *	- move the centroids of the remaining clusters to the leading rows
+ *	  of C, and
+ *	- set counts_k to the size of cluster k.
+ *
+ * rows of C and entries of counts beyond n_nonempty are zeroed.
+ */
+ok_status kmeans_compact(ok_float * C, const enum CBLAS_ORDER orderC,
+	size_t n_clusters, size_t vec_length, size_t * a2c, size_t stride_a2c,
+	size_t n_vectors, ok_float * counts, size_t stride_counts,
+	size_t * n_nonempty)
+{
+	ok_status err = OPTKIT_SUCCESS;
+	size_t i, j, k, label, * sizes = OK_NULL;
+	size_t stride_row, stride_col;
+
+	if (!C || !a2c || !counts || !n_nonempty)
+		return OK_SCAN_ERR( OPTKIT_ERROR_UNALLOCATED );
+
+	stride_row = (orderC == CblasRowMajor) ? vec_length : 1;
+	stride_col = (orderC == CblasRowMajor) ? 1 : n_clusters;
+
+	sizes = (size_t *) calloc(n_clusters, sizeof(*sizes));
+	if (!sizes && n_clusters)
+		return OK_SCAN_ERR( OPTKIT_ERROR_MEMORY );
+
+	for (i = 0; i < n_vectors && !err; ++i)
+		if (a2c[i * stride_a2c] < n_clusters)
+			++sizes[a2c[i * stride_a2c]];
+		else
+			err = OK_SCAN_ERR( OPTKIT_ERROR_OUT_OF_BOUNDS );
+
+	/* sizes_k <- new label of cluster k; rows move up, never down */
+	for (k = 0, label = 0; k < n_clusters && !err; ++k) {
+		if (sizes[k] == 0)
+			continue;
+		counts[label * stride_counts] = (ok_float) sizes[k];
+		if (label != k)
+			for (j = 0; j < vec_length; ++j)
+				C[label * stride_row + j * stride_col] =
+					C[k * stride_row + j * stride_col];
+		sizes[k] = label++;
+	}
+
+	if (!err) {
+		for (k = label; k < n_clusters; ++k) {
+			counts[k * stride_counts] = kZero;
+			for (j = 0; j < vec_length; ++j)
+				C[k * stride_row + j * stride_col] = kZero;
+		}
+
+		#ifdef _OPENMP
+		#pragma omp parallel for
+		#endif
+		for (i = 0; i < n_vectors; ++i)
+			a2c[i * stride_a2c] = sizes[a2c[i * stride_a2c]];
+
+		*n_nonempty = label;
+	}
+
+	free(sizes);
+	return err;
+}
+
+/*
+ * distances for the tile of vectors {a_i}, i in [offset, offset + tile),
+ * formed in columns [slot * tile_size, slot * tile_size + tile) of h->D
+ */
+static ok_status cluster_tentative_tile(matrix * A, matrix * C,
+	cluster_aid * h, size_t offset, size_t tile, size_t slot,
+	size_t tile_size)
+{
+	matrix A_tile, D_tile;
+	vector d_min_tile;
+	upsamplingvec u_tile;
+
+	OK_RETURNIF_ERR( matrix_submatrix(&A_tile, A, offset, 0, tile,
+		A->size2) );
+	OK_RETURNIF_ERR( matrix_submatrix(&D_tile, &h->D, 0, slot * tile_size,
+		C->size1, tile) );
+	OK_RETURNIF_ERR( vector_subvector(&d_min_tile, &h->d_min, offset,
+		tile) );
+	OK_RETURNIF_ERR( upsamplingvec_subvector(&u_tile, &h->a2c_tentative,
+		offset, tile, C->size1) );
+
+	OK_RETURNIF_ERR( blas_gemm(h->hdl, CblasNoTrans, CblasTrans,
+		-2 * kOne, C, &A_tile, kZero, &D_tile) );
+	OK_RETURNIF_ERR( linalg_matrix_broadcast_vector(&D_tile,
+		&h->c_squared, OkTransformAdd, CblasLeft) );
+	return linalg_matrix_reduce_indmin(&u_tile.vec, &d_min_tile, &D_tile,
+		CblasLeft);
+}
+
+/*
+ * set tentative assignments h->a2c_tentative of the vectors A to their
+ * nearest centroids C, given h->c_squared_k = c_k'c_k:
+ *
+ * for each tile of vectors {a_i}, i in [offset, offset + tile):
+ *	set D_ki = - 2 * c_k'a_i + c_k^2,
+ *	set tentative cluster assignment of vector i argmin_k {D_ki}
+ *
+ * only k x tile blocks of distances are held in memory at a time, one per
+ * tile buffer (slot) of h->D. with several slots, tiles are formed in
+ * parallel, in rounds of one tile per slot; each thread's inner BLAS and
+ * OpenMP calls are limited to its share of the thread budget. with a
+ * single slot, the tiles run in sequence with the full thread budget.
+ */
+ok_status cluster_tentative(matrix * A, matrix * C, cluster_aid * h)
+{
+	OK_CHECK_MATRIX(A);
+	OK_CHECK_MATRIX(C);
+	OK_CHECK_PTR(h);
+	ok_status err = OPTKIT_SUCCESS;
+	size_t offset, round, slot, tile, tile_size, n_tiles, n_slots;
+	int n_max, n_inner;
+
+	tile_size = h->tile_size < h->D.size2 ? h->tile_size : h->D.size2;
+	if (h->D.size1 != C->size1 || h->a2c_tentative.size1 != A->size1 ||
+		h->c_squared.size != C->size1 || A->size2 != C->size2 ||
+		(A->size1 > 0 && tile_size == 0))
+		return OK_SCAN_ERR( OPTKIT_ERROR_DIMENSION_MISMATCH );
+
+	n_tiles = tile_size > 0 ? (A->size1 + tile_size - 1) / tile_size : 0;
+	n_slots = tile_size > 0 ? h->D.size2 / tile_size : 0;
+	n_slots = n_slots < h->tile_slots ? n_slots : h->tile_slots;
+	n_slots = n_slots < n_tiles ? n_slots : n_tiles;
+
+	if (n_slots < 2) {
+		for (offset = 0; offset < A->size1; offset += tile_size) {
+			tile = A->size1 - offset;
+			tile = tile < tile_size ? tile : tile_size;
+			OK_RETURNIF_ERR( cluster_tentative_tile(A, C, h, offset, tile,
+				0, tile_size) );
+		}
+		h->distance_evals += A->size1 * C->size1;
+		return OPTKIT_SUCCESS;
+	}
+
+	n_max = ok_get_max_threads();
+	n_inner = n_max / (int) n_slots;
+
+	#ifdef _OPENMP
+	#pragma omp parallel num_threads((int) n_slots) \
+		private(round, slot, offset, tile)
+	#endif
+	{
+		ok_threads threads_saved;
+		ok_status thread_err = ok_threads_limit(n_inner > 0 ? n_inner : 1,
+			&threads_saved);
+
+		/* tile round + slot uses buffer slot; rounds end with a barrier */
+		for (round = 0; round < n_tiles; round += n_slots) {
+			#ifdef _OPENMP
+			#pragma omp for schedule(static, 1)
+			#endif
+			for (slot = 0; slot < n_slots; ++slot) {
+				if (thread_err || round + slot >= n_tiles)
+					continue;
+				offset = (round + slot) * tile_size;
+				tile = A->size1 - offset;
+				tile = tile < tile_size ? tile : tile_size;
+				OK_CHECK_ERR( thread_err, cluster_tentative_tile(A, C, h,
+					offset, tile, slot, tile_size) );
+			}
+		}
+
+		OK_MAX_ERR( thread_err, ok_threads_restore(&threads_saved) );
+
+		#ifdef _OPENMP
+		#pragma omp critical
+		#endif
+		err = err > thread_err ? err : thread_err;
+	}
+
+	if (!err)
+		h->distance_evals += A->size1 * C->size1;
+	return err;
+}
+
 ok_status cluster(matrix * A, matrix * C, upsamplingvec * a2c,
 	cluster_aid * helper, ok_float maxdist)
 {
@@ -162,23 +372,15 @@ ok_status cluster(matrix * A, matrix * C, upsamplingvec * a2c,
 	OK_CHECK_PTR(helper);
 	cluster_aid * h = helper;
 
-	/*
-	 * Prep work: set
-	 *	h->c_squared_k = c_k'c_k,
-	 *	D_ki = - 2 * c_k'a_i
-	 */
+	if (h->search == OkClusterSearchKDTree ||
+		(h->search == OkClusterSearchAuto &&
+		cluster_kdtree_favored(A->size2, C->size1)))
+		return cluster_kdtree(A, C, a2c, h, maxdist);
+
+	/* Prep work: set h->c_squared_k = c_k'c_k */
 	OK_RETURNIF_ERR( linalg_matrix_row_squares(CblasNoTrans, C,
 		&h->c_squared) );
-	OK_RETURNIF_ERR( blas_gemm(h->hdl, CblasNoTrans, CblasTrans, -2 * kOne,
-		C, A, kZero, &h->D) );
-
-	/* Form D_{ki} = - 2 * c_k'a_i + c_k^2 */
-	OK_RETURNIF_ERR( linalg_matrix_broadcast_vector(&h->D, &h->c_squared,
-		OkTransformAdd, CblasLeft) );
-
-	/* set tentative cluster assigment of vector i argmin_k {D_ki} */
-	OK_RETURNIF_ERR( linalg_matrix_reduce_indmin(&h->a2c_tentative.vec,
-		&h->d_min, &h->D, CblasLeft) );
+	OK_RETURNIF_ERR( cluster_tentative(A, C, h) );
 
 	/* finalize cluster assignements */
 	if (maxdist == OK_INFINITY)
@@ -238,8 +440,13 @@ static ok_status k_means_finish(cluster_aid * h)
 	return err;
 }
 
-ok_status k_means(matrix * A, matrix * C, upsamplingvec * a2c, vector * counts,
-	cluster_aid * h, const ok_float dist_reltol, const size_t change_abstol,
+/*
+ * Lloyd iterations; if bounds b are provided, assignments are pruned with
+ * the triangle inequality and only the necessary distances evaluated
+ */
+static ok_status k_means_(matrix * A, matrix * C, upsamplingvec * a2c,
+	vector * counts, cluster_aid * h, kmeans_bounds * b,
+	const ok_float dist_reltol, const size_t change_abstol,
 	const size_t maxiter, const uint verbose)
 {
 	ok_status err = OPTKIT_SUCCESS;
@@ -250,17 +457,20 @@ ok_status k_means(matrix * A, matrix * C, upsamplingvec * a2c, vector * counts,
 		"iteration: %u \t changed: %u \t change tol: %u\n";
 	char exitfmt[] = "quitting k-means after %u iterations, error = %u\n";
 	int valid;
+	OK_PROFILE_TIMER(t);
 
 	OK_CHECK_MATRIX(A);
 	OK_CHECK_MATRIX(C);
 	OK_CHECK_UPSAMPLINGVEC(a2c);
 	OK_CHECK_VECTOR(counts);
+	OK_CHECK_PTR(h);
 
 	/* bounds/dimension checks */
 	OK_RETURNIF_ERR( upsamplingvec_check_bounds(a2c) );
 	valid = (counts->size == C->size1) && (A->size2 == C->size2);
-	valid &= (A->size1 == a2c->size1) && (C->size2 >= a2c->size2);
-	valid &= (h->D.size1 == C->size1) && (h->D.size2 == A->size1);
+	valid &= (A->size1 == a2c->size1) && (C->size1 >= a2c->size2);
+	valid &= (h->D.size1 == C->size1) &&
+		(h->a2c_tentative.size1 == A->size1);
 	if (!valid)
 		return OK_SCAN_ERR( OPTKIT_ERROR_DIMENSION_MISMATCH );
 
@@ -273,6 +483,9 @@ ok_status k_means(matrix * A, matrix * C, upsamplingvec * a2c, vector * counts,
 
 	/* ensure C is initialized */
 	OK_CHECK_ERR( err, calculate_centroids(A, C, a2c, counts, h) );
+	h->distance_evals = 0;
+	h->iters = 0;
+	h->assign_time = h->update_time = kZero;
 
 	if (!err && verbose)
 		printf("\nstarting k-means on %zu vectors and %zu centroids\n",
@@ -283,8 +496,20 @@ ok_status k_means(matrix * A, matrix * C, upsamplingvec * a2c, vector * counts,
 			&maxiter);
 		printf("%s %zu %s %f\n", "ITER", iter, "DISTANCE TOLERANCE",
 			tol);
-		OK_CHECK_ERR( err, cluster(A, C, a2c, h, tol) );
+		OK_PROFILE_TIC(t);
+		if (b)
+			OK_CHECK_ERR( err, cluster_pruned(A, C, a2c, h, b, tol) );
+		else
+			OK_CHECK_ERR( err, cluster(A, C, a2c, h, tol) );
+		OK_PROFILE_TOC(t, h->assign_time);
+
+		OK_PROFILE_TIC(t);
 		OK_CHECK_ERR( err, calculate_centroids(A, C, a2c, counts, h) );
+		if (b)
+			OK_CHECK_ERR( err, kmeans_bounds_update(b, C, h) );
+		OK_PROFILE_TOC(t, h->update_time);
+
+		h->iters = iter + 1;
 		if (verbose)
 			printf(iterfmt, iter, h->reassigned, change_abstol);
 		if (h->reassigned < change_abstol)
@@ -296,6 +521,37 @@ ok_status k_means(matrix * A, matrix * C, upsamplingvec * a2c, vector * counts,
 	return err;
 }
 
+ok_status k_means(matrix * A, matrix * C, upsamplingvec * a2c, vector * counts,
+	cluster_aid * h, const ok_float dist_reltol, const size_t change_abstol,
+	const size_t maxiter, const uint verbose)
+{
+	return k_means_(A, C, a2c, counts, h, OK_NULL, dist_reltol,
+		change_abstol, maxiter, verbose);
+}
+
+ok_status k_means_pruned(matrix * A, matrix * C, upsamplingvec * a2c,
+	vector * counts, cluster_aid * h, const ok_float dist_reltol,
+	const size_t change_abstol, const size_t maxiter, const uint verbose,
+	const enum OPTKIT_KMEANS_ALGORITHM algorithm)
+{
+	ok_status err = OPTKIT_SUCCESS;
+	kmeans_bounds b;
+	OK_CHECK_MATRIX(A);
+	OK_CHECK_MATRIX(C);
+
+	if (algorithm == OkKmeansLloyd)
+		return k_means(A, C, a2c, counts, h, dist_reltol,
+			change_abstol, maxiter, verbose);
+
+	memset(&b, 0, sizeof(b));
+	OK_CHECK_ERR( err, kmeans_bounds_alloc(&b, A->size1, C->size1,
+		A->size2, algorithm) );
+	OK_CHECK_ERR( err, k_means_(A, C, a2c, counts, h, &b, dist_reltol,
+		change_abstol, maxiter, verbose) );
+	OK_MAX_ERR( err, kmeans_bounds_free(&b) );
+	return err;
+}
+
 void * kmeans_easy_init(size_t n_vectors, size_t n_clusters, size_t vec_length)
 {
 	kmeans_work * w = OK_NULL;
@@ -317,24 +573,53 @@ ok_status kmeans_easy_resize(const void * work, size_t n_vectors,
 		n_clusters, vec_length);
 }
 
-ok_status kmeans_easy_run(const void * work, const kmeans_settings * const s,
-	const kmeans_io * io)
+static ok_status __kmeans_easy_run(kmeans_work * w,
+	const kmeans_settings * const s, const kmeans_io * io)
 {
-	if (!work || !s || !io)
-		return OK_SCAN_ERR( OPTKIT_ERROR_UNALLOCATED );
-	kmeans_work * w = (kmeans_work *) work;
-
 	OK_RETURNIF_ERR( kmeans_work_load(w, io->A, io->orderA, io->C,
 		io->orderC, io->a2c, io->stride_a2c, io->counts,
 		io->stride_counts) );
 
-	OK_RETURNIF_ERR( k_means(&w->A, &w->C, &w->a2c, &w->counts,
+	w->h.search = s->search;
+	if (s->init != OkKmeansInitAssignments)
+		OK_RETURNIF_ERR( kmeans_seed(&w->A, &w->C, &w->a2c, s->init,
+			s->seed) );
+
+	OK_RETURNIF_ERR( k_means_pruned(&w->A, &w->C, &w->a2c, &w->counts,
 		&w->h, s->dist_reltol, s->change_abstol, s->maxiter,
-		s->verbose) );
+		s->verbose, s->algorithm) );
 
 	return kmeans_work_extract(io->C, io->orderC,
 		io->a2c, io->stride_a2c, io->counts, io->stride_counts, w);
 }
+
+ok_status kmeans_easy_run(const void * work, const kmeans_settings * const s,
+	const kmeans_io * io)
+{
+	ok_status err = OPTKIT_SUCCESS;
+	ok_threads threads_saved;
+	if (!work || !s || !io)
+		return OK_SCAN_ERR( OPTKIT_ERROR_UNALLOCATED );
+
+	/* limit OpenMP/BLAS threads for the duration of the run */
+	OK_RETURNIF_ERR( ok_threads_limit(s->num_threads, &threads_saved) );
+	err = __kmeans_easy_run((kmeans_work *) work, s, io);
+	OK_MAX_ERR( err, ok_threads_restore(&threads_saved) );
+	return err;
+}
+
+ok_status kmeans_easy_compact(const void * work, const kmeans_io * io,
+	size_t * n_clusters)
+{
+	if (!work || !io)
+		return OK_SCAN_ERR( OPTKIT_ERROR_UNALLOCATED );
+	kmeans_work * w = (kmeans_work *) work;
+
+	return kmeans_compact(io->C, io->orderC, w->C.size1, w->C.size2,
+		io->a2c, io->stride_a2c, w->A.size1, io->counts,
+		io->stride_counts, n_clusters);
+}
+
 ok_status kmeans_easy_finish(void * work)
 {
 	ok_status err = kmeans_work_free((kmeans_work *) work);
@@ -343,6 +628,474 @@ ok_status kmeans_easy_finish(void * work)
 	return err;
 }
 
+static int kmeans_block_cost_compare(const void * a, const void * b)
+{
+	size_t cost_a = ((const size_t *) a)[0];
+	size_t cost_b = ((const size_t *) b)[0];
+	return (cost_a < cost_b) - (cost_a > cost_b);
+}
+
+/*
+ * k-means over independent blocks of vectors, stored contiguously in one
+ * (row-major) buffer: block b consists of vectors
+ *
+ *	A[block_offsets[b] : block_offsets[b + 1], :],
+ *
+ * initial centroids C[cluster_offsets[b] : cluster_offsets[b + 1], :], and
+ * assignments a2c[block_offsets[b] : block_offsets[b + 1]] (block-local
+ * labels), and is clustered with settings s[b].
+ *
+ * blocks are processed in parallel, largest first, by at most n_blocks
+ * threads, each holding its own kmeans_work sized for the largest block. the results of each
+ * block are compacted in place (see kmeans_compact) in C, a2c and counts,
+ * with the number of non-empty clusters of block b written to
+ * n_clusters[b].
+ *
+ * the thread limit s[0].num_threads (if nonzero) applies to the whole
+ * call; per-block limits s[b].num_threads are ignored.
+ */
+ok_status blockwise_kmeans(size_t n_blocks, const size_t * block_offsets,
+	const size_t * cluster_offsets, size_t vec_length, ok_float * A,
+	ok_float * C, size_t * a2c, ok_float * counts, size_t * n_clusters,
+	const kmeans_settings * s)
+{
+	ok_status err = OPTKIT_SUCCESS;
+	size_t b, max_vectors = 0, max_clusters = 0, * order = OK_NULL;
+	size_t size_b, clusters_b;
+	int i, n_team;
+	ok_threads threads_saved;
+
+	if (!block_offsets || !cluster_offsets || !A || !C || !a2c ||
+		!counts || !n_clusters || !s)
+		return OK_SCAN_ERR( OPTKIT_ERROR_UNALLOCATED );
+	if (n_blocks == 0)
+		return OPTKIT_SUCCESS;
+
+	OK_RETURNIF_ERR( ok_threads_limit(s->num_threads, &threads_saved) );
+
+	/* (cost, block) pairs, sorted by decreasing cost */
+	order = (size_t *) malloc(2 * n_blocks * sizeof(*order));
+	if (!order) {
+		ok_threads_restore(&threads_saved);
+		return OK_SCAN_ERR( OPTKIT_ERROR_MEMORY );
+	}
+	for (b = 0; b < n_blocks && !err; ++b) {
+		if (block_offsets[b + 1] < block_offsets[b] ||
+			cluster_offsets[b + 1] < cluster_offsets[b]) {
+			err = OK_SCAN_ERR( OPTKIT_ERROR_DIMENSION_MISMATCH );
+			break;
+		}
+		size_b = block_offsets[b + 1] - block_offsets[b];
+		clusters_b = cluster_offsets[b + 1] - cluster_offsets[b];
+		max_vectors = size_b > max_vectors ? size_b : max_vectors;
+		max_clusters = clusters_b > max_clusters ?
+			clusters_b : max_clusters;
+		order[2 * b] = size_b * clusters_b;
+		order[2 * b + 1] = b;
+		n_clusters[b] = 0;
+	}
+	if (!err)
+		qsort(order, n_blocks, 2 * sizeof(*order),
+			kmeans_block_cost_compare);
+
+	/* one kmeans_work per thread: no more threads than blocks */
+	n_team = ok_get_max_threads();
+	if ((size_t) n_team > n_blocks)
+		n_team = (int) n_blocks;
+
+	#ifdef _OPENMP
+	#pragma omp parallel if (!err) num_threads(n_team) \
+		private(b, size_b, clusters_b)
+	#endif
+	{
+		ok_status thread_err = OPTKIT_SUCCESS;
+		kmeans_work w;
+		kmeans_io io;
+
+		memset(&w, 0, sizeof(w));
+		OK_CHECK_ERR( thread_err, kmeans_work_alloc(&w, max_vectors,
+			max_clusters, vec_length) );
+
+		#ifdef _OPENMP
+		#pragma omp for schedule(dynamic, 1)
+		#endif
+		for (i = 0; i < (int) n_blocks; ++i) {
+			b = order[2 * i + 1];
+			size_b = block_offsets[b + 1] - block_offsets[b];
+			clusters_b = cluster_offsets[b + 1] - cluster_offsets[b];
+			if (thread_err || size_b == 0)
+				continue;
+
+			io.A = A + block_offsets[b] * vec_length;
+			io.C = C + cluster_offsets[b] * vec_length;
+			io.counts = counts + cluster_offsets[b];
+			io.a2c = a2c + block_offsets[b];
+			io.orderA = io.orderC = CblasRowMajor;
+			io.stride_a2c = io.stride_counts = 1;
+
+			OK_CHECK_ERR( thread_err, kmeans_work_subselect(&w, size_b,
+				clusters_b, vec_length) );
+			OK_CHECK_ERR( thread_err, __kmeans_easy_run(&w, s + b, &io) );
+			OK_CHECK_ERR( thread_err, kmeans_easy_compact(&w, &io,
+				n_clusters + b) );
+		}
+
+		OK_MAX_ERR( thread_err, kmeans_work_free(&w) );
+
+		#ifdef _OPENMP
+		#pragma omp critical
+		#endif
+		err = err > thread_err ? err : thread_err;
+	}
+
+	free(order);
+	OK_MAX_ERR( err, ok_threads_restore(&threads_saved) );
+	return err;
+}
+
+/*
+ * mini-batch k-means update (Sculley, 2010) for batch A: assign each
+ * vector to its nearest centroid, then, with b_k batch vectors assigned
+ * to centroid k, set
+ *
+ *	counts_k += b_k,
+ *	c_k += (1 / counts_k) * sum_{i: u(i) = k} (a_i - c_k),
+ *
+ * i.e., move each centroid by a per-cluster learning rate 1 / counts_k.
+ *
+ * the batch A is overwritten by residuals A - UC; S (same shape as C) and
+ * counts_batch (same size as counts) are workspace.
+ */
+ok_status kmeans_minibatch_update(matrix * A, matrix * C, upsamplingvec * a2c,
+	vector * counts, cluster_aid * h, matrix * S, vector * counts_batch)
+{
+	size_t k;
+	vector c, s;
+	OK_CHECK_MATRIX(A);
+	OK_CHECK_MATRIX(C);
+	OK_CHECK_UPSAMPLINGVEC(a2c);
+	OK_CHECK_VECTOR(counts);
+	OK_CHECK_PTR(h);
+	OK_CHECK_MATRIX(S);
+	OK_CHECK_VECTOR(counts_batch);
+
+	if (S->size1 != C->size1 || S->size2 != C->size2 ||
+		counts->size != C->size1 || counts_batch->size != C->size1)
+		return OK_SCAN_ERR( OPTKIT_ERROR_DIMENSION_MISMATCH );
+
+	a2c->size2 = C->size1;
+	OK_RETURNIF_ERR( cluster(A, C, a2c, h, OK_INFINITY) );
+
+	/* A = A - UC; S = U'A */
+	OK_RETURNIF_ERR( upsamplingvec_mul_matrix(h->hdl, CblasNoTrans,
+		CblasNoTrans, CblasNoTrans, -kOne, a2c, C, kOne, A) );
+	OK_RETURNIF_ERR( upsamplingvec_mul_matrix(h->hdl, CblasTrans,
+		CblasNoTrans, CblasNoTrans, kOne, a2c, A, kZero, S) );
+
+	/* counts += U'1; S = diag(counts)^{-1} S */
+	OK_RETURNIF_ERR( upsamplingvec_count(a2c, counts_batch) );
+	OK_RETURNIF_ERR( vector_add(counts, counts_batch) );
+	OK_RETURNIF_ERR( vector_memcpy_vv(counts_batch, counts) );
+	OK_RETURNIF_ERR( vector_safe_recip(counts_batch) );
+	OK_RETURNIF_ERR( linalg_matrix_broadcast_vector(S, counts_batch,
+		OkTransformScale, CblasLeft) );
+
+	/* C = C + S */
+	for (k = 0; k < C->size1; ++k) {
+		OK_RETURNIF_ERR( matrix_row(&c, C, k) );
+		OK_RETURNIF_ERR( matrix_row(&s, S, k) );
+		OK_RETURNIF_ERR( vector_add(&c, &s) );
+	}
+	return OPTKIT_SUCCESS;
+}
+
+ok_status kmeans_minibatch_work_alloc(kmeans_minibatch_work * w,
+	size_t batch_size, size_t n_clusters, size_t vec_length)
+{
+	ok_status err = OPTKIT_SUCCESS;
+	OK_CHECK_PTR(w);
+
+	memset(w, 0, sizeof(*w));
+	w->batch_size = batch_size;
+	w->n_clusters = n_clusters;
+	w->vec_length = vec_length;
+	OK_CHECK_ERR( err,
+		matrix_alloc(&w->A, batch_size, vec_length, CblasRowMajor) );
+	OK_CHECK_ERR( err,
+		matrix_calloc(&w->C, n_clusters, vec_length, CblasRowMajor) );
+	OK_CHECK_ERR( err,
+		matrix_alloc(&w->S, n_clusters, vec_length, CblasRowMajor) );
+	OK_CHECK_ERR( err,
+		upsamplingvec_alloc(&w->a2c, batch_size, n_clusters) );
+	OK_CHECK_ERR( err,
+		vector_calloc(&w->counts, n_clusters) );
+	OK_CHECK_ERR( err,
+		vector_alloc(&w->counts_batch, n_clusters) );
+	OK_CHECK_ERR( err,
+		cluster_aid_alloc(&w->h, batch_size, n_clusters,
+			CblasRowMajor) );
+	if (err)
+		OK_MAX_ERR( err, kmeans_minibatch_work_free(w) );
+	return err;
+}
+
+ok_status kmeans_minibatch_work_free(kmeans_minibatch_work * w)
+{
+	ok_status err = OPTKIT_SUCCESS;
+	OK_CHECK_PTR(w);
+
+	if (w->A.data)
+		OK_MAX_ERR( err, matrix_free(&w->A) );
+	if (w->C.data)
+		OK_MAX_ERR( err, matrix_free(&w->C) );
+	if (w->S.data)
+		OK_MAX_ERR( err, matrix_free(&w->S) );
+	if (w->a2c.indices)
+		OK_MAX_ERR( err, upsamplingvec_free(&w->a2c) );
+	if (w->counts.data)
+		OK_MAX_ERR( err, vector_free(&w->counts) );
+	if (w->counts_batch.data)
+		OK_MAX_ERR( err, vector_free(&w->counts_batch) );
+	if (w->h.hdl)
+		OK_MAX_ERR( err, cluster_aid_free(&w->h) );
+	memset(w, 0, sizeof(*w));
+	return err;
+}
+
+/*
+ * copy a batch of n_vectors <= batch_size vectors into the work, and
+ * restrict the batch-sized workspace to the batch
+ */
+static ok_status kmeans_minibatch_work_load_batch(kmeans_minibatch_work * w,
+	const ok_float * A, const enum CBLAS_ORDER orderA, size_t n_vectors)
+{
+	OK_CHECK_PTR(w);
+	OK_CHECK_PTR(A);
+
+	if (n_vectors > w->batch_size || n_vectors == 0)
+		return OK_SCAN_ERR( OPTKIT_ERROR_DIMENSION_MISMATCH );
+
+	w->A.size1 = n_vectors;
+	w->a2c.size1 = n_vectors;
+	w->a2c.vec.size = n_vectors;
+	OK_RETURNIF_ERR( cluster_aid_subselect(&w->h, 0, 0, n_vectors,
+		w->n_clusters) );
+	return matrix_memcpy_ma(&w->A, A, orderA);
+}
+
+void * kmeans_minibatch_easy_init(size_t batch_size, size_t n_clusters,
+	size_t vec_length)
+{
+	kmeans_minibatch_work * w = OK_NULL;
+	w = (kmeans_minibatch_work *) malloc(sizeof(*w));
+	if (!w)
+		return OK_NULL;
+	memset(w, 0, sizeof(*w));
+	if (kmeans_minibatch_work_alloc(w, batch_size, n_clusters,
+		vec_length)) {
+		ok_free(w);
+		w = OK_NULL;
+	}
+	return (void *) w;
+}
+
+ok_status kmeans_minibatch_easy_load(const void * work, const ok_float * C,
+	const enum CBLAS_ORDER orderC, const ok_float * counts,
+	size_t stride_counts)
+{
+	if (!work || !C || !counts)
+		return OK_SCAN_ERR( OPTKIT_ERROR_UNALLOCATED );
+	kmeans_minibatch_work * w = (kmeans_minibatch_work *) work;
+
+	OK_RETURNIF_ERR( matrix_memcpy_ma(&w->C, C, orderC) );
+	return vector_memcpy_va(&w->counts, counts, stride_counts);
+}
+
+/*
+ * seed centroids from a batch by k-means++ or k-means||; counts are
+ * reset to zero
+ */
+ok_status kmeans_minibatch_easy_seed(const void * work, const ok_float * A,
+	const enum CBLAS_ORDER orderA, size_t n_vectors,
+	const enum OPTKIT_KMEANS_INIT init, const size_t seed)
+{
+	OK_CHECK_PTR(work);
+	kmeans_minibatch_work * w = (kmeans_minibatch_work *) work;
+
+	OK_RETURNIF_ERR( kmeans_minibatch_work_load_batch(w, A, orderA,
+		n_vectors) );
+	OK_RETURNIF_ERR( kmeans_seed(&w->A, &w->C, &w->a2c, init, seed) );
+	return vector_scale(&w->counts, kZero);
+}
+
+ok_status kmeans_minibatch_easy_update(const void * work, const ok_float * A,
+	const enum CBLAS_ORDER orderA, size_t n_vectors)
+{
+	OK_CHECK_PTR(work);
+	kmeans_minibatch_work * w = (kmeans_minibatch_work *) work;
+
+	OK_RETURNIF_ERR( kmeans_minibatch_work_load_batch(w, A, orderA,
+		n_vectors) );
+	return kmeans_minibatch_update(&w->A, &w->C, &w->a2c, &w->counts,
+		&w->h, &w->S, &w->counts_batch);
+}
+
+/*
+ * assign a batch of vectors to the nearest (current) centroids, without
+ * updating the centroids
+ */
+ok_status kmeans_minibatch_easy_assign(const void * work, const ok_float * A,
+	const enum CBLAS_ORDER orderA, size_t n_vectors, size_t * a2c,
+	size_t stride_a2c)
+{
+	if (!work || !a2c)
+		return OK_SCAN_ERR( OPTKIT_ERROR_UNALLOCATED );
+	kmeans_minibatch_work * w = (kmeans_minibatch_work *) work;
+
+	OK_RETURNIF_ERR( kmeans_minibatch_work_load_batch(w, A, orderA,
+		n_vectors) );
+	w->a2c.size2 = w->C.size1;
+	OK_RETURNIF_ERR( cluster(&w->A, &w->C, &w->a2c, &w->h,
+		OK_INFINITY) );
+	return indvector_memcpy_av(a2c, &w->a2c.vec, stride_a2c);
+}
+
+ok_status kmeans_minibatch_easy_extract(ok_float * C,
+	const enum CBLAS_ORDER orderC, ok_float * counts,
+	size_t stride_counts, const void * work)
+{
+	if (!work || !C || !counts)
+		return OK_SCAN_ERR( OPTKIT_ERROR_UNALLOCATED );
+	kmeans_minibatch_work * w = (kmeans_minibatch_work *) work;
+
+	OK_RETURNIF_ERR( matrix_memcpy_am(C, &w->C, orderC) );
+	return vector_memcpy_av(counts, &w->counts, stride_counts);
+}
+
+ok_status kmeans_minibatch_easy_finish(void * work)
+{
+	ok_status err = kmeans_minibatch_work_free(
+		(kmeans_minibatch_work *) work);
+	if (work)
+		ok_free(work);
+	return err;
+}
+
+ok_status kmeans_predict_work_alloc(kmeans_predict_work * w,
+	size_t batch_size, size_t n_clusters, size_t vec_length)
+{
+	ok_status err = OPTKIT_SUCCESS;
+	OK_CHECK_PTR(w);
+
+	memset(w, 0, sizeof(*w));
+	w->batch_size = batch_size;
+	w->n_clusters = n_clusters;
+	w->vec_length = vec_length;
+	OK_CHECK_ERR( err,
+		matrix_alloc(&w->A, batch_size, vec_length, CblasRowMajor) );
+	OK_CHECK_ERR( err,
+		matrix_calloc(&w->C, n_clusters, vec_length, CblasRowMajor) );
+	OK_CHECK_ERR( err,
+		upsamplingvec_alloc(&w->a2c, batch_size, n_clusters) );
+	OK_CHECK_ERR( err,
+		cluster_aid_alloc(&w->h, batch_size, n_clusters,
+			CblasRowMajor) );
+	if (err)
+		OK_MAX_ERR( err, kmeans_predict_work_free(w) );
+	return err;
+}
+
+ok_status kmeans_predict_work_free(kmeans_predict_work * w)
+{
+	ok_status err = OPTKIT_SUCCESS;
+	OK_CHECK_PTR(w);
+
+	if (w->A.data)
+		OK_MAX_ERR( err, matrix_free(&w->A) );
+	if (w->C.data)
+		OK_MAX_ERR( err, matrix_free(&w->C) );
+	if (w->a2c.indices)
+		OK_MAX_ERR( err, upsamplingvec_free(&w->a2c) );
+	if (w->h.hdl)
+		OK_MAX_ERR( err, cluster_aid_free(&w->h) );
+	if (w->kdtree)
+		OK_MAX_ERR( err, cluster_kdtree_free(w->kdtree) );
+	ok_free(w->indicator);
+	memset(w, 0, sizeof(*w));
+	return err;
+}
+
+/*
+ * fitted k-means model: centroids C are loaded once, and the squared
+ * centroid norms c_k'c_k (or, where favored, a k-d tree over C) held in
+ * the work for all subsequent batches
+ */
+void * kmeans_predict_easy_init(const ok_float * C,
+	const enum CBLAS_ORDER orderC, size_t n_clusters, size_t vec_length,
+	size_t batch_size)
+{
+	ok_status err = OPTKIT_SUCCESS;
+	kmeans_predict_work * w = OK_NULL;
+	#ifdef __CUDACC__
+	w = (kmeans_predict_work *) malloc(sizeof(*w));
+	memset(w, 0, sizeof(*w));
+	#else
+	ok_alloc(w, sizeof(*w));
+	#endif
+	OK_CHECK_ERR( err, kmeans_predict_work_alloc(w, batch_size,
+		n_clusters, vec_length) );
+	OK_CHECK_ERR( err, matrix_memcpy_ma(&w->C, C, orderC) );
+	OK_CHECK_ERR( err, linalg_matrix_row_squares(CblasNoTrans, &w->C,
+		&w->h.c_squared) );
+	if (!err && cluster_kdtree_favored(vec_length, n_clusters))
+		OK_CHECK_ERR( err, cluster_kdtree_alloc(&w->kdtree, &w->C) );
+	if (err) {
+		kmeans_predict_easy_finish(w);
+		w = OK_NULL;
+	}
+	return (void *) w;
+}
+
+/*
+ * assign a batch of n_vectors <= batch_size vectors to the nearest
+ * centroids of the model
+ */
+ok_status kmeans_predict_easy_run(const void * work, const ok_float * A,
+	const enum CBLAS_ORDER orderA, size_t n_vectors, size_t * a2c,
+	size_t stride_a2c)
+{
+	if (!work || !A || !a2c)
+		return OK_SCAN_ERR( OPTKIT_ERROR_UNALLOCATED );
+	kmeans_predict_work * w = (kmeans_predict_work *) work;
+
+	if (n_vectors > w->batch_size || n_vectors == 0)
+		return OK_SCAN_ERR( OPTKIT_ERROR_DIMENSION_MISMATCH );
+
+	w->A.size1 = n_vectors;
+	w->a2c.size1 = n_vectors;
+	w->a2c.vec.size = n_vectors;
+	OK_RETURNIF_ERR( cluster_aid_subselect(&w->h, 0, 0, n_vectors,
+		w->n_clusters) );
+	OK_RETURNIF_ERR( matrix_memcpy_ma(&w->A, A, orderA) );
+
+	if (w->kdtree) {
+		OK_RETURNIF_ERR( cluster_kdtree_search(&w->A, &w->C, &w->a2c,
+			&w->h, OK_INFINITY, w->kdtree) );
+		return indvector_memcpy_av(a2c, &w->a2c.vec, stride_a2c);
+	}
+
+	OK_RETURNIF_ERR( cluster_tentative(&w->A, &w->C, &w->h) );
+	return indvector_memcpy_av(a2c, &w->h.a2c_tentative.vec, stride_a2c);
+}
+
+ok_status kmeans_predict_easy_finish(void * work)
+{
+	ok_status err = kmeans_predict_work_free((kmeans_predict_work *) work);
+	if (work)
+		ok_free(work);
+	return err;
+}
+
 #ifdef __cplusplus
 }
 #endif
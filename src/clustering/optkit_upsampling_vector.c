@@ -4,6 +4,50 @@
 extern "C" {
 #endif
 
+/*
+ * CSR-style inverse index of upsampling vector u, by counting sort: the
+ * vectors assigned to index k are
+ *
+ *	perm[offsets[k]], ..., perm[offsets[k + 1] - 1],
+ *
+ * in ascending order. perm is optional; caller frees offsets (and perm).
+ */
+static ok_status upsamplingvec_inverse_index(const upsamplingvec * u,
+	const size_t n_bins, size_t ** offsets, size_t ** perm)
+{
+	size_t i, k, idx;
+
+	ok_alloc(*offsets, (n_bins + 1) * sizeof(**offsets));
+	if (!*offsets)
+		return OK_SCAN_ERR( OPTKIT_ERROR_UNALLOCATED );
+
+	for (i = 0; i < u->size1; ++i) {
+		idx = u->indices[i * u->stride];
+		if (idx >= n_bins)
+			return OK_SCAN_ERR( OPTKIT_ERROR_OUT_OF_BOUNDS );
+		++(*offsets)[idx + 1];
+	}
+	for (k = 0; k < n_bins; ++k)
+		(*offsets)[k + 1] += (*offsets)[k];
+
+	if (!perm)
+		return OPTKIT_SUCCESS;
+
+	ok_alloc(*perm, (u->size1 > 0 ? u->size1 : 1) * sizeof(**perm));
+	if (!*perm)
+		return OK_SCAN_ERR( OPTKIT_ERROR_UNALLOCATED );
+
+	/* fill bins, advancing offsets[k] to the end of bin k... */
+	for (i = 0; i < u->size1; ++i)
+		(*perm)[(*offsets)[u->indices[i * u->stride]]++] = i;
+
+	/* ...then shift back to the start of bin k */
+	for (k = n_bins; k > 0; --k)
+		(*offsets)[k] = (*offsets)[k - 1];
+	(*offsets)[0] = 0;
+	return OPTKIT_SUCCESS;
+}
+
 ok_status upsamplingvec_mul_matrix(void * linalg_handle,
 	const enum CBLAS_TRANSPOSE transU, const enum CBLAS_TRANSPOSE transI,
 	const enum CBLAS_TRANSPOSE transO, const ok_float alpha,
@@ -13,8 +57,10 @@ ok_status upsamplingvec_mul_matrix(void * linalg_handle,
 	OK_CHECK_MATRIX(M_in);
 	OK_CHECK_MATRIX(M_out);
 
-	size_t i, dim_in1, dim_in2, dim_out1, dim_out2;
+	ok_status err = OPTKIT_SUCCESS;
+	size_t i, j, dim_in1, dim_in2, dim_out1, dim_out2;
 	size_t ptr_stride_in, ptr_stride_out;
+	size_t * offsets = OK_NULL, * perm = OK_NULL;
 	int stride_in, stride_out;
 	const int transpose = transU == CblasTrans;
 
@@ -52,39 +98,52 @@ ok_status upsamplingvec_mul_matrix(void * linalg_handle,
 				ptr_stride_in,
 				stride_in, M_out->data + i * ptr_stride_out,
 				stride_out);
-	else
-		#ifdef _OPENMP
-		#pragma omp parallel for
-		#endif
-		for (i = 0; i < dim_in1; ++i)
-			CBLAS(axpy)((int) dim_in2, alpha,
-				M_in->data + i * ptr_stride_in, stride_in,
-				M_out->data + u->indices[i*u->stride] *
-				ptr_stride_out,
-				stride_out);
-
-	return OPTKIT_SUCCESS;
+	else {
+		/*
+		 * gather, rather than scatter: each output row i accumulates
+		 * the input rows assigned to it, in ascending order, so that
+		 * threads write disjoint rows and results are deterministic
+		 */
+		err = upsamplingvec_inverse_index(u, dim_out1, &offsets, &perm);
+		if (!err)
+			#ifdef _OPENMP
+			#pragma omp parallel for private(j) schedule(dynamic)
+			#endif
+			for (i = 0; i < dim_out1; ++i)
+				for (j = offsets[i]; j < offsets[i + 1]; ++j)
+					CBLAS(axpy)((int) dim_in2, alpha,
+						M_in->data + perm[j] *
+						ptr_stride_in, stride_in,
+						M_out->data + i * ptr_stride_out,
+						stride_out);
+		ok_free(offsets);
+		ok_free(perm);
+	}
+
+	return err;
 }
 
 ok_status upsamplingvec_count(const upsamplingvec * u, vector * counts)
 {
-	size_t i;
+	ok_status err = OPTKIT_SUCCESS;
+	size_t k, * offsets = OK_NULL;
 	if ((!u || !counts) || (!u->indices || !counts->data))
 		return OPTKIT_ERROR_UNALLOCATED;
 
 	if (u->size2 > counts->size)
 		return OPTKIT_ERROR_DIMENSION_MISMATCH;
 
-	OK_RETURNIF_ERR( vector_scale(counts, kZero) );
-
-	#ifdef _OPENMP
-	#pragma omp parallel for
-	#endif
-	for (i = 0; i < u->size1; ++i)
-		counts->data[u->indices[i * u->stride] * counts->stride] +=
-			kOne;
+	err = upsamplingvec_inverse_index(u, counts->size, &offsets, OK_NULL);
+	if (!err)
+		#ifdef _OPENMP
+		#pragma omp parallel for
+		#endif
+		for (k = 0; k < counts->size; ++k)
+			counts->data[k * counts->stride] =
+				(ok_float) (offsets[k + 1] - offsets[k]);
 
-	return OPTKIT_SUCCESS;
+	ok_free(offsets);
+	return err;
 }
 
 #ifdef __cplusplus
@@ -56,6 +56,7 @@ ok_status upsamplingvec_subvector(upsamplingvec * usub, upsamplingvec * u,
 	OK_RETURNIF_ERR( indvector_subvector(&usub->vec, &u->vec, offset1,
 		length1) );
 	usub->indices = usub->vec.data;
+	usub->stride = usub->vec.stride;
 	usub->size1 = length1;
 	usub->size2 = size2;
 	return OPTKIT_SUCCESS;
@@ -1,5 +1,9 @@
 #include "optkit_sparse.h"
 
+#ifdef _OPENMP
+#include <omp.h>
+#endif
+
 #ifdef __cplusplus
 extern "C" {
 #endif
@@ -8,6 +12,57 @@ extern "C" {
 }
 #endif
 
+template<typename T, typename I>
+void __csr2csc_(size_t m, size_t n, size_t nnz, T * csr_val, I * row_ptr,
+	I * col_ind, T * csc_val, I * row_ind, I * col_ptr)
+{
+	I i, j, k, l;
+	memset(col_ptr, 0, (n + 1) * sizeof(I));
+
+	for (i = 0; i < (I) nnz; i++)
+		col_ptr[col_ind[i] + 1]++;
+
+	for (i = 0; i < (I) n; i++)
+		col_ptr[i + 1] += col_ptr[i];
+
+	for (i = 0; i < (I) m; i++) {
+		for (j = row_ptr[i]; j < row_ptr[i + 1]; j++) {
+			k = col_ind[j];
+			l = col_ptr[k]++;
+			row_ind[l] = i;
+			csc_val[l] = csr_val[j];
+		}
+	}
+
+	for (i = (I) n; i > 0; i--)
+	    col_ptr[i] = col_ptr[i - 1];
+
+	col_ptr[0] = 0;
+}
+
+template<typename T, typename I>
+void __transpose_inplace_(sp_matrix_<T, I> * A, SPARSE_TRANSPOSE_DIRECTION dir)
+{
+	if (dir == Forward2Adjoint)
+		if (A->order == CblasRowMajor)
+			__csr2csc_<T, I>(A->size1, A->size2, A->nnz, A->val,
+				A->ptr, A->ind, A->val + A->nnz,
+				A->ind + A->nnz, A->ptr + A->ptrlen);
+		else
+			__csr2csc_<T, I>(A->size2, A->size1, A->nnz, A->val,
+				A->ptr, A->ind, A->val + A->nnz,
+				A->ind + A->nnz, A->ptr + A->ptrlen);
+	else
+		if (A->order == CblasRowMajor)
+			__csr2csc_<T, I>(A->size2, A->size1, A->nnz,
+				A->val + A->nnz, A->ptr + A->ptrlen,
+				A->ind + A->nnz, A->val, A->ind, A->ptr);
+		else
+			__csr2csc_<T, I>(A->size1, A->size2, A->nnz,
+				A->val + A->nnz, A->ptr + A->ptrlen,
+				A->ind + A->nnz, A->val, A->ind, A->ptr);
+}
+
 template<typename T, typename I>
 ok_status sp_matrix_alloc_(sp_matrix_<T, I> * A, size_t m, size_t n, size_t nnz,
 	enum CBLAS_ORDER order)
@@ -26,6 +81,29 @@ ok_status sp_matrix_alloc_(sp_matrix_<T, I> * A, size_t m, size_t n, size_t nnz,
 	A->ind = (I *) malloc(2 * nnz * sizeof(I));
 	A->ptr = (I *) malloc((2 + m + n) * sizeof(I));
 	A->order = order;
+	A->is_view = 0;
+
+	return OPTKIT_SUCCESS;
+}
+
+template<typename T, typename I>
+ok_status sp_matrix_view_(sp_matrix_<T, I> * A, size_t m, size_t n,
+	size_t nnz, T * val, I * ind, I * ptr, enum CBLAS_ORDER order)
+{
+	if (!A || !val || !ind || !ptr)
+		return OK_SCAN_ERR( OPTKIT_ERROR_UNALLOCATED );
+	if (A->val || A->ind || A->ptr)
+		return OK_SCAN_ERR( OPTKIT_ERROR_OVERWRITE );
+
+	A->size1 = m;
+	A->size2 = n;
+	A->nnz = nnz;
+	A->ptrlen = (order == CblasColMajor) ? n + 1 : m + 1;
+	A->val = val;
+	A->ind = ind;
+	A->ptr = ptr;
+	A->order = order;
+	A->is_view = 1;
 
 	return OPTKIT_SUCCESS;
 }
@@ -45,9 +123,16 @@ template<typename T, typename I>
 ok_status sp_matrix_free_(sp_matrix_<T, I> * A)
 {
 	OK_CHECK_SPARSEMAT(A);
-	ok_free(A->val);
-	ok_free(A->ind);
-	ok_free(A->ptr);
+	if (A->is_view) {
+		A->val = OK_NULL;
+		A->ind = OK_NULL;
+		A->ptr = OK_NULL;
+		A->is_view = 0;
+	} else {
+		ok_free(A->val);
+		ok_free(A->ind);
+		ok_free(A->ptr);
+	}
 	A->size1 = (size_t) 0;
 	A->size2 = (size_t) 0;
 	A->nnz = (size_t) 0;
@@ -63,6 +148,16 @@ ok_status sp_matrix_memcpy_mm_(sp_matrix_<T, I> * A,
 	OK_CHECK_SPARSEMAT(B);
 	if (A->nnz != B->nnz || A->size1 + A->size2 != B->size1 + B->size2)
 		return OK_SCAN_ERR( OPTKIT_ERROR_DIMENSION_MISMATCH );
+	if (A->is_view || B->is_view) {
+		if (A->ptrlen != B->ptrlen)
+			return OK_SCAN_ERR( OPTKIT_ERROR_LAYOUT_MISMATCH );
+		memcpy(A->val, B->val, A->nnz * sizeof(T));
+		memcpy(A->ind, B->ind, A->nnz * sizeof(I));
+		memcpy(A->ptr, B->ptr, A->ptrlen * sizeof(I));
+		if (!A->is_view)
+			__transpose_inplace_<T, I>(A, Forward2Adjoint);
+		return OPTKIT_SUCCESS;
+	}
 	memcpy(A->val, B->val, 2 * A->nnz * sizeof(T));
 	memcpy(A->ind, B->ind, 2 * A->nnz * sizeof(I));
 	memcpy(A->ptr, B->ptr, (A->size1 + A->size2 + 2) * sizeof(I));
@@ -75,140 +170,474 @@ ok_status sp_matrix_memcpy_vals_mm_(sp_matrix_<T, I> * A,
 {
 	OK_CHECK_SPARSEMAT(A);
 	OK_CHECK_SPARSEMAT(B);
-	memcpy(A->val, B->val, 2 * A->nnz * sizeof(T));
+	if (A->is_view || B->is_view) {
+		memcpy(A->val, B->val, A->nnz * sizeof(T));
+		if (!A->is_view)
+			__transpose_inplace_<T, I>(A, Forward2Adjoint);
+	} else {
+		memcpy(A->val, B->val, 2 * A->nnz * sizeof(T));
+	}
 	return OPTKIT_SUCCESS;
 }
 
-#ifdef __cplusplus
-extern "C" {
-#endif
+template<typename T, typename I>
+ok_status sp_matrix_memcpy_ma_(sp_matrix_<T, I> * A, const T * val,
+	const I * ind, const I * ptr)
+{
+	OK_CHECK_SPARSEMAT(A);
+	if (!val || !ind || !ptr)
+		return OK_SCAN_ERR( OPTKIT_ERROR_UNALLOCATED );
 
-void __csr2csc(size_t m, size_t n, size_t nnz, ok_float * csr_val,
-	ok_int * row_ptr, ok_int * col_ind, ok_float * csc_val,
-	ok_int * row_ind, ok_int * col_ptr)
+	memcpy(A->val, val, A->nnz * sizeof(T));
+	memcpy(A->ind, ind, A->nnz * sizeof(I));
+	memcpy(A->ptr, ptr, A->ptrlen * sizeof(I));
+	if (!A->is_view)
+		__transpose_inplace_<T, I>(A, Forward2Adjoint);
+	return OPTKIT_SUCCESS;
+}
+
+template<typename T, typename I>
+ok_status sp_matrix_memcpy_am_(T * val, I * ind, I * ptr,
+	const sp_matrix_<T, I> * A)
 {
-	ok_int i, j, k, l;
-	memset(col_ptr, 0, (n + 1) * sizeof(ok_int));
+	OK_CHECK_SPARSEMAT(A);
+	if (!val || !ind || !ptr)
+		return OK_SCAN_ERR( OPTKIT_ERROR_UNALLOCATED );
 
-	for (i = 0; i < (ok_int) nnz; i++)
-		col_ptr[col_ind[i] + 1]++;
+	memcpy(val, A->val, A->nnz * sizeof(T));
+	memcpy(ind, A->ind, A->nnz * sizeof(I));
+	memcpy(ptr, A->ptr, A->ptrlen * sizeof(I));
+	return OPTKIT_SUCCESS;
+}
 
-	for (i = 0; i < (ok_int) n; i++)
-		col_ptr[i + 1] += col_ptr[i];
+/*
+ * select the half of the forward/adjoint storage that yields a row-wise
+ * (CSR) traversal for the requested operation:
+ *      csr, forward op -> forward
+ *      csr, adjoint op -> adjoint
+ *      csc, forward op -> adjoint
+ *      csc, adjoint op -> forward
+ */
+template<typename T, typename I>
+ok_status __sp_gemv_setup(enum CBLAS_TRANSPOSE transA,
+	const sp_matrix_<T, I> * A, const vector * x, const vector * y,
+	size_t * ptrlen, size_t * offset_ptr, size_t * offset_nz)
+{
+	OK_CHECK_SPARSEMAT(A);
+	OK_CHECK_VECTOR(x);
+	OK_CHECK_VECTOR(y);
+	if ((transA == CblasNoTrans &&
+		(A->size1 != y->size || A->size2 != x->size)) ||
+	    (transA == CblasTrans &&
+	    	(A->size1 != x->size || A->size2 != y->size)))
+	    	return OK_SCAN_ERR( OPTKIT_ERROR_DIMENSION_MISMATCH );
 
-	for (i = 0; i < (ok_int) m; i++) {
-		for (j = row_ptr[i]; j < row_ptr[i + 1]; j++) {
-			k = col_ind[j];
-			l = col_ptr[k]++;
-			row_ind[l] = i;
-			csc_val[l] = csr_val[j];
+	if ((A->order == CblasRowMajor) != (transA == CblasTrans)) {
+		*ptrlen = A->ptrlen;
+		*offset_ptr = 0;
+		*offset_nz = 0;
+	} else {
+		*ptrlen = A->size1 + A->size2 + 2 - A->ptrlen;
+		*offset_ptr = A->ptrlen;
+		*offset_nz = A->nnz;
+	}
+	return OPTKIT_SUCCESS;
+}
+
+/*
+ * threads for a view's adjoint scatter: each thread accumulates its share
+ * of the stored rows (columns) into a private copy of the output, and the
+ * copies are summed; 1 (a serial scatter into y) for short operands
+ */
+static int __sp_scatter_threads(size_t ptrlen)
+{
+	int n_threads = 1;
+	#ifdef _OPENMP
+	n_threads = omp_get_max_threads();
+	if ((size_t) n_threads > ptrlen / 64)
+		n_threads = (int) (ptrlen / 64);
+	#endif
+	return n_threads > 1 ? n_threads : 1;
+}
+
+/*
+ * views store no adjoint copy; form y = alpha * op(A) * x + beta * y by
+ * scattering each stored row (column) of a CSR (CSC) array into y
+ */
+template<typename T, typename I>
+ok_status __sp_gemv_scatter(const sp_matrix_<T, I> * A, T alpha, vector * x,
+	T beta, vector * y)
+{
+	size_t i, k, size = y->size;
+	int t, n_threads = __sp_scatter_threads(A->ptrlen - 1);
+	I j;
+	T tmp, * acc = OK_NULL, * acc_t;
+
+	for (i = 0; i < size; ++i)
+		y->data[i] = (beta == (T) 0) ? (T) 0 : beta * y->data[i];
+
+	if (n_threads == 1) {
+		for (i = 0; i < A->ptrlen - 1; ++i) {
+			tmp = alpha * x->data[i];
+			for (j = A->ptr[i]; j < A->ptr[i + 1]; ++j)
+				y->data[A->ind[j]] += A->val[j] * tmp;
 		}
+		return OPTKIT_SUCCESS;
 	}
 
-	for (i = (ok_int) n; i > 0; i--)
-	    col_ptr[i] = col_ptr[i - 1];
+	acc = (T *) calloc((size_t) n_threads * size, sizeof(T));
+	if (!acc)
+		return OK_SCAN_ERR( OPTKIT_ERROR_MEMORY );
 
-	col_ptr[0] = 0;
+	#ifdef _OPENMP
+	#pragma omp parallel num_threads(n_threads) private(i, j, k, t, tmp, acc_t)
+	#endif
+	{
+		#ifdef _OPENMP
+		acc_t = acc + (size_t) omp_get_thread_num() * size;
+		#pragma omp for schedule(static)
+		#else
+		acc_t = acc;
+		#endif
+		for (i = 0; i < A->ptrlen - 1; ++i) {
+			tmp = alpha * x->data[i];
+			for (j = A->ptr[i]; j < A->ptr[i + 1]; ++j)
+				acc_t[A->ind[j]] += A->val[j] * tmp;
+		}
+
+		#ifdef _OPENMP
+		#pragma omp for schedule(static)
+		#endif
+		for (k = 0; k < size; ++k)
+			for (t = 0; t < n_threads; ++t)
+				y->data[k] += acc[(size_t) t * size + k];
+	}
+	free(acc);
+	return OPTKIT_SUCCESS;
 }
 
-void __transpose_inplace(sp_matrix * A, SPARSE_TRANSPOSE_DIRECTION dir)
+template<typename T, typename I>
+ok_status sp_blas_gemv_(enum CBLAS_TRANSPOSE transA, T alpha,
+	sp_matrix_<T, I> * A, vector * x, T beta, vector * y)
 {
-	if (dir == Forward2Adjoint)
-		if (A->order == CblasRowMajor)
-			__csr2csc(A->size1, A->size2, A->nnz, A->val, A->ptr,
-				A->ind, A->val + A->nnz, A->ind + A->nnz,
-				A->ptr + A->ptrlen);
-		else
-			__csr2csc(A->size2, A->size1, A->nnz, A->val, A->ptr,
-				A->ind, A->val + A->nnz, A->ind + A->nnz,
-				A->ptr + A->ptrlen);
-	else
-		if (A->order == CblasRowMajor)
-			__csr2csc(A->size2, A->size1, A->nnz, A->val + A->nnz,
-				A->ptr + A->ptrlen, A->ind + A->nnz, A->val,
-				A->ind, A->ptr);
-		else
-			__csr2csc(A->size1, A->size2, A->nnz, A->val + A->nnz,
-				A->ptr + A->ptrlen, A->ind + A->nnz, A->val,
-				A->ind, A->ptr);
+	size_t ptrlen, offset_ptr, offset_nz, i;
+	I j, * ind, * ptr;
+	T * val, tmp;
+
+	OK_RETURNIF_ERR( (__sp_gemv_setup<T, I>(transA, A, x, y, &ptrlen,
+		&offset_ptr, &offset_nz)) );
+	if (A->is_view && offset_ptr)
+		return __sp_gemv_scatter<T, I>(A, alpha, x, beta, y);
+	ptr = A->ptr + offset_ptr;
+	ind = A->ind + offset_nz;
+	val = A->val + offset_nz;
+
+	#ifdef _OPENMP
+	#pragma omp parallel for private(j, tmp)
+	#endif
+	for (i = 0; i < ptrlen - 1; ++i) {
+		tmp = kZero;
+		for (j = ptr[i]; j < ptr[i + 1]; ++j)
+			tmp += val[j] * x->data[ind[j]];
+		y->data[i] = alpha * tmp + beta * y->data[i];
+	}
+	return OPTKIT_SUCCESS;
 }
 
-ok_status sp_make_handle(void ** sparse_handle)
+/*
+ * dense blocks: element (i, j) of X is X->data[i * rows + j * cols], with
+ * (rows, cols) = (ld, 1) for row-major and (1, ld) for column-major X
+ */
+template<typename T, typename I>
+ok_status __sp_gemm_setup(enum CBLAS_TRANSPOSE transA,
+	const sp_matrix_<T, I> * A, const matrix_<T> * X, const matrix_<T> * Y,
+	size_t * ptrlen, size_t * offset_ptr, size_t * offset_nz)
 {
-	* sparse_handle = OK_NULL;
+	OK_CHECK_SPARSEMAT(A);
+	OK_CHECK_MATRIX(X);
+	OK_CHECK_MATRIX(Y);
+	if (X->order != Y->order)
+		return OK_SCAN_ERR( OPTKIT_ERROR_LAYOUT_MISMATCH );
+	if (X->size2 != Y->size2 || (transA == CblasNoTrans &&
+		(A->size1 != Y->size1 || A->size2 != X->size1)) ||
+	    (transA == CblasTrans &&
+	    	(A->size1 != X->size1 || A->size2 != Y->size1)))
+	    	return OK_SCAN_ERR( OPTKIT_ERROR_DIMENSION_MISMATCH );
+
+	if ((A->order == CblasRowMajor) != (transA == CblasTrans)) {
+		*ptrlen = A->ptrlen;
+		*offset_ptr = 0;
+		*offset_nz = 0;
+	} else {
+		*ptrlen = A->size1 + A->size2 + 2 - A->ptrlen;
+		*offset_ptr = A->ptrlen;
+		*offset_nz = A->nnz;
+	}
 	return OPTKIT_SUCCESS;
 }
 
-ok_status sp_destroy_handle(void * sparse_handle)
+/*
+ * views: Y = alpha * op(A) * X + beta * Y by scattering the stored rows
+ * (columns) into per-thread copies of Y, as in __sp_gemv_scatter
+ */
+template<typename T, typename I>
+ok_status __sp_gemm_scatter(const sp_matrix_<T, I> * A, T alpha,
+	matrix_<T> * X, T beta, matrix_<T> * Y)
 {
+	size_t i, k, c, ncols = X->size2, size = Y->size1 * X->size2;
+	size_t x_row, x_col, y_row, y_col;
+	int t, n_threads = __sp_scatter_threads(A->ptrlen - 1);
+	I j;
+	T tmp, * acc = OK_NULL, * acc_t, * y_k;
+
+	x_row = (X->order == CblasRowMajor) ? X->ld : 1;
+	x_col = (X->order == CblasRowMajor) ? 1 : X->ld;
+	y_row = (Y->order == CblasRowMajor) ? Y->ld : 1;
+	y_col = (Y->order == CblasRowMajor) ? 1 : Y->ld;
+
+	/* accumulators are row-major, Y->size1 x ncols */
+	acc = (T *) calloc((size_t) n_threads * size, sizeof(T));
+	if (!acc)
+		return OK_SCAN_ERR( OPTKIT_ERROR_MEMORY );
+
+	#ifdef _OPENMP
+	#pragma omp parallel num_threads(n_threads) \
+		private(i, j, k, c, t, tmp, acc_t, y_k)
+	#endif
+	{
+		#ifdef _OPENMP
+		acc_t = acc + (size_t) omp_get_thread_num() * size;
+		#pragma omp for schedule(static)
+		#else
+		acc_t = acc;
+		#endif
+		for (i = 0; i < A->ptrlen - 1; ++i)
+			for (j = A->ptr[i]; j < A->ptr[i + 1]; ++j) {
+				tmp = alpha * A->val[j];
+				for (c = 0; c < ncols; ++c)
+					acc_t[(size_t) A->ind[j] * ncols + c] += tmp *
+						X->data[i * x_row + c * x_col];
+			}
+
+		#ifdef _OPENMP
+		#pragma omp for schedule(static)
+		#endif
+		for (k = 0; k < Y->size1; ++k) {
+			y_k = Y->data + k * y_row;
+			for (c = 0; c < ncols; ++c) {
+				tmp = (beta == (T) 0) ? (T) 0 : beta * y_k[c * y_col];
+				for (t = 0; t < n_threads; ++t)
+					tmp += acc[(size_t) t * size + k * ncols + c];
+				y_k[c * y_col] = tmp;
+			}
+		}
+	}
+	free(acc);
 	return OPTKIT_SUCCESS;
 }
 
-ok_status sp_matrix_alloc(sp_matrix * A, size_t m, size_t n, size_t nnz,
-	enum CBLAS_ORDER order)
-	{ return sp_matrix_alloc_<ok_float, ok_int>(A, m, n, nnz, order); }
-
-ok_status sp_matrix_calloc(sp_matrix * A, size_t m, size_t n, size_t nnz,
-	enum CBLAS_ORDER order)
-	{ return sp_matrix_calloc_<ok_float, ok_int>(A, m, n, nnz, order); }
+/*
+ * Y = alpha * op(A) * X + beta * Y: each row of the selected storage is
+ * read once and applied to every column of the block
+ */
+template<typename T, typename I>
+ok_status sp_blas_gemm_(enum CBLAS_TRANSPOSE transA, T alpha,
+	sp_matrix_<T, I> * A, matrix_<T> * X, T beta, matrix_<T> * Y)
+{
+	size_t ptrlen, offset_ptr, offset_nz, i, c, ncols;
+	size_t x_row, x_col, y_row, y_col;
+	I j, * ind, * ptr;
+	T * val, * y_i, tmp;
+
+	OK_RETURNIF_ERR( (__sp_gemm_setup<T, I>(transA, A, X, Y, &ptrlen,
+		&offset_ptr, &offset_nz)) );
+	if (A->is_view && offset_ptr)
+		return __sp_gemm_scatter<T, I>(A, alpha, X, beta, Y);
+
+	ncols = X->size2;
+	x_row = (X->order == CblasRowMajor) ? X->ld : 1;
+	x_col = (X->order == CblasRowMajor) ? 1 : X->ld;
+	y_row = (Y->order == CblasRowMajor) ? Y->ld : 1;
+	y_col = (Y->order == CblasRowMajor) ? 1 : Y->ld;
+
+	ptr = A->ptr + offset_ptr;
+	ind = A->ind + offset_nz;
+	val = A->val + offset_nz;
 
-ok_status sp_matrix_free(sp_matrix * A)
-	{ return sp_matrix_free_<ok_float, ok_int>(A); }
+	#ifdef _OPENMP
+	#pragma omp parallel for private(c, j, tmp, y_i)
+	#endif
+	for (i = 0; i < ptrlen - 1; ++i) {
+		y_i = Y->data + i * y_row;
+		for (c = 0; c < ncols; ++c)
+			y_i[c * y_col] = (beta == (T) 0) ? (T) 0 :
+				beta * y_i[c * y_col];
+		for (j = ptr[i]; j < ptr[i + 1]; ++j) {
+			tmp = alpha * val[j];
+			for (c = 0; c < ncols; ++c)
+				y_i[c * y_col] += tmp *
+					X->data[ind[j] * x_row + c * x_col];
+		}
+	}
+	return OPTKIT_SUCCESS;
+}
 
-ok_status sp_matrix_memcpy_mm(sp_matrix * A, const sp_matrix * B)
-	{ return sp_matrix_memcpy_mm_<ok_float, ok_int>(A, B); }
+/*
+ * compressed index: each row (of the forward and adjoint copies) stores
+ * its smallest column index as a base, and each nonzero stores the offset
+ * of its column from that base in a 16- or 32-bit unsigned integer.
+ * column indices need not be sorted within rows.
+ */
+template<typename I>
+static void __sp_row_range(const I * ind, I start, I stop, I * lo, I * hi)
+{
+	I j;
+	*lo = *hi = ind[start];
+	for (j = start + 1; j < stop; ++j)
+		if (ind[j] < *lo)
+			*lo = ind[j];
+		else if (ind[j] > *hi)
+			*hi = ind[j];
+}
 
-ok_status sp_matrix_memcpy_ma(void * sparse_handle, sp_matrix * A,
-	const ok_float * val, const ok_int * ind, const ok_int * ptr)
+template<typename T, typename I>
+ok_status sp_matrix_compress_index_(sp_cindex * D, const sp_matrix_<T, I> * A,
+	size_t width)
 {
+	size_t i, nz, ptrlen, max_span = 0;
+	I j, lo, hi;
+	uint16_t * off16;
+	uint32_t * off32;
+
 	OK_CHECK_SPARSEMAT(A);
-	if (!val || !ind || !ptr)
-		return OK_SCAN_ERR( OPTKIT_ERROR_UNALLOCATED );
+	OK_CHECK_PTR(D);
+	if (A->is_view)
+		return OK_SCAN_ERR( OPTKIT_ERROR_LAYOUT_MISMATCH );
+	if (D->base || D->offset)
+		return OK_SCAN_ERR( OPTKIT_ERROR_OVERWRITE );
+	if (width != 0 && width != 16 && width != 32)
+		return OK_SCAN_ERR( OPTKIT_ERROR_DOMAIN );
 
-	memcpy(A->val, val, A->nnz * sizeof(ok_float));
-	memcpy(A->ind, ind, A->nnz * sizeof(ok_int));
-	memcpy(A->ptr, ptr, A->ptrlen * sizeof(ok_int));
-	__transpose_inplace(A, Forward2Adjoint);
+	ptrlen = A->size1 + A->size2 + 2;
+	for (i = 0; i < ptrlen - 1; ++i) {
+		nz = (i >= A->ptrlen) ? A->nnz : 0;
+		if (A->ptr[i + 1] <= A->ptr[i])
+			continue;
+		__sp_row_range<I>(A->ind + nz, A->ptr[i], A->ptr[i + 1], &lo,
+			&hi);
+		if ((size_t) (hi - lo) > max_span)
+			max_span = (size_t) (hi - lo);
+	}
+
+	if (width == 0)
+		width = (max_span <= (size_t) UINT16_MAX) ? 16 : 32;
+	if ((width == 16 && max_span > (size_t) UINT16_MAX) ||
+	    (width == 32 && max_span > (size_t) UINT32_MAX))
+		return OK_SCAN_ERR( OPTKIT_ERROR_OUT_OF_BOUNDS );
+
+	D->base = (size_t *) calloc(ptrlen, sizeof(size_t));
+	D->offset = malloc(2 * A->nnz * (width / 8));
+	if (!D->base || !D->offset) {
+		ok_free(D->base);
+		ok_free(D->offset);
+		return OK_SCAN_ERR( OPTKIT_ERROR_MEMORY );
+	}
+	D->nnz = A->nnz;
+	D->ptrlen = ptrlen;
+	D->width = width;
+	off16 = (uint16_t *) D->offset;
+	off32 = (uint32_t *) D->offset;
+
+	for (i = 0; i < ptrlen - 1; ++i) {
+		nz = (i >= A->ptrlen) ? A->nnz : 0;
+		if (A->ptr[i + 1] <= A->ptr[i])
+			continue;
+		__sp_row_range<I>(A->ind + nz, A->ptr[i], A->ptr[i + 1], &lo,
+			&hi);
+		D->base[i] = (size_t) lo;
+		for (j = A->ptr[i]; j < A->ptr[i + 1]; ++j)
+			if (width == 16)
+				off16[j + nz] = (uint16_t) (A->ind[j + nz] - lo);
+			else
+				off32[j + nz] = (uint32_t) (A->ind[j + nz] - lo);
+	}
 	return OPTKIT_SUCCESS;
 }
 
-ok_status sp_matrix_memcpy_am(ok_float * val, ok_int * ind, ok_int * ptr,
-	const sp_matrix * A)
+template<typename T, typename I, typename O>
+void __sp_gemv_cindex(size_t ptrlen, const I * ptr, const T * val,
+	const size_t * base, const O * offset, T alpha, vector * x, T beta,
+	vector * y)
+{
+	size_t i;
+	I j;
+	T tmp;
+	const T * x_row;
+
+	#ifdef _OPENMP
+	#pragma omp parallel for private(j, tmp, x_row)
+	#endif
+	for (i = 0; i < ptrlen - 1; ++i) {
+		tmp = kZero;
+		x_row = x->data + base[i];
+		for (j = ptr[i]; j < ptr[i + 1]; ++j)
+			tmp += val[j] * x_row[offset[j]];
+		y->data[i] = alpha * tmp + beta * y->data[i];
+	}
+}
+
+template<typename T, typename I>
+ok_status sp_blas_gemv_cindex_(enum CBLAS_TRANSPOSE transA, T alpha,
+	sp_matrix_<T, I> * A, sp_cindex * D, vector * x, T beta, vector * y)
 {
+	size_t ptrlen, offset_ptr, offset_nz;
+
 	OK_CHECK_SPARSEMAT(A);
-	if (!val || !ind || !ptr)
+	OK_CHECK_PTR(D);
+	if (!D->base || !D->offset)
 		return OK_SCAN_ERR( OPTKIT_ERROR_UNALLOCATED );
+	if (A->is_view)
+		return OK_SCAN_ERR( OPTKIT_ERROR_LAYOUT_MISMATCH );
+	if (D->nnz != A->nnz || D->ptrlen != A->size1 + A->size2 + 2)
+		return OK_SCAN_ERR( OPTKIT_ERROR_DIMENSION_MISMATCH );
+	OK_RETURNIF_ERR( (__sp_gemv_setup<T, I>(transA, A, x, y, &ptrlen,
+		&offset_ptr, &offset_nz)) );
 
-	memcpy(val, A->val, A->nnz * sizeof(ok_float));
-	memcpy(ind, A->ind, A->nnz * sizeof(ok_int));
-	memcpy(ptr, A-> ptr, A->ptrlen * sizeof(ok_int));
+	if (D->width == 16)
+		__sp_gemv_cindex<T, I, uint16_t>(ptrlen, A->ptr + offset_ptr,
+			A->val + offset_nz, D->base + offset_ptr,
+			(uint16_t *) D->offset + offset_nz, alpha, x, beta, y);
+	else
+		__sp_gemv_cindex<T, I, uint32_t>(ptrlen, A->ptr + offset_ptr,
+			A->val + offset_nz, D->base + offset_ptr,
+			(uint32_t *) D->offset + offset_nz, alpha, x, beta, y);
 	return OPTKIT_SUCCESS;
 }
 
-ok_status sp_matrix_memcpy_vals_mm(sp_matrix * A, const sp_matrix * B)
-	{ return sp_matrix_memcpy_vals_mm_<ok_float, ok_int>(A, B); }
-
-ok_status sp_matrix_memcpy_vals_ma(void * sparse_handle, sp_matrix * A,
-  const ok_float * val)
+template<typename T, typename I>
+ok_status sp_matrix_memcpy_vals_ma_(sp_matrix_<T, I> * A, const T * val)
 {
 	OK_CHECK_SPARSEMAT(A);
 	OK_CHECK_PTR(val);
 
-	memcpy(A->val, val, A->nnz * sizeof(ok_float));
-	__transpose_inplace(A, Forward2Adjoint);
+	memcpy(A->val, val, A->nnz * sizeof(T));
+	if (!A->is_view)
+		__transpose_inplace_<T, I>(A, Forward2Adjoint);
 	return OPTKIT_SUCCESS;
 }
 
-ok_status sp_matrix_memcpy_vals_am(ok_float * val, const sp_matrix * A)
+template<typename T, typename I>
+ok_status sp_matrix_memcpy_vals_am_(T * val, const sp_matrix_<T, I> * A)
 {
 	OK_CHECK_SPARSEMAT(A);
 	OK_CHECK_PTR(val);
 
-	memcpy(val, A->val, A->nnz * sizeof(ok_float));
+	memcpy(val, A->val, A->nnz * sizeof(T));
 	return OPTKIT_SUCCESS;
 }
 
-ok_status sp_matrix_abs(sp_matrix * A)
+template<typename T, typename I>
+ok_status sp_matrix_abs_(sp_matrix_<T, I> * A)
 {
 	size_t i;
 	OK_CHECK_SPARSEMAT(A);
@@ -216,12 +645,13 @@ ok_status sp_matrix_abs(sp_matrix * A)
 	#ifdef _OPENMP
 	#pragma omp parallel for
 	#endif
-	for (i = 0; i < 2 * A->nnz; ++i)
+	for (i = 0; i < (2 - A->is_view) * A->nnz; ++i)
 		A->val[i] = MATH(fabs)(A->val[i]);
 	return OPTKIT_SUCCESS;
 }
 
-ok_status sp_matrix_pow(sp_matrix * A, const ok_float x)
+template<typename T, typename I>
+ok_status sp_matrix_pow_(sp_matrix_<T, I> * A, const T x)
 {
 	size_t i;
 	OK_CHECK_SPARSEMAT(A);
@@ -229,19 +659,49 @@ ok_status sp_matrix_pow(sp_matrix * A, const ok_float x)
 	#ifdef _OPENMP
 	#pragma omp parallel for
 	#endif
-	for (i = 0; i < 2 * A->nnz; ++i)
+	for (i = 0; i < (2 - A->is_view) * A->nnz; ++i)
 		A->val[i] = MATH(pow)(A->val[i], x);
 	return OPTKIT_SUCCESS;
 }
 
-ok_status sp_matrix_scale(sp_matrix * A, const ok_float alpha)
+template<typename T, typename I>
+ok_status sp_matrix_scale_(sp_matrix_<T, I> * A, const T alpha)
 {
 	OK_CHECK_SPARSEMAT(A);
-	CBLAS(scal)( (int) (2 * A->nnz), alpha, A->val, 1);
+	CBLAS(scal)( (int) ((2 - A->is_view) * A->nnz), alpha, A->val, 1);
+	return OPTKIT_SUCCESS;
+}
+
+/*
+ * views: scale the stored orientation only, by compressed dimension
+ * (rows of CSR, columns of CSC) or by index (columns of CSR, rows of CSC)
+ */
+template<typename T, typename I>
+ok_status __sp_matrix_view_scale_diag(sp_matrix_<T, I> * A,
+	const vector_<T> * v, enum CBLAS_SIDE side)
+{
+	size_t i;
+	I j;
+
+	if ((side == CblasLeft) == (A->order == CblasRowMajor)) {
+		#ifdef _OPENMP
+		#pragma omp parallel for private(j)
+		#endif
+		for (i = 0; i < A->ptrlen - 1; ++i)
+			for (j = A->ptr[i]; j < A->ptr[i + 1]; ++j)
+				A->val[j] *= v->data[i * v->stride];
+	} else {
+		#ifdef _OPENMP
+		#pragma omp parallel for
+		#endif
+		for (i = 0; i < A->nnz; ++i)
+			A->val[i] *= v->data[(size_t) A->ind[i] * v->stride];
+	}
 	return OPTKIT_SUCCESS;
 }
 
-ok_status __sp_matrix_scale_diag(sp_matrix * A, const vector * v,
+template<typename T, typename I>
+ok_status sp_matrix_scale_diag_(sp_matrix_<T, I> * A, const vector_<T> * v,
 	enum CBLAS_SIDE side)
 {
 	size_t i, offset, offsetnz, stop;
@@ -251,6 +711,8 @@ ok_status __sp_matrix_scale_diag(sp_matrix * A, const vector * v,
 	if ((side == CblasLeft && A->size1 != v->size ) ||
 		(side == CblasRight && A->size2 != v->size))
 		return OK_SCAN_ERR( OPTKIT_ERROR_DIMENSION_MISMATCH );
+	if (A->is_view)
+		return __sp_matrix_view_scale_diag<T, I>(A, v, side);
 
 	if (side == CblasLeft) {
 		offsetnz = (A->order == CblasRowMajor) ? 0 : A->nnz;
@@ -274,17 +736,79 @@ ok_status __sp_matrix_scale_diag(sp_matrix * A, const vector * v,
 		CBLAS(scal)( (int) (A->ptr[i + 1] - A->ptr[i]),
 			v->data[i - offset], A->val + A->ptr[i] + offsetnz, 1);
 	}
-	__transpose_inplace(A, dir);
+	__transpose_inplace_<T, I>(A, dir);
+	return OPTKIT_SUCCESS;
+}
+
+#ifdef __cplusplus
+extern "C" {
+#endif
+
+ok_status sp_make_handle(void ** sparse_handle)
+{
+	* sparse_handle = OK_NULL;
+	return OPTKIT_SUCCESS;
+}
+
+ok_status sp_destroy_handle(void * sparse_handle)
+{
 	return OPTKIT_SUCCESS;
 }
 
+ok_status sp_matrix_alloc(sp_matrix * A, size_t m, size_t n, size_t nnz,
+	enum CBLAS_ORDER order)
+	{ return sp_matrix_alloc_<ok_float, ok_int>(A, m, n, nnz, order); }
+
+ok_status sp_matrix_calloc(sp_matrix * A, size_t m, size_t n, size_t nnz,
+	enum CBLAS_ORDER order)
+	{ return sp_matrix_calloc_<ok_float, ok_int>(A, m, n, nnz, order); }
+
+ok_status sp_matrix_free(sp_matrix * A)
+	{ return sp_matrix_free_<ok_float, ok_int>(A); }
+
+ok_status sp_matrix_view_array(sp_matrix * A, size_t m, size_t n,
+	size_t nnz, ok_float * val, ok_int * ind, ok_int * ptr,
+	enum CBLAS_ORDER order)
+	{ return sp_matrix_view_<ok_float, ok_int>(A, m, n, nnz, val, ind, ptr,
+		order); }
+
+ok_status sp_matrix_memcpy_mm(sp_matrix * A, const sp_matrix * B)
+	{ return sp_matrix_memcpy_mm_<ok_float, ok_int>(A, B); }
+
+ok_status sp_matrix_memcpy_ma(void * sparse_handle, sp_matrix * A,
+	const ok_float * val, const ok_int * ind, const ok_int * ptr)
+	{ return sp_matrix_memcpy_ma_<ok_float, ok_int>(A, val, ind, ptr); }
+
+ok_status sp_matrix_memcpy_am(ok_float * val, ok_int * ind, ok_int * ptr,
+	const sp_matrix * A)
+	{ return sp_matrix_memcpy_am_<ok_float, ok_int>(val, ind, ptr, A); }
+
+ok_status sp_matrix_memcpy_vals_mm(sp_matrix * A, const sp_matrix * B)
+	{ return sp_matrix_memcpy_vals_mm_<ok_float, ok_int>(A, B); }
+
+ok_status sp_matrix_memcpy_vals_ma(void * sparse_handle, sp_matrix * A,
+  const ok_float * val)
+	{ return sp_matrix_memcpy_vals_ma_<ok_float, ok_int>(A, val); }
+
+ok_status sp_matrix_memcpy_vals_am(ok_float * val, const sp_matrix * A)
+	{ return sp_matrix_memcpy_vals_am_<ok_float, ok_int>(val, A); }
+
+ok_status sp_matrix_abs(sp_matrix * A)
+	{ return sp_matrix_abs_<ok_float, ok_int>(A); }
+
+ok_status sp_matrix_pow(sp_matrix * A, const ok_float x)
+	{ return sp_matrix_pow_<ok_float, ok_int>(A, x); }
+
+ok_status sp_matrix_scale(sp_matrix * A, const ok_float alpha)
+	{ return sp_matrix_scale_<ok_float, ok_int>(A, alpha); }
+
 ok_status sp_matrix_scale_left(void * sparse_handle, sp_matrix * A,
 	const vector * v)
-	{ return __sp_matrix_scale_diag(A, v, CblasLeft); }
+	{ return sp_matrix_scale_diag_<ok_float, ok_int>(A, v, CblasLeft); }
 
 ok_status sp_matrix_scale_right(void * sparse_handle, sp_matrix * A,
 	const vector * v)
-	{ return __sp_matrix_scale_diag(A, v, CblasRight); }
+	{ return sp_matrix_scale_diag_<ok_float, ok_int>(A, v, CblasRight); }
 
 ok_status sp_matrix_print(const sp_matrix * A)
 {
@@ -330,6 +854,8 @@ ok_status sp_matrix_print_transpose(const sp_matrix * A)
 	ok_float * val_base = A->val + A->nnz;
 
 	OK_CHECK_SPARSEMAT(A);
+	if (A->is_view)
+		return OK_SCAN_ERR( OPTKIT_ERROR_LAYOUT_MISMATCH );
 	if (A->order == CblasRowMajor)
 		printf("sparse CSC matrix:\n");
 	else
@@ -358,55 +884,112 @@ ok_status sp_matrix_print_transpose(const sp_matrix * A)
 	return OPTKIT_SUCCESS;
 }
 
-/*
- * Always perform forward (non-transpose) operations.
- * cusparse library uses csr, so for (input, op) combination:
- *      csr, forward op -> forward
- *      csr, adjoint op -> adjoint
- *      csc, forward op -> adjoint
- *      csc, adjoint op -> forward
- */
 ok_status sp_blas_gemv(void * sparse_handle, enum CBLAS_TRANSPOSE transA,
 	ok_float alpha, sp_matrix * A, vector * x, ok_float beta, vector * y)
-{
-	size_t ptrlen, i;
-	ok_int j;
-	ok_float * val, tmp;
-	ok_int * ind, * ptr;
+	{ return sp_blas_gemv_<ok_float, ok_int>(transA, alpha, A, x, beta, y); }
 
-	OK_CHECK_SPARSEMAT(A);
-	OK_CHECK_VECTOR(x);
-	OK_CHECK_VECTOR(y);
-	if ((transA == CblasNoTrans &&
-		(A->size1 != y->size || A->size2 != x->size)) ||
-	    (transA == CblasTrans &&
-	    	(A->size1 != x->size || A->size2 != y->size)))
-	    	return OK_SCAN_ERR( OPTKIT_ERROR_DIMENSION_MISMATCH );
+ok_status sp_blas_gemm(void * sparse_handle, enum CBLAS_TRANSPOSE transA,
+	ok_float alpha, sp_matrix * A, matrix * X, ok_float beta, matrix * Y)
+	{ return sp_blas_gemm_<ok_float, ok_int>(transA, alpha, A, X, beta, Y); }
 
-	if ((A->order == CblasRowMajor) != (transA == CblasTrans)) {
-		ptrlen = A->ptrlen;
-		ptr = A->ptr;
-		ind = A->ind;
-		val = A->val;
-	} else {
-		ptrlen = A->size1 + A->size2 + 2 - A->ptrlen;
-		ptr = A->ptr + A->ptrlen;
-		ind = A->ind + A->nnz;
-		val = A->val + A->nnz;
-	}
+ok_status sp_matrix_compress_index(sp_cindex * D, const sp_matrix * A,
+	size_t width)
+	{ return sp_matrix_compress_index_<ok_float, ok_int>(D, A, width); }
 
-	#ifdef _OPENMP
-	#pragma omp parallel for
-	#endif
-	for (i = 0; i < ptrlen - 1; ++i) {
-		tmp = kZero;
-		for (j = ptr[i]; j < ptr[i + 1]; ++j)
-			tmp += val[j] * x->data[ind[j]];
-		y->data[i] = alpha * tmp + beta * y->data[i];
-	}
+ok_status sp_cindex_free(sp_cindex * D)
+{
+	OK_CHECK_PTR(D);
+	if (!D->base || !D->offset)
+		return OK_SCAN_ERR( OPTKIT_ERROR_UNALLOCATED );
+	ok_free(D->base);
+	ok_free(D->offset);
+	D->nnz = (size_t) 0;
+	D->ptrlen = (size_t) 0;
+	D->width = (size_t) 0;
 	return OPTKIT_SUCCESS;
 }
 
+ok_status sp_blas_gemv_cindex(void * sparse_handle,
+	enum CBLAS_TRANSPOSE transA, ok_float alpha, sp_matrix * A,
+	sp_cindex * D, vector * x, ok_float beta, vector * y)
+{
+	return sp_blas_gemv_cindex_<ok_float, ok_int>(transA, alpha, A, D, x,
+		beta, y);
+}
+
+/* 64-bit index sparse matrices */
+ok_status sp_matrix64_alloc(sp_matrix64 * A, size_t m, size_t n, size_t nnz,
+	enum CBLAS_ORDER order)
+	{ return sp_matrix_alloc_<ok_float, ok_int64>(A, m, n, nnz, order); }
+
+ok_status sp_matrix64_calloc(sp_matrix64 * A, size_t m, size_t n, size_t nnz,
+	enum CBLAS_ORDER order)
+	{ return sp_matrix_calloc_<ok_float, ok_int64>(A, m, n, nnz, order); }
+
+ok_status sp_matrix64_free(sp_matrix64 * A)
+	{ return sp_matrix_free_<ok_float, ok_int64>(A); }
+
+ok_status sp_matrix64_view_array(sp_matrix64 * A, size_t m, size_t n,
+	size_t nnz, ok_float * val, ok_int64 * ind, ok_int64 * ptr,
+	enum CBLAS_ORDER order)
+	{ return sp_matrix_view_<ok_float, ok_int64>(A, m, n, nnz, val, ind,
+		ptr, order); }
+
+ok_status sp_matrix64_memcpy_mm(sp_matrix64 * A, const sp_matrix64 * B)
+	{ return sp_matrix_memcpy_mm_<ok_float, ok_int64>(A, B); }
+
+ok_status sp_matrix64_memcpy_ma(void * sparse_handle, sp_matrix64 * A,
+	const ok_float * val, const ok_int64 * ind, const ok_int64 * ptr)
+	{ return sp_matrix_memcpy_ma_<ok_float, ok_int64>(A, val, ind, ptr); }
+
+ok_status sp_matrix64_memcpy_am(ok_float * val, ok_int64 * ind,
+	ok_int64 * ptr, const sp_matrix64 * A)
+	{ return sp_matrix_memcpy_am_<ok_float, ok_int64>(val, ind, ptr, A); }
+
+ok_status sp_matrix64_memcpy_vals_ma(void * sparse_handle, sp_matrix64 * A,
+	const ok_float * val)
+	{ return sp_matrix_memcpy_vals_ma_<ok_float, ok_int64>(A, val); }
+
+ok_status sp_matrix64_memcpy_vals_am(ok_float * val, const sp_matrix64 * A)
+	{ return sp_matrix_memcpy_vals_am_<ok_float, ok_int64>(val, A); }
+
+ok_status sp_matrix64_abs(sp_matrix64 * A)
+	{ return sp_matrix_abs_<ok_float, ok_int64>(A); }
+
+ok_status sp_matrix64_pow(sp_matrix64 * A, const ok_float x)
+	{ return sp_matrix_pow_<ok_float, ok_int64>(A, x); }
+
+ok_status sp_matrix64_scale(sp_matrix64 * A, const ok_float alpha)
+	{ return sp_matrix_scale_<ok_float, ok_int64>(A, alpha); }
+
+ok_status sp_matrix64_scale_left(void * sparse_handle, sp_matrix64 * A,
+	const vector * v)
+	{ return sp_matrix_scale_diag_<ok_float, ok_int64>(A, v, CblasLeft); }
+
+ok_status sp_matrix64_scale_right(void * sparse_handle, sp_matrix64 * A,
+	const vector * v)
+	{ return sp_matrix_scale_diag_<ok_float, ok_int64>(A, v, CblasRight); }
+
+ok_status sp_matrix64_compress_index(sp_cindex * D, const sp_matrix64 * A,
+	size_t width)
+	{ return sp_matrix_compress_index_<ok_float, ok_int64>(D, A, width); }
+
+ok_status sp_blas_gemv64(void * sparse_handle, enum CBLAS_TRANSPOSE transA,
+	ok_float alpha, sp_matrix64 * A, vector * x, ok_float beta, vector * y)
+	{ return sp_blas_gemv_<ok_float, ok_int64>(transA, alpha, A, x, beta, y); }
+
+ok_status sp_blas_gemm64(void * sparse_handle, enum CBLAS_TRANSPOSE transA,
+	ok_float alpha, sp_matrix64 * A, matrix * X, ok_float beta, matrix * Y)
+	{ return sp_blas_gemm_<ok_float, ok_int64>(transA, alpha, A, X, beta, Y); }
+
+ok_status sp_blas_gemv64_cindex(void * sparse_handle,
+	enum CBLAS_TRANSPOSE transA, ok_float alpha, sp_matrix64 * A,
+	sp_cindex * D, vector * x, ok_float beta, vector * y)
+{
+	return sp_blas_gemv_cindex_<ok_float, ok_int64>(transA, alpha, A, D, x,
+		beta, y);
+}
+
 #ifdef __cplusplus
 }
 #endif
@@ -89,6 +89,7 @@ ok_status sp_matrix_alloc_(sp_matrix_<T, I> * A, size_t m, size_t n, size_t nnz,
 	OK_RETURNIF_ERR( ok_alloc_gpu(A->ind, 2 * nnz * sizeof(I)) );
 	OK_RETURNIF_ERR( ok_alloc_gpu(A->ptr, (2 + m + n) * sizeof(I)) );
 	A->order = order;
+	A->is_view = 0;
 	return OPTKIT_SUCCESS;
 }
 
@@ -197,6 +198,14 @@ ok_status sp_matrix_calloc(sp_matrix * A, size_t m, size_t n, size_t nnz,
 ok_status sp_matrix_free(sp_matrix * A)
 	{ return sp_matrix_free_<ok_float, ok_int>(A); }
 
+ok_status sp_matrix_view_array(sp_matrix * A, size_t m, size_t n,
+	size_t nnz, ok_float * val, ok_int * ind, ok_int * ptr,
+	enum CBLAS_ORDER order)
+{
+	printf("\nMethod `sp_matrix_view_array()` not implemented for GPU\n");
+	return OPTKIT_ERROR;
+}
+
 ok_status sp_matrix_memcpy_mm(sp_matrix * A, const sp_matrix * B)
 	{ return sp_matrix_memcpy_mm_<ok_float, ok_int>(A, B); }
 
@@ -473,6 +482,164 @@ ok_status sp_blas_gemv(void * sparse_handle, enum CBLAS_TRANSPOSE transA,
 	return err;
 }
 
+/* column-major blocks only: csrmm reads and writes column-major X, Y */
+ok_status sp_blas_gemm(void * sparse_handle, enum CBLAS_TRANSPOSE transA,
+	ok_float alpha, sp_matrix * A, matrix * X, ok_float beta, matrix * Y)
+{
+	OK_CHECK_SPARSEMAT(A);
+	OK_CHECK_MATRIX(X);
+	OK_CHECK_MATRIX(Y);
+	OK_CHECK_PTR(sparse_handle);
+
+	if (X->order != CblasColMajor || Y->order != CblasColMajor)
+		return OK_SCAN_ERR( OPTKIT_ERROR_LAYOUT_MISMATCH );
+	if (X->size2 != Y->size2 || (transA == CblasNoTrans &&
+		(A->size1 != Y->size1 || A->size2 != X->size1)) ||
+	    (transA == CblasTrans &&
+	    	(A->size1 != X->size1 || A->size2 != Y->size1)))
+	    	return OK_SCAN_ERR( OPTKIT_ERROR_DIMENSION_MISMATCH );
+
+	ok_status err = OPTKIT_SUCCESS;
+	ok_sparse_handle * sp_hdl = (ok_sparse_handle *) sparse_handle;
+	int forward = ((A->order == CblasRowMajor) == (transA == CblasNoTrans));
+	int size1 = (transA == CblasNoTrans) ? (int) A->size1 : (int) A->size2;
+	int size2 = (transA == CblasNoTrans) ? (int) A->size2 : (int) A->size1;
+	size_t offset = forward ? 0 : A->nnz;
+	size_t offset_ptr = forward ? 0 : A->ptrlen;
+
+	err = OK_SCAN_CUSPARSE( CUSPARSE(csrmm)( *(sp_hdl->hdl),
+		CUSPARSE_OPERATION_NON_TRANSPOSE, size1, (int) X->size2, size2,
+		(int) A->nnz, &alpha, *(sp_hdl->descr), A->val + offset,
+		A->ptr + offset_ptr, A->ind + offset, X->data, (int) X->ld,
+		&beta, Y->data, (int) Y->ld) );
+	cudaDeviceSynchronize();
+	return err;
+}
+
+/* compressed indices and 64-bit index sparse matrices are CPU-only */
+ok_status sp_matrix_compress_index(sp_cindex * D, const sp_matrix * A,
+	size_t width)
+{
+	printf("\nMethod `sp_matrix_compress_index()` not implemented for GPU\n");
+	return OPTKIT_ERROR;
+}
+
+ok_status sp_cindex_free(sp_cindex * D)
+{
+	printf("\nMethod `sp_cindex_free()` not implemented for GPU\n");
+	return OPTKIT_ERROR;
+}
+
+ok_status sp_blas_gemv_cindex(void * sparse_handle,
+	enum CBLAS_TRANSPOSE transA, ok_float alpha, sp_matrix * A,
+	sp_cindex * D, vector * x, ok_float beta, vector * y)
+{
+	printf("\nMethod `sp_blas_gemv_cindex()` not implemented for GPU\n");
+	return OPTKIT_ERROR;
+}
+
+ok_status sp_matrix64_calloc(sp_matrix64 * A, size_t m, size_t n, size_t nnz,
+	enum CBLAS_ORDER order)
+{
+	printf("\nMethod `sp_matrix64_calloc()` not implemented for GPU\n");
+	return OPTKIT_ERROR;
+}
+
+ok_status sp_matrix64_free(sp_matrix64 * A)
+{
+	printf("\nMethod `sp_matrix64_free()` not implemented for GPU\n");
+	return OPTKIT_ERROR;
+}
+
+ok_status sp_matrix64_view_array(sp_matrix64 * A, size_t m, size_t n,
+	size_t nnz, ok_float * val, ok_int64 * ind, ok_int64 * ptr,
+	enum CBLAS_ORDER order)
+{
+	printf("\nMethod `sp_matrix64_view_array()` not implemented for GPU\n");
+	return OPTKIT_ERROR;
+}
+
+ok_status sp_matrix64_memcpy_ma(void * sparse_handle, sp_matrix64 * A,
+	const ok_float * val, const ok_int64 * ind, const ok_int64 * ptr)
+{
+	printf("\nMethod `sp_matrix64_memcpy_ma()` not implemented for GPU\n");
+	return OPTKIT_ERROR;
+}
+
+ok_status sp_matrix64_memcpy_vals_ma(void * sparse_handle, sp_matrix64 * A,
+	const ok_float * val)
+{
+	printf("\nMethod `sp_matrix64_memcpy_vals_ma()` not implemented for GPU\n");
+	return OPTKIT_ERROR;
+}
+
+ok_status sp_matrix64_memcpy_vals_am(ok_float * val, const sp_matrix64 * A)
+{
+	printf("\nMethod `sp_matrix64_memcpy_vals_am()` not implemented for GPU\n");
+	return OPTKIT_ERROR;
+}
+
+ok_status sp_matrix64_abs(sp_matrix64 * A)
+{
+	printf("\nMethod `sp_matrix64_abs()` not implemented for GPU\n");
+	return OPTKIT_ERROR;
+}
+
+ok_status sp_matrix64_pow(sp_matrix64 * A, const ok_float x)
+{
+	printf("\nMethod `sp_matrix64_pow()` not implemented for GPU\n");
+	return OPTKIT_ERROR;
+}
+
+ok_status sp_matrix64_scale(sp_matrix64 * A, const ok_float alpha)
+{
+	printf("\nMethod `sp_matrix64_scale()` not implemented for GPU\n");
+	return OPTKIT_ERROR;
+}
+
+ok_status sp_matrix64_scale_left(void * sparse_handle, sp_matrix64 * A,
+	const vector * v)
+{
+	printf("\nMethod `sp_matrix64_scale_left()` not implemented for GPU\n");
+	return OPTKIT_ERROR;
+}
+
+ok_status sp_matrix64_scale_right(void * sparse_handle, sp_matrix64 * A,
+	const vector * v)
+{
+	printf("\nMethod `sp_matrix64_scale_right()` not implemented for GPU\n");
+	return OPTKIT_ERROR;
+}
+
+ok_status sp_matrix64_compress_index(sp_cindex * D, const sp_matrix64 * A,
+	size_t width)
+{
+	printf("\nMethod `sp_matrix64_compress_index()` not implemented for GPU\n");
+	return OPTKIT_ERROR;
+}
+
+ok_status sp_blas_gemv64(void * sparse_handle, enum CBLAS_TRANSPOSE transA,
+	ok_float alpha, sp_matrix64 * A, vector * x, ok_float beta, vector * y)
+{
+	printf("\nMethod `sp_blas_gemv64()` not implemented for GPU\n");
+	return OPTKIT_ERROR;
+}
+
+ok_status sp_blas_gemm64(void * sparse_handle, enum CBLAS_TRANSPOSE transA,
+	ok_float alpha, sp_matrix64 * A, matrix * X, ok_float beta, matrix * Y)
+{
+	printf("\nMethod `sp_blas_gemm64()` not implemented for GPU\n");
+	return OPTKIT_ERROR;
+}
+
+ok_status sp_blas_gemv64_cindex(void * sparse_handle,
+	enum CBLAS_TRANSPOSE transA, ok_float alpha, sp_matrix64 * A,
+	sp_cindex * D, vector * x, ok_float beta, vector * y)
+{
+	printf("\nMethod `sp_blas_gemv64_cindex()` not implemented for GPU\n");
+	return OPTKIT_ERROR;
+}
+
 #ifdef __cplusplus
 }
 #endif
@@ -14,9 +14,7 @@ static ok_status ok_rand_u01(ok_float * x, const size_t size,
 	std::uniform_real_distribution<ok_float> dist(kZero, kOne);
 	uint i;
 
-	#ifdef _OPENMP
-	#pragma omp parallel for
-	#endif
+	/* serial: the generator state is not safe to share between threads */
 	for (i = 0; i < size; ++i)
 		x[i * stride] = dist(generator);
 	return OPTKIT_SUCCESS;
@@ -311,6 +309,90 @@ ok_status vector_max_(const vector_<T> * v, const T default_value, T * maxval)
 	return OPTKIT_SUCCESS;
 }
 
+template<typename T>
+ok_status vector_axpy_dot_(T alpha, const vector_<T> * x, vector_<T> * y,
+	T * x_dot_y)
+{
+	T dot = 0, yi;
+	size_t i;
+	OK_CHECK_VECTOR(x);
+	OK_CHECK_VECTOR(y);
+	if (x->size != y->size)
+		return OK_SCAN_ERR( OPTKIT_ERROR_DIMENSION_MISMATCH );
+
+	#ifdef _OPENMP
+	#pragma omp parallel for private(yi) reduction(+ : dot)
+	#endif
+	for (i = 0; i < x->size; ++i) {
+		yi = y->data[i * y->stride] + alpha * x->data[i * x->stride];
+		y->data[i * y->stride] = yi;
+		dot += x->data[i * x->stride] * yi;
+	}
+
+	if (x_dot_y)
+		*x_dot_y = dot;
+	return OPTKIT_SUCCESS;
+}
+
+template<typename T>
+ok_status vector_xpby_sumsq_(const vector_<T> * x, T beta, vector_<T> * y,
+	T * sumsq)
+{
+	T sum = 0, yi;
+	size_t i;
+	OK_CHECK_VECTOR(x);
+	OK_CHECK_VECTOR(y);
+	if (x->size != y->size)
+		return OK_SCAN_ERR( OPTKIT_ERROR_DIMENSION_MISMATCH );
+
+	#ifdef _OPENMP
+	#pragma omp parallel for private(yi) reduction(+ : sum)
+	#endif
+	for (i = 0; i < x->size; ++i) {
+		yi = x->data[i * x->stride] + beta * y->data[i * y->stride];
+		y->data[i * y->stride] = yi;
+		sum += yi * yi;
+	}
+
+	if (sumsq)
+		*sumsq = sum;
+	return OPTKIT_SUCCESS;
+}
+
+template<typename T>
+ok_status vector_axpy2_sumsq_(T alpha1, const vector_<T> * x1,
+	vector_<T> * y1, T alpha2, const vector_<T> * x2, vector_<T> * y2,
+	T * sumsq1, T * sumsq2)
+{
+	T sum1 = 0, sum2 = 0, yi;
+	size_t i;
+	OK_CHECK_VECTOR(x1);
+	OK_CHECK_VECTOR(y1);
+	OK_CHECK_VECTOR(x2);
+	OK_CHECK_VECTOR(y2);
+	if (x1->size != y1->size || x2->size != y1->size ||
+		y2->size != y1->size)
+		return OK_SCAN_ERR( OPTKIT_ERROR_DIMENSION_MISMATCH );
+
+	#ifdef _OPENMP
+	#pragma omp parallel for private(yi) reduction(+ : sum1, sum2)
+	#endif
+	for (i = 0; i < y1->size; ++i) {
+		yi = y1->data[i * y1->stride] + alpha1 * x1->data[i * x1->stride];
+		y1->data[i * y1->stride] = yi;
+		sum1 += yi * yi;
+		yi = y2->data[i * y2->stride] + alpha2 * x2->data[i * x2->stride];
+		y2->data[i * y2->stride] = yi;
+		sum2 += yi * yi;
+	}
+
+	if (sumsq1)
+		*sumsq1 = sum1;
+	if (sumsq2)
+		*sumsq2 = sum2;
+	return OPTKIT_SUCCESS;
+}
+
 /* explicit instantiations for downstream code*/
 /* vector_scale required by: equilibration */
 template ok_status vector_scale_(vector_<float> * v, float x);
@@ -461,6 +543,20 @@ ok_status vector_min(const vector * v, ok_float * minval)
 ok_status vector_max(const vector * v, ok_float * maxval)
 	{ return vector_max_<ok_float>(v, -OK_FLOAT_MAX, maxval); }
 
+ok_status vector_axpy_dot(ok_float alpha, const vector * x, vector * y,
+	ok_float * x_dot_y)
+	{ return vector_axpy_dot_<ok_float>(alpha, x, y, x_dot_y); }
+
+ok_status vector_xpby_sumsq(const vector * x, ok_float beta, vector * y,
+	ok_float * sumsq)
+	{ return vector_xpby_sumsq_<ok_float>(x, beta, y, sumsq); }
+
+ok_status vector_axpy2_sumsq(ok_float alpha1, const vector * x1,
+	vector * y1, ok_float alpha2, const vector * x2, vector * y2,
+	ok_float * sumsq1, ok_float * sumsq2)
+	{ return vector_axpy2_sumsq_<ok_float>(alpha1, x1, y1, alpha2, x2, y2,
+		sumsq1, sumsq2); }
+
 ok_status vector_uniform_rand(vector * v, const ok_float minval,
 	const ok_float maxval)
 {
@@ -2,6 +2,9 @@
 #include "optkit_defs_gpu.h"
 #include "optkit_thrust.hpp"
 #include "optkit_vector.h"
+#include <thrust/iterator/counting_iterator.h>
+#include <thrust/transform_reduce.h>
+#include <thrust/tuple.h>
 
 /* CUDA helper methods */
 
@@ -26,6 +29,83 @@ static __global__ void generate(curandState * globalState, ok_float * data,
 	#endif
 }
 
+/*
+ * fused updates: each functor updates element i of its outputs and returns
+ * the element's contribution to the reduction, so that one
+ * thrust::transform_reduce over the indices makes a single pass
+ */
+template<typename T>
+struct AxpyDotF : thrust::unary_function<size_t, T>
+{
+	T alpha;
+	const T * x;
+	T * y;
+	size_t stride_x, stride_y;
+	AxpyDotF(T alpha, const T * x, size_t stride_x, T * y, size_t stride_y) :
+		alpha(alpha), x(x), y(y), stride_x(stride_x), stride_y(stride_y)
+		{ }
+	__device__ T operator()(size_t i)
+	{
+		T xi = x[i * stride_x];
+		T yi = y[i * stride_y] + alpha * xi;
+		y[i * stride_y] = yi;
+		return xi * yi;
+	}
+};
+
+template<typename T>
+struct XpbySumsqF : thrust::unary_function<size_t, T>
+{
+	T beta;
+	const T * x;
+	T * y;
+	size_t stride_x, stride_y;
+	XpbySumsqF(const T * x, size_t stride_x, T beta, T * y,
+		size_t stride_y) : beta(beta), x(x), y(y), stride_x(stride_x),
+		stride_y(stride_y) { }
+	__device__ T operator()(size_t i)
+	{
+		T yi = x[i * stride_x] + beta * y[i * stride_y];
+		y[i * stride_y] = yi;
+		return yi * yi;
+	}
+};
+
+template<typename T>
+struct Axpy2SumsqF : thrust::unary_function<size_t, thrust::tuple<T, T> >
+{
+	T alpha1, alpha2;
+	const T * x1, * x2;
+	T * y1, * y2;
+	size_t stride_x1, stride_y1, stride_x2, stride_y2;
+	Axpy2SumsqF(T alpha1, const T * x1, size_t stride_x1, T * y1,
+		size_t stride_y1, T alpha2, const T * x2, size_t stride_x2,
+		T * y2, size_t stride_y2) : alpha1(alpha1), alpha2(alpha2),
+		x1(x1), x2(x2), y1(y1), y2(y2), stride_x1(stride_x1),
+		stride_y1(stride_y1), stride_x2(stride_x2),
+		stride_y2(stride_y2) { }
+	__device__ thrust::tuple<T, T> operator()(size_t i)
+	{
+		T yi1 = y1[i * stride_y1] + alpha1 * x1[i * stride_x1];
+		y1[i * stride_y1] = yi1;
+		T yi2 = y2[i * stride_y2] + alpha2 * x2[i * stride_x2];
+		y2[i * stride_y2] = yi2;
+		return thrust::make_tuple(yi1 * yi1, yi2 * yi2);
+	}
+};
+
+template<typename T>
+struct PairPlusF : thrust::binary_function<thrust::tuple<T, T>,
+	thrust::tuple<T, T>, thrust::tuple<T, T> >
+{
+	__device__ thrust::tuple<T, T> operator()(const thrust::tuple<T, T> & a,
+		const thrust::tuple<T, T> & b)
+	{
+		return thrust::make_tuple(thrust::get<0>(a) + thrust::get<0>(b),
+			thrust::get<1>(a) + thrust::get<1>(b));
+	}
+};
+
 } /* namespace optkit */
 
 static ok_status ok_rand_u01(ok_float * x, const size_t size,
@@ -218,6 +298,75 @@ ok_status vector_max_(const vector_<T> * v, const T default_value, T * maxval)
 	return OK_STATUS_CUDA;
 }
 
+template<typename T>
+ok_status vector_axpy_dot_(T alpha, const vector_<T> * x, vector_<T> * y,
+	T * x_dot_y)
+{
+	T dot;
+	OK_CHECK_VECTOR(x);
+	OK_CHECK_VECTOR(y);
+	if (x->size != y->size)
+		return OK_SCAN_ERR( OPTKIT_ERROR_DIMENSION_MISMATCH );
+
+	dot = thrust::transform_reduce(thrust::device,
+		thrust::counting_iterator<size_t>(0),
+		thrust::counting_iterator<size_t>(x->size),
+		optkit::AxpyDotF<T>(alpha, x->data, x->stride, y->data,
+			y->stride), static_cast<T>(0), thrust::plus<T>());
+	if (x_dot_y)
+		*x_dot_y = dot;
+	return OK_STATUS_CUDA;
+}
+
+template<typename T>
+ok_status vector_xpby_sumsq_(const vector_<T> * x, T beta, vector_<T> * y,
+	T * sumsq)
+{
+	T sum;
+	OK_CHECK_VECTOR(x);
+	OK_CHECK_VECTOR(y);
+	if (x->size != y->size)
+		return OK_SCAN_ERR( OPTKIT_ERROR_DIMENSION_MISMATCH );
+
+	sum = thrust::transform_reduce(thrust::device,
+		thrust::counting_iterator<size_t>(0),
+		thrust::counting_iterator<size_t>(x->size),
+		optkit::XpbySumsqF<T>(x->data, x->stride, beta, y->data,
+			y->stride), static_cast<T>(0), thrust::plus<T>());
+	if (sumsq)
+		*sumsq = sum;
+	return OK_STATUS_CUDA;
+}
+
+template<typename T>
+ok_status vector_axpy2_sumsq_(T alpha1, const vector_<T> * x1,
+	vector_<T> * y1, T alpha2, const vector_<T> * x2, vector_<T> * y2,
+	T * sumsq1, T * sumsq2)
+{
+	thrust::tuple<T, T> sums;
+	OK_CHECK_VECTOR(x1);
+	OK_CHECK_VECTOR(y1);
+	OK_CHECK_VECTOR(x2);
+	OK_CHECK_VECTOR(y2);
+	if (x1->size != y1->size || x2->size != y1->size ||
+		y2->size != y1->size)
+		return OK_SCAN_ERR( OPTKIT_ERROR_DIMENSION_MISMATCH );
+
+	sums = thrust::transform_reduce(thrust::device,
+		thrust::counting_iterator<size_t>(0),
+		thrust::counting_iterator<size_t>(y1->size),
+		optkit::Axpy2SumsqF<T>(alpha1, x1->data, x1->stride, y1->data,
+			y1->stride, alpha2, x2->data, x2->stride, y2->data,
+			y2->stride),
+		thrust::make_tuple(static_cast<T>(0), static_cast<T>(0)),
+		optkit::PairPlusF<T>());
+	if (sumsq1)
+		*sumsq1 = thrust::get<0>(sums);
+	if (sumsq2)
+		*sumsq2 = thrust::get<1>(sums);
+	return OK_STATUS_CUDA;
+}
+
 
 #ifdef __cplusplus
 extern "C" {
@@ -369,6 +518,20 @@ ok_status vector_min(const vector * v, ok_float * minval)
 ok_status vector_max(const vector * v, ok_float * maxval)
 	{ return vector_max_<ok_float>(v, (ok_float) -OK_FLOAT_MAX, maxval); }
 
+ok_status vector_axpy_dot(ok_float alpha, const vector * x, vector * y,
+	ok_float * x_dot_y)
+	{ return vector_axpy_dot_<ok_float>(alpha, x, y, x_dot_y); }
+
+ok_status vector_xpby_sumsq(const vector * x, ok_float beta, vector * y,
+	ok_float * sumsq)
+	{ return vector_xpby_sumsq_<ok_float>(x, beta, y, sumsq); }
+
+ok_status vector_axpy2_sumsq(ok_float alpha1, const vector * x1,
+	vector * y1, ok_float alpha2, const vector * x2, vector * y2,
+	ok_float * sumsq1, ok_float * sumsq2)
+	{ return vector_axpy2_sumsq_<ok_float>(alpha1, x1, y1, alpha2, x2, y2,
+		sumsq1, sumsq2); }
+
 ok_status vector_uniform_rand(vector * v, const ok_float minval,
 	const ok_float maxval)
 {
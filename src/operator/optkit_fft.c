@@ -0,0 +1,195 @@
+#include "optkit_fft.h"
+
+#ifdef __cplusplus
+extern "C" {
+#endif
+
+static const double kFFTPi = 3.14159265358979323846;
+
+size_t fft_next_pow2(size_t n)
+{
+	size_t size = 1;
+	while (size < n)
+		size <<= 1;
+	return size;
+}
+
+/* twiddle factors exp(-2 pi i k / size), k = 0, ..., size/2 - 1 */
+ok_status fft_plan_alloc(fft_plan * plan, size_t size)
+{
+	size_t k;
+	double theta;
+
+	OK_CHECK_PTR(plan);
+	if (plan->twiddle)
+		return OK_SCAN_ERR( OPTKIT_ERROR_OVERWRITE );
+	if (size == 0 || (size & (size - 1)))
+		return OK_SCAN_ERR( OPTKIT_ERROR_DOMAIN );
+
+	plan->size = size;
+	ok_alloc(plan->twiddle, (size > 1 ? size : 2) * sizeof(ok_float));
+	for (k = 0; k < size / 2; ++k) {
+		theta = -2 * kFFTPi * (double) k / (double) size;
+		plan->twiddle[2 * k] = (ok_float) cos(theta);
+		plan->twiddle[2 * k + 1] = (ok_float) sin(theta);
+	}
+	return OPTKIT_SUCCESS;
+}
+
+ok_status fft_plan_free(fft_plan * plan)
+{
+	OK_CHECK_PTR(plan);
+	ok_free(plan->twiddle);
+	plan->size = 0;
+	return OPTKIT_SUCCESS;
+}
+
+/*
+ * in-place iterative Cooley-Tukey FFT. the inverse transform is
+ * unnormalized, i.e., ifft(fft(x)) = size * x.
+ */
+ok_status fft_execute(const fft_plan * plan, ok_float * data, int inverse)
+{
+	size_t size, i, j, k, len, half, step;
+	ok_float wr, wi, ur, ui, vr, vi, tmp;
+	ok_float sign = inverse ? -kOne : kOne;
+
+	OK_CHECK_PTR(plan);
+	OK_CHECK_PTR(plan->twiddle);
+	OK_CHECK_PTR(data);
+	size = plan->size;
+
+	/* bit-reversal permutation */
+	for (i = 1, j = 0; i < size; ++i) {
+		k = size >> 1;
+		for (; j & k; k >>= 1)
+			j ^= k;
+		j ^= k;
+		if (i < j) {
+			tmp = data[2 * i];
+			data[2 * i] = data[2 * j];
+			data[2 * j] = tmp;
+			tmp = data[2 * i + 1];
+			data[2 * i + 1] = data[2 * j + 1];
+			data[2 * j + 1] = tmp;
+		}
+	}
+
+	/* butterflies */
+	for (len = 2; len <= size; len <<= 1) {
+		half = len >> 1;
+		step = size / len;
+		for (i = 0; i < size; i += len)
+			for (j = 0; j < half; ++j) {
+				wr = plan->twiddle[2 * j * step];
+				wi = sign * plan->twiddle[2 * j * step + 1];
+				ur = data[2 * (i + j)];
+				ui = data[2 * (i + j) + 1];
+				vr = data[2 * (i + j + half)];
+				vi = data[2 * (i + j + half) + 1];
+				tmp = vr * wr - vi * wi;
+				vi = vr * wi + vi * wr;
+				vr = tmp;
+				data[2 * (i + j)] = ur + vr;
+				data[2 * (i + j) + 1] = ui + vi;
+				data[2 * (i + j + half)] = ur - vr;
+				data[2 * (i + j + half) + 1] = ui - vi;
+			}
+	}
+	return OPTKIT_SUCCESS;
+}
+
+ok_status fft_circulant_alloc(fft_circulant * C, const ok_float * column,
+	size_t size)
+{
+	ok_status err = OPTKIT_SUCCESS;
+	size_t k;
+
+	OK_CHECK_PTR(C);
+	OK_CHECK_PTR(column);
+	if (C->spectrum)
+		return OK_SCAN_ERR( OPTKIT_ERROR_OVERWRITE );
+
+	C->size = size;
+	C->plan.twiddle = OK_NULL;
+	OK_RETURNIF_ERR( fft_plan_alloc(&C->plan, size) );
+	ok_alloc(C->spectrum, 2 * size * sizeof(ok_float));
+	ok_alloc(C->buffer, 2 * size * sizeof(ok_float));
+
+	for (k = 0; k < size; ++k)
+		C->spectrum[2 * k] = column[k] / (ok_float) size;
+
+	OK_CHECK_ERR( err, fft_execute(&C->plan, C->spectrum, 0) );
+	if (err)
+		OK_MAX_ERR( err, fft_circulant_free(C) );
+	return err;
+}
+
+ok_status fft_circulant_free(fft_circulant * C)
+{
+	OK_CHECK_PTR(C);
+	ok_free(C->spectrum);
+	ok_free(C->buffer);
+	return fft_plan_free(&C->plan);
+}
+
+ok_status fft_circulant_scale(fft_circulant * C, const ok_float scaling)
+{
+	size_t k;
+	OK_CHECK_PTR(C);
+	OK_CHECK_PTR(C->spectrum);
+	for (k = 0; k < 2 * C->size; ++k)
+		C->spectrum[k] *= scaling;
+	return OPTKIT_SUCCESS;
+}
+
+/*
+ * output = alpha * C[:m, :n] * input + beta * output, or
+ * output = alpha * C[:n, :m]^T * input + beta * output,
+ *
+ * with the input zero-padded to the circulant dimension. the work vector
+ * must have at least output->size entries unless alpha = 1, beta = 0.
+ */
+ok_status fft_circulant_mul(void * linalg_handle, fft_circulant * C,
+	int transpose, ok_float alpha, vector * input, ok_float beta,
+	vector * output, vector * work)
+{
+	size_t k;
+	ok_float re, im, sr, si;
+	vector w;
+
+	OK_CHECK_PTR(C);
+	OK_CHECK_PTR(C->buffer);
+	OK_CHECK_VECTOR(input);
+	OK_CHECK_VECTOR(output);
+	if (input->size > C->size || output->size > C->size)
+		return OK_SCAN_ERR( OPTKIT_ERROR_DIMENSION_MISMATCH );
+
+	memset(C->buffer, 0, 2 * C->size * sizeof(ok_float));
+	OK_RETURNIF_ERR( vector_memcpy_av(C->buffer, input, 2) );
+	OK_RETURNIF_ERR( fft_execute(&C->plan, C->buffer, 0) );
+
+	for (k = 0; k < C->size; ++k) {
+		re = C->buffer[2 * k];
+		im = C->buffer[2 * k + 1];
+		sr = C->spectrum[2 * k];
+		si = transpose ? -C->spectrum[2 * k + 1] : C->spectrum[2 * k + 1];
+		C->buffer[2 * k] = re * sr - im * si;
+		C->buffer[2 * k + 1] = re * si + im * sr;
+	}
+
+	OK_RETURNIF_ERR( fft_execute(&C->plan, C->buffer, 1) );
+
+	if (alpha == kOne && beta == kZero)
+		return OK_SCAN_ERR( vector_memcpy_va(output, C->buffer, 2) );
+
+	OK_CHECK_VECTOR(work);
+	OK_RETURNIF_ERR( vector_subvector(&w, work, 0, output->size) );
+	OK_RETURNIF_ERR( vector_memcpy_va(&w, C->buffer, 2) );
+	OK_RETURNIF_ERR( vector_scale(output, beta) );
+	return OK_SCAN_ERR( blas_axpy(linalg_handle, alpha, &w, output) );
+}
+
+#ifdef __cplusplus
+}
+#endif
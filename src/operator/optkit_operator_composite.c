@@ -0,0 +1,449 @@
+#include "optkit_operator_composite.h"
+
+#ifdef __cplusplus
+extern "C" {
+#endif
+
+/* COMPOSITE LINEAR OPERATORS */
+
+/*
+ * blocks can be applied concurrently if they are distinct objects whose
+ * products only read their data; toeplitz, fourier and kronecker
+ * operators write scratch space in their data, and nested composites
+ * may share sub-operators with other blocks
+ */
+static int composite_operator_blocks_stateless(operator ** ops, size_t nops)
+{
+	size_t i, j;
+	for (i = 0; i < nops; ++i) {
+		if (ops[i]->kind != OkOperatorDense &&
+			ops[i]->kind != OkOperatorSparseCSR &&
+			ops[i]->kind != OkOperatorSparseCSC &&
+			ops[i]->kind != OkOperatorDiagonal)
+			return 0;
+		for (j = 0; j < i; ++j)
+			if (ops[j] == ops[i] || ops[j]->data == ops[i]->data)
+				return 0;
+	}
+	return 1;
+}
+
+void * composite_operator_data_alloc(operator ** ops, size_t nops,
+	OPTKIT_OPERATOR kind)
+{
+	ok_status err = OPTKIT_SUCCESS;
+	composite_operator_data * op_data = OK_NULL;
+	size_t i;
+
+	if (!ops || nops == 0)
+		err = OK_SCAN_ERR( OPTKIT_ERROR_UNALLOCATED );
+	for (i = 0; i < nops && !err; ++i)
+		if (!ops[i] || !ops[i]->data)
+			err = OK_SCAN_ERR( OPTKIT_ERROR_UNALLOCATED );
+		else if ((kind == OkOperatorCat &&
+				ops[i]->size2 != ops[0]->size2) ||
+			(kind == OkOperatorSplit &&
+				ops[i]->size1 != ops[0]->size1) ||
+			(kind == OkOperatorAdd &&
+				(ops[i]->size1 != ops[0]->size1 ||
+				ops[i]->size2 != ops[0]->size2)))
+			err = OK_SCAN_ERR( OPTKIT_ERROR_DIMENSION_MISMATCH );
+
+	if (!err) {
+		ok_alloc(op_data, sizeof(*op_data));
+		op_data->nops = nops;
+		ok_alloc(op_data->ops, nops * sizeof(*op_data->ops));
+		ok_alloc(op_data->offsets, (nops + 1) * sizeof(size_t));
+		ok_alloc(op_data->scaling, nops * sizeof(ok_float));
+		ok_alloc(op_data->status, nops * sizeof(ok_status));
+		op_data->parallel = (kind == OkOperatorCat ||
+			kind == OkOperatorSplit) &&
+			composite_operator_blocks_stateless(ops, nops);
+		for (i = 0; i < nops; ++i) {
+			op_data->ops[i] = ops[i];
+			op_data->scaling[i] = kOne;
+			op_data->offsets[i + 1] = op_data->offsets[i];
+			if (kind == OkOperatorCat)
+				op_data->offsets[i + 1] += ops[i]->size1;
+			else if (kind == OkOperatorSplit)
+				op_data->offsets[i + 1] += ops[i]->size2;
+		}
+	}
+	return (void *) op_data;
+}
+
+ok_status composite_operator_data_free(void * data)
+{
+	composite_operator_data * op_data = (composite_operator_data *) data;
+	OK_CHECK_PTR(op_data);
+	ok_free(op_data->ops);
+	ok_free(op_data->offsets);
+	ok_free(op_data->scaling);
+	ok_free(op_data->status);
+	ok_free(op_data);
+	return OPTKIT_SUCCESS;
+}
+
+/* output[block i] = alpha * s_i * op(A_i) * input + beta * output[block i] */
+static ok_status composite_operator_block_disjoint(
+	composite_operator_data * op_data, size_t i, int transpose,
+	ok_float alpha, vector * input, ok_float beta, vector * output)
+{
+	operator * o = op_data->ops[i];
+	vector out_i;
+	OK_RETURNIF_ERR( vector_subvector(&out_i, output, op_data->offsets[i],
+		op_data->offsets[i + 1] - op_data->offsets[i]) );
+	alpha *= op_data->scaling[i];
+	if (transpose)
+		return o->fused_adjoint(o->data, alpha, input, beta, &out_i);
+	else
+		return o->fused_apply(o->data, alpha, input, beta, &out_i);
+}
+
+/*
+ * output[block i] = alpha * s_i * op(A_i) * input + beta * output[block i],
+ *
+ * blocks write disjoint subvectors of the output and are independent;
+ * they run in parallel when op_data->parallel is set, each thread's inner
+ * BLAS/OpenMP calls limited to its share of the thread budget.
+ */
+static ok_status composite_operator_blocks_disjoint(void * data,
+	int transpose, ok_float alpha, vector * input, ok_float beta,
+	vector * output)
+{
+	composite_operator_data * op_data = (composite_operator_data *) data;
+	ok_status err = OPTKIT_SUCCESS;
+	size_t i, nops;
+	int n_max, n_team, n_inner;
+
+	OK_CHECK_PTR(op_data);
+	OK_CHECK_VECTOR(input);
+	OK_CHECK_VECTOR(output);
+	nops = op_data->nops;
+	if (output->size != op_data->offsets[nops])
+		return OK_SCAN_ERR( OPTKIT_ERROR_DIMENSION_MISMATCH );
+
+	n_max = ok_get_max_threads();
+	n_team = (size_t) n_max > nops ? (int) nops : n_max;
+	n_inner = n_team > 0 ? n_max / n_team : 1;
+
+	if (!op_data->parallel || n_team < 2) {
+		for (i = 0; i < nops; ++i)
+			OK_RETURNIF_ERR( composite_operator_block_disjoint(op_data, i,
+				transpose, alpha, input, beta, output) );
+		return OPTKIT_SUCCESS;
+	}
+
+	#ifdef _OPENMP
+	#pragma omp parallel num_threads(n_team)
+	#endif
+	{
+		ok_threads threads_saved;
+		ok_status thread_err = ok_threads_limit(n_inner, &threads_saved);
+
+		#ifdef _OPENMP
+		#pragma omp for schedule(dynamic, 1)
+		#endif
+		for (i = 0; i < nops; ++i)
+			op_data->status[i] = thread_err ? thread_err :
+				composite_operator_block_disjoint(op_data, i,
+					transpose, alpha, input, beta, output);
+
+		OK_MAX_ERR( thread_err, ok_threads_restore(&threads_saved) );
+
+		#ifdef _OPENMP
+		#pragma omp critical
+		#endif
+		err = err > thread_err ? err : thread_err;
+	}
+
+	for (i = 0; i < nops; ++i)
+		OK_MAX_ERR( err, op_data->status[i] );
+	return err;
+}
+
+/*
+ * output = alpha * sum_i s_i * op(A_i) * input[block i] + beta * output,
+ *
+ * (with input[block i] = input when the input is not partitioned)
+ * blocks accumulate into the same output and run in sequence.
+ */
+static ok_status composite_operator_blocks_accumulate(void * data,
+	int transpose, int partition_input, ok_float alpha, vector * input,
+	ok_float beta, vector * output)
+{
+	composite_operator_data * op_data = (composite_operator_data *) data;
+	operator * o;
+	vector in_i;
+	size_t i;
+
+	OK_CHECK_PTR(op_data);
+	OK_CHECK_VECTOR(input);
+	OK_CHECK_VECTOR(output);
+	if (partition_input && input->size != op_data->offsets[op_data->nops])
+		return OK_SCAN_ERR( OPTKIT_ERROR_DIMENSION_MISMATCH );
+
+	for (i = 0; i < op_data->nops; ++i) {
+		o = op_data->ops[i];
+		if (partition_input)
+			OK_RETURNIF_ERR( vector_subvector(&in_i, input,
+				op_data->offsets[i],
+				op_data->offsets[i + 1] - op_data->offsets[i]) );
+		else
+			in_i = *input;
+		if (transpose)
+			OK_RETURNIF_ERR( o->fused_adjoint(o->data,
+				alpha * op_data->scaling[i], &in_i,
+				i == 0 ? beta : kOne, output) );
+		else
+			OK_RETURNIF_ERR( o->fused_apply(o->data,
+				alpha * op_data->scaling[i], &in_i,
+				i == 0 ? beta : kOne, output) );
+	}
+	return OPTKIT_SUCCESS;
+}
+
+/* CAT: [A_0; A_1; ...] */
+ok_status cat_operator_mul(void * data, vector * input, vector * output)
+{
+	return composite_operator_blocks_disjoint(data, 0, kOne, input, kZero,
+		output);
+}
+
+ok_status cat_operator_mul_t(void * data, vector * input, vector * output)
+{
+	return composite_operator_blocks_accumulate(data, 1, 1, kOne, input,
+		kZero, output);
+}
+
+ok_status cat_operator_mul_fused(void * data, ok_float alpha,
+	vector * input, ok_float beta, vector * output)
+{
+	return composite_operator_blocks_disjoint(data, 0, alpha, input, beta,
+		output);
+}
+
+ok_status cat_operator_mul_t_fused(void * data, ok_float alpha,
+	vector * input, ok_float beta, vector * output)
+{
+	return composite_operator_blocks_accumulate(data, 1, 1, alpha, input,
+		beta, output);
+}
+
+/* SPLIT: [A_0, A_1, ...] */
+ok_status split_operator_mul(void * data, vector * input, vector * output)
+{
+	return composite_operator_blocks_accumulate(data, 0, 1, kOne, input,
+		kZero, output);
+}
+
+ok_status split_operator_mul_t(void * data, vector * input, vector * output)
+{
+	return composite_operator_blocks_disjoint(data, 1, kOne, input, kZero,
+		output);
+}
+
+ok_status split_operator_mul_fused(void * data, ok_float alpha,
+	vector * input, ok_float beta, vector * output)
+{
+	return composite_operator_blocks_accumulate(data, 0, 1, alpha, input,
+		beta, output);
+}
+
+ok_status split_operator_mul_t_fused(void * data, ok_float alpha,
+	vector * input, ok_float beta, vector * output)
+{
+	return composite_operator_blocks_disjoint(data, 1, alpha, input, beta,
+		output);
+}
+
+/* ADD: A_0 + A_1 + ... */
+ok_status add_operator_mul(void * data, vector * input, vector * output)
+{
+	return composite_operator_blocks_accumulate(data, 0, 0, kOne, input,
+		kZero, output);
+}
+
+ok_status add_operator_mul_t(void * data, vector * input, vector * output)
+{
+	return composite_operator_blocks_accumulate(data, 1, 0, kOne, input,
+		kZero, output);
+}
+
+ok_status add_operator_mul_fused(void * data, ok_float alpha,
+	vector * input, ok_float beta, vector * output)
+{
+	return composite_operator_blocks_accumulate(data, 0, 0, alpha, input,
+		beta, output);
+}
+
+ok_status add_operator_mul_t_fused(void * data, ok_float alpha,
+	vector * input, ok_float beta, vector * output)
+{
+	return composite_operator_blocks_accumulate(data, 1, 0, alpha, input,
+		beta, output);
+}
+
+/* NEG: -A_0 */
+ok_status neg_operator_mul(void * data, vector * input, vector * output)
+{
+	return neg_operator_mul_fused(data, kOne, input, kZero, output);
+}
+
+ok_status neg_operator_mul_t(void * data, vector * input, vector * output)
+{
+	return neg_operator_mul_t_fused(data, kOne, input, kZero, output);
+}
+
+ok_status neg_operator_mul_fused(void * data, ok_float alpha,
+	vector * input, ok_float beta, vector * output)
+{
+	OK_CHECK_PTR(data);
+	composite_operator_data * op_data = (composite_operator_data *) data;
+	operator * o = op_data->ops[0];
+	return o->fused_apply(o->data, -alpha * op_data->scaling[0], input,
+		beta, output);
+}
+
+ok_status neg_operator_mul_t_fused(void * data, ok_float alpha,
+	vector * input, ok_float beta, vector * output)
+{
+	OK_CHECK_PTR(data);
+	composite_operator_data * op_data = (composite_operator_data *) data;
+	operator * o = op_data->ops[0];
+	return o->fused_adjoint(o->data, -alpha * op_data->scaling[0], input,
+		beta, output);
+}
+
+static operator * composite_operator_alloc(OPTKIT_OPERATOR kind,
+	operator ** ops, size_t nops)
+{
+	operator * o = OK_NULL;
+	composite_operator_data * data;
+
+	data = (composite_operator_data *) composite_operator_data_alloc(ops,
+		nops, kind);
+	if (data) {
+		ok_alloc(o, sizeof(*o));
+		o->kind = kind;
+		o->size1 = kind == OkOperatorCat ? data->offsets[nops] :
+			ops[0]->size1;
+		o->size2 = kind == OkOperatorSplit ? data->offsets[nops] :
+			ops[0]->size2;
+		o->data = data;
+		o->free = composite_operator_data_free;
+		if (kind == OkOperatorCat) {
+			o->apply = cat_operator_mul;
+			o->adjoint = cat_operator_mul_t;
+			o->fused_apply = cat_operator_mul_fused;
+			o->fused_adjoint = cat_operator_mul_t_fused;
+		} else if (kind == OkOperatorSplit) {
+			o->apply = split_operator_mul;
+			o->adjoint = split_operator_mul_t;
+			o->fused_apply = split_operator_mul_fused;
+			o->fused_adjoint = split_operator_mul_t_fused;
+		} else if (kind == OkOperatorAdd) {
+			o->apply = add_operator_mul;
+			o->adjoint = add_operator_mul_t;
+			o->fused_apply = add_operator_mul_fused;
+			o->fused_adjoint = add_operator_mul_t_fused;
+		} else {
+			o->apply = neg_operator_mul;
+			o->adjoint = neg_operator_mul_t;
+			o->fused_apply = neg_operator_mul_fused;
+			o->fused_adjoint = neg_operator_mul_t_fused;
+		}
+	}
+	return o;
+}
+
+operator * cat_operator_alloc(operator ** ops, size_t nops)
+{
+	return composite_operator_alloc(OkOperatorCat, ops, nops);
+}
+
+operator * split_operator_alloc(operator ** ops, size_t nops)
+{
+	return composite_operator_alloc(OkOperatorSplit, ops, nops);
+}
+
+operator * add_operator_alloc(operator ** ops, size_t nops)
+{
+	return composite_operator_alloc(OkOperatorAdd, ops, nops);
+}
+
+operator * neg_operator_alloc(operator * A)
+{
+	return composite_operator_alloc(OkOperatorNeg, &A, 1);
+}
+
+static ok_status composite_operator_typecheck(operator * A,
+	const char * caller)
+{
+	OK_CHECK_OPERATOR(A);
+	if (A->kind != OkOperatorCat && A->kind != OkOperatorSplit &&
+		A->kind != OkOperatorAdd && A->kind != OkOperatorNeg) {
+		printf("composite_operator_%s() %s %s\n", caller, "undefined for",
+			optkit_op2str(A->kind));
+		return OPTKIT_ERROR;
+	} else {
+		return OPTKIT_SUCCESS;
+	}
+}
+
+ok_status composite_operator_get_nblocks(operator * A, size_t * nblocks)
+{
+	OK_RETURNIF_ERR( composite_operator_typecheck(A, "get_nblocks") );
+	OK_CHECK_PTR(nblocks);
+	*nblocks = ((composite_operator_data *) A->data)->nops;
+	return OPTKIT_SUCCESS;
+}
+
+/* retrieve sub-operator and its row (cat) or column (split) offset */
+ok_status composite_operator_get_block(operator * A, size_t block,
+	operator ** op, size_t * offset)
+{
+	composite_operator_data * op_data;
+	OK_RETURNIF_ERR( composite_operator_typecheck(A, "get_block") );
+	OK_CHECK_PTR(op);
+	OK_CHECK_PTR(offset);
+	op_data = (composite_operator_data *) A->data;
+	if (block >= op_data->nops)
+		return OK_SCAN_ERR( OPTKIT_ERROR_OUT_OF_BOUNDS );
+	*op = op_data->ops[block];
+	*offset = op_data->offsets[block];
+	return OPTKIT_SUCCESS;
+}
+
+/*
+ * scale the composite by scaling the per-block scalars; the borrowed
+ * sub-operators, which may be shared by several blocks (or composites),
+ * are left unchanged
+ */
+ok_status composite_operator_scale(operator * A, const ok_float scaling)
+{
+	composite_operator_data * op_data;
+	size_t i;
+	OK_RETURNIF_ERR( composite_operator_typecheck(A, "scale") );
+	op_data = (composite_operator_data *) A->data;
+	for (i = 0; i < op_data->nops; ++i)
+		op_data->scaling[i] *= scaling;
+	return OPTKIT_SUCCESS;
+}
+
+/* scale a single block of the composite */
+ok_status composite_operator_scale_block(operator * A, size_t block,
+	const ok_float scaling)
+{
+	composite_operator_data * op_data;
+	OK_RETURNIF_ERR( composite_operator_typecheck(A, "scale_block") );
+	op_data = (composite_operator_data *) A->data;
+	if (block >= op_data->nops)
+		return OK_SCAN_ERR( OPTKIT_ERROR_OUT_OF_BOUNDS );
+	op_data->scaling[block] *= scaling;
+	return OPTKIT_SUCCESS;
+}
+
+#ifdef __cplusplus
+}
+#endif
@@ -68,6 +68,55 @@ ok_status dense_operator_mul_t_fused(void * data, ok_float alpha,
 		beta, output);
 }
 
+/*
+ * output = op(A) * input; blocks in the layout opposite to A's are
+ * handled as output' = input' * op(A)' on transposed views
+ */
+static ok_status dense_operator_gemm(dense_operator_data * op_data,
+	enum CBLAS_TRANSPOSE transA, matrix * input, matrix * output)
+{
+	matrix * A = op_data->A;
+	matrix input_t, output_t;
+	OK_CHECK_MATRIX(input);
+	OK_CHECK_MATRIX(output);
+
+	if (input->order != output->order)
+		return OK_SCAN_ERR( OPTKIT_ERROR_LAYOUT_MISMATCH );
+	if (input->order == A->order)
+		return blas_gemm(op_data->dense_handle, transA, CblasNoTrans,
+			kOne, A, input, kZero, output);
+
+	input_t.size1 = input->size2;
+	input_t.size2 = input->size1;
+	input_t.ld = input->ld;
+	input_t.data = input->data;
+	input_t.order = A->order;
+	output_t.size1 = output->size2;
+	output_t.size2 = output->size1;
+	output_t.ld = output->ld;
+	output_t.data = output->data;
+	output_t.order = A->order;
+	return blas_gemm(op_data->dense_handle, CblasNoTrans,
+		(transA == CblasNoTrans) ? CblasTrans : CblasNoTrans, kOne,
+		&input_t, A, kZero, &output_t);
+}
+
+ok_status dense_operator_mul_block(void * data, matrix * input,
+	matrix * output)
+{
+	OK_CHECK_PTR(data);
+	return dense_operator_gemm((dense_operator_data *) data, CblasNoTrans,
+		input, output);
+}
+
+ok_status dense_operator_mul_t_block(void * data, matrix * input,
+	matrix * output)
+{
+	OK_CHECK_PTR(data);
+	return dense_operator_gemm((dense_operator_data *) data, CblasTrans,
+		input, output);
+}
+
 operator * dense_operator_alloc(matrix * A)
 {
 	operator * o = OK_NULL;
@@ -84,6 +133,8 @@ operator * dense_operator_alloc(matrix * A)
 			o->adjoint = dense_operator_mul_t;
 			o->fused_apply = dense_operator_mul_fused;
 			o->fused_adjoint = dense_operator_mul_t_fused;
+			o->apply_block = dense_operator_mul_block;
+			o->adjoint_block = dense_operator_mul_t_block;
 			o->free = dense_operator_data_free;
 		}
 	}
@@ -0,0 +1,243 @@
+#include "optkit_operator_fourier.h"
+
+#ifdef __cplusplus
+extern "C" {
+#endif
+
+static const double kFourierPi = 3.14159265358979323846;
+
+/* FOURIER LINEAR OPERATOR */
+void * fourier_operator_data_alloc(size_t n)
+{
+	ok_status err = OPTKIT_SUCCESS;
+	fourier_operator_data * op_data = OK_NULL;
+	size_t j, size;
+	double theta;
+
+	if (n == 0)
+		err = OK_SCAN_ERR( OPTKIT_ERROR_DOMAIN );
+
+	if (!err) {
+		size = fft_next_pow2(2 * n - 1);
+		ok_alloc(op_data, sizeof(*op_data));
+		op_data->n = n;
+		op_data->scaling = kOne / MATH(sqrt)((ok_float) n);
+		ok_alloc(op_data->chirp, 2 * n * sizeof(ok_float));
+		ok_alloc(op_data->spectrum, 2 * size * sizeof(ok_float));
+		ok_alloc(op_data->buffer, 2 * size * sizeof(ok_float));
+
+		/* chirp w_j = exp(-pi i j^2 / n), with j^2 reduced mod 2n */
+		for (j = 0; j < n; ++j) {
+			theta = -kFourierPi * (double) ((j * j) % (2 * n)) /
+				(double) n;
+			op_data->chirp[2 * j] = (ok_float) cos(theta);
+			op_data->chirp[2 * j + 1] = (ok_float) sin(theta);
+		}
+
+		/* spectrum of the circulant embedding of conj(w), scaled 1/size */
+		for (j = 0; j < n; ++j) {
+			op_data->spectrum[2 * j] = op_data->chirp[2 * j] /
+				(ok_float) size;
+			op_data->spectrum[2 * j + 1] = -op_data->chirp[2 * j + 1] /
+				(ok_float) size;
+		}
+		for (j = 1; j < n; ++j) {
+			op_data->spectrum[2 * (size - j)] =
+				op_data->spectrum[2 * j];
+			op_data->spectrum[2 * (size - j) + 1] =
+				op_data->spectrum[2 * j + 1];
+		}
+
+		err = OK_SCAN_ERR( fft_plan_alloc(&op_data->plan, size) );
+		OK_CHECK_ERR( err, fft_execute(&op_data->plan, op_data->spectrum,
+			0) );
+		OK_CHECK_ERR( err, vector_calloc(&op_data->work, 2 * n) );
+		OK_CHECK_ERR( err, blas_make_handle(&(op_data->dense_handle)) );
+		if (err) {
+			fourier_operator_data_free(op_data);
+			op_data = OK_NULL;
+		}
+	}
+	return (void *) op_data;
+}
+
+ok_status fourier_operator_data_free(void * data)
+{
+	fourier_operator_data * op_data = (fourier_operator_data *) data;
+	OK_CHECK_PTR(op_data);
+	ok_status err = fft_plan_free(&op_data->plan);
+	if (op_data->work.data)
+		OK_MAX_ERR( err, vector_free(&op_data->work) );
+	if (op_data->dense_handle)
+		OK_MAX_ERR( err, blas_destroy_handle(op_data->dense_handle) );
+	ok_free(op_data->chirp);
+	ok_free(op_data->spectrum);
+	ok_free(op_data->buffer);
+	ok_free(op_data);
+	return OK_SCAN_ERR( err );
+}
+
+static void fourier_chirp_mul(const ok_float * chirp, ok_float * buffer,
+	size_t n)
+{
+	size_t j;
+	ok_float re, im;
+	for (j = 0; j < n; ++j) {
+		re = buffer[2 * j];
+		im = buffer[2 * j + 1];
+		buffer[2 * j] = re * chirp[2 * j] - im * chirp[2 * j + 1];
+		buffer[2 * j + 1] = re * chirp[2 * j + 1] + im * chirp[2 * j];
+	}
+}
+
+/*
+ * Bluestein DFT of the (complex) length-n sequence stored in the
+ * leading entries of the zero-padded buffer:
+ *
+ *	X_k = w_k * sum_j (z_j w_j) conj(w_{k - j}),
+ *
+ * overwrites buffer[:n] with X * scaling.
+ */
+static ok_status fourier_bluestein(fourier_operator_data * op_data)
+{
+	size_t k, n = op_data->n;
+	ok_float re, im, sr, si;
+	ok_float * buffer = op_data->buffer;
+
+	fourier_chirp_mul(op_data->chirp, buffer, n);
+	OK_RETURNIF_ERR( fft_execute(&op_data->plan, buffer, 0) );
+	for (k = 0; k < op_data->plan.size; ++k) {
+		re = buffer[2 * k];
+		im = buffer[2 * k + 1];
+		sr = op_data->spectrum[2 * k];
+		si = op_data->spectrum[2 * k + 1];
+		buffer[2 * k] = re * sr - im * si;
+		buffer[2 * k + 1] = re * si + im * sr;
+	}
+	OK_RETURNIF_ERR( fft_execute(&op_data->plan, buffer, 1) );
+	fourier_chirp_mul(op_data->chirp, buffer, n);
+	for (k = 0; k < 2 * n; ++k)
+		buffer[k] *= op_data->scaling;
+	return OPTKIT_SUCCESS;
+}
+
+ok_status fourier_operator_mul(void * data, vector * input, vector * output)
+{
+	return fourier_operator_mul_fused(data, kOne, input, kZero, output);
+}
+
+ok_status fourier_operator_mul_t(void * data, vector * input, vector * output)
+{
+	return fourier_operator_mul_t_fused(data, kOne, input, kZero, output);
+}
+
+/* output = alpha * [Re(Fx); Im(Fx)] + beta * output */
+ok_status fourier_operator_mul_fused(void * data, ok_float alpha,
+	vector * input, ok_float beta, vector * output)
+{
+	fourier_operator_data * op_data = (fourier_operator_data *) data;
+	vector * target, re, im;
+	size_t n;
+
+	OK_CHECK_PTR(op_data);
+	OK_CHECK_VECTOR(input);
+	OK_CHECK_VECTOR(output);
+	n = op_data->n;
+	if (input->size != n || output->size != 2 * n)
+		return OK_SCAN_ERR( OPTKIT_ERROR_DIMENSION_MISMATCH );
+
+	memset(op_data->buffer, 0, 2 * op_data->plan.size * sizeof(ok_float));
+	OK_RETURNIF_ERR( vector_memcpy_av(op_data->buffer, input, 2) );
+	OK_RETURNIF_ERR( fourier_bluestein(op_data) );
+
+	target = (alpha == kOne && beta == kZero) ? output : &op_data->work;
+	OK_RETURNIF_ERR( vector_subvector(&re, target, 0, n) );
+	OK_RETURNIF_ERR( vector_subvector(&im, target, n, n) );
+	OK_RETURNIF_ERR( vector_memcpy_va(&re, op_data->buffer, 2) );
+	OK_RETURNIF_ERR( vector_memcpy_va(&im, op_data->buffer + 1, 2) );
+
+	if (target == output)
+		return OPTKIT_SUCCESS;
+	OK_RETURNIF_ERR( vector_scale(output, beta) );
+	return OK_SCAN_ERR( blas_axpy(op_data->dense_handle, alpha, target,
+		output) );
+}
+
+/* output = alpha * Re(F(u - iv)) + beta * output, for input = [u; v] */
+ok_status fourier_operator_mul_t_fused(void * data, ok_float alpha,
+	vector * input, ok_float beta, vector * output)
+{
+	fourier_operator_data * op_data = (fourier_operator_data *) data;
+	vector u, v, w;
+	size_t j, n;
+
+	OK_CHECK_PTR(op_data);
+	OK_CHECK_VECTOR(input);
+	OK_CHECK_VECTOR(output);
+	n = op_data->n;
+	if (input->size != 2 * n || output->size != n)
+		return OK_SCAN_ERR( OPTKIT_ERROR_DIMENSION_MISMATCH );
+
+	memset(op_data->buffer, 0, 2 * op_data->plan.size * sizeof(ok_float));
+	OK_RETURNIF_ERR( vector_subvector(&u, input, 0, n) );
+	OK_RETURNIF_ERR( vector_subvector(&v, input, n, n) );
+	OK_RETURNIF_ERR( vector_memcpy_av(op_data->buffer, &u, 2) );
+	OK_RETURNIF_ERR( vector_memcpy_av(op_data->buffer + 1, &v, 2) );
+	for (j = 0; j < n; ++j)
+		op_data->buffer[2 * j + 1] *= -kOne;
+	OK_RETURNIF_ERR( fourier_bluestein(op_data) );
+
+	if (alpha == kOne && beta == kZero)
+		return OK_SCAN_ERR( vector_memcpy_va(output, op_data->buffer, 2) );
+
+	OK_RETURNIF_ERR( vector_subvector(&w, &op_data->work, 0, n) );
+	OK_RETURNIF_ERR( vector_memcpy_va(&w, op_data->buffer, 2) );
+	OK_RETURNIF_ERR( vector_scale(output, beta) );
+	return OK_SCAN_ERR( blas_axpy(op_data->dense_handle, alpha, &w, output) );
+}
+
+operator * fourier_operator_alloc(size_t n)
+{
+	operator * o = OK_NULL;
+	void * data;
+
+	if (n > 0) {
+		data = fourier_operator_data_alloc(n);
+		if (data) {
+			ok_alloc(o, sizeof(*o));
+			o->kind = OkOperatorFourier;
+			o->size1 = 2 * n;
+			o->size2 = n;
+			o->data = data;
+			o->apply = fourier_operator_mul;
+			o->adjoint = fourier_operator_mul_t;
+			o->fused_apply = fourier_operator_mul_fused;
+			o->fused_adjoint = fourier_operator_mul_t_fused;
+			o->free = fourier_operator_data_free;
+		}
+	}
+	return o;
+}
+
+static ok_status fourier_operator_typecheck(operator * A, const char * caller)
+{
+	OK_CHECK_OPERATOR(A);
+	if (A->kind != OkOperatorFourier) {
+		printf("fourier_operator_%s() %s %s\n", caller, "undefined for",
+			optkit_op2str(A->kind));
+		return OPTKIT_ERROR;
+	} else {
+		return OPTKIT_SUCCESS;
+	}
+}
+
+ok_status fourier_operator_scale(operator * A, const ok_float scaling)
+{
+	OK_RETURNIF_ERR( fourier_operator_typecheck(A, "scale") );
+	((fourier_operator_data *) A->data)->scaling *= scaling;
+	return OPTKIT_SUCCESS;
+}
+
+#ifdef __cplusplus
+}
+#endif
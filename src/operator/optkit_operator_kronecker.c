@@ -0,0 +1,228 @@
+#include "optkit_operator_kronecker.h"
+
+#ifdef __cplusplus
+extern "C" {
+#endif
+
+/* KRONECKER PRODUCT LINEAR OPERATOR */
+void * kronecker_operator_data_alloc(operator * A, operator * B)
+{
+	ok_status err = OPTKIT_SUCCESS;
+	kronecker_operator_data * op_data = OK_NULL;
+	size_t p, q, r, s, pq, mn;
+
+	if (!A || !A->data || !B || !B->data)
+		err = OK_SCAN_ERR( OPTKIT_ERROR_UNALLOCATED );
+
+	if (!err) {
+		p = A->size1;
+		q = A->size2;
+		r = B->size1;
+		s = B->size2;
+		pq = p > q ? p : q;
+		mn = p * r > q * s ? p * r : q * s;
+
+		ok_alloc(op_data, sizeof(*op_data));
+		op_data->A = A;
+		op_data->B = B;
+		op_data->scaling = kOne;
+		err = OK_SCAN_ERR( vector_calloc(&op_data->BX, r * q) );
+		OK_CHECK_ERR( err, vector_calloc(&op_data->BtY, s * p) );
+		OK_CHECK_ERR( err, vector_calloc(&op_data->row_in, pq) );
+		OK_CHECK_ERR( err, vector_calloc(&op_data->row_out, pq) );
+		OK_CHECK_ERR( err, vector_calloc(&op_data->work, mn) );
+		OK_CHECK_ERR( err, blas_make_handle(&(op_data->dense_handle)) );
+		if (err) {
+			kronecker_operator_data_free(op_data);
+			op_data = OK_NULL;
+		}
+	}
+	return (void *) op_data;
+}
+
+ok_status kronecker_operator_data_free(void * data)
+{
+	kronecker_operator_data * op_data = (kronecker_operator_data *) data;
+	ok_status err = OPTKIT_SUCCESS;
+	OK_CHECK_PTR(op_data);
+	if (op_data->BX.data)
+		OK_MAX_ERR( err, vector_free(&op_data->BX) );
+	if (op_data->BtY.data)
+		OK_MAX_ERR( err, vector_free(&op_data->BtY) );
+	if (op_data->row_in.data)
+		OK_MAX_ERR( err, vector_free(&op_data->row_in) );
+	if (op_data->row_out.data)
+		OK_MAX_ERR( err, vector_free(&op_data->row_out) );
+	if (op_data->work.data)
+		OK_MAX_ERR( err, vector_free(&op_data->work) );
+	if (op_data->dense_handle)
+		OK_MAX_ERR( err, blas_destroy_handle(op_data->dense_handle) );
+	ok_free(op_data);
+	return OK_SCAN_ERR( err );
+}
+
+/* view of entries v[offset], v[offset + stride], ... (n entries) */
+static void kronecker_strided_view(vector * view, const vector * v,
+	size_t offset, size_t n, size_t stride)
+{
+	view->size = n;
+	view->stride = v->stride * stride;
+	view->data = v->data + offset * v->stride;
+}
+
+/*
+ * output = alpha * scaling * op(kron(A, B)) * input + beta * output,
+ *
+ * in two passes, with op(kron(A, B)) = kron(op(A), op(B)):
+ *	pass 1: T[:, j] = op(B) * input[j * inner_in: (j + 1) * inner_in]
+ *	pass 2: Z[i, :] = op(A) * T[i, :], with rows of T and Z gathered
+ *		through contiguous buffers for the calls to A
+ */
+static ok_status kronecker_operator_apply(kronecker_operator_data * op_data,
+	int transpose, ok_float alpha, vector * input, ok_float beta,
+	vector * output)
+{
+	operator * outer = op_data->A, * inner = op_data->B;
+	ok_status (* inner_mul)(void *, vector *, vector *);
+	ok_status (* outer_mul)(void *, vector *, vector *);
+	vector * T, * target, in, out, row, Ti, Zi;
+	size_t i, j, inner_in, inner_out, outer_in, outer_out;
+
+	if (!transpose) {
+		inner_in = inner->size2;
+		inner_out = inner->size1;
+		outer_in = outer->size2;
+		outer_out = outer->size1;
+		inner_mul = inner->apply;
+		outer_mul = outer->apply;
+		T = &op_data->BX;
+	} else {
+		inner_in = inner->size1;
+		inner_out = inner->size2;
+		outer_in = outer->size1;
+		outer_out = outer->size2;
+		inner_mul = inner->adjoint;
+		outer_mul = outer->adjoint;
+		T = &op_data->BtY;
+	}
+
+	OK_CHECK_VECTOR(input);
+	OK_CHECK_VECTOR(output);
+	if (input->size != inner_in * outer_in ||
+		output->size != inner_out * outer_out)
+		return OK_SCAN_ERR( OPTKIT_ERROR_DIMENSION_MISMATCH );
+
+	for (j = 0; j < outer_in; ++j) {
+		OK_RETURNIF_ERR( vector_subvector(&in, input, j * inner_in,
+			inner_in) );
+		OK_RETURNIF_ERR( vector_subvector(&out, T, j * inner_out,
+			inner_out) );
+		OK_RETURNIF_ERR( inner_mul(inner->data, &in, &out) );
+	}
+
+	if (alpha == kOne && beta == kZero) {
+		target = output;
+	} else {
+		OK_RETURNIF_ERR( vector_subvector(&row, &op_data->work, 0,
+			output->size) );
+		target = &row;
+	}
+
+	OK_RETURNIF_ERR( vector_subvector(&in, &op_data->row_in, 0, outer_in) );
+	OK_RETURNIF_ERR( vector_subvector(&out, &op_data->row_out, 0,
+		outer_out) );
+	for (i = 0; i < inner_out; ++i) {
+		kronecker_strided_view(&Ti, T, i, outer_in, inner_out);
+		kronecker_strided_view(&Zi, target, i, outer_out, inner_out);
+		OK_RETURNIF_ERR( vector_memcpy_vv(&in, &Ti) );
+		OK_RETURNIF_ERR( outer_mul(outer->data, &in, &out) );
+		OK_RETURNIF_ERR( vector_memcpy_vv(&Zi, &out) );
+	}
+
+	if (target == output) {
+		if (op_data->scaling != kOne)
+			OK_RETURNIF_ERR( vector_scale(output, op_data->scaling) );
+		return OPTKIT_SUCCESS;
+	}
+	OK_RETURNIF_ERR( vector_scale(output, beta) );
+	return OK_SCAN_ERR( blas_axpy(op_data->dense_handle,
+		alpha * op_data->scaling, target, output) );
+}
+
+ok_status kronecker_operator_mul(void * data, vector * input, vector * output)
+{
+	OK_CHECK_PTR(data);
+	return kronecker_operator_apply((kronecker_operator_data *) data, 0,
+		kOne, input, kZero, output);
+}
+
+ok_status kronecker_operator_mul_t(void * data, vector * input,
+	vector * output)
+{
+	OK_CHECK_PTR(data);
+	return kronecker_operator_apply((kronecker_operator_data *) data, 1,
+		kOne, input, kZero, output);
+}
+
+ok_status kronecker_operator_mul_fused(void * data, ok_float alpha,
+	vector * input, ok_float beta, vector * output)
+{
+	OK_CHECK_PTR(data);
+	return kronecker_operator_apply((kronecker_operator_data *) data, 0,
+		alpha, input, beta, output);
+}
+
+ok_status kronecker_operator_mul_t_fused(void * data, ok_float alpha,
+	vector * input, ok_float beta, vector * output)
+{
+	OK_CHECK_PTR(data);
+	return kronecker_operator_apply((kronecker_operator_data *) data, 1,
+		alpha, input, beta, output);
+}
+
+operator * kronecker_operator_alloc(operator * A, operator * B)
+{
+	operator * o = OK_NULL;
+	void * data;
+
+	if (A && A->data && B && B->data) {
+		data = kronecker_operator_data_alloc(A, B);
+		if (data) {
+			ok_alloc(o, sizeof(*o));
+			o->kind = OkOperatorKronecker;
+			o->size1 = A->size1 * B->size1;
+			o->size2 = A->size2 * B->size2;
+			o->data = data;
+			o->apply = kronecker_operator_mul;
+			o->adjoint = kronecker_operator_mul_t;
+			o->fused_apply = kronecker_operator_mul_fused;
+			o->fused_adjoint = kronecker_operator_mul_t_fused;
+			o->free = kronecker_operator_data_free;
+		}
+	}
+	return o;
+}
+
+static ok_status kronecker_operator_typecheck(operator * A,
+	const char * caller)
+{
+	OK_CHECK_OPERATOR(A);
+	if (A->kind != OkOperatorKronecker) {
+		printf("kronecker_operator_%s() %s %s\n", caller, "undefined for",
+			optkit_op2str(A->kind));
+		return OPTKIT_ERROR;
+	} else {
+		return OPTKIT_SUCCESS;
+	}
+}
+
+ok_status kronecker_operator_scale(operator * A, const ok_float scaling)
+{
+	OK_RETURNIF_ERR( kronecker_operator_typecheck(A, "scale") );
+	((kronecker_operator_data *) A->data)->scaling *= scaling;
+	return OPTKIT_SUCCESS;
+}
+
+#ifdef __cplusplus
+}
+#endif
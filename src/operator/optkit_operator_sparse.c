@@ -4,98 +4,171 @@
 extern "C" {
 #endif
 
+/*
+ * transforms change values only, so the exporter holds values only: a
+ * round trip never writes to the index arrays, which a view shares with
+ * its caller
+ */
 struct sparse_operator_exporter {
 	ok_float * val;
-	ok_int * ind, * ptr;
 };
 
-void * sparse_operator_data_alloc(sp_matrix * A)
+static void * sparse_operator_data_alloc_(sp_matrix * A, sp_matrix64 * A64)
 {
 	ok_status err = OPTKIT_SUCCESS;
 	sparse_operator_data * op_data = OK_NULL;
 
-	if (!A || !A->val || !A->ind | !A->ptr)
-		err = OK_SCAN_ERR( OPTKIT_ERROR_UNALLOCATED );
-
-	if (!err) {
-		ok_alloc(op_data, sizeof(*op_data));
-		OK_CHECK_ERR( err,
-			sp_make_handle(&(op_data->sparse_handle)) );
-		op_data->A = A;
-		if (err) {
-			sparse_operator_data_free(op_data);
-			op_data = OK_NULL;
-		}
+	ok_alloc(op_data, sizeof(*op_data));
+	OK_CHECK_ERR( err,
+		sp_make_handle(&(op_data->sparse_handle)) );
+	op_data->A = A;
+	op_data->A64 = A64;
+	if (err) {
+		sparse_operator_data_free(op_data);
+		op_data = OK_NULL;
 	}
 	return (void *) op_data;
 }
 
+void * sparse_operator_data_alloc(sp_matrix * A)
+{
+	if (!A || !A->val || !A->ind || !A->ptr) {
+		OK_SCAN_ERR( OPTKIT_ERROR_UNALLOCATED );
+		return OK_NULL;
+	}
+	return sparse_operator_data_alloc_(A, OK_NULL);
+}
+
+void * sparse_operator64_data_alloc(sp_matrix64 * A)
+{
+	if (!A || !A->val || !A->ind || !A->ptr) {
+		OK_SCAN_ERR( OPTKIT_ERROR_UNALLOCATED );
+		return OK_NULL;
+	}
+	return sparse_operator_data_alloc_(OK_NULL, A);
+}
+
 ok_status sparse_operator_data_free(void * data)
 {
 	sparse_operator_data * op_data = (sparse_operator_data *) data;
+	ok_status err = OPTKIT_SUCCESS;
 	OK_CHECK_PTR( op_data );
-	OK_RETURNIF_ERR( sp_destroy_handle(op_data->sparse_handle) );
+	if (op_data->cindex) {
+		OK_MAX_ERR( err, sp_cindex_free(op_data->cindex) );
+		ok_free(op_data->cindex);
+	}
+	OK_MAX_ERR( err, sp_destroy_handle(op_data->sparse_handle) );
 	ok_free(op_data);
-	return OPTKIT_SUCCESS;
+	return err;
+}
+
+/* y = alpha * op(A) * x + beta * y, through the compressed index if set */
+static ok_status sparse_operator_gemv(sparse_operator_data * op_data,
+	enum CBLAS_TRANSPOSE transA, ok_float alpha, vector * x,
+	ok_float beta, vector * y)
+{
+	OK_CHECK_PTR(op_data);
+	if (op_data->A64 && op_data->cindex)
+		return sp_blas_gemv64_cindex(op_data->sparse_handle, transA,
+			alpha, op_data->A64, op_data->cindex, x, beta, y);
+	if (op_data->A64)
+		return sp_blas_gemv64(op_data->sparse_handle, transA, alpha,
+			op_data->A64, x, beta, y);
+	if (op_data->cindex)
+		return sp_blas_gemv_cindex(op_data->sparse_handle, transA,
+			alpha, op_data->A, op_data->cindex, x, beta, y);
+	return sp_blas_gemv(op_data->sparse_handle, transA, alpha,
+		op_data->A, x, beta, y);
 }
 
 ok_status sparse_operator_mul(void * data, vector * input, vector * output)
 {
-	OK_CHECK_PTR(data);
-	return sp_blas_gemv(((sparse_operator_data *) data)->sparse_handle,
-		CblasNoTrans, kOne, ((sparse_operator_data *) data)->A, input,
-		kZero, output);
+	return sparse_operator_gemv((sparse_operator_data *) data, CblasNoTrans,
+		kOne, input, kZero, output);
 }
 
 ok_status sparse_operator_mul_t(void * data, vector * input, vector * output)
 {
-	OK_CHECK_PTR(data);
-	return sp_blas_gemv(((sparse_operator_data *) data)->sparse_handle,
-		CblasTrans, kOne, ((sparse_operator_data *) data)->A, input,
-		kZero, output);
+	return sparse_operator_gemv((sparse_operator_data *) data, CblasTrans,
+		kOne, input, kZero, output);
 }
 
 ok_status sparse_operator_mul_fused(void * data, ok_float alpha, vector * input,
 	ok_float beta, vector * output)
 {
-	OK_CHECK_PTR(data);
-	return sp_blas_gemv(((sparse_operator_data *) data)->sparse_handle,
-		CblasNoTrans, alpha, ((sparse_operator_data *) data)->A, input,
-		beta, output);
+	return sparse_operator_gemv((sparse_operator_data *) data, CblasNoTrans,
+		alpha, input, beta, output);
 }
 
 ok_status sparse_operator_mul_t_fused(void * data, ok_float alpha,
 	vector * input, ok_float beta, vector * output)
 {
-	OK_CHECK_PTR(data);
-	return sp_blas_gemv(((sparse_operator_data *) data)->sparse_handle,
-		CblasTrans, alpha, ((sparse_operator_data *) data)->A, input,
-		beta, output);
+	return sparse_operator_gemv((sparse_operator_data *) data, CblasTrans,
+		alpha, input, beta, output);
 }
 
-operator * sparse_operator_alloc(sp_matrix * A)
+ok_status sparse_operator_mul_block(void * data, matrix * input,
+	matrix * output)
+{
+	sparse_operator_data * op_data = (sparse_operator_data *) data;
+	OK_CHECK_PTR(op_data);
+	if (op_data->A64)
+		return sp_blas_gemm64(op_data->sparse_handle, CblasNoTrans, kOne,
+			op_data->A64, input, kZero, output);
+	return sp_blas_gemm(op_data->sparse_handle, CblasNoTrans, kOne,
+		op_data->A, input, kZero, output);
+}
+
+ok_status sparse_operator_mul_t_block(void * data, matrix * input,
+	matrix * output)
+{
+	sparse_operator_data * op_data = (sparse_operator_data *) data;
+	OK_CHECK_PTR(op_data);
+	if (op_data->A64)
+		return sp_blas_gemm64(op_data->sparse_handle, CblasTrans, kOne,
+			op_data->A64, input, kZero, output);
+	return sp_blas_gemm(op_data->sparse_handle, CblasTrans, kOne,
+		op_data->A, input, kZero, output);
+}
+
+static operator * sparse_operator_alloc_(void * data, size_t size1,
+	size_t size2, enum CBLAS_ORDER order)
 {
 	operator * o = OK_NULL;
-	void * data = OK_NULL;
-	if (A && A->val && A->ind && A->ptr) {
-		data = sparse_operator_data_alloc(A);
-		if (data) {
-			ok_alloc(o, sizeof(*o));
-			o->kind = (A->order == CblasColMajor) ? OkOperatorSparseCSC :
-					OkOperatorSparseCSR;
-			o->size1 = A->size1;
-			o->size2 = A->size2;
-			o->data = data;
-			o->apply = sparse_operator_mul;
-			o->adjoint = sparse_operator_mul_t;
-			o->fused_apply = sparse_operator_mul_fused;
-			o->fused_adjoint = sparse_operator_mul_t_fused;
-			o->free = sparse_operator_data_free;
-		}
+	if (data) {
+		ok_alloc(o, sizeof(*o));
+		o->kind = (order == CblasColMajor) ? OkOperatorSparseCSC :
+				OkOperatorSparseCSR;
+		o->size1 = size1;
+		o->size2 = size2;
+		o->data = data;
+		o->apply = sparse_operator_mul;
+		o->adjoint = sparse_operator_mul_t;
+		o->fused_apply = sparse_operator_mul_fused;
+		o->fused_adjoint = sparse_operator_mul_t_fused;
+		o->apply_block = sparse_operator_mul_block;
+		o->adjoint_block = sparse_operator_mul_t_block;
+		o->free = sparse_operator_data_free;
 	}
 	return o;
 }
 
+operator * sparse_operator_alloc(sp_matrix * A)
+{
+	if (!A || !A->val || !A->ind || !A->ptr)
+		return OK_NULL;
+	return sparse_operator_alloc_(sparse_operator_data_alloc(A), A->size1,
+		A->size2, A->order);
+}
+
+operator * sparse_operator64_alloc(sp_matrix64 * A)
+{
+	if (!A || !A->val || !A->ind || !A->ptr)
+		return OK_NULL;
+	return sparse_operator_alloc_(sparse_operator64_data_alloc(A),
+		A->size1, A->size2, A->order);
+}
+
 static ok_status sparse_operator_typecheck(operator * A,
 	const char * caller)
 {
@@ -120,20 +193,67 @@ sp_matrix * sparse_operator_get_matrix_pointer(operator * A)
 		return OK_NULL;
 }
 
+sp_matrix64 * sparse_operator_get_matrix64_pointer(operator * A)
+{
+	ok_status err = sparse_operator_typecheck(A, "get_matrix64_pointer");
+
+	if (!err)
+		return ((sparse_operator_data *) A->data)->A64;
+	else
+		return OK_NULL;
+}
+
+/*
+ * build (or rebuild) the operator's compressed index, with offsets of the
+ * given width in bits (16 or 32; 0 selects the narrowest that fits).
+ * views are not supported, since they store no adjoint copy.
+ */
+ok_status sparse_operator_compress_index(operator * A, size_t width)
+{
+	ok_status err = OPTKIT_SUCCESS;
+	sparse_operator_data * op_data;
+	sp_cindex * cindex = OK_NULL;
+	OK_RETURNIF_ERR( sparse_operator_typecheck(A, "compress_index") );
+	op_data = (sparse_operator_data *) A->data;
+
+	ok_alloc(cindex, sizeof(*cindex));
+	if (!cindex)
+		return OK_SCAN_ERR( OPTKIT_ERROR_MEMORY );
+	if (op_data->A64)
+		OK_CHECK_ERR( err,
+			sp_matrix64_compress_index(cindex, op_data->A64, width) );
+	else
+		OK_CHECK_ERR( err,
+			sp_matrix_compress_index(cindex, op_data->A, width) );
+	if (err) {
+		ok_free(cindex);
+		return err;
+	}
+
+	if (op_data->cindex) {
+		OK_MAX_ERR( err, sp_cindex_free(op_data->cindex) );
+		ok_free(op_data->cindex);
+	}
+	op_data->cindex = cindex;
+	return err;
+}
+
 void * sparse_operator_export(operator * A)
 {
 	ok_status err = sparse_operator_typecheck(A, "export");
 	sparse_operator_data * op_data = OK_NULL;
 	struct sparse_operator_exporter * export = OK_NULL;
+	size_t nnz;
 
 	if (!err) {
 		op_data = (sparse_operator_data *) A->data;
+		nnz = (op_data->A64) ? op_data->A64->nnz : op_data->A->nnz;
 		ok_alloc(export, sizeof(*export));
-		ok_alloc(export->val, op_data->A->nnz * sizeof(*export->val));
-		ok_alloc(export->ind, op_data->A->nnz * sizeof(*export->ind));
-		ok_alloc(export->ptr, op_data->A->ptrlen * sizeof(*export->ptr));
-		sp_matrix_memcpy_am(export->val, export->ind, export->ptr,
-			op_data->A);
+		ok_alloc(export->val, nnz * sizeof(*export->val));
+		if (op_data->A64)
+			sp_matrix64_memcpy_vals_am(export->val, op_data->A64);
+		else
+			sp_matrix_memcpy_vals_am(export->val, op_data->A);
 	}
 	return (void *) export;
 }
@@ -147,12 +267,14 @@ void * sparse_operator_import(operator * A, void * data)
 	if (!err && data) {
 		op_data = (sparse_operator_data *) A->data;
 		import = (struct sparse_operator_exporter *) data;
-		sp_matrix_memcpy_ma(op_data->sparse_handle, op_data->A,
-			import->val, import->ind, import->ptr);
+		if (op_data->A64)
+			sp_matrix64_memcpy_vals_ma(op_data->sparse_handle,
+				op_data->A64, import->val);
+		else
+			sp_matrix_memcpy_vals_ma(op_data->sparse_handle,
+				op_data->A, import->val);
 
 		ok_free(import->val);
-		ok_free(import->ind);
-		ok_free(import->ptr);
 		ok_free(import);
 		data = OK_NULL;
 	}
@@ -162,36 +284,54 @@ void * sparse_operator_import(operator * A, void * data)
 
 ok_status sparse_operator_abs(operator * A)
 {
+	sparse_operator_data * op_data;
 	OK_RETURNIF_ERR( sparse_operator_typecheck(A, "abs") );
-	return sp_matrix_abs(((sparse_operator_data *) A->data)->A);
+	op_data = (sparse_operator_data *) A->data;
+	if (op_data->A64)
+		return sp_matrix64_abs(op_data->A64);
+	return sp_matrix_abs(op_data->A);
 }
 
 ok_status sparse_operator_pow(operator * A, const ok_float power)
 {
+	sparse_operator_data * op_data;
 	OK_RETURNIF_ERR( sparse_operator_typecheck(A, "pow") );
-	return sp_matrix_pow(((sparse_operator_data *) A->data)->A, power);
+	op_data = (sparse_operator_data *) A->data;
+	if (op_data->A64)
+		return sp_matrix64_pow(op_data->A64, power);
+	return sp_matrix_pow(op_data->A, power);
 }
 
 ok_status sparse_operator_scale(operator * A, const ok_float scaling)
 {
+	sparse_operator_data * op_data;
 	OK_RETURNIF_ERR( sparse_operator_typecheck(A, "scale") );
-	return sp_matrix_scale(((sparse_operator_data *) A->data)->A, scaling);
+	op_data = (sparse_operator_data *) A->data;
+	if (op_data->A64)
+		return sp_matrix64_scale(op_data->A64, scaling);
+	return sp_matrix_scale(op_data->A, scaling);
 }
 
 ok_status sparse_operator_scale_left(operator * A, const vector * v)
 {
+	sparse_operator_data * op_data;
 	OK_RETURNIF_ERR( sparse_operator_typecheck(A, "scale_left") );
-	return sp_matrix_scale_left(
-		((sparse_operator_data *) A->data)->sparse_handle,
-		((sparse_operator_data *) A->data)->A, v);
+	op_data = (sparse_operator_data *) A->data;
+	if (op_data->A64)
+		return sp_matrix64_scale_left(op_data->sparse_handle,
+			op_data->A64, v);
+	return sp_matrix_scale_left(op_data->sparse_handle, op_data->A, v);
 }
 
 ok_status sparse_operator_scale_right(operator * A, const vector * v)
 {
+	sparse_operator_data * op_data;
 	OK_RETURNIF_ERR( sparse_operator_typecheck(A, "scale_right") );
-	return sp_matrix_scale_right(
-		((sparse_operator_data *) A->data)->sparse_handle,
-		((sparse_operator_data *) A->data)->A, v);
+	op_data = (sparse_operator_data *) A->data;
+	if (op_data->A64)
+		return sp_matrix64_scale_right(op_data->sparse_handle,
+			op_data->A64, v);
+	return sp_matrix_scale_right(op_data->sparse_handle, op_data->A, v);
 }
 
 transformable_operator * sparse_operator_to_transformable(operator * A)
@@ -0,0 +1,240 @@
+#include "optkit_operator_toeplitz.h"
+
+#ifdef __cplusplus
+extern "C" {
+#endif
+
+/* TOEPLITZ-STRUCTURED LINEAR OPERATORS */
+void * toeplitz_operator_data_alloc(const ok_float * embedding,
+	size_t embedding_size, size_t work_size)
+{
+	ok_status err = OPTKIT_SUCCESS;
+	toeplitz_operator_data * op_data = OK_NULL;
+
+	if (!embedding)
+		err = OK_SCAN_ERR( OPTKIT_ERROR_UNALLOCATED );
+
+	if (!err) {
+		ok_alloc(op_data, sizeof(*op_data));
+		err = OK_SCAN_ERR( fft_circulant_alloc(&op_data->C, embedding,
+			embedding_size) );
+		OK_CHECK_ERR( err, vector_calloc(&op_data->work, work_size) );
+		OK_CHECK_ERR( err, blas_make_handle(&(op_data->dense_handle)) );
+		if (err) {
+			toeplitz_operator_data_free(op_data);
+			op_data = OK_NULL;
+		}
+	}
+	return (void *) op_data;
+}
+
+ok_status toeplitz_operator_data_free(void * data)
+{
+	toeplitz_operator_data * op_data = (toeplitz_operator_data *) data;
+	OK_CHECK_PTR(op_data);
+	ok_status err = fft_circulant_free(&op_data->C);
+	if (op_data->work.data)
+		OK_MAX_ERR( err, vector_free(&op_data->work) );
+	if (op_data->dense_handle)
+		OK_MAX_ERR( err, blas_destroy_handle(op_data->dense_handle) );
+	ok_free(op_data);
+	return OK_SCAN_ERR( err );
+}
+
+ok_status toeplitz_operator_mul(void * data, vector * input, vector * output)
+{
+	return toeplitz_operator_mul_fused(data, kOne, input, kZero, output);
+}
+
+ok_status toeplitz_operator_mul_t(void * data, vector * input, vector * output)
+{
+	return toeplitz_operator_mul_t_fused(data, kOne, input, kZero, output);
+}
+
+ok_status toeplitz_operator_mul_fused(void * data, ok_float alpha,
+	vector * input, ok_float beta, vector * output)
+{
+	toeplitz_operator_data * op_data = (toeplitz_operator_data *) data;
+	OK_CHECK_PTR(op_data);
+	return fft_circulant_mul(op_data->dense_handle, &op_data->C, 0, alpha,
+		input, beta, output, &op_data->work);
+}
+
+ok_status toeplitz_operator_mul_t_fused(void * data, ok_float alpha,
+	vector * input, ok_float beta, vector * output)
+{
+	toeplitz_operator_data * op_data = (toeplitz_operator_data *) data;
+	OK_CHECK_PTR(op_data);
+	return fft_circulant_mul(op_data->dense_handle, &op_data->C, 1, alpha,
+		input, beta, output, &op_data->work);
+}
+
+static operator * toeplitz_family_operator_alloc(OPTKIT_OPERATOR kind,
+	size_t m, size_t n, const ok_float * embedding, size_t embedding_size)
+{
+	operator * o = OK_NULL;
+	void * data;
+
+	data = toeplitz_operator_data_alloc(embedding, embedding_size,
+		m > n ? m : n);
+	if (data) {
+		ok_alloc(o, sizeof(*o));
+		o->kind = kind;
+		o->size1 = m;
+		o->size2 = n;
+		o->data = data;
+		o->apply = toeplitz_operator_mul;
+		o->adjoint = toeplitz_operator_mul_t;
+		o->fused_apply = toeplitz_operator_mul_fused;
+		o->fused_adjoint = toeplitz_operator_mul_t_fused;
+		o->free = toeplitz_operator_data_free;
+	}
+	return o;
+}
+
+/*
+ * first column of the circulant embedding of the m x n Toeplitz matrix
+ * with given first column (m entries) and first row (n entries; the
+ * leading entry is ignored in favor of first_column[0]):
+ *
+ *	a = [c_0, ..., c_{m-1}, 0, ..., 0, r_{n-1}, ..., r_1]
+ *
+ * where the embedding size is the smallest power of two >= m + n - 1.
+ */
+static ok_float * toeplitz_embedding(const ok_float * first_column, size_t m,
+	const ok_float * first_row, size_t n, size_t * embedding_size)
+{
+	ok_float * embedding = OK_NULL;
+	size_t k, size = fft_next_pow2(m + n - 1);
+
+	ok_alloc(embedding, size * sizeof(ok_float));
+	for (k = 0; k < m; ++k)
+		embedding[k] = first_column[k];
+	for (k = 1; k < n; ++k)
+		embedding[size - k] = first_row[k];
+	*embedding_size = size;
+	return embedding;
+}
+
+/*
+ * first column of a circulant embedding of the n x n circulant matrix
+ * with first column c (given as `size_c` <= n leading entries, zero-
+ * padded): c itself if n is a power of two, otherwise the Toeplitz
+ * embedding with first row r_k = c_{(n - k) mod n}.
+ */
+static ok_float * circulant_embedding(const ok_float * c, size_t size_c,
+	size_t n, size_t * embedding_size)
+{
+	ok_float * embedding = OK_NULL;
+	size_t k, size;
+
+	if (fft_next_pow2(n) == n) {
+		size = n;
+		ok_alloc(embedding, size * sizeof(ok_float));
+		for (k = 0; k < size_c; ++k)
+			embedding[k] = c[k];
+	} else {
+		size = fft_next_pow2(2 * n - 1);
+		ok_alloc(embedding, size * sizeof(ok_float));
+		for (k = 0; k < size_c; ++k)
+			embedding[k] = c[k];
+		for (k = 1; k < n; ++k)
+			if (n - k < size_c)
+				embedding[size - k] = c[n - k];
+	}
+	*embedding_size = size;
+	return embedding;
+}
+
+operator * toeplitz_operator_alloc(const ok_float * first_column, size_t m,
+	const ok_float * first_row, size_t n)
+{
+	operator * o = OK_NULL;
+	ok_float * embedding;
+	size_t size;
+
+	if (first_column && first_row && m > 0 && n > 0) {
+		embedding = toeplitz_embedding(first_column, m, first_row, n,
+			&size);
+		o = toeplitz_family_operator_alloc(OkOperatorToeplitz, m, n,
+			embedding, size);
+		ok_free(embedding);
+	}
+	return o;
+}
+
+operator * circulant_operator_alloc(const ok_float * first_column, size_t n)
+{
+	operator * o = OK_NULL;
+	ok_float * embedding;
+	size_t size;
+
+	if (first_column && n > 0) {
+		embedding = circulant_embedding(first_column, n, n, &size);
+		o = toeplitz_family_operator_alloc(OkOperatorCirculant, n, n,
+			embedding, size);
+		ok_free(embedding);
+	}
+	return o;
+}
+
+/* full linear convolution, (n + kernel_size - 1) x n */
+operator * convolution_operator_alloc(const ok_float * kernel,
+	size_t kernel_size, size_t n)
+{
+	operator * o = OK_NULL;
+	ok_float * embedding = OK_NULL;
+	size_t k, m = n + kernel_size - 1, size = fft_next_pow2(m);
+
+	if (kernel && kernel_size > 0 && n > 0) {
+		ok_alloc(embedding, size * sizeof(ok_float));
+		for (k = 0; k < kernel_size; ++k)
+			embedding[k] = kernel[k];
+		o = toeplitz_family_operator_alloc(OkOperatorConvolution, m, n,
+			embedding, size);
+		ok_free(embedding);
+	}
+	return o;
+}
+
+/* periodic convolution of length-n signals, kernel zero-padded to n */
+operator * circular_convolution_operator_alloc(const ok_float * kernel,
+	size_t kernel_size, size_t n)
+{
+	operator * o = OK_NULL;
+	ok_float * embedding;
+	size_t size;
+
+	if (kernel && kernel_size > 0 && kernel_size <= n) {
+		embedding = circulant_embedding(kernel, kernel_size, n, &size);
+		o = toeplitz_family_operator_alloc(
+			OkOperatorCircularConvolution, n, n, embedding, size);
+		ok_free(embedding);
+	}
+	return o;
+}
+
+static ok_status toeplitz_operator_typecheck(operator * A, const char * caller)
+{
+	OK_CHECK_OPERATOR(A);
+	if (A->kind != OkOperatorToeplitz && A->kind != OkOperatorCirculant &&
+		A->kind != OkOperatorConvolution &&
+		A->kind != OkOperatorCircularConvolution) {
+		printf("toeplitz_operator_%s() %s %s\n", caller, "undefined for",
+			optkit_op2str(A->kind));
+		return OPTKIT_ERROR;
+	} else {
+		return OPTKIT_SUCCESS;
+	}
+}
+
+ok_status toeplitz_operator_scale(operator * A, const ok_float scaling)
+{
+	OK_RETURNIF_ERR( toeplitz_operator_typecheck(A, "scale") );
+	return fft_circulant_scale(&((toeplitz_operator_data *) A->data)->C,
+		scaling);
+}
+
+#ifdef __cplusplus
+}
+#endif
@@ -0,0 +1,74 @@
+#include "optkit_operator_typesafe.h"
+
+#ifdef __cplusplus
+extern "C" {
+#endif
+
+/* dispatch operator transforms on operator kind */
+ok_status typesafe_operator_scale(operator * A, const ok_float scaling)
+{
+	OK_CHECK_OPERATOR(A);
+	switch (A->kind) {
+	case OkOperatorDense:
+		return dense_operator_scale(A, scaling);
+	case OkOperatorSparseCSR:
+	case OkOperatorSparseCSC:
+		return sparse_operator_scale(A, scaling);
+	case OkOperatorDiagonal:
+		return diagonal_operator_scale(A, scaling);
+	case OkOperatorToeplitz:
+	case OkOperatorCirculant:
+	case OkOperatorConvolution:
+	case OkOperatorCircularConvolution:
+		return toeplitz_operator_scale(A, scaling);
+	case OkOperatorFourier:
+		return fourier_operator_scale(A, scaling);
+	case OkOperatorKronecker:
+		return kronecker_operator_scale(A, scaling);
+	case OkOperatorCat:
+	case OkOperatorSplit:
+	case OkOperatorAdd:
+	case OkOperatorNeg:
+		return composite_operator_scale(A, scaling);
+	default:
+		printf("typesafe_operator_scale() %s %s\n", "undefined for",
+			optkit_op2str(A->kind));
+		return OPTKIT_ERROR;
+	}
+}
+
+ok_status typesafe_operator_scale_left(operator * A, const vector * v)
+{
+	OK_CHECK_OPERATOR(A);
+	switch (A->kind) {
+	case OkOperatorDense:
+		return dense_operator_scale_left(A, v);
+	case OkOperatorSparseCSR:
+	case OkOperatorSparseCSC:
+		return sparse_operator_scale_left(A, v);
+	default:
+		printf("typesafe_operator_scale_left() %s %s\n", "undefined for",
+			optkit_op2str(A->kind));
+		return OPTKIT_ERROR;
+	}
+}
+
+ok_status typesafe_operator_scale_right(operator * A, const vector * v)
+{
+	OK_CHECK_OPERATOR(A);
+	switch (A->kind) {
+	case OkOperatorDense:
+		return dense_operator_scale_right(A, v);
+	case OkOperatorSparseCSR:
+	case OkOperatorSparseCSC:
+		return sparse_operator_scale_right(A, v);
+	default:
+		printf("typesafe_operator_scale_right() %s %s\n", "undefined for",
+			optkit_op2str(A->kind));
+		return OPTKIT_ERROR;
+	}
+}
+
+#ifdef __cplusplus
+}
+#endif
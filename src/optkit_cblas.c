@@ -0,0 +1,685 @@
+#define _GNU_SOURCE /* RTLD_DEFAULT, dladdr */
+#include <dlfcn.h>
+#include <pthread.h>
+#include "optkit_defs.h"
+
+#ifdef __cplusplus
+extern "C" {
+#endif
+
+/*
+ * BUILTIN CBLAS
+ *
+ * Portable fallback routines, used when no CBLAS library can be loaded.
+ * Each routine is implemented for column-major storage; row-major calls
+ * are mapped onto the column-major implementation as in the reference
+ * CBLAS (a row-major matrix is the transpose of a column-major one).
+ * Increments are assumed positive, as in all optkit calls.
+ */
+#define kCBLAS_BLOCK 64
+
+/* start of column j of column-major A */
+#define __COL(A, j, ld) ((A) + (size_t) (j) * (size_t) (ld))
+
+static ok_float __entry(const ok_float * A, const enum CBLAS_TRANSPOSE trans,
+	const int i, const int j, const int ld)
+{
+	return trans == CblasNoTrans ? __COL(A, j, ld)[i] : __COL(A, i, ld)[j];
+}
+
+static void __scale(const int N, const ok_float beta, ok_float * Y,
+	const int incY)
+{
+	int i;
+	if (beta == kZero)
+		for (i = 0; i < N; ++i)
+			Y[i * incY] = kZero;
+	else if (beta != kOne)
+		for (i = 0; i < N; ++i)
+			Y[i * incY] *= beta;
+}
+
+static void __axpy(const int N, const ok_float alpha, const ok_float * X,
+	const int incX, ok_float * Y, const int incY)
+{
+	int i;
+	for (i = 0; i < N; ++i)
+		Y[i * incY] += alpha * X[i * incX];
+}
+
+static ok_float __nrm2(const int N, const ok_float * X, const int incX)
+{
+	ok_float scale = kZero, ssq = kOne, xi;
+	int i;
+
+	/* scaled sum of squares, as in the reference BLAS */
+	for (i = 0; i < N; ++i) {
+		xi = MATH(fabs)(X[i * incX]);
+		if (xi == kZero)
+			continue;
+		if (scale < xi) {
+			ssq = kOne + ssq * (scale / xi) * (scale / xi);
+			scale = xi;
+		} else {
+			ssq += (xi / scale) * (xi / scale);
+		}
+	}
+	return scale * MATH(sqrt)(ssq);
+}
+
+static void __scal(const int N, const ok_float alpha, ok_float * X,
+	const int incX)
+{
+	int i;
+	for (i = 0; i < N; ++i)
+		X[i * incX] *= alpha;
+}
+
+static ok_float __asum(const int N, const ok_float * X, const int incX)
+{
+	ok_float sum = kZero;
+	int i;
+	for (i = 0; i < N; ++i)
+		sum += MATH(fabs)(X[i * incX]);
+	return sum;
+}
+
+static ok_float __dot(const int N, const ok_float * X, const int incX,
+	const ok_float * Y, const int incY)
+{
+	ok_float sum = kZero;
+	int i;
+	for (i = 0; i < N; ++i)
+		sum += X[i * incX] * Y[i * incY];
+	return sum;
+}
+
+static void __copy(const int N, const ok_float * X, const int incX,
+	ok_float * Y, const int incY)
+{
+	int i;
+	for (i = 0; i < N; ++i)
+		Y[i * incY] = X[i * incX];
+}
+
+static CBLAS_INDEX __iamax(const int N, const ok_float * X, const int incX)
+{
+	ok_float xmax = -kOne, xi;
+	CBLAS_INDEX imax = 0;
+	int i;
+	for (i = 0; i < N; ++i) {
+		xi = MATH(fabs)(X[i * incX]);
+		if (xi > xmax) {
+			xmax = xi;
+			imax = (CBLAS_INDEX) i;
+		}
+	}
+	return imax;
+}
+
+static void __gemv(const enum CBLAS_ORDER order,
+	const enum CBLAS_TRANSPOSE TransA, const int M, const int N,
+	const ok_float alpha, const ok_float * A, const int lda,
+	const ok_float * X, const int incX, const ok_float beta,
+	ok_float * Y, const int incY)
+{
+	int i, j, m = M, n = N;
+	enum CBLAS_TRANSPOSE trans = TransA;
+	const ok_float * a;
+	ok_float tmp;
+
+	if (order == CblasRowMajor) {
+		m = N;
+		n = M;
+		trans = TransA == CblasNoTrans ? CblasTrans : CblasNoTrans;
+	}
+
+	__scale(trans == CblasNoTrans ? m : n, beta, Y, incY);
+	if (alpha == kZero)
+		return;
+
+	for (j = 0; j < n; ++j) {
+		a = __COL(A, j, lda);
+		if (trans == CblasNoTrans) {
+			tmp = alpha * X[j * incX];
+			for (i = 0; i < m; ++i)
+				Y[i * incY] += tmp * a[i];
+		} else {
+			tmp = kZero;
+			for (i = 0; i < m; ++i)
+				tmp += a[i] * X[i * incX];
+			Y[j * incY] += alpha * tmp;
+		}
+	}
+}
+
+/* solve op(A) x = b for column-major triangular A, b overwritten by x */
+static void __trsv_colmajor(const enum CBLAS_UPLO uplo,
+	const enum CBLAS_TRANSPOSE trans, const enum CBLAS_DIAG diag,
+	const int N, const ok_float * A, const int lda, ok_float * X,
+	const int incX)
+{
+	int i, j;
+	const int nonunit = diag == CblasNonUnit;
+	const ok_float * a;
+	ok_float tmp;
+
+	if (trans == CblasNoTrans && uplo == CblasUpper)
+		for (j = N - 1; j >= 0; --j) {
+			a = __COL(A, j, lda);
+			if (nonunit)
+				X[j * incX] /= a[j];
+			tmp = X[j * incX];
+			for (i = 0; i < j; ++i)
+				X[i * incX] -= tmp * a[i];
+		}
+	else if (trans == CblasNoTrans)
+		for (j = 0; j < N; ++j) {
+			a = __COL(A, j, lda);
+			if (nonunit)
+				X[j * incX] /= a[j];
+			tmp = X[j * incX];
+			for (i = j + 1; i < N; ++i)
+				X[i * incX] -= tmp * a[i];
+		}
+	else if (uplo == CblasUpper)
+		for (j = 0; j < N; ++j) {
+			a = __COL(A, j, lda);
+			tmp = X[j * incX];
+			for (i = 0; i < j; ++i)
+				tmp -= a[i] * X[i * incX];
+			X[j * incX] = nonunit ? tmp / a[j] : tmp;
+		}
+	else
+		for (j = N - 1; j >= 0; --j) {
+			a = __COL(A, j, lda);
+			tmp = X[j * incX];
+			for (i = j + 1; i < N; ++i)
+				tmp -= a[i] * X[i * incX];
+			X[j * incX] = nonunit ? tmp / a[j] : tmp;
+		}
+}
+
+static enum CBLAS_UPLO __flip_uplo(const enum CBLAS_UPLO uplo)
+{
+	return uplo == CblasUpper ? CblasLower : CblasUpper;
+}
+
+static enum CBLAS_TRANSPOSE __flip_trans(const enum CBLAS_TRANSPOSE trans)
+{
+	return trans == CblasNoTrans ? CblasTrans : CblasNoTrans;
+}
+
+static void __trsv(const enum CBLAS_ORDER order, const enum CBLAS_UPLO Uplo,
+	const enum CBLAS_TRANSPOSE TransA, const enum CBLAS_DIAG Diag,
+	const int N, const ok_float * A, const int lda, ok_float * X,
+	const int incX)
+{
+	if (order == CblasRowMajor)
+		__trsv_colmajor(__flip_uplo(Uplo), __flip_trans(TransA), Diag, N,
+			A, lda, X, incX);
+	else
+		__trsv_colmajor(Uplo, TransA, Diag, N, A, lda, X, incX);
+}
+
+static void __sbmv(const enum CBLAS_ORDER order, const enum CBLAS_UPLO Uplo,
+	const int N, const int K, const ok_float alpha, const ok_float * A,
+	const int lda, const ok_float * X, const int incX,
+	const ok_float beta, ok_float * Y, const int incY)
+{
+	int i, j, iend;
+	const int upper = (order == CblasColMajor) == (Uplo == CblasUpper);
+	const ok_float * a;
+	ok_float tmp1, tmp2;
+
+	__scale(N, beta, Y, incY);
+	if (alpha == kZero)
+		return;
+
+	/* band storage: A_ij at a[K + i - j] (upper) or a[i - j] (lower) */
+	for (j = 0; j < N; ++j) {
+		a = __COL(A, j, lda);
+		tmp1 = alpha * X[j * incX];
+		tmp2 = kZero;
+		if (upper) {
+			for (i = j > K ? j - K : 0; i < j; ++i) {
+				Y[i * incY] += tmp1 * a[K + i - j];
+				tmp2 += a[K + i - j] * X[i * incX];
+			}
+			Y[j * incY] += tmp1 * a[K] + alpha * tmp2;
+		} else {
+			iend = j + K < N - 1 ? j + K : N - 1;
+			for (i = j + 1; i <= iend; ++i) {
+				Y[i * incY] += tmp1 * a[i - j];
+				tmp2 += a[i - j] * X[i * incX];
+			}
+			Y[j * incY] += tmp1 * a[0] + alpha * tmp2;
+		}
+	}
+}
+
+static void __syrk(const enum CBLAS_ORDER Order, const enum CBLAS_UPLO Uplo,
+	const enum CBLAS_TRANSPOSE Trans, const int N, const int K,
+	const ok_float alpha, const ok_float * A, const int lda,
+	const ok_float beta, ok_float * C, const int ldc)
+{
+	int i, j, l, iend;
+	enum CBLAS_UPLO uplo = Uplo;
+	enum CBLAS_TRANSPOSE trans = Trans;
+	ok_float * c;
+	const ok_float * a;
+	ok_float tmp;
+
+	if (Order == CblasRowMajor) {
+		uplo = __flip_uplo(Uplo);
+		trans = __flip_trans(Trans);
+	}
+
+	for (j = 0; j < N; ++j) {
+		c = __COL(C, j, ldc);
+		if (uplo == CblasUpper)
+			__scale(j + 1, beta, c, 1);
+		else
+			__scale(N - j, beta, c + j, 1);
+	}
+	if (alpha == kZero)
+		return;
+
+	/* C(:, j) += alpha * op(A) * op(A)(j, :)^T, over the uplo triangle */
+	for (j = 0; j < N; ++j) {
+		c = __COL(C, j, ldc);
+		if (trans == CblasNoTrans) {
+			for (l = 0; l < K; ++l) {
+				a = __COL(A, l, lda);
+				tmp = alpha * a[j];
+				if (uplo == CblasUpper)
+					for (i = 0; i <= j; ++i)
+						c[i] += tmp * a[i];
+				else
+					for (i = j; i < N; ++i)
+						c[i] += tmp * a[i];
+			}
+		} else {
+			a = __COL(A, j, lda);
+			iend = uplo == CblasUpper ? j + 1 : N;
+			for (i = uplo == CblasUpper ? 0 : j; i < iend; ++i)
+				c[i] += alpha * __dot(K, __COL(A, i, lda), 1, a, 1);
+		}
+	}
+}
+
+/* cache-blocked C = alpha * op(A) * op(B) + beta * C, column-major */
+static void __gemm_colmajor(const enum CBLAS_TRANSPOSE transA,
+	const enum CBLAS_TRANSPOSE transB, const int M, const int N,
+	const int K, const ok_float alpha, const ok_float * A, const int lda,
+	const ok_float * B, const int ldb, const ok_float beta, ok_float * C,
+	const int ldc)
+{
+	int jb;
+
+	/* column blocks of C are independent */
+	#ifdef _OPENMP
+	#pragma omp parallel for
+	#endif
+	for (jb = 0; jb < N; jb += kCBLAS_BLOCK) {
+		const int jend = jb + kCBLAS_BLOCK < N ? jb + kCBLAS_BLOCK : N;
+		int i, j, l, ib, lb, iend, lend;
+		const ok_float * a;
+		ok_float * c;
+		ok_float tmp;
+
+		for (j = jb; j < jend; ++j)
+			__scale(M, beta, __COL(C, j, ldc), 1);
+		if (alpha == kZero)
+			continue;
+
+		for (lb = 0; lb < K; lb += kCBLAS_BLOCK) {
+			lend = lb + kCBLAS_BLOCK < K ? lb + kCBLAS_BLOCK : K;
+			for (ib = 0; ib < M; ib += kCBLAS_BLOCK) {
+				iend = ib + kCBLAS_BLOCK < M ? ib + kCBLAS_BLOCK : M;
+				for (j = jb; j < jend; ++j) {
+					c = __COL(C, j, ldc);
+					if (transA == CblasNoTrans)
+						for (l = lb; l < lend; ++l) {
+							a = __COL(A, l, lda);
+							tmp = alpha * __entry(B, transB, l, j, ldb);
+							for (i = ib; i < iend; ++i)
+								c[i] += tmp * a[i];
+						}
+					else
+						for (i = ib; i < iend; ++i) {
+							a = __COL(A, i, lda);
+							tmp = kZero;
+							for (l = lb; l < lend; ++l)
+								tmp += a[l] * __entry(B, transB, l, j,
+									ldb);
+							c[i] += alpha * tmp;
+						}
+				}
+			}
+		}
+	}
+}
+
+static void __gemm(const enum CBLAS_ORDER Order,
+	const enum CBLAS_TRANSPOSE TransA, const enum CBLAS_TRANSPOSE TransB,
+	const int M, const int N, const int K, const ok_float alpha,
+	const ok_float * A, const int lda, const ok_float * B, const int ldb,
+	const ok_float beta, ok_float * C, const int ldc)
+{
+	if (Order == CblasRowMajor)
+		__gemm_colmajor(TransB, TransA, N, M, K, alpha, B, ldb, A, lda,
+			beta, C, ldc);
+	else
+		__gemm_colmajor(TransA, TransB, M, N, K, alpha, A, lda, B, ldb,
+			beta, C, ldc);
+}
+
+/*
+ * solve X op(A) = alpha * B for the M rows of column-major B, by column
+ * operations on B, as in the reference BLAS
+ */
+static void __trsm_right_colmajor(const enum CBLAS_UPLO uplo,
+	const enum CBLAS_TRANSPOSE trans, const enum CBLAS_DIAG diag,
+	const int M, const int N, const ok_float alpha, const ok_float * A,
+	const int lda, ok_float * B, const int ldb)
+{
+	int j, k, jj;
+	const int nonunit = diag == CblasNonUnit;
+	const int forward = (trans == CblasNoTrans) == (uplo == CblasUpper);
+	const ok_float * a;
+	ok_float * b;
+
+	for (jj = 0; jj < N; ++jj) {
+		j = forward ? jj : N - 1 - jj;
+		a = __COL(A, j, lda);
+		b = __COL(B, j, ldb);
+		if (trans == CblasNoTrans) {
+			/* B(:, j) = (alpha * B(:, j) - sum_k A(k, j) * X(:, k)) / A(j, j) */
+			__scal(M, alpha, b, 1);
+			for (k = forward ? 0 : j + 1; k < (forward ? j : N); ++k)
+				if (a[k] != kZero)
+					__axpy(M, -a[k], __COL(B, k, ldb), 1, b, 1);
+			if (nonunit)
+				__scal(M, kOne / a[j], b, 1);
+		} else {
+			/* X(:, j) final; eliminate it from the remaining columns */
+			if (nonunit)
+				__scal(M, kOne / a[j], b, 1);
+			for (k = forward ? j + 1 : 0; k < (forward ? N : j); ++k)
+				if (a[k] != kZero)
+					__axpy(M, -a[k], b, 1, __COL(B, k, ldb), 1);
+			__scal(M, alpha, b, 1);
+		}
+	}
+}
+
+static void __trsm(const enum CBLAS_ORDER Order, const enum CBLAS_SIDE Side,
+	const enum CBLAS_UPLO Uplo, const enum CBLAS_TRANSPOSE TransA,
+	const enum CBLAS_DIAG Diag, const int M, const int N,
+	const ok_float alpha, const ok_float * A, const int lda, ok_float * B,
+	const int ldb)
+{
+	int j, m = M, n = N;
+	enum CBLAS_SIDE side = Side;
+	enum CBLAS_UPLO uplo = Uplo;
+
+	if (Order == CblasRowMajor) {
+		m = N;
+		n = M;
+		side = Side == CblasLeft ? CblasRight : CblasLeft;
+		uplo = __flip_uplo(Uplo);
+	}
+
+	/*
+	 * left: columns of B are independent, solve op(A) X = alpha * B
+	 * column by column; right: rows of B are independent, solve by
+	 * blocks of rows
+	 */
+	if (side == CblasLeft) {
+		#ifdef _OPENMP
+		#pragma omp parallel for
+		#endif
+		for (j = 0; j < n; ++j) {
+			__scal(m, alpha, __COL(B, j, ldb), 1);
+			__trsv_colmajor(uplo, TransA, Diag, m, A, lda,
+				__COL(B, j, ldb), 1);
+		}
+	} else {
+		#ifdef _OPENMP
+		#pragma omp parallel for
+		#endif
+		for (j = 0; j < m; j += kCBLAS_BLOCK)
+			__trsm_right_colmajor(uplo, TransA, Diag,
+				j + kCBLAS_BLOCK < m ? kCBLAS_BLOCK : m - j, n, alpha,
+				A, lda, B + j, ldb);
+	}
+}
+
+static const ok_cblas_table __builtin = {
+	"builtin", "",
+	__axpy, __nrm2, __scal, __asum, __dot, __copy, __iamax,
+	__gemv, __trsv, __sbmv,
+	__syrk, __gemm, __trsm,
+	OK_NULL, OK_NULL, OK_NULL
+};
+
+/*
+ * CBLAS LIBRARY LOADING
+ */
+#ifndef FLOAT
+#define OK_CBLAS_SYMBOL(x) "cblas_d" #x
+#define OK_CBLAS_ISYMBOL(x) "cblas_id" #x
+#else
+#define OK_CBLAS_SYMBOL(x) "cblas_s" #x
+#define OK_CBLAS_ISYMBOL(x) "cblas_is" #x
+#endif
+
+#define OK_CBLAS_BIND(t, lib, x) \
+	(*(void **) (&(t)->x) = dlsym(lib, OK_CBLAS_SYMBOL(x)))
+
+typedef struct ok_cblas_candidate {
+	const char * family;
+	const char * path; /* NULL: symbols already loaded in the process */
+} ok_cblas_candidate;
+
+static const ok_cblas_candidate __candidates[] = {
+#ifdef __APPLE__
+	{"openblas", "libopenblas.dylib"},
+	{"mkl", "libmkl_rt.dylib"},
+	{"blis", "libblis.dylib"},
+	{"accelerate",
+		"/System/Library/Frameworks/Accelerate.framework/Accelerate"},
+#else
+	{"openblas", "libopenblas.so.0"},
+	{"openblas", "libopenblas.so"},
+	{"mkl", "libmkl_rt.so.2"},
+	{"mkl", "libmkl_rt.so"},
+	{"blis", "libblis.so.4"},
+	{"blis", "libblis.so"},
+	{"reference", "libcblas.so.3"},
+	{"reference", "libcblas.so"},
+	{"system", "libblas.so.3"},
+	{"system", "libblas.so"},
+#endif
+	{"system", OK_NULL}
+};
+
+static void * __cblas_symbol(void * lib, const char * const * names)
+{
+	void * sym = OK_NULL;
+	size_t i;
+	for (i = 0; names[i] && !sym; ++i)
+		sym = dlsym(lib, names[i]);
+	return sym;
+}
+
+/* library family, told by its extensions (e.g., when found as libblas) */
+static const char * __cblas_family(void * lib, const char * family)
+{
+	if (dlsym(lib, "openblas_get_config"))
+		return "openblas";
+	if (dlsym(lib, "MKL_Get_Version"))
+		return "mkl";
+	if (dlsym(lib, "bli_info_get_version_str"))
+		return "blis";
+	return family;
+}
+
+static int __cblas_bind(ok_cblas_table * t, void * lib)
+{
+	static const char * const get_threads[] = {"openblas_get_num_threads",
+		"MKL_Get_Max_Threads", OK_NULL};
+	static const char * const set_threads[] = {"openblas_set_num_threads",
+		"MKL_Set_Num_Threads", OK_NULL};
+	static const char * const set_threads_local[] = {
+		"openblas_set_num_threads_local", "MKL_Set_Num_Threads_Local",
+		OK_NULL};
+
+	OK_CBLAS_BIND(t, lib, axpy);
+	OK_CBLAS_BIND(t, lib, nrm2);
+	OK_CBLAS_BIND(t, lib, scal);
+	OK_CBLAS_BIND(t, lib, asum);
+	OK_CBLAS_BIND(t, lib, dot);
+	OK_CBLAS_BIND(t, lib, copy);
+	*(void **) (&t->iamax) = dlsym(lib, OK_CBLAS_ISYMBOL(amax));
+	OK_CBLAS_BIND(t, lib, gemv);
+	OK_CBLAS_BIND(t, lib, trsv);
+	OK_CBLAS_BIND(t, lib, sbmv);
+	OK_CBLAS_BIND(t, lib, syrk);
+	OK_CBLAS_BIND(t, lib, gemm);
+	OK_CBLAS_BIND(t, lib, trsm);
+	*(void **) (&t->get_num_threads) = __cblas_symbol(lib, get_threads);
+	*(void **) (&t->set_num_threads) = __cblas_symbol(lib, set_threads);
+	*(void **) (&t->set_num_threads_local) = __cblas_symbol(lib,
+		set_threads_local);
+
+	return t->axpy && t->nrm2 && t->scal && t->asum && t->dot && t->copy &&
+		t->iamax && t->gemv && t->trsv && t->sbmv && t->syrk &&
+		t->gemm && t->trsm;
+}
+
+static int __cblas_open(ok_cblas_table * t, const char * family,
+	const char * path)
+{
+	void * lib = path ? dlopen(path, RTLD_NOW | RTLD_LOCAL) : RTLD_DEFAULT;
+	Dl_info info;
+
+	if (!lib)
+		return 0;
+	memset(t, 0, sizeof(*t));
+	if (!__cblas_bind(t, lib)) {
+		if (path)
+			dlclose(lib);
+		return 0;
+	}
+
+	/* handles of bound libraries are kept open for the process lifetime */
+	t->name = __cblas_family(lib, family);
+	if (dladdr(*(void **) (&t->gemm), &info) && info.dli_fname)
+		strncpy(t->library, info.dli_fname, OK_CBLAS_PATHLEN - 1);
+	return 1;
+}
+
+static ok_status __cblas_resolve(ok_cblas_table * t, const char * request)
+{
+	const int any = !request || !*request || !strcmp(request, "auto");
+	size_t i;
+
+	if (!any && !strcmp(request, "builtin")) {
+		*t = __builtin;
+		return OPTKIT_SUCCESS;
+	}
+	if (!any && (strchr(request, '/') || strstr(request, ".so") ||
+		strstr(request, ".dylib")))
+		return __cblas_open(t, "custom", request) ?
+			OPTKIT_SUCCESS : OPTKIT_ERROR;
+
+	for (i = 0; i < sizeof(__candidates) / sizeof(*__candidates); ++i)
+		if (any || !strcmp(request, __candidates[i].family))
+			if (__cblas_open(t, __candidates[i].family,
+				__candidates[i].path))
+				return OPTKIT_SUCCESS;
+
+	if (!any)
+		return OPTKIT_ERROR;
+	*t = __builtin;
+	return OPTKIT_SUCCESS;
+}
+
+/*
+ * the table in use; replaced (never modified) by ok_blas_select() under
+ * the lock. Replaced tables are not freed, as other threads may still be
+ * calling through them.
+ */
+static const ok_cblas_table * __active = OK_NULL;
+static pthread_mutex_t __lock = PTHREAD_MUTEX_INITIALIZER;
+
+static ok_status __cblas_install(const char * request)
+{
+	ok_cblas_table * t;
+	ok_status err;
+
+	ok_alloc(t, sizeof(*t));
+	if (!t)
+		return OPTKIT_ERROR;
+	err = __cblas_resolve(t, request);
+	if (err)
+		ok_free(t);
+	else
+		__atomic_store_n(&__active, t, __ATOMIC_RELEASE);
+	return err;
+}
+
+const ok_cblas_table * ok_cblas(void)
+{
+	const ok_cblas_table * t = __atomic_load_n(&__active, __ATOMIC_ACQUIRE);
+	const char * request;
+
+	if (t)
+		return t;
+
+	pthread_mutex_lock(&__lock);
+	if (!__active) {
+		request = getenv("OPTKIT_BLAS");
+		if (__cblas_install(request)) {
+			printf("OPTKIT_BLAS=%s: CBLAS library not found, "
+				"using defaults\n", request);
+			__cblas_install(OK_NULL);
+		}
+	}
+	t = __active;
+	pthread_mutex_unlock(&__lock);
+	return t;
+}
+
+/*
+ * bind the CBLAS library named (as for OPTKIT_BLAS) by name, or by the
+ * environment if name is NULL; the current library remains in use if the
+ * requested one cannot be loaded
+ */
+ok_status ok_blas_select(const char * name)
+{
+	ok_status err;
+
+	if (!name)
+		name = getenv("OPTKIT_BLAS");
+	pthread_mutex_lock(&__lock);
+	err = __cblas_install(name);
+	pthread_mutex_unlock(&__lock);
+	return OK_SCAN_ERR( err );
+}
+
+const char * ok_blas_backend(void)
+{
+	return ok_cblas()->name;
+}
+
+const char * ok_blas_library(void)
+{
+	return ok_cblas()->library;
+}
+
+#ifdef __cplusplus
+}
+#endif
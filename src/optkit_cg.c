@@ -142,6 +142,97 @@ ok_status pcg_helper_free(pcg_helper * helper)
 	return err;
 }
 
+block_cgls_helper * block_cgls_helper_alloc(size_t m, size_t n,
+	size_t nrhs)
+{
+	ok_status err = OPTKIT_SUCCESS;
+	block_cgls_helper * h = OK_NULL;
+	ok_alloc(h, sizeof(*h));
+	h->nrhs = nrhs;
+	OK_CHECK_ERR( err, matrix_calloc(&(h->P), n, nrhs, CblasColMajor) );
+	OK_CHECK_ERR( err, matrix_calloc(&(h->Q), m, nrhs, CblasColMajor) );
+	OK_CHECK_ERR( err, matrix_calloc(&(h->R), m, nrhs, CblasColMajor) );
+	OK_CHECK_ERR( err, matrix_calloc(&(h->S), n, nrhs, CblasColMajor) );
+	OK_CHECK_ERR( err, blas_make_handle(&(h->blas_handle)) );
+	ok_alloc(h->index, nrhs * sizeof(*h->index));
+	ok_alloc(h->alpha, nrhs * sizeof(*h->alpha));
+	ok_alloc(h->gamma, nrhs * sizeof(*h->gamma));
+	ok_alloc(h->p_squared, nrhs * sizeof(*h->p_squared));
+	ok_alloc(h->norm_s0, nrhs * sizeof(*h->norm_s0));
+	ok_alloc(h->norm_x, nrhs * sizeof(*h->norm_x));
+	ok_alloc(h->xmax, nrhs * sizeof(*h->xmax));
+	ok_alloc(h->indefinite, nrhs * sizeof(*h->indefinite));
+	ok_alloc(h->iters, nrhs * sizeof(*h->iters));
+	if (err) {
+		OK_MAX_ERR( err, block_cgls_helper_free(h) );
+		h = OK_NULL;
+	}
+	return h;
+}
+
+ok_status block_cgls_helper_free(block_cgls_helper * helper)
+{
+	if (!helper)
+		return OK_SCAN_ERR( OPTKIT_ERROR_UNALLOCATED );
+
+	ok_status err = OK_SCAN_ERR( blas_destroy_handle(helper->blas_handle) );
+	OK_MAX_ERR( err, matrix_free(&(helper->P)) );
+	OK_MAX_ERR( err, matrix_free(&(helper->Q)) );
+	OK_MAX_ERR( err, matrix_free(&(helper->R)) );
+	OK_MAX_ERR( err, matrix_free(&(helper->S)) );
+	ok_free(helper->index);
+	ok_free(helper->alpha);
+	ok_free(helper->gamma);
+	ok_free(helper->p_squared);
+	ok_free(helper->norm_s0);
+	ok_free(helper->norm_x);
+	ok_free(helper->xmax);
+	ok_free(helper->indefinite);
+	ok_free(helper->iters);
+	ok_free(helper);
+	return err;
+}
+
+block_pcg_helper * block_pcg_helper_alloc(size_t m, size_t n, size_t nrhs)
+{
+	ok_status err = OPTKIT_SUCCESS;
+	block_pcg_helper * h = OK_NULL;
+	ok_alloc(h, sizeof(*h));
+	h->nrhs = nrhs;
+	OK_CHECK_ERR( err, matrix_calloc(&(h->P), n, nrhs, CblasColMajor) );
+	OK_CHECK_ERR( err, matrix_calloc(&(h->Q), n, nrhs, CblasColMajor) );
+	OK_CHECK_ERR( err, matrix_calloc(&(h->R), n, nrhs, CblasColMajor) );
+	OK_CHECK_ERR( err, matrix_calloc(&(h->Z), n, nrhs, CblasColMajor) );
+	OK_CHECK_ERR( err, matrix_calloc(&(h->temp), m, nrhs, CblasColMajor) );
+	OK_CHECK_ERR( err, blas_make_handle(&(h->blas_handle)) );
+	ok_alloc(h->index, nrhs * sizeof(*h->index));
+	ok_alloc(h->gamma, nrhs * sizeof(*h->gamma));
+	ok_alloc(h->norm_r, nrhs * sizeof(*h->norm_r));
+	if (err) {
+		OK_MAX_ERR( err, block_pcg_helper_free(h) );
+		h = OK_NULL;
+	}
+	return h;
+}
+
+ok_status block_pcg_helper_free(block_pcg_helper * helper)
+{
+	if (!helper)
+		return OK_SCAN_ERR( OPTKIT_ERROR_UNALLOCATED );
+
+	ok_status err = OK_SCAN_ERR( blas_destroy_handle(helper->blas_handle) );
+	OK_MAX_ERR( err, matrix_free(&(helper->P)) );
+	OK_MAX_ERR( err, matrix_free(&(helper->Q)) );
+	OK_MAX_ERR( err, matrix_free(&(helper->R)) );
+	OK_MAX_ERR( err, matrix_free(&(helper->Z)) );
+	OK_MAX_ERR( err, matrix_free(&(helper->temp)) );
+	ok_free(helper->index);
+	ok_free(helper->gamma);
+	ok_free(helper->norm_r);
+	ok_free(helper);
+	return err;
+}
+
 /*
  *  CGLS Conjugate Gradient Least squares
  *
@@ -179,7 +270,7 @@ ok_status cgls_nonallocating(cgls_helper * helper,
 	/* variable and constant declarations */
 	char fmt[] = "%5d %9.2e %12.5e\n";
 	uint k;
-	ok_float p_squared;
+	ok_float p_squared, x_squared;
 	int indefinite = 0, converged = 0;
 	const ok_float kNegRho = -rho;
 
@@ -193,11 +284,15 @@ ok_status cgls_nonallocating(cgls_helper * helper,
 
 	/* r = b - Ax */
 	vector_memcpy_vv(&r, b);
-	if (h->norm_x > 0)
+	h->products = 0;
+	if (h->norm_x > 0) {
 		op->fused_apply(op->data, -kOne, x, kOne, &r);
+		++h->products;
+	}
 
 	/* s = A'*r - rho * x */
 	op->adjoint(op->data, &r, &s);
+	++h->products;
 	if (h->norm_x > 0)
 		blas_axpy(blas_hdl, kNegRho, x, &s);
 
@@ -209,6 +304,7 @@ ok_status cgls_nonallocating(cgls_helper * helper,
 	h->norm_s0 =  h->norm_s;
 	h->gamma = h->norm_s0 * h->norm_s0;
 	h->xmax = h->norm_x;
+	p_squared = h->gamma;
 
 	*flag = 0;
 	if (h->norm_s < kEps)
@@ -217,7 +313,13 @@ ok_status cgls_nonallocating(cgls_helper * helper,
 	if (!quiet && !*flag)
 		printf("    k    norm x        resNE\n");
 
-	/* ------------------- CGLS ----------------- */
+	/*
+	 * ------------------- CGLS -----------------
+	 *
+	 * besides the products by A and A', each iteration makes one pass
+	 * over each of q and r (length m), and two fused passes over x, p and
+	 * s (length n) that also return ||x||^2, ||s||^2 and ||p||^2
+	 */
 	for (k = 0; k < maxiter && !*flag; ++k) {
 		/* q = Ap */
 		op->apply(op->data, &p, &q);
@@ -227,9 +329,10 @@ ok_status cgls_nonallocating(cgls_helper * helper,
 		 * delta = ||p||_2^2 + rho * ||q||_2^2
 		 * BUT THE CODE PERFORMS:
 		 * delta = ||q||_2^2 + rho * ||p||_2^2
+		 *
+		 * (||p||_2^2 from the update of p in the last iteration)
 		 */
 		blas_dot(blas_hdl, &q, &q, &h->delta);
-		blas_dot(blas_hdl, &p, &p, &p_squared);
 		h->delta += rho * p_squared;
 
 		if (h->delta <= 0)
@@ -238,28 +341,24 @@ ok_status cgls_nonallocating(cgls_helper * helper,
 			h->delta = kEps;
 
 		h->alpha = h->gamma / h->delta;
-		/* x += alpha * p */
 		/* r -= alpha * q */
-		blas_axpy(blas_hdl, h->alpha, &p, x);
 		blas_axpy(blas_hdl, -(h->alpha), &q, &r);
 
-		/* s = A'r - rho * x */
-		op->adjoint(op->data, &r, &s);
-		blas_axpy(blas_hdl, kNegRho, x, &s);
-
+		/* x += alpha * p, s = A'r - rho * x; ||x||^2 and ||s||^2 */
 		/* compute gamma = ||s||^2 */
 		/* compute beta = gamma/gamma_prev */
-		blas_nrm2(blas_hdl, &s, &h->norm_s);
+		op->adjoint(op->data, &r, &s);
 		h->gamma_prev = h->gamma;
-		h->gamma = h->norm_s * h->norm_s;
+		vector_axpy2_sumsq(h->alpha, &p, x, kNegRho, x, &s, &x_squared,
+			&h->gamma);
+		h->norm_x = MATH(sqrt)(x_squared);
+		h->norm_s = MATH(sqrt)(h->gamma);
 		h->beta = h->gamma / h->gamma_prev;
 
-		/* p = s + beta * p */
-		vector_scale(&p, h->beta);
-		blas_axpy(blas_hdl, kOne, &s, &p);
+		/* p = s + beta * p; ||p||^2 */
+		vector_xpby_sumsq(&s, h->beta, &p, &p_squared);
 
 		/* convergence check */
-		blas_nrm2(blas_hdl, x, &h->norm_x);
 		h->xmax = (h->norm_x > h->xmax) ? h->norm_x : h->xmax;
 		converged = ((h->norm_s < h->norm_s0 * tol) ||
 			(h->norm_x * tol > 1));
@@ -269,6 +368,10 @@ ok_status cgls_nonallocating(cgls_helper * helper,
 			break;
 	}
 
+	/* record work: each iteration applies A and A' */
+	h->iters = (k < maxiter && converged) ? k + 1 : k;
+	h->products += 2 * h->iters;
+
 	/* determine exit status */
 	h->shrink = h->norm_x / h->xmax;
 	if (k == maxiter)
@@ -460,24 +563,25 @@ ok_status pcg_nonallocating(pcg_helper * helper, operator * op,
 	/* gamma = r'Mr */
 	blas_dot(blas_hdl, &r, &p, &h->gamma);
 
+	/*
+	 * besides the products by A, A' and M, each iteration makes four
+	 * passes over vectors of length n: two fused update/reduction passes,
+	 * the dot product r'Mr and the update of p
+	 */
 	for (k = 0; k < maxiter && !err; ++k) {
 		/* q = (rho * I + A'A)p */
+		/* alpha = <p, r> / <p, q> */
 		op->apply(op->data, &p, &temp);
 		op->adjoint(op->data, &temp, &q);
-		blas_axpy(blas_hdl, rho, &p, &q);
-
-		/* alpha = <p, r> / <p, q> */
-		blas_dot(blas_hdl, &p, &q, &h->alpha);
+		vector_axpy_dot(rho, &p, &q, &h->alpha);
 		if (!err)
 			h->alpha = h->gamma / h->alpha;
 
 		/* x += alpha * p */
 		/* r -= alpha * q */
-		blas_axpy(blas_hdl, +h->alpha, &p, x);
-		blas_axpy(blas_hdl, -h->alpha, &q, &r);
-
 		/* check convergence */
-		blas_dot(blas_hdl, &r, &r, &h->norm_r);
+		vector_axpy2_sumsq(h->alpha, &p, x, -h->alpha, &q, &r, OK_NULL,
+			&h->norm_r);
 		if (!err)
 			h->norm_r = MATH(sqrt)(h->norm_r);
 		if (h->norm_r <= tol) {
@@ -496,8 +600,7 @@ ok_status pcg_nonallocating(pcg_helper * helper, operator * op,
 		blas_dot(blas_hdl, &r, &z, &h->gamma);
 
 		/* p = p * gamma / gamma_prev + Mr */
-		vector_scale(&p, h->gamma / h->gamma_prev);
-		blas_axpy(blas_hdl, kOne, &z, &p);
+		vector_xpby_sumsq(&z, h->gamma / h->gamma_prev, &p, OK_NULL);
 	}
 
 	/* store solution for warm start in x0 (alias of z) */
@@ -549,6 +652,424 @@ ok_status pcg_finish(void * pcg_work)
 	return pcg_helper_free((pcg_helper *) pcg_work);
 }
 
+/*
+ * output = op(A) * input over the columns of input, as one block product
+ * when the operator provides one and column by column otherwise
+ */
+static ok_status __block_product(operator * op, enum CBLAS_TRANSPOSE transA,
+	matrix * input, matrix * output)
+{
+	ok_status err = OPTKIT_SUCCESS;
+	vector in, out;
+	size_t j;
+
+	if (transA == CblasNoTrans && op->apply_block)
+		return op->apply_block(op->data, input, output);
+	if (transA == CblasTrans && op->adjoint_block)
+		return op->adjoint_block(op->data, input, output);
+
+	for (j = 0; j < input->size2 && !err; ++j) {
+		OK_CHECK_ERR( err, matrix_column(&in, input, j) );
+		OK_CHECK_ERR( err, matrix_column(&out, output, j) );
+		if (transA == CblasNoTrans)
+			OK_CHECK_ERR( err, op->apply(op->data, &in, &out) );
+		else
+			OK_CHECK_ERR( err, op->adjoint(op->data, &in, &out) );
+	}
+	return err;
+}
+
+static ok_status __block_check(operator * op, matrix * B, matrix * X,
+	size_t nrhs)
+{
+	if (B->order != CblasColMajor || X->order != CblasColMajor)
+		return OK_SCAN_ERR( OPTKIT_ERROR_LAYOUT_MISMATCH );
+	if (B->size2 != X->size2 || B->size2 > nrhs)
+		return OK_SCAN_ERR( OPTKIT_ERROR_DIMENSION_MISMATCH );
+	return OPTKIT_SUCCESS;
+}
+
+/*
+ * remove the right-hand side in column j from the active set, moving the
+ * last active column into its place
+ */
+static ok_status __block_cgls_retire(block_cgls_helper * h, size_t j)
+{
+	vector dst, src;
+	size_t last = --h->active;
+	if (j == last)
+		return OPTKIT_SUCCESS;
+
+	OK_RETURNIF_ERR( matrix_column(&dst, &h->P, j) );
+	OK_RETURNIF_ERR( matrix_column(&src, &h->P, last) );
+	OK_RETURNIF_ERR( vector_memcpy_vv(&dst, &src) );
+	OK_RETURNIF_ERR( matrix_column(&dst, &h->R, j) );
+	OK_RETURNIF_ERR( matrix_column(&src, &h->R, last) );
+	OK_RETURNIF_ERR( vector_memcpy_vv(&dst, &src) );
+	h->index[j] = h->index[last];
+	h->gamma[j] = h->gamma[last];
+	h->p_squared[j] = h->p_squared[last];
+	h->norm_s0[j] = h->norm_s0[last];
+	h->norm_x[j] = h->norm_x[last];
+	h->xmax[j] = h->xmax[last];
+	h->indefinite[j] = h->indefinite[last];
+	return OPTKIT_SUCCESS;
+}
+
+/*
+ * block CGLS: the CGLS iteration above, run for every column of B at
+ * once. each iteration forms Q = AP and S = A'R as block products over
+ * the active columns; the remaining vector work is per column, with the
+ * fused updates of cgls_nonallocating. columns leave the block as they
+ * converge, with flag[j] set as in cgls_nonallocating.
+ */
+ok_status block_cgls_nonallocating(block_cgls_helper * helper,
+	operator * op, matrix * B, matrix * X, const ok_float rho,
+	const ok_float tol, const size_t maxiter, const int quiet,
+	uint * flag)
+{
+	OK_CHECK_PTR(helper);
+	OK_CHECK_OPERATOR(op);
+	OK_CHECK_MATRIX(B);
+	OK_CHECK_MATRIX(X);
+	OK_CHECK_PTR(flag);
+
+	ok_status err = OPTKIT_SUCCESS;
+	block_cgls_helper * h = helper;
+	void * blas_hdl = h->blas_handle;
+	matrix P, Q, R, S;
+	vector b, x, p, q, r, s;
+	size_t j, nrhs = B->size2;
+	uint k;
+	ok_float delta, gamma_prev, norm_s, x_squared, shrink;
+	const ok_float kNegRho = -rho;
+	char fmt[] = "%5d %9u\n";
+
+	OK_RETURNIF_ERR( __block_check(op, B, X, h->nrhs) );
+	if (op->size1 != B->size1 || op->size2 != X->size1 ||
+		h->R.size1 != B->size1 || h->S.size1 != X->size1)
+		return OK_SCAN_ERR( OPTKIT_ERROR_DIMENSION_MISMATCH );
+
+	/* r = b - Ax */
+	h->active = nrhs;
+	h->products = 0;
+	for (j = 0; j < nrhs && !err; ++j) {
+		h->index[j] = j;
+		h->iters[j] = 0;
+		h->indefinite[j] = 0;
+		flag[j] = 0;
+		OK_CHECK_ERR( err, matrix_column(&b, B, j) );
+		OK_CHECK_ERR( err, matrix_column(&x, X, j) );
+		OK_CHECK_ERR( err, matrix_column(&r, &h->R, j) );
+		OK_CHECK_ERR( err, vector_memcpy_vv(&r, &b) );
+		OK_CHECK_ERR( err, blas_nrm2(blas_hdl, &x, h->norm_x + j) );
+		if (!err && h->norm_x[j] > 0)
+			OK_CHECK_ERR( err, op->fused_apply(op->data, -kOne, &x,
+				kOne, &r) );
+	}
+
+	/* s = A'*r - rho * x */
+	OK_CHECK_ERR( err, matrix_submatrix(&R, &h->R, 0, 0, B->size1, nrhs) );
+	OK_CHECK_ERR( err, matrix_submatrix(&S, &h->S, 0, 0, X->size1, nrhs) );
+	OK_CHECK_ERR( err, __block_product(op, CblasTrans, &R, &S) );
+	++h->products;
+
+	/* p = s, initial norms */
+	for (j = 0; j < nrhs && !err; ++j) {
+		OK_CHECK_ERR( err, matrix_column(&x, X, j) );
+		OK_CHECK_ERR( err, matrix_column(&s, &h->S, j) );
+		OK_CHECK_ERR( err, matrix_column(&p, &h->P, j) );
+		if (!err && h->norm_x[j] > 0)
+			OK_CHECK_ERR( err, blas_axpy(blas_hdl, kNegRho, &x, &s) );
+		OK_CHECK_ERR( err, vector_memcpy_vv(&p, &s) );
+		OK_CHECK_ERR( err, blas_nrm2(blas_hdl, &s, h->norm_s0 + j) );
+		h->gamma[j] = h->norm_s0[j] * h->norm_s0[j];
+		h->p_squared[j] = h->gamma[j];
+		h->xmax[j] = h->norm_x[j];
+		if (h->norm_s0[j] < kEps)
+			flag[j] = 1;
+	}
+	for (j = nrhs; j-- > 0 && !err;)
+		if (flag[h->index[j]])
+			OK_CHECK_ERR( err, __block_cgls_retire(h, j) );
+
+	if (!quiet && h->active)
+		printf("    k    active\n");
+
+	for (k = 0; k < maxiter && h->active && !err; ++k) {
+		OK_CHECK_ERR( err, matrix_submatrix(&P, &h->P, 0, 0, X->size1,
+			h->active) );
+		OK_CHECK_ERR( err, matrix_submatrix(&Q, &h->Q, 0, 0, B->size1,
+			h->active) );
+		OK_CHECK_ERR( err, matrix_submatrix(&R, &h->R, 0, 0, B->size1,
+			h->active) );
+		OK_CHECK_ERR( err, matrix_submatrix(&S, &h->S, 0, 0, X->size1,
+			h->active) );
+
+		/* Q = AP */
+		OK_CHECK_ERR( err, __block_product(op, CblasNoTrans, &P, &Q) );
+
+		/* delta = ||q||_2^2 + rho * ||p||_2^2, r -= alpha * q */
+		for (j = 0; j < h->active && !err; ++j) {
+			OK_CHECK_ERR( err, matrix_column(&q, &h->Q, j) );
+			OK_CHECK_ERR( err, matrix_column(&r, &h->R, j) );
+			OK_CHECK_ERR( err, blas_dot(blas_hdl, &q, &q, &delta) );
+			delta += rho * h->p_squared[j];
+			if (delta <= 0)
+				h->indefinite[j] = 1;
+			if (delta == 0)
+				delta = kEps;
+			h->alpha[j] = h->gamma[j] / delta;
+			OK_CHECK_ERR( err, blas_axpy(blas_hdl, -h->alpha[j], &q,
+				&r) );
+		}
+
+		/* S = A'R */
+		OK_CHECK_ERR( err, __block_product(op, CblasTrans, &R, &S) );
+		h->products += 2;
+
+		/*
+		 * x += alpha * p, s -= rho * x, p = s + beta * p; columns that
+		 * converge are retired (in reverse, so that each column moved
+		 * into a vacated slot has already been updated)
+		 */
+		for (j = h->active; j-- > 0 && !err;) {
+			OK_CHECK_ERR( err, matrix_column(&x, X, h->index[j]) );
+			OK_CHECK_ERR( err, matrix_column(&p, &h->P, j) );
+			OK_CHECK_ERR( err, matrix_column(&s, &h->S, j) );
+			gamma_prev = h->gamma[j];
+			OK_CHECK_ERR( err, vector_axpy2_sumsq(h->alpha[j], &p, &x,
+				kNegRho, &x, &s, &x_squared, h->gamma + j) );
+			OK_CHECK_ERR( err, vector_xpby_sumsq(&s,
+				h->gamma[j] / gamma_prev, &p, h->p_squared + j) );
+			if (err)
+				break;
+
+			h->norm_x[j] = MATH(sqrt)(x_squared);
+			norm_s = MATH(sqrt)(h->gamma[j]);
+			h->xmax[j] = (h->norm_x[j] > h->xmax[j]) ?
+				h->norm_x[j] : h->xmax[j];
+			if ((norm_s < h->norm_s0[j] * tol) ||
+				(h->norm_x[j] * tol > 1)) {
+				shrink = h->norm_x[j] / h->xmax[j];
+				h->iters[h->index[j]] = k + 1;
+				if (h->indefinite[j])
+					flag[h->index[j]] = 3;
+				else if (shrink * shrink <= tol)
+					flag[h->index[j]] = 4;
+				OK_CHECK_ERR( err, __block_cgls_retire(h, j) );
+			}
+		}
+
+		if (!quiet && (!h->active || (k + 1) % 10 == 0))
+			printf(fmt, k + 1, (uint) h->active);
+	}
+
+	/* columns still active did not converge in maxiter iterations */
+	for (j = 0; j < h->active; ++j) {
+		h->iters[h->index[j]] = k;
+		flag[h->index[j]] = 2;
+	}
+
+	return err;
+}
+
+ok_status block_cgls(operator * op, matrix * B, matrix * X,
+	const ok_float rho, const ok_float tol, const size_t maxiter,
+	const int quiet, uint * flag)
+{
+	OK_CHECK_OPERATOR(op);
+	OK_CHECK_MATRIX(B);
+	ok_status err = OPTKIT_SUCCESS;
+	block_cgls_helper * helper = block_cgls_helper_alloc(op->size1,
+		op->size2, B->size2);
+
+	OK_CHECK_ERR( err,
+		block_cgls_nonallocating(helper, op, B, X, rho, tol, maxiter,
+			quiet, flag) );
+	OK_MAX_ERR( err,
+		block_cgls_helper_free(helper) );
+
+	return err;
+}
+
+/*
+ * remove the right-hand side in column j from the active set, moving the
+ * last active column into its place
+ */
+static ok_status __block_pcg_retire(block_pcg_helper * h, size_t j)
+{
+	vector dst, src;
+	size_t last = --h->active;
+	if (j == last)
+		return OPTKIT_SUCCESS;
+
+	OK_RETURNIF_ERR( matrix_column(&dst, &h->P, j) );
+	OK_RETURNIF_ERR( matrix_column(&src, &h->P, last) );
+	OK_RETURNIF_ERR( vector_memcpy_vv(&dst, &src) );
+	OK_RETURNIF_ERR( matrix_column(&dst, &h->R, j) );
+	OK_RETURNIF_ERR( matrix_column(&src, &h->R, last) );
+	OK_RETURNIF_ERR( vector_memcpy_vv(&dst, &src) );
+	h->index[j] = h->index[last];
+	h->gamma[j] = h->gamma[last];
+	h->norm_r[j] = h->norm_r[last];
+	return OPTKIT_SUCCESS;
+}
+
+/*
+ * block PCG: the PCG iteration above, run for every column of B at once,
+ * starting from X. the products by A and A' and the preconditioner act on
+ * the block of active columns; a column leaves the block when its
+ * residual norm falls to tol, with the iterations it took in iters[j].
+ */
+ok_status block_pcg_nonallocating(block_pcg_helper * helper, operator * op,
+	operator * pre_cond, matrix * B, matrix * X, const ok_float rho,
+	const ok_float tol, const size_t maxiter, const int quiet, uint * iters)
+{
+	OK_CHECK_PTR(helper);
+	OK_CHECK_OPERATOR(op);
+	OK_CHECK_OPERATOR(pre_cond);
+	OK_CHECK_MATRIX(B);
+	OK_CHECK_MATRIX(X);
+	OK_CHECK_PTR(iters);
+
+	ok_status err = OPTKIT_SUCCESS;
+	block_pcg_helper * h = helper;
+	void * blas_hdl = h->blas_handle;
+	matrix P, Q, R, Z, T;
+	vector b, x, p, q, r, z, t;
+	size_t j, n = X->size1, nrhs = B->size2;
+	uint k;
+	ok_float norm_x, pq, alpha, gamma_prev;
+	const ok_float kNormTol = (tol < 1e-18) ? tol : (ok_float) 1e-18;
+	char fmt[] = "tol: %.4e, converged: %u of %u, iters: %u\n";
+
+	OK_RETURNIF_ERR( __block_check(op, B, X, h->nrhs) );
+	if (pre_cond->size1 != pre_cond->size2 || pre_cond->size1 != n ||
+		op->size2 != n || B->size1 != n || h->P.size1 != n ||
+		h->temp.size1 != op->size1)
+		return OK_SCAN_ERR( OPTKIT_ERROR_DIMENSION_MISMATCH );
+
+	/* r = b - (rho * I + A'A)x */
+	h->active = nrhs;
+	h->products = 0;
+	for (j = 0; j < nrhs && !err; ++j) {
+		h->index[j] = j;
+		iters[j] = 0;
+		OK_CHECK_ERR( err, matrix_column(&b, B, j) );
+		OK_CHECK_ERR( err, matrix_column(&x, X, j) );
+		OK_CHECK_ERR( err, matrix_column(&r, &h->R, j) );
+		OK_CHECK_ERR( err, matrix_column(&t, &h->temp, j) );
+		OK_CHECK_ERR( err, vector_memcpy_vv(&r, &b) );
+		OK_CHECK_ERR( err, blas_nrm2(blas_hdl, &x, &norm_x) );
+		if (!err && norm_x > 0) {
+			OK_CHECK_ERR( err, op->apply(op->data, &x, &t) );
+			OK_CHECK_ERR( err, op->fused_adjoint(op->data, -kOne, &t,
+				kOne, &r) );
+			OK_CHECK_ERR( err, blas_axpy(blas_hdl, -rho, &x, &r) );
+		}
+	}
+
+	/* p = z = Mr, gamma = r'Mr */
+	OK_CHECK_ERR( err, matrix_submatrix(&R, &h->R, 0, 0, n, nrhs) );
+	OK_CHECK_ERR( err, matrix_submatrix(&Z, &h->Z, 0, 0, n, nrhs) );
+	OK_CHECK_ERR( err, __block_product(pre_cond, CblasNoTrans, &R, &Z) );
+	for (j = 0; j < nrhs && !err; ++j) {
+		OK_CHECK_ERR( err, matrix_column(&r, &h->R, j) );
+		OK_CHECK_ERR( err, matrix_column(&z, &h->Z, j) );
+		OK_CHECK_ERR( err, matrix_column(&p, &h->P, j) );
+		OK_CHECK_ERR( err, vector_memcpy_vv(&p, &z) );
+		OK_CHECK_ERR( err, blas_dot(blas_hdl, &r, &z, h->gamma + j) );
+		OK_CHECK_ERR( err, blas_nrm2(blas_hdl, &r, h->norm_r + j) );
+	}
+	for (j = nrhs; j-- > 0 && !err;)
+		if (h->norm_r[j] < kNormTol)
+			OK_CHECK_ERR( err, __block_pcg_retire(h, j) );
+
+	for (k = 0; k < maxiter && h->active && !err; ++k) {
+		OK_CHECK_ERR( err, matrix_submatrix(&P, &h->P, 0, 0, n,
+			h->active) );
+		OK_CHECK_ERR( err, matrix_submatrix(&Q, &h->Q, 0, 0, n,
+			h->active) );
+		OK_CHECK_ERR( err, matrix_submatrix(&T, &h->temp, 0, 0,
+			op->size1, h->active) );
+
+		/* Q = A'AP */
+		OK_CHECK_ERR( err, __block_product(op, CblasNoTrans, &P, &T) );
+		OK_CHECK_ERR( err, __block_product(op, CblasTrans, &T, &Q) );
+		h->products += 2;
+
+		/*
+		 * q += rho * p, alpha = gamma / p'q, x += alpha * p,
+		 * r -= alpha * q; retire converged columns in reverse
+		 */
+		for (j = h->active; j-- > 0 && !err;) {
+			OK_CHECK_ERR( err, matrix_column(&x, X, h->index[j]) );
+			OK_CHECK_ERR( err, matrix_column(&p, &h->P, j) );
+			OK_CHECK_ERR( err, matrix_column(&q, &h->Q, j) );
+			OK_CHECK_ERR( err, matrix_column(&r, &h->R, j) );
+			OK_CHECK_ERR( err, vector_axpy_dot(rho, &p, &q, &pq) );
+			alpha = h->gamma[j] / pq;
+			OK_CHECK_ERR( err, vector_axpy2_sumsq(alpha, &p, &x,
+				-alpha, &q, &r, OK_NULL, h->norm_r + j) );
+			if (err)
+				break;
+			h->norm_r[j] = MATH(sqrt)(h->norm_r[j]);
+			if (h->norm_r[j] <= tol) {
+				iters[h->index[j]] = k + 1;
+				OK_CHECK_ERR( err, __block_pcg_retire(h, j) );
+			}
+		}
+		if (!h->active)
+			continue;
+
+		/* Z = MR, gamma = r'z, p = z + (gamma / gamma_prev) * p */
+		OK_CHECK_ERR( err, matrix_submatrix(&R, &h->R, 0, 0, n,
+			h->active) );
+		OK_CHECK_ERR( err, matrix_submatrix(&Z, &h->Z, 0, 0, n,
+			h->active) );
+		OK_CHECK_ERR( err, __block_product(pre_cond, CblasNoTrans, &R,
+			&Z) );
+		for (j = 0; j < h->active && !err; ++j) {
+			OK_CHECK_ERR( err, matrix_column(&r, &h->R, j) );
+			OK_CHECK_ERR( err, matrix_column(&z, &h->Z, j) );
+			OK_CHECK_ERR( err, matrix_column(&p, &h->P, j) );
+			gamma_prev = h->gamma[j];
+			OK_CHECK_ERR( err, blas_dot(blas_hdl, &r, &z, h->gamma + j) );
+			OK_CHECK_ERR( err, vector_xpby_sumsq(&z,
+				h->gamma[j] / gamma_prev, &p, OK_NULL) );
+		}
+	}
+
+	/* columns still active did not converge in maxiter iterations */
+	for (j = 0; j < h->active; ++j)
+		iters[h->index[j]] = (uint) maxiter;
+
+	if (!quiet)
+		printf(fmt, tol, (uint) (nrhs - h->active), (uint) nrhs, k);
+
+	return err;
+}
+
+ok_status block_pcg(operator * op, operator * pre_cond, matrix * B,
+	matrix * X, const ok_float rho, const ok_float tol,
+	const size_t maxiter, const int quiet, uint * iters)
+{
+	OK_CHECK_OPERATOR(op);
+	OK_CHECK_MATRIX(B);
+	ok_status err = OPTKIT_SUCCESS;
+	block_pcg_helper * helper = block_pcg_helper_alloc(op->size1,
+		op->size2, B->size2);
+
+	OK_CHECK_ERR( err,
+		block_pcg_nonallocating(helper, op, pre_cond, B, X, rho, tol,
+			maxiter, quiet, iters) );
+	OK_MAX_ERR( err,
+		block_pcg_helper_free(helper) );
+
+	return err;
+}
+
 #ifdef __cplusplus
 }
 #endif
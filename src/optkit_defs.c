@@ -1,5 +1,10 @@
+#include <pthread.h>
 #include "optkit_defs.h"
 
+#ifdef _OPENMP
+#include <omp.h>
+#endif
+
 #ifdef __cplusplus
 extern "C" {
 #endif
@@ -11,6 +16,145 @@ void optkit_version(int * maj, int * min, int * change, int * status) {
 	* status = (int) OPTKIT_VERSION_STATUS;
 }
 
+/*
+ * OpenMP thread budget of the calling thread: parallel regions
+ * encountered by this thread (e.g., in a solve called from one of several
+ * Python threads) use at most n_threads threads
+ */
+ok_status ok_set_num_threads(int n_threads)
+{
+	if (n_threads < 1)
+		return OK_SCAN_ERR( OPTKIT_ERROR_DOMAIN );
+	#ifdef _OPENMP
+	omp_set_num_threads(n_threads);
+	#endif
+	return OPTKIT_SUCCESS;
+}
+
+int ok_get_max_threads(void)
+{
+	#ifdef _OPENMP
+	return omp_get_max_threads();
+	#else
+	return 1;
+	#endif
+}
+
+/*
+ * thread control of the CBLAS library in use, if it offers any (OpenBLAS,
+ * MKL); 0 threads are reported otherwise
+ */
+int ok_blas_get_num_threads(void)
+{
+	const ok_cblas_table * blas = ok_cblas();
+	return blas->get_num_threads ? blas->get_num_threads() : 0;
+}
+
+ok_status ok_blas_set_num_threads(int n_threads)
+{
+	const ok_cblas_table * blas = ok_cblas();
+
+	if (n_threads < 1)
+		return OK_SCAN_ERR( OPTKIT_ERROR_DOMAIN );
+	if (blas->set_num_threads)
+		blas->set_num_threads(n_threads);
+	return OPTKIT_SUCCESS;
+}
+
+/*
+ * process-wide BLAS limit shared by overlapping ok_threads_limit() calls,
+ * for libraries without a per-thread setter: the lowest limit requested
+ * by the calls in progress holds until the last of them returns, which
+ * restores the setting that preceded the first
+ */
+static pthread_mutex_t __blas_lock = PTHREAD_MUTEX_INITIALIZER;
+static int __blas_holders = 0;
+static int __blas_limit = 0;
+static int __blas_prev = 0;
+
+static ok_status __blas_limit_shared(int n_threads, int * prev)
+{
+	ok_status err = OPTKIT_SUCCESS;
+
+	pthread_mutex_lock(&__blas_lock);
+	if (__blas_holders == 0) {
+		__blas_prev = ok_blas_get_num_threads();
+		__blas_limit = n_threads;
+		err = ok_blas_set_num_threads(n_threads);
+	} else if (n_threads < __blas_limit) {
+		__blas_limit = n_threads;
+		err = ok_blas_set_num_threads(n_threads);
+	}
+	if (!err)
+		++__blas_holders;
+	*prev = __blas_prev;
+	pthread_mutex_unlock(&__blas_lock);
+	return err;
+}
+
+static ok_status __blas_restore_shared(void)
+{
+	ok_status err = OPTKIT_SUCCESS;
+
+	pthread_mutex_lock(&__blas_lock);
+	if (__blas_holders > 0 && --__blas_holders == 0 && __blas_prev > 0)
+		err = ok_blas_set_num_threads(__blas_prev);
+	pthread_mutex_unlock(&__blas_lock);
+	return err;
+}
+
+/*
+ * limit OpenMP and BLAS threads of the calling thread to n_threads,
+ * saving the previous limits for ok_threads_restore(); no-op if
+ * n_threads == 0.
+ *
+ * The BLAS limit is per-thread if the library offers a per-thread setter
+ * (OpenBLAS >= 0.3.27, MKL). Otherwise, it is process-wide and shared by
+ * overlapping calls (see above), so concurrent solves never leave the
+ * process with another call's limit.
+ */
+ok_status ok_threads_limit(int n_threads, ok_threads * saved)
+{
+	const ok_cblas_table * blas = ok_cblas();
+
+	OK_CHECK_PTR(saved);
+	saved->omp = 0;
+	saved->blas = 0;
+	saved->blas_scope = OK_THREADS_BLAS_NONE;
+	if (n_threads == 0)
+		return OPTKIT_SUCCESS;
+	if (n_threads < 0)
+		return OK_SCAN_ERR( OPTKIT_ERROR_DOMAIN );
+
+	saved->omp = ok_get_max_threads();
+	OK_RETURNIF_ERR( ok_set_num_threads(n_threads) );
+	if (blas->set_num_threads_local) {
+		saved->blas = blas->set_num_threads_local(n_threads);
+		saved->blas_scope = OK_THREADS_BLAS_LOCAL;
+	} else if (blas->set_num_threads) {
+		OK_RETURNIF_ERR( __blas_limit_shared(n_threads, &saved->blas) );
+		saved->blas_scope = OK_THREADS_BLAS_SHARED;
+	}
+	return OPTKIT_SUCCESS;
+}
+
+ok_status ok_threads_restore(const ok_threads * saved)
+{
+	const ok_cblas_table * blas = ok_cblas();
+
+	OK_CHECK_PTR(saved);
+	if (saved->omp == 0)
+		return OPTKIT_SUCCESS;
+
+	OK_RETURNIF_ERR( ok_set_num_threads(saved->omp) );
+	if (saved->blas_scope == OK_THREADS_BLAS_LOCAL &&
+		blas->set_num_threads_local)
+		blas->set_num_threads_local(saved->blas);
+	else if (saved->blas_scope == OK_THREADS_BLAS_SHARED)
+		return __blas_restore_shared();
+	return OPTKIT_SUCCESS;
+}
+
 /* device reset */
 ok_status ok_device_reset()
 {
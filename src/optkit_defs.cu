@@ -12,6 +12,62 @@ void optkit_version(int * maj, int * min, int * change, int * status) {
 	* status = (int) OPTKIT_VERSION_STATUS;
 }
 
+/* host threading is not used in GPU libraries */
+ok_status ok_set_num_threads(int n_threads)
+{
+	if (n_threads < 1)
+		return OK_SCAN_ERR( OPTKIT_ERROR_DOMAIN );
+	return OPTKIT_SUCCESS;
+}
+
+int ok_get_max_threads(void)
+{
+	return 1;
+}
+
+int ok_blas_get_num_threads(void)
+{
+	return 0;
+}
+
+ok_status ok_blas_set_num_threads(int n_threads)
+{
+	if (n_threads < 1)
+		return OK_SCAN_ERR( OPTKIT_ERROR_DOMAIN );
+	return OPTKIT_SUCCESS;
+}
+
+/* GPU libraries call cuBLAS; there is no CBLAS library to select */
+ok_status ok_blas_select(const char * name)
+{
+	return OPTKIT_SUCCESS;
+}
+
+const char * ok_blas_backend(void)
+{
+	return "cublas";
+}
+
+const char * ok_blas_library(void)
+{
+	return "";
+}
+
+ok_status ok_threads_limit(int n_threads, ok_threads * saved)
+{
+	OK_CHECK_PTR(saved);
+	saved->omp = 0;
+	saved->blas = 0;
+	saved->blas_scope = OK_THREADS_BLAS_NONE;
+	return OPTKIT_SUCCESS;
+}
+
+ok_status ok_threads_restore(const ok_threads * saved)
+{
+	OK_CHECK_PTR(saved);
+	return OPTKIT_SUCCESS;
+}
+
 ok_status ok_device_reset()
 {
 	cudaDeviceReset();
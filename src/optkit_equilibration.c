@@ -198,11 +198,62 @@ ok_status operator_regularized_sinkhorn(void * linalg_handle, operator * A,
 	return err;
 }
 
-/* STUB */
+/*
+ * block-scalar equilibration for concatenated (split) operators: scale
+ * each row (column) block A_i by 1 / ||A_i||, so that the blocks are
+ * balanced, and record the scalings in d (e). the scalings are held by
+ * the composite, so each block is scaled as recorded even when blocks
+ * share a sub-operator.
+ */
+static ok_status operator_equilibrate_blocks(void * linalg_handle,
+	operator * A, vector * v)
+{
+	operator * block;
+	vector v_block;
+	size_t b, nblocks, offset, size;
+	ok_float norm;
+
+	OK_RETURNIF_ERR( composite_operator_get_nblocks(A, &nblocks) );
+	for (b = 0; b < nblocks; ++b) {
+		OK_RETURNIF_ERR( composite_operator_get_block(A, b, &block,
+			&offset) );
+		size = A->kind == OkOperatorCat ? block->size1 : block->size2;
+		OK_RETURNIF_ERR( operator_estimate_norm(linalg_handle, block,
+			&norm) );
+		if (norm == kZero)
+			continue;
+		OK_RETURNIF_ERR( composite_operator_scale_block(A, b,
+			kOne / norm) );
+		OK_RETURNIF_ERR( vector_subvector(&v_block, v, offset, size) );
+		OK_RETURNIF_ERR( vector_set_all(&v_block, kOne / norm) );
+	}
+	return OPTKIT_SUCCESS;
+}
+
+/*
+ * equilibration for matrix-free operators, whose entries cannot be
+ * rescaled individually: D = I, E = I, and the operator is unchanged,
+ * except for concatenated/split operators, which are balanced blockwise.
+ * (the solver still normalizes A by its estimated norm.)
+ */
 ok_status operator_equilibrate(void * linalg_handle, operator * A,
 	vector * d, vector * e, const ok_float pnorm)
 {
-	return OPTKIT_ERROR;
+	OK_CHECK_OPERATOR(A);
+	OK_CHECK_VECTOR(d);
+	OK_CHECK_VECTOR(e);
+	if (d->size != A->size1 || e->size != A->size2)
+		return OK_SCAN_ERR( OPTKIT_ERROR_DIMENSION_MISMATCH );
+
+	OK_RETURNIF_ERR( vector_set_all(d, kOne) );
+	OK_RETURNIF_ERR( vector_set_all(e, kOne) );
+	if (A->kind == OkOperatorCat)
+		return OK_SCAN_ERR( operator_equilibrate_blocks(linalg_handle, A,
+			d) );
+	else if (A->kind == OkOperatorSplit)
+		return OK_SCAN_ERR( operator_equilibrate_blocks(linalg_handle, A,
+			e) );
+	return OPTKIT_SUCCESS;
 }
 
 /*
@@ -55,6 +55,34 @@ ok_status projector_get_norm(projector * P, ok_float * norm)
 	return err;
 }
 
+/*
+ * operator products (by A or A^T) and CG iterations performed by the last
+ * call to P->project
+ */
+ok_status projector_get_work(projector * P, uint * products, uint * cg_iters)
+{
+	OK_CHECK_PROJECTOR(P);
+	OK_CHECK_PTR(products);
+	OK_CHECK_PTR(cg_iters);
+
+	ok_status err = OPTKIT_SUCCESS;
+	indirect_projector_generic * Pi = OK_NULL;
+
+	if (P->kind == OkProjectorDenseDirect) {
+		*products = 2;
+		*cg_iters = 0;
+	} else if (P->kind == OkProjectorIndirect) {
+		Pi = (indirect_projector_generic *) P->data;
+		*products = Pi->products;
+		*cg_iters = Pi->iters;
+	} else {
+		*products = 0;
+		*cg_iters = 0;
+		err = OK_SCAN_ERR( OPTKIT_ERROR_DOMAIN );
+	}
+	return err;
+}
+
 
 /* Direct Projector methods */
 ok_status direct_projector_alloc(direct_projector * P, matrix * A)
@@ -165,6 +193,105 @@ ok_status direct_projector_project(void * linalg_handle, direct_projector * P,
 	}
 }
 
+/*
+ * view of A in the order ord: stored in the other order, the same
+ * buffer reads as A^T
+ */
+static matrix __matrix_order_view(const matrix * A, enum CBLAS_ORDER ord,
+	int * transposed)
+{
+	matrix A_view = *A;
+	*transposed = A->order != ord;
+	if (*transposed) {
+		A_view.size1 = A->size2;
+		A_view.size2 = A->size1;
+		A_view.order = ord;
+	}
+	return A_view;
+}
+
+/*
+ * project the K columns of (X_in, Y_in) onto y = Ax as in
+ * direct_projector_project, with one matrix-matrix product in place of
+ * each matrix-vector product and one triangular solve with K right-hand
+ * sides in place of each triangular vector solve.
+ *
+ * X_* are n x K and Y_* are m x K, all four stored in the same order,
+ * which need not be the order of A.
+ */
+ok_status direct_projector_project_batch(void * linalg_handle,
+	direct_projector * P, matrix * X_in, matrix * Y_in, matrix * X_out,
+	matrix * Y_out)
+{
+	size_t j;
+	int transposed;
+	vector col_in, col_out;
+	matrix A, L;
+	enum CBLAS_TRANSPOSE tA, tA_;
+	enum CBLAS_UPLO uplo;
+
+	if (!P || !P->A || !P->L)
+		return OK_SCAN_ERR( OPTKIT_ERROR_UNALLOCATED );
+	OK_CHECK_MATRIX(X_in);
+	OK_CHECK_MATRIX(Y_in);
+	OK_CHECK_MATRIX(X_out);
+	OK_CHECK_MATRIX(Y_out);
+	if (X_in->size1 != P->A->size2 || Y_in->size1 != P->A->size1 ||
+		X_out->size1 != P->A->size2 || Y_out->size1 != P->A->size1 ||
+		X_in->size2 != Y_in->size2 || X_out->size2 != X_in->size2 ||
+		Y_out->size2 != X_in->size2)
+		return OK_SCAN_ERR( OPTKIT_ERROR_DIMENSION_MISMATCH );
+
+	/* products by A and solves with L take tA; by A^T and L^T, tA_ */
+	A = __matrix_order_view(P->A, X_out->order, &transposed);
+	L = __matrix_order_view(P->L, X_out->order, &transposed);
+	tA = transposed ? CblasTrans : CblasNoTrans;
+	tA_ = transposed ? CblasNoTrans : CblasTrans;
+	uplo = transposed ? CblasUpper : CblasLower;
+
+	if (P->skinny) {
+		OK_RETURNIF_ERR(
+			matrix_memcpy_mm(X_out, X_in) );
+		OK_RETURNIF_ERR(
+			blas_gemm(linalg_handle, tA_, CblasNoTrans, kOne, &A, Y_in,
+				kOne, X_out) );
+		OK_RETURNIF_ERR(
+			blas_trsm(linalg_handle, CblasLeft, uplo, tA, CblasNonUnit,
+				kOne, &L, X_out) );
+		OK_RETURNIF_ERR(
+			blas_trsm(linalg_handle, CblasLeft, uplo, tA_,
+				CblasNonUnit, kOne, &L, X_out) );
+		return OK_SCAN_ERR(
+			blas_gemm(linalg_handle, tA, CblasNoTrans, kOne, &A, X_out,
+				kZero, Y_out) );
+
+	} else {
+		OK_RETURNIF_ERR(
+			matrix_memcpy_mm(Y_out, Y_in) );
+		OK_RETURNIF_ERR(
+			blas_gemm(linalg_handle, tA, CblasNoTrans, kOne, &A, X_in,
+				-kOne, Y_out) );
+		OK_RETURNIF_ERR(
+			blas_trsm(linalg_handle, CblasLeft, uplo, tA, CblasNonUnit,
+				kOne, &L, Y_out) );
+		OK_RETURNIF_ERR(
+			blas_trsm(linalg_handle, CblasLeft, uplo, tA_,
+				CblasNonUnit, kOne, &L, Y_out) );
+		OK_RETURNIF_ERR(
+			matrix_memcpy_mm(X_out, X_in) );
+		OK_RETURNIF_ERR(
+			blas_gemm(linalg_handle, tA_, CblasNoTrans, -kOne, &A, Y_out,
+				kOne, X_out) );
+		for (j = 0; j < Y_out->size2; ++j) {
+			OK_RETURNIF_ERR( matrix_column(&col_in, Y_in, j) );
+			OK_RETURNIF_ERR( matrix_column(&col_out, Y_out, j) );
+			OK_RETURNIF_ERR(
+				blas_axpy(linalg_handle, kOne, &col_in, &col_out) );
+		}
+		return OPTKIT_SUCCESS;
+	}
+}
+
 #ifndef OPTKIT_NO_INDIRECT_PROJECTOR
 /* Indirect Projector methods */
 ok_status indirect_projector_alloc(indirect_projector * P, operator * A)
@@ -372,6 +499,8 @@ void * indirect_projector_data_alloc(operator * A)
 	P->cgls_work = cgls_init(A->size1, A->size2);
 	P->normA = kOne;
 	P->normalized = 0;
+	P->iters = 0;
+	P->products = 0;
 	err = blas_make_handle(&(P->linalg_handle));
 	if (err || !P->A || !P->cgls_work) {
 		OK_MAX_ERR( err,
@@ -420,6 +549,8 @@ ok_status indirect_projector_g_project(void * data, vector * x_in, vector * y_in
 	OK_RETURNIF_ERR(
 		cgls_solve(P->cgls_work, P->A, y_out, x_out, kOne, tol,
 			kItersCG, kQuietCG, &P->flag) );
+	P->iters = ((cgls_helper *) P->cgls_work)->iters;
+	P->products = ((cgls_helper *) P->cgls_work)->products + 2;
 
 	/* x_out += x0 */
 	OK_RETURNIF_ERR(
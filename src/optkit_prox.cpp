@@ -174,6 +174,81 @@ ok_status function_eval_vector_(const function_vector_<T> * f,
 	return OPTKIT_SUCCESS;
 }
 
+template<typename T>
+ok_status function_support_vector_(const function_vector_<T> * f,
+	const vector_<T> * s, T tol, T bound, T * val)
+{
+	OK_CHECK_FNVECTOR(f);
+	OK_CHECK_VECTOR(s);
+	OK_CHECK_PTR(val);
+	if (f->size != s->size)
+		return OK_SCAN_ERR( OPTKIT_ERROR_DIMENSION_MISMATCH );
+
+	T sum = 0;
+	uint i;
+	#ifdef _OPENMP
+	#pragma omp parallel for reduction(+:sum)
+	#endif
+	for (i = 0; i < f->size; ++i)
+		sum += FuncSupportDomain<T>(&f->objectives[i],
+			s->data[i * s->stride], tol, bound);
+	*val = sum;
+
+	return OPTKIT_SUCCESS;
+}
+
+template<typename T>
+ok_status function_recession_vector_(const function_vector_<T> * f,
+	const vector_<T> * v, T tol, T * val)
+{
+	OK_CHECK_FNVECTOR(f);
+	OK_CHECK_VECTOR(v);
+	OK_CHECK_PTR(val);
+	if (f->size != v->size)
+		return OK_SCAN_ERR( OPTKIT_ERROR_DIMENSION_MISMATCH );
+
+	T sum = 0;
+	uint i;
+	#ifdef _OPENMP
+	#pragma omp parallel for reduction(+:sum)
+	#endif
+	for (i = 0; i < f->size; ++i)
+		sum += FuncRecession<T>(&f->objectives[i],
+			v->data[i * v->stride], tol);
+	*val = sum;
+
+	return OPTKIT_SUCCESS;
+}
+
+template<typename T>
+ok_status function_polish_vector_(const function_vector_<T> * f,
+	const vector_<T> * x, T tol, vector_<T> * x_fix, vector_<T> * fixed,
+	vector_<T> * w, vector_<T> * g)
+{
+	OK_CHECK_FNVECTOR(f);
+	OK_CHECK_VECTOR(x);
+	OK_CHECK_VECTOR(x_fix);
+	OK_CHECK_VECTOR(fixed);
+	OK_CHECK_VECTOR(w);
+	OK_CHECK_VECTOR(g);
+	if (f->size != x->size || f->size != x_fix->size ||
+		f->size != fixed->size || f->size != w->size ||
+		f->size != g->size)
+		return OK_SCAN_ERR( OPTKIT_ERROR_DIMENSION_MISMATCH );
+
+	uint i;
+	#ifdef _OPENMP
+	#pragma omp parallel for
+	#endif
+	for (i = 0; i < f->size; ++i)
+		FuncPolish<T>(&f->objectives[i], x->data[i * x->stride], tol,
+			x_fix->data + i * x_fix->stride,
+			fixed->data + i * fixed->stride, w->data + i * w->stride,
+			g->data + i * g->stride);
+
+	return OPTKIT_SUCCESS;
+}
+
 #ifdef __cplusplus
 extern "C" {
 #endif
@@ -212,6 +287,17 @@ ok_status prox_eval_vector(const function_vector * f, ok_float rho,
 ok_status function_eval_vector(const function_vector * f, const vector * x,
 	ok_float * fn_val)
 	{ return function_eval_vector_<ok_float>(f, x, fn_val); }
+ok_status function_support_vector(const function_vector * f,
+	const vector * s, ok_float tol, ok_float bound, ok_float * val)
+	{ return function_support_vector_<ok_float>(f, s, tol, bound, val); }
+ok_status function_recession_vector(const function_vector * f,
+	const vector * v, ok_float tol, ok_float * val)
+	{ return function_recession_vector_<ok_float>(f, v, tol, val); }
+
+ok_status function_polish_vector(const function_vector * f,
+	const vector * x, ok_float tol, vector * x_fix, vector * fixed,
+	vector * w, vector * g)
+	{ return function_polish_vector_<ok_float>(f, x, tol, x_fix, fixed, w, g); }
 
 #ifdef __cplusplus
 }
@@ -21,6 +21,19 @@ __global__ static void set_fn_vector(function_t_<T> * objs, const T a,
 	}
 }
 
+template<typename T>
+__global__ static void polish_fn_vector(const function_t_<T> * objs,
+	const T * x, size_t stride_x, T tol, T * x_fix, size_t stride_fix,
+	T * fixed, size_t stride_fixed, T * w, size_t stride_w, T * g,
+	size_t stride_g, uint n)
+{
+	uint tid = blockIdx.x * blockDim.x + threadIdx.x;
+	for (uint i = tid; i < n; i += gridDim.x * blockDim.x)
+		FuncPolish<T>(objs + i, x[i * stride_x], tol,
+			x_fix + i * stride_fix, fixed + i * stride_fixed,
+			w + i * stride_w, g + i * stride_g);
+}
+
 /*
  * CUDA C++ implementation with thrust::
  * =====================================
@@ -44,6 +57,25 @@ struct FuncEvalF : thrust::binary_function<function_t_<T>, T, T>
 		{ return FuncEval<T>(&f_obj, x); }
 };
 
+/* thrust::binary functions defining elementwise asymptotic evaluations */
+template<typename T>
+struct FuncSupportDomainF : thrust::binary_function<function_t_<T>, T, T>
+{
+	T tol, bound;
+	FuncSupportDomainF(T tol, T bound) : tol(tol), bound(bound) { }
+	__device__ T operator()(const function_t_<T> & f_obj, T s)
+		{ return FuncSupportDomain<T>(&f_obj, s, tol, bound); }
+};
+
+template<typename T>
+struct FuncRecessionF : thrust::binary_function<function_t_<T>, T, T>
+{
+	T tol;
+	FuncRecessionF(T tol) : tol(tol) { }
+	__device__ T operator()(const function_t_<T> & f_obj, T v)
+		{ return FuncRecession<T>(&f_obj, v, tol); }
+};
+
 } /* namespace optkit */
 
 /* vectorwise prox evaluation leveraging thrust::binary function */
@@ -84,6 +116,21 @@ T function_eval_gpu(function_t_<T> * const f, T * const x, size_t stride,
 		optkit::FuncEvalF<T>());
 }
 
+/* vectorwise sum of a thrust::binary_function F */
+template<typename T, typename F>
+T function_reduce_gpu(function_t_<T> * const f, T * const x, size_t stride,
+	size_t n, F op)
+{
+	strided_range<thrust::device_ptr<const function_t_<T> > > f_strided(
+		thrust::device_pointer_cast(f),
+		thrust::device_pointer_cast(f + n), 1);
+	strided_range<thrust::device_ptr<const T> > x_strided(
+		thrust::device_pointer_cast(x),
+		thrust::device_pointer_cast(x + stride * n), stride);
+	return thrust::inner_product(f_strided.begin(), f_strided.end(),
+		x_strided.begin(), static_cast<T>(0), thrust::plus<T>(), op);
+}
+
 template<typename T>
 ok_status function_vector_alloc_(function_vector_<T> * f, size_t n)
 {
@@ -237,6 +284,61 @@ ok_status function_eval_vector_(const function_vector_<T> * f,
 	return OK_STATUS_CUDA;
 }
 
+template<typename T>
+ok_status function_support_vector_(const function_vector_<T> * f,
+	const vector_<T> * s, T tol, T bound, T * val)
+{
+	OK_CHECK_FNVECTOR(f);
+	OK_CHECK_VECTOR(s);
+	OK_CHECK_PTR(val);
+	if (f->size != s->size)
+		return OK_SCAN_ERR( OPTKIT_ERROR_DIMENSION_MISMATCH );
+
+	*val = function_reduce_gpu<T>(f->objectives, s->data, s->stride,
+		f->size, optkit::FuncSupportDomainF<T>(tol, bound));
+	return OK_STATUS_CUDA;
+}
+
+template<typename T>
+ok_status function_recession_vector_(const function_vector_<T> * f,
+	const vector_<T> * v, T tol, T * val)
+{
+	OK_CHECK_FNVECTOR(f);
+	OK_CHECK_VECTOR(v);
+	OK_CHECK_PTR(val);
+	if (f->size != v->size)
+		return OK_SCAN_ERR( OPTKIT_ERROR_DIMENSION_MISMATCH );
+
+	*val = function_reduce_gpu<T>(f->objectives, v->data, v->stride,
+		f->size, optkit::FuncRecessionF<T>(tol));
+	return OK_STATUS_CUDA;
+}
+
+template<typename T>
+ok_status function_polish_vector_(const function_vector_<T> * f,
+	const vector_<T> * x, T tol, vector_<T> * x_fix, vector_<T> * fixed,
+	vector_<T> * w, vector_<T> * g)
+{
+	OK_CHECK_FNVECTOR(f);
+	OK_CHECK_VECTOR(x);
+	OK_CHECK_VECTOR(x_fix);
+	OK_CHECK_VECTOR(fixed);
+	OK_CHECK_VECTOR(w);
+	OK_CHECK_VECTOR(g);
+	if (f->size != x->size || f->size != x_fix->size ||
+		f->size != fixed->size || f->size != w->size ||
+		f->size != g->size)
+		return OK_SCAN_ERR( OPTKIT_ERROR_DIMENSION_MISMATCH );
+
+	uint grid_dim = calc_grid_dim(f->size);
+	optkit::polish_fn_vector<<<grid_dim, kBlockSize>>>(f->objectives,
+		x->data, x->stride, tol, x_fix->data, x_fix->stride, fixed->data,
+		fixed->stride, w->data, w->stride, g->data, g->stride,
+		(uint) f->size);
+	cudaDeviceSynchronize();
+	return OK_STATUS_CUDA;
+}
+
 #ifdef __cplusplus
 extern "C" {
 #endif
@@ -275,6 +377,16 @@ ok_status prox_eval_vector(const function_vector * f, ok_float rho,
 ok_status function_eval_vector(const function_vector * f, const vector * x,
 	ok_float * fn_val)
 	{ return function_eval_vector_<ok_float>(f, x, fn_val); }
+ok_status function_support_vector(const function_vector * f,
+	const vector * s, ok_float tol, ok_float bound, ok_float * val)
+	{ return function_support_vector_<ok_float>(f, s, tol, bound, val); }
+ok_status function_recession_vector(const function_vector * f,
+	const vector * v, ok_float tol, ok_float * val)
+	{ return function_recession_vector_<ok_float>(f, v, tol, val); }
+ok_status function_polish_vector(const function_vector * f,
+	const vector * x, ok_float tol, vector * x_fix, vector * fixed,
+	vector * w, vector * g)
+	{ return function_polish_vector_<ok_float>(f, x, tol, x_fix, fixed, w, g); }
 
 #ifdef __cplusplus
 }
@@ -1,3 +1,7 @@
+#ifndef _POSIX_C_SOURCE
+#define _POSIX_C_SOURCE 200809L /* clock_gettime, CLOCK_MONOTONIC */
+#endif
+
 #include "optkit_pogs.h"
 
 #ifdef __cplusplus
@@ -253,7 +257,7 @@ POGS_PRIVATE ok_status pogs_solver_loop(pogs_solver * solver, pogs_info * info)
 		return OK_SCAN_ERR( OPTKIT_ERROR_UNALLOCATED );
 
 	/* declare / get handles to all auxiliary types */
-	int converged = 0;
+	int converged = 0, status = OkPogsUnconverged;
 	uint k, PRINT_ITER = 10000u;
 	adapt_params rho_params = (adapt_params){kDELTAMIN, kZero, kZero, kOne};
 	pogs_settings * settings = solver->settings;
@@ -261,10 +265,13 @@ POGS_PRIVATE ok_status pogs_solver_loop(pogs_solver * solver, pogs_info * info)
 	pogs_objectives obj = (pogs_objectives){OK_NAN, OK_NAN, OK_NAN};
 	pogs_residuals res = (pogs_residuals){OK_NAN, OK_NAN, OK_NAN};
 	pogs_tolerances eps = (pogs_tolerances){0, 0, 0, 0, 0, 0, 0, 0};
+	anderson_work * aa = OK_NULL;
+	ok_float rho_prev;
 	ok_status err = initialize_conditions(&obj, &res, &eps, settings,
 		solver->z->m, solver->z->n);
 
 	void * linalg_handle = solver->linalg_handle;
+	OK_PROFILE_TIMER(t);
 
 	if (settings->verbose == 0)
 		PRINT_ITER = settings->maxiter * 2u;
@@ -276,47 +283,718 @@ POGS_PRIVATE ok_status pogs_solver_loop(pogs_solver * solver, pogs_info * info)
 	if (settings->verbose > 0)
 		print_header_string();
 
+	/* reset phase timers and work counters */
+	info->prox_time = info->project_time = info->dual_time = kZero;
+	info->check_time = info->adapt_time = info->anderson_time = kZero;
+	info->polish_time = kZero;
+	info->gemv_count = info->cg_iters = 0;
+	info->polished = 0;
+
+	if (!err && settings->anderson)
+		OK_CHECK_ERR( err,
+			anderson_work_alloc(&aa, z->m, z->n, settings->anderson) );
+
 	/* iterate until converged, or error/maxiter reached */
 	for (k = 1; !err && k <= settings->maxiter; ++k) {
+		if (aa)
+			OK_CHECK_ERR( err,
+				anderson_set_input(aa, z) );
 		OK_CHECK_ERR( err,
 			set_prev(z) );
+
+		OK_PROFILE_TIC(t);
 		OK_CHECK_ERR( err,
 			prox(linalg_handle, solver->f, solver->g, z,
 				solver->rho) );
+		OK_PROFILE_TOC(t, info->prox_time);
+
+		OK_PROFILE_TIC(t);
 		OK_CHECK_ERR( err,
 			project_primal(linalg_handle, solver->M->P, z,
 				settings->alpha) );
+		OK_PROFILE_TOC(t, info->project_time);
+		/* direct projection: one product each by A and A^T */
+		OK_PROFILE_COUNT(info->gemv_count, 2);
+
+		OK_PROFILE_TIC(t);
 		OK_CHECK_ERR( err,
 			update_dual(linalg_handle, z, settings->alpha) );
+		OK_PROFILE_TOC(t, info->dual_time);
 
+		/* residuals: one product each by A and A^T */
+		OK_PROFILE_TIC(t);
 		converged = check_convergence(linalg_handle, solver, &obj, &res,
 			&eps);
-
-		if ((k % PRINT_ITER == 0 || converged ||k == settings->maxiter)
+		if (!converged)
+			OK_CHECK_ERR( err,
+				check_infeasibility(linalg_handle, OK_NULL,
+					solver->f, solver->g, z, settings->alpha,
+					settings->infeastol, &status) );
+		OK_PROFILE_TOC(t, info->check_time);
+		OK_PROFILE_COUNT(info->gemv_count, 2);
+
+		if ((k % PRINT_ITER == 0 || converged || status ||
+			k == settings->maxiter)
 			&& settings->verbose)
 			print_iter_string(&res, &eps, &obj, k);
 
-		if (converged || k == settings->maxiter)
+		if (converged || status || k == settings->maxiter)
 			break;
 
+		if (aa) {
+			OK_PROFILE_TIC(t);
+			OK_CHECK_ERR( err,
+				anderson_step(linalg_handle, aa, z) );
+			OK_PROFILE_TOC(t, info->anderson_time);
+		}
+
+		OK_PROFILE_TIC(t);
+		rho_prev = solver->rho;
 		if (settings->adaptiverho)
 			OK_CHECK_ERR( err,
 				adaptrho(z, settings, &solver->rho, &rho_params,
 					&res, &eps, k) );
+		OK_PROFILE_TOC(t, info->adapt_time);
+
+		/* G changes with rho: restart acceleration */
+		if (aa && solver->rho != rho_prev)
+			OK_CHECK_ERR( err,
+				anderson_reset(aa) );
 	}
 
-	if (!converged && k == settings->maxiter)
+	if (aa)
+		OK_MAX_ERR( err, anderson_work_free(aa) );
+
+	if (status == OkPogsPrimalInfeasible && settings->verbose)
+		printf("primal infeasible at iter = %u\n", k);
+	else if (status == OkPogsDualInfeasible && settings->verbose)
+		printf("dual infeasible at iter = %u\n", k);
+	else if (!converged && k == settings->maxiter)
 		printf("reached max iter = %u\n", k);
 
 	/* update info */
 	info->rho = solver->rho;
 	info->obj = obj.primal;
 	info->converged = converged;
+	info->status = converged ? OkPogsSolved : status;
 	info->err = err;
 	info->k = k;
 	return err;
 }
 
+POGS_PRIVATE ok_status pogs_polish_work_alloc(pogs_polish_work ** work,
+	size_t m, size_t n, enum CBLAS_ORDER ord)
+{
+	ok_status err = OPTKIT_SUCCESS;
+	pogs_polish_work * w = OK_NULL;
+	block_vector ** blocks[10];
+	size_t i;
+
+	if (*work != OK_NULL)
+		return OK_SCAN_ERR( OPTKIT_ERROR_OVERWRITE );
+
+	ok_alloc(w, sizeof(*w));
+	w->m = m;
+	w->n = n;
+	blocks[0] = &w->fix;
+	blocks[1] = &w->fixed;
+	blocks[2] = &w->curv;
+	blocks[3] = &w->grad;
+	blocks[4] = &w->D;
+	blocks[5] = &w->h;
+	blocks[6] = &w->lambda;
+	blocks[7] = &w->primal;
+	blocks[8] = &w->dual;
+	blocks[9] = &w->temp;
+	for (i = 0; i < 10; ++i)
+		OK_CHECK_ERR( err, block_vector_alloc(blocks[i], m, n) );
+	OK_CHECK_ERR( err, matrix_calloc(&w->AD, m, n, ord) );
+	OK_CHECK_ERR( err, matrix_calloc(&w->M, n, n, ord) );
+
+	if (err)
+		OK_MAX_ERR( err, pogs_polish_work_free(w) );
+	else
+		*work = w;
+	return err;
+}
+
+POGS_PRIVATE ok_status pogs_polish_work_free(pogs_polish_work * work)
+{
+	ok_status err = OPTKIT_SUCCESS;
+	block_vector * blocks[10];
+	size_t i;
+	OK_CHECK_PTR(work);
+	blocks[0] = work->fix;
+	blocks[1] = work->fixed;
+	blocks[2] = work->curv;
+	blocks[3] = work->grad;
+	blocks[4] = work->D;
+	blocks[5] = work->h;
+	blocks[6] = work->lambda;
+	blocks[7] = work->primal;
+	blocks[8] = work->dual;
+	blocks[9] = work->temp;
+	for (i = 0; i < 10; ++i)
+		if (blocks[i])
+			OK_MAX_ERR( err, block_vector_free(blocks[i]) );
+	if (work->AD.data)
+		OK_MAX_ERR( err, matrix_free(&work->AD) );
+	if (work->M.data)
+		OK_MAX_ERR( err, matrix_free(&work->M) );
+	ok_free(work);
+	return err;
+}
+
+/*
+ * optimality residual of the point (z, zt) = (primal, dual),
+ *
+ *	max(||Ax - y||, ||A'yt + xt||, ||Prox_{rho, f, g}(z - zt) - z||):
+ *
+ * primal and dual feasibility as in update_residuals, and the distance of
+ * z from the prox of z - zt, which vanishes iff -rho * zt is a subgradient
+ * of (f, g) at z
+ */
+POGS_PRIVATE ok_status polish_merit(void * linalg_handle,
+	pogs_solver * solver, block_vector * primal, block_vector * dual,
+	block_vector * temp, ok_float * merit)
+{
+	OK_CHECK_PTR(solver);
+	OK_CHECK_PTR(primal);
+	OK_CHECK_PTR(dual);
+	OK_CHECK_PTR(temp);
+	OK_CHECK_PTR(merit);
+
+	ok_status err = OPTKIT_SUCCESS;
+	matrix * A = solver->M->A;
+	ok_float res_primal = kZero, res_dual = kZero, res_prox = kZero;
+
+	OK_CHECK_ERR( err, vector_memcpy_vv(temp->y, primal->y) );
+	OK_CHECK_ERR( err, blas_gemv(linalg_handle, CblasNoTrans, kOne, A,
+		primal->x, -kOne, temp->y) );
+	OK_CHECK_ERR( err, blas_nrm2(linalg_handle, temp->y, &res_primal) );
+
+	OK_CHECK_ERR( err, vector_memcpy_vv(temp->x, dual->x) );
+	OK_CHECK_ERR( err, blas_gemv(linalg_handle, CblasTrans, kOne, A,
+		dual->y, kOne, temp->x) );
+	OK_CHECK_ERR( err, blas_nrm2(linalg_handle, temp->x, &res_dual) );
+
+	OK_CHECK_ERR( err, vector_memcpy_vv(temp->vec, primal->vec) );
+	OK_CHECK_ERR( err, blas_axpy(linalg_handle, -kOne, dual->vec,
+		temp->vec) );
+	OK_CHECK_ERR( err, prox_eval_vector(solver->f, solver->rho, temp->y,
+		temp->y) );
+	OK_CHECK_ERR( err, prox_eval_vector(solver->g, solver->rho, temp->x,
+		temp->x) );
+	OK_CHECK_ERR( err, blas_axpy(linalg_handle, -kOne, primal->vec,
+		temp->vec) );
+	OK_CHECK_ERR( err, blas_nrm2(linalg_handle, temp->vec, &res_prox) );
+
+	*merit = res_primal > res_dual ? res_primal : res_dual;
+	*merit = *merit > res_prox ? *merit : res_prox;
+	return err;
+}
+
+/*
+ * polish the ADMM solution (z^{k+1/2}, zt^{k+1/2}).
+ *
+ * components of y (x) within kPOLISHTOL of a kink of f (g), or of the
+ * boundary of its domain, are fixed there; f and g are replaced by
+ * quadratic models at the remaining components (see FuncPolish). the
+ * resulting equality-constrained least-squares problem in x,
+ *
+ *	minimize	sum_{i free} q_i(a_i'x) + sum_{j free} q_j(x_j)
+ *	subject to	a_i'x = y_fix_i, i fixed,
+ *			x_j = x_fix_j, j fixed,
+ *
+ * is solved by kPOLISHREFINE steps of the proximal method of multipliers
+ * with penalty 1 / kPOLISHDELTA, each a solve with the Cholesky factor of
+ *
+ *	M = A'diag(D_y)A + diag(D_x) + delta I,
+ *
+ * with D = curvature of the model for free components, 1 / delta for
+ * fixed ones. the duals follow from the model gradients (free) and the
+ * multipliers (fixed). the polished point replaces the ADMM point only if
+ * it has a smaller optimality residual (see polish_merit).
+ */
+POGS_PRIVATE ok_status pogs_polish(pogs_solver * solver, pogs_info * info)
+{
+	OK_CHECK_PTR(solver);
+	OK_CHECK_PTR(info);
+
+	ok_status err = OPTKIT_SUCCESS;
+	pogs_polish_work * w = OK_NULL;
+	pogs_variables * z = solver->z;
+	matrix * A = solver->M->A;
+	void * linalg_handle = solver->linalg_handle;
+	const ok_float delta = kPOLISHDELTA;
+	ok_float merit_admm = kZero, merit_polish = kZero;
+	pogs_objectives obj;
+	vector diag;
+	uint r;
+	OK_PROFILE_TIMER(t);
+
+	OK_PROFILE_TIC(t);
+	diag.data = OK_NULL;
+	diag.size = 0;
+	diag.stride = 0;
+
+	OK_CHECK_ERR( err, pogs_polish_work_alloc(&w, z->m, z->n, A->order) );
+	OK_CHECK_ERR( err, polish_merit(linalg_handle, solver, z->primal12,
+		z->dual12, w->temp, &merit_admm) );
+
+	/* guess active set, model the rest */
+	OK_CHECK_ERR( err, function_polish_vector(solver->f, z->primal12->y,
+		kPOLISHTOL, w->fix->y, w->fixed->y, w->curv->y, w->grad->y) );
+	OK_CHECK_ERR( err, function_polish_vector(solver->g, z->primal12->x,
+		kPOLISHTOL, w->fix->x, w->fixed->x, w->curv->x, w->grad->x) );
+
+	/* D = curv + fixed / delta */
+	OK_CHECK_ERR( err, vector_memcpy_vv(w->D->vec, w->fixed->vec) );
+	OK_CHECK_ERR( err, vector_scale(w->D->vec, kOne / delta) );
+	OK_CHECK_ERR( err, vector_add(w->D->vec, w->curv->vec) );
+
+	/* M = A'diag(D_y)A + diag(D_x) + delta I = LL' */
+	OK_CHECK_ERR( err, vector_memcpy_vv(w->temp->y, w->D->y) );
+	OK_CHECK_ERR( err, vector_sqrt(w->temp->y) );
+	OK_CHECK_ERR( err, matrix_memcpy_mm(&w->AD, A) );
+	OK_CHECK_ERR( err, linalg_matrix_broadcast_vector(&w->AD, w->temp->y,
+		OkTransformScale, CblasLeft) );
+	OK_CHECK_ERR( err, blas_gemm(linalg_handle, CblasTrans, CblasNoTrans,
+		kOne, &w->AD, &w->AD, kZero, &w->M) );
+	OK_CHECK_ERR( err, matrix_diagonal(&diag, &w->M) );
+	OK_CHECK_ERR( err, vector_add(&diag, w->D->x) );
+	OK_CHECK_ERR( err, vector_add_constant(&diag, delta) );
+	OK_CHECK_ERR( err, linalg_cholesky_decomp(linalg_handle, &w->M) );
+
+	/* proximal method of multipliers, starting from x^{k+1/2} */
+	OK_CHECK_ERR( err, vector_memcpy_vv(w->primal->x, z->primal12->x) );
+	for (r = 0; r < kPOLISHREFINE && !err; ++r) {
+		/* h = D * fix - grad - lambda */
+		OK_CHECK_ERR( err, vector_memcpy_vv(w->h->vec, w->fix->vec) );
+		OK_CHECK_ERR( err, vector_mul(w->h->vec, w->D->vec) );
+		OK_CHECK_ERR( err, vector_sub(w->h->vec, w->grad->vec) );
+		OK_CHECK_ERR( err, vector_sub(w->h->vec, w->lambda->vec) );
+
+		/* x = M^-1 (A'h_y + h_x + delta * x), y = Ax */
+		OK_CHECK_ERR( err, vector_memcpy_vv(w->temp->x, w->h->x) );
+		OK_CHECK_ERR( err, blas_axpy(linalg_handle, delta,
+			w->primal->x, w->temp->x) );
+		OK_CHECK_ERR( err, blas_gemv(linalg_handle, CblasTrans, kOne, A,
+			w->h->y, kOne, w->temp->x) );
+		OK_CHECK_ERR( err, linalg_cholesky_svx(linalg_handle, &w->M,
+			w->temp->x) );
+		OK_CHECK_ERR( err, vector_memcpy_vv(w->primal->x, w->temp->x) );
+		OK_CHECK_ERR( err, blas_gemv(linalg_handle, CblasNoTrans, kOne,
+			A, w->primal->x, kZero, w->primal->y) );
+
+		/* lambda += fixed * (z - fix) / delta */
+		OK_CHECK_ERR( err, vector_memcpy_vv(w->temp->vec,
+			w->primal->vec) );
+		OK_CHECK_ERR( err, vector_sub(w->temp->vec, w->fix->vec) );
+		OK_CHECK_ERR( err, vector_mul(w->temp->vec, w->fixed->vec) );
+		OK_CHECK_ERR( err, blas_axpy(linalg_handle, kOne / delta,
+			w->temp->vec, w->lambda->vec) );
+	}
+
+	/* zt = -(grad + curv * (z - fix) + lambda) / rho */
+	OK_CHECK_ERR( err, vector_memcpy_vv(w->dual->vec, w->primal->vec) );
+	OK_CHECK_ERR( err, vector_sub(w->dual->vec, w->fix->vec) );
+	OK_CHECK_ERR( err, vector_mul(w->dual->vec, w->curv->vec) );
+	OK_CHECK_ERR( err, vector_add(w->dual->vec, w->grad->vec) );
+	OK_CHECK_ERR( err, vector_add(w->dual->vec, w->lambda->vec) );
+	OK_CHECK_ERR( err, vector_scale(w->dual->vec, -kOne / solver->rho) );
+
+	OK_CHECK_ERR( err, polish_merit(linalg_handle, solver, w->primal,
+		w->dual, w->temp, &merit_polish) );
+
+	if (!err && merit_polish < merit_admm) {
+		OK_CHECK_ERR( err, vector_memcpy_vv(z->primal12->vec,
+			w->primal->vec) );
+		OK_CHECK_ERR( err, vector_memcpy_vv(z->dual12->vec,
+			w->dual->vec) );
+		OK_CHECK_ERR( err, update_objective(linalg_handle, solver->f,
+			solver->g, solver->rho, z, &obj) );
+		if (!err)
+			info->obj = obj.primal;
+		info->polished = !err;
+	}
+
+	if (!err && solver->settings->verbose)
+		printf("polish: residual %0.3e -> %0.3e, %s\n", merit_admm,
+			merit_polish, info->polished ? "accepted" : "rejected");
+
+	if (w)
+		OK_MAX_ERR( err, pogs_polish_work_free(w) );
+	OK_PROFILE_TOC(t, info->polish_time);
+	/* two residual checks, and one product each by A and A^T per step */
+	OK_PROFILE_COUNT(info->gemv_count, 4 + 2 * kPOLISHREFINE);
+	return err;
+}
+
+POGS_PRIVATE ok_status pogs_batch_alloc(pogs_batch ** batch, size_t m,
+	size_t n, size_t K)
+{
+	ok_status err = OPTKIT_SUCCESS;
+	pogs_batch * b = OK_NULL;
+	matrix * blocks[6];
+	size_t i, j;
+
+	if (*batch != OK_NULL)
+		return OK_SCAN_ERR( OPTKIT_ERROR_OVERWRITE );
+	if (K == 0)
+		return OK_SCAN_ERR( OPTKIT_ERROR_DOMAIN );
+
+	ok_alloc(b, sizeof(*b));
+	b->m = m;
+	b->n = n;
+	b->K = K;
+	b->active = K;
+	blocks[0] = &b->primal;
+	blocks[1] = &b->primal12;
+	blocks[2] = &b->dual;
+	blocks[3] = &b->dual12;
+	blocks[4] = &b->prev;
+	blocks[5] = &b->temp;
+	for (i = 0; i < 6; ++i)
+		OK_CHECK_ERR( err, matrix_calloc(blocks[i], m + n, K,
+			CblasColMajor) );
+
+	ok_alloc(b->z, K * sizeof(*b->z));
+	ok_alloc(b->blocks, 6 * K * sizeof(*b->blocks));
+	ok_alloc(b->views, 18 * K * sizeof(*b->views));
+	ok_alloc(b->index, K * sizeof(*b->index));
+
+	/* block vector i of z[j]: (vec, y, x) views of column j of block i */
+	for (j = 0; j < K && !err; ++j) {
+		b->index[j] = j;
+		b->z[j].m = m;
+		b->z[j].n = n;
+		b->z[j].primal = b->blocks + 6 * j;
+		b->z[j].primal12 = b->blocks + 6 * j + 1;
+		b->z[j].dual = b->blocks + 6 * j + 2;
+		b->z[j].dual12 = b->blocks + 6 * j + 3;
+		b->z[j].prev = b->blocks + 6 * j + 4;
+		b->z[j].temp = b->blocks + 6 * j + 5;
+		for (i = 0; i < 6 && !err; ++i) {
+			block_vector * zi = b->blocks + 6 * j + i;
+			zi->size = m + n;
+			zi->m = m;
+			zi->n = n;
+			zi->vec = b->views + 18 * j + 3 * i;
+			zi->y = zi->vec + 1;
+			zi->x = zi->vec + 2;
+			OK_CHECK_ERR( err, matrix_column(zi->vec, blocks[i], j) );
+			OK_CHECK_ERR( err, vector_subvector(zi->y, zi->vec, 0, m) );
+			OK_CHECK_ERR( err, vector_subvector(zi->x, zi->vec, m, n) );
+		}
+	}
+
+	if (err)
+		OK_MAX_ERR( err, pogs_batch_free(b) );
+	else
+		*batch = b;
+	return err;
+}
+
+POGS_PRIVATE ok_status pogs_batch_free(pogs_batch * batch)
+{
+	ok_status err = OPTKIT_SUCCESS;
+	matrix * blocks[6];
+	size_t i;
+	OK_CHECK_PTR(batch);
+	blocks[0] = &batch->primal;
+	blocks[1] = &batch->primal12;
+	blocks[2] = &batch->dual;
+	blocks[3] = &batch->dual12;
+	blocks[4] = &batch->prev;
+	blocks[5] = &batch->temp;
+	for (i = 0; i < 6; ++i)
+		if (blocks[i]->data)
+			OK_MAX_ERR( err, matrix_free(blocks[i]) );
+	ok_free(batch->z);
+	ok_free(batch->blocks);
+	ok_free(batch->views);
+	ok_free(batch->index);
+	ok_free(batch);
+	return err;
+}
+
+/*
+ * remove the problem in column j from the active set, moving the last
+ * active column into its place
+ */
+POGS_PRIVATE ok_status pogs_batch_retire(pogs_batch * batch, size_t j)
+{
+	OK_CHECK_PTR(batch);
+	if (j >= batch->active)
+		return OK_SCAN_ERR( OPTKIT_ERROR_DOMAIN );
+
+	size_t last = --batch->active;
+	pogs_variables * z = batch->z + j, * z_last = batch->z + last;
+	if (j == last)
+		return OPTKIT_SUCCESS;
+
+	OK_RETURNIF_ERR(
+		vector_memcpy_vv(z->primal->vec, z_last->primal->vec) );
+	OK_RETURNIF_ERR(
+		vector_memcpy_vv(z->primal12->vec, z_last->primal12->vec) );
+	OK_RETURNIF_ERR(
+		vector_memcpy_vv(z->dual->vec, z_last->dual->vec) );
+	OK_RETURNIF_ERR(
+		vector_memcpy_vv(z->dual12->vec, z_last->dual12->vec) );
+	OK_RETURNIF_ERR(
+		vector_memcpy_vv(z->prev->vec, z_last->prev->vec) );
+	batch->index[j] = batch->index[last];
+	return OPTKIT_SUCCESS;
+}
+
+/*
+ * project_primal for every active column; a direct projector takes all
+ * columns in one batched solve, an indirect projector one at a time
+ */
+POGS_PRIVATE ok_status project_primal_batch(void * linalg_handle,
+	projector_ * proj, pogs_batch * batch, ok_float alpha)
+{
+	size_t j;
+	if (!proj || !batch)
+		return OK_SCAN_ERR( OPTKIT_ERROR_UNALLOCATED );
+
+	for (j = 0; j < batch->active; ++j) {
+		pogs_variables * z = batch->z + j;
+		OK_RETURNIF_ERR( vector_set_all(z->temp->vec, kZero) );
+		OK_RETURNIF_ERR( blas_axpy(linalg_handle, alpha,
+			z->primal12->vec, z->temp->vec) );
+		OK_RETURNIF_ERR( blas_axpy(linalg_handle, kOne - alpha,
+			z->prev->vec, z->temp->vec) );
+		OK_RETURNIF_ERR( blas_axpy(linalg_handle, kOne, z->dual->vec,
+			z->temp->vec) );
+	}
+
+#ifndef OPTKIT_INDIRECT
+	matrix X_in, Y_in, X_out, Y_out;
+	OK_RETURNIF_ERR( matrix_submatrix(&Y_in, &batch->temp, 0, 0, batch->m,
+		batch->active) );
+	OK_RETURNIF_ERR( matrix_submatrix(&X_in, &batch->temp, batch->m, 0,
+		batch->n, batch->active) );
+	OK_RETURNIF_ERR( matrix_submatrix(&Y_out, &batch->primal, 0, 0,
+		batch->m, batch->active) );
+	OK_RETURNIF_ERR( matrix_submatrix(&X_out, &batch->primal, batch->m, 0,
+		batch->n, batch->active) );
+	return OK_SCAN_ERR( direct_projector_project_batch(linalg_handle, proj,
+		&X_in, &Y_in, &X_out, &Y_out) );
+#else
+	for (j = 0; j < batch->active; ++j)
+		OK_RETURNIF_ERR( PROJECTOR(project)(linalg_handle, proj,
+			batch->z[j].temp->x, batch->z[j].temp->y,
+			batch->z[j].primal->x, batch->z[j].primal->y) );
+	return OPTKIT_SUCCESS;
+#endif
+}
+
+/*
+ * update_residuals for every active column, with the products by A and
+ * A^T taken over all columns at once; obj and res are indexed by problem
+ */
+POGS_PRIVATE ok_status update_residuals_batch(void * linalg_handle,
+	matrix * A, pogs_batch * batch, pogs_objectives * obj,
+	pogs_residuals * res)
+{
+	matrix X12, Y12, Xt12, Yt12, X_temp, Y_temp, A_view;
+	enum CBLAS_TRANSPOSE tA = CblasNoTrans, tA_ = CblasTrans;
+	size_t j, m, n, active;
+	OK_CHECK_MATRIX(A);
+	if (!batch || !obj || !res)
+		return OK_SCAN_ERR( OPTKIT_ERROR_UNALLOCATED );
+
+	/* in the order of the blocks, a row-major A reads as A^T */
+	A_view = *A;
+	if (A->order != batch->temp.order) {
+		A_view.size1 = A->size2;
+		A_view.size2 = A->size1;
+		A_view.order = batch->temp.order;
+		tA = CblasTrans;
+		tA_ = CblasNoTrans;
+	}
+
+	m = batch->m;
+	n = batch->n;
+	active = batch->active;
+	OK_RETURNIF_ERR( matrix_submatrix(&Y12, &batch->primal12, 0, 0, m,
+		active) );
+	OK_RETURNIF_ERR( matrix_submatrix(&X12, &batch->primal12, m, 0, n,
+		active) );
+	OK_RETURNIF_ERR( matrix_submatrix(&Yt12, &batch->dual12, 0, 0, m,
+		active) );
+	OK_RETURNIF_ERR( matrix_submatrix(&Xt12, &batch->dual12, m, 0, n,
+		active) );
+	OK_RETURNIF_ERR( matrix_submatrix(&Y_temp, &batch->temp, 0, 0, m,
+		active) );
+	OK_RETURNIF_ERR( matrix_submatrix(&X_temp, &batch->temp, m, 0, n,
+		active) );
+
+	OK_RETURNIF_ERR( matrix_memcpy_mm(&Y_temp, &Y12) );
+	OK_RETURNIF_ERR( blas_gemm(linalg_handle, tA, CblasNoTrans, kOne,
+		&A_view, &X12, -kOne, &Y_temp) );
+	OK_RETURNIF_ERR( matrix_memcpy_mm(&X_temp, &Xt12) );
+	OK_RETURNIF_ERR( blas_gemm(linalg_handle, tA_, CblasNoTrans, kOne,
+		&A_view, &Yt12, kOne, &X_temp) );
+
+	for (j = 0; j < active; ++j) {
+		size_t p = batch->index[j];
+		res[p].gap = obj[p].gap;
+		OK_RETURNIF_ERR( blas_nrm2(linalg_handle, batch->z[j].temp->y,
+			&res[p].primal) );
+		OK_RETURNIF_ERR( blas_nrm2(linalg_handle, batch->z[j].temp->x,
+			&res[p].dual) );
+	}
+	return OPTKIT_SUCCESS;
+}
+
+/*
+ * iterate K problems with the same matrix in lockstep: the prox, dual
+ * and convergence updates run column by column, while the projection
+ * and the residual products act on the block of active columns. a
+ * problem leaves the block once it converges, is found infeasible or
+ * reaches settings->maxiter; its outputs are copied as it leaves.
+ *
+ * f, g, info and output are indexed by problem; f and g are scaled.
+ */
+POGS_PRIVATE ok_status pogs_batch_loop(pogs_solver * solver,
+	pogs_batch * batch, function_vector * f, function_vector * g,
+	pogs_info * info, pogs_output * output)
+{
+	if (!solver || !batch || !f || !g || !info || !output)
+		return OK_SCAN_ERR( OPTKIT_ERROR_UNALLOCATED );
+
+	ok_status err = OPTKIT_SUCCESS;
+	pogs_settings * settings = solver->settings;
+	void * linalg_handle = solver->linalg_handle;
+	size_t K = batch->K, j, p;
+	uint k, n_converged = 0;
+	ok_float * rho = OK_NULL;
+	adapt_params * rho_params = OK_NULL;
+	pogs_objectives * obj = OK_NULL;
+	pogs_residuals * res = OK_NULL;
+	pogs_tolerances * eps = OK_NULL;
+	pogs_info phases;
+	OK_TIMER t_solve = tic();
+	OK_PROFILE_TIMER(t);
+
+	ok_alloc(rho, K * sizeof(*rho));
+	ok_alloc(rho_params, K * sizeof(*rho_params));
+	ok_alloc(obj, K * sizeof(*obj));
+	ok_alloc(res, K * sizeof(*res));
+	ok_alloc(eps, K * sizeof(*eps));
+	memset(&phases, 0, sizeof(phases));
+
+	for (p = 0; p < K && !err; ++p) {
+		rho[p] = settings->rho;
+		rho_params[p] = (adapt_params){kDELTAMIN, kZero, kZero, kOne};
+		info[p].converged = 0;
+		info[p].status = OkPogsUnconverged;
+		OK_CHECK_ERR( err, initialize_conditions(obj + p, res + p,
+			eps + p, settings, batch->m, batch->n) );
+	}
+
+	for (k = 1; !err && batch->active > 0; ++k) {
+		OK_PROFILE_TIC(t);
+		for (j = 0; j < batch->active && !err; ++j) {
+			p = batch->index[j];
+			OK_CHECK_ERR( err, set_prev(batch->z + j) );
+			OK_CHECK_ERR( err, prox(linalg_handle, f + p, g + p,
+				batch->z + j, rho[p]) );
+		}
+		OK_PROFILE_TOC(t, phases.prox_time);
+
+		OK_PROFILE_TIC(t);
+		OK_CHECK_ERR( err, project_primal_batch(linalg_handle,
+			solver->M->P, batch, settings->alpha) );
+		OK_PROFILE_TOC(t, phases.project_time);
+
+		OK_PROFILE_TIC(t);
+		for (j = 0; j < batch->active && !err; ++j)
+			OK_CHECK_ERR( err, update_dual(linalg_handle, batch->z + j,
+				settings->alpha) );
+		OK_PROFILE_TOC(t, phases.dual_time);
+
+		OK_PROFILE_TIC(t);
+		for (j = 0; j < batch->active && !err; ++j) {
+			p = batch->index[j];
+			OK_CHECK_ERR( err, update_objective(linalg_handle, f + p,
+				g + p, rho[p], batch->z + j, obj + p) );
+			OK_CHECK_ERR( err, update_tolerances(linalg_handle,
+				batch->z + j, obj + p, eps + p) );
+		}
+		OK_CHECK_ERR( err, update_residuals_batch(linalg_handle,
+			solver->M->A, batch, obj, res) );
+		for (j = 0; j < batch->active && !err; ++j) {
+			p = batch->index[j];
+			info[p].converged = (res[p].primal < eps[p].primal) &&
+				(res[p].dual < eps[p].dual) &&
+				(res[p].gap < eps[p].gap || !(settings->gapstop));
+			if (!info[p].converged)
+				OK_CHECK_ERR( err, check_infeasibility(linalg_handle,
+					OK_NULL, f + p, g + p, batch->z + j,
+					settings->alpha, settings->infeastol,
+					&info[p].status) );
+		}
+		OK_PROFILE_TOC(t, phases.check_time);
+
+		/*
+		 * retire finished problems, last column first: the column
+		 * moved into place of a retired one has been visited already
+		 */
+		for (j = batch->active; j-- > 0 && !err;) {
+			p = batch->index[j];
+			if (info[p].converged || info[p].status ||
+				k >= settings->maxiter) {
+				info[p].status = info[p].converged ? OkPogsSolved :
+					info[p].status;
+				n_converged += (uint) info[p].converged;
+				info[p].k = k;
+				info[p].obj = obj[p].primal;
+				info[p].rho = rho[p];
+				info[p].solve_time = toc(t_solve);
+				OK_CHECK_ERR( err, copy_output(output + p, batch->z + j,
+					solver->M->d, solver->M->e, rho[p],
+					settings->suppress) );
+				OK_CHECK_ERR( err, pogs_batch_retire(batch, j) );
+			} else if (settings->adaptiverho) {
+				OK_PROFILE_TIC(t);
+				OK_CHECK_ERR( err, adaptrho(batch->z + j, settings,
+					rho + p, rho_params + p, res + p, eps + p, k) );
+				OK_PROFILE_TOC(t, phases.adapt_time);
+			}
+		}
+	}
+
+	if (settings->verbose)
+		printf("batch: %u of %u problems converged, %u iterations\n",
+			n_converged, (uint) K, k - 1);
+
+	/* phase times are totals for the batch */
+	for (p = 0; p < K; ++p) {
+		info[p].err = err;
+		info[p].prox_time = phases.prox_time;
+		info[p].project_time = phases.project_time;
+		info[p].dual_time = phases.dual_time;
+		info[p].check_time = phases.check_time;
+		info[p].adapt_time = phases.adapt_time;
+		info[p].anderson_time = info[p].polish_time = kZero;
+		info[p].polished = 0;
+		/* one product each by A and A^T to project, and to check */
+		info[p].gemv_count = info[p].cg_iters = 0;
+		OK_PROFILE_COUNT(info[p].gemv_count, 4 * info[p].k);
+	}
+
+	ok_free(rho);
+	ok_free(rho_params);
+	ok_free(obj);
+	ok_free(res);
+	ok_free(eps);
+	return err;
+}
+
 pogs_solver * pogs_init(ok_float * A, size_t m, size_t n, enum CBLAS_ORDER ord)
 {
 	ok_status err = OPTKIT_SUCCESS;
@@ -357,8 +1035,13 @@ ok_status pogs_solve(pogs_solver * solver, function_vector * f,
 	OK_CHECK_FNVECTOR(g);
 
 	ok_status err = OPTKIT_SUCCESS;
+	ok_threads threads_saved;
 	OK_TIMER t = tic();
 
+	/* limit OpenMP/BLAS threads for the duration of the solve */
+	OK_RETURNIF_ERR( ok_threads_limit(settings->num_threads,
+		&threads_saved) );
+
 	/* copy settings */
 	OK_CHECK_ERR( err,
 		update_settings(solver->settings, settings) );
@@ -381,6 +1064,8 @@ ok_status pogs_solve(pogs_solver * solver, function_vector * f,
 	if (!err) {
 		t = tic();
 		OK_CHECK_ERR( err, pogs_solver_loop(solver, info) );
+		if (!err && settings->polish && info->converged)
+			OK_CHECK_ERR( err, pogs_polish(solver, info) );
 		info->solve_time = toc(t);
 	}
 
@@ -388,6 +1073,90 @@ ok_status pogs_solve(pogs_solver * solver, function_vector * f,
 	OK_CHECK_ERR( err,
 		copy_output(output, solver->z, solver->M->d, solver->M->e,
 			solver->rho, settings->suppress) );
+	OK_MAX_ERR( err, ok_threads_restore(&threads_saved) );
+	return err;
+}
+
+/*
+ * solve K problems with the same matrix,
+ *
+ *	minimize f_i(y) + g_i(x) subject to y = Ax, i = 1, ..., K,
+ *
+ * iterating them together (see pogs_batch_loop); f, g, info and output
+ * are arrays of K. every problem starts from zero with rho = settings->rho:
+ * settings->warmstart, resume and anderson are ignored, and the solver's
+ * own iterates are left untouched. each info[i].solve_time measures until
+ * problem i finished; its phase times are totals for the batch.
+ */
+ok_status pogs_solve_batch(pogs_solver * solver, size_t K,
+	function_vector * f, function_vector * g, const pogs_settings * settings,
+	pogs_info * info, pogs_output * output)
+{
+	if (!solver || !f || !g || !settings || !info || !output)
+		return OK_SCAN_ERR( OPTKIT_ERROR_UNALLOCATED );
+	if (K == 0)
+		return OPTKIT_SUCCESS;
+
+	ok_status err = OPTKIT_SUCCESS;
+	ok_threads threads_saved;
+	pogs_batch * batch = OK_NULL;
+	function_vector * f_scaled = OK_NULL, * g_scaled = OK_NULL;
+	size_t p, m = solver->z->m, n = solver->z->n;
+	ok_float setup_time;
+	OK_TIMER t = tic();
+
+	for (p = 0; p < K; ++p) {
+		if (!f[p].objectives || !g[p].objectives)
+			return OK_SCAN_ERR( OPTKIT_ERROR_UNALLOCATED );
+		if (f[p].size != m || g[p].size != n)
+			return OK_SCAN_ERR( OPTKIT_ERROR_DIMENSION_MISMATCH );
+	}
+
+	/* limit OpenMP/BLAS threads for the duration of the solve */
+	OK_RETURNIF_ERR( ok_threads_limit(settings->num_threads,
+		&threads_saved) );
+
+	OK_CHECK_ERR( err,
+		update_settings(solver->settings, settings) );
+
+	/* copy and scale function vectors */
+	ok_alloc(f_scaled, K * sizeof(*f_scaled));
+	ok_alloc(g_scaled, K * sizeof(*g_scaled));
+	for (p = 0; p < K && !err; ++p) {
+		OK_CHECK_ERR( err, function_vector_calloc(f_scaled + p, m) );
+		OK_CHECK_ERR( err, function_vector_calloc(g_scaled + p, n) );
+		OK_CHECK_ERR( err, function_vector_memcpy_va(f_scaled + p,
+			f[p].objectives) );
+		OK_CHECK_ERR( err, function_vector_memcpy_va(g_scaled + p,
+			g[p].objectives) );
+		OK_CHECK_ERR( err, function_vector_div(f_scaled + p,
+			solver->M->d) );
+		OK_CHECK_ERR( err, function_vector_mul(g_scaled + p,
+			solver->M->e) );
+	}
+
+	OK_CHECK_ERR( err,
+		pogs_batch_alloc(&batch, m, n, K) );
+	setup_time = toc(t) + solver->init_time;
+
+	/* run solver */
+	OK_CHECK_ERR( err,
+		pogs_batch_loop(solver, batch, f_scaled, g_scaled, info,
+			output) );
+	for (p = 0; p < K; ++p)
+		info[p].setup_time = setup_time;
+
+	if (batch)
+		OK_MAX_ERR( err, pogs_batch_free(batch) );
+	for (p = 0; p < K; ++p) {
+		if (f_scaled[p].objectives)
+			OK_MAX_ERR( err, function_vector_free(f_scaled + p) );
+		if (g_scaled[p].objectives)
+			OK_MAX_ERR( err, function_vector_free(g_scaled + p) );
+	}
+	ok_free(f_scaled);
+	ok_free(g_scaled);
+	OK_MAX_ERR( err, ok_threads_restore(&threads_saved) );
 	return err;
 }
 
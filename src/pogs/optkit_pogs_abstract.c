@@ -1,3 +1,7 @@
+#ifndef _POSIX_C_SOURCE
+#define _POSIX_C_SOURCE 200809L /* clock_gettime, CLOCK_MONOTONIC */
+#endif
+
 #include "optkit_pogs_abstract.h"
 
 #ifdef __cplusplus
@@ -6,6 +10,67 @@ extern "C" {
 
 const ok_float kProjectorTolInitial = (ok_float) 1e-6;
 
+/*
+ * location of a sparse view operator's value pointer, or NULL if the
+ * operator does not wrap caller-owned arrays
+ */
+static ok_float ** pogs_work_view_values(pogs_work * W, size_t * nnz)
+{
+	sparse_operator_data * op_data = (sparse_operator_data *) W->A->data;
+
+	if (op_data->A64 && op_data->A64->is_view) {
+		*nnz = op_data->A64->nnz;
+		return &(op_data->A64->val);
+	} else if (op_data->A && op_data->A->is_view) {
+		*nnz = op_data->A->nnz;
+		return &(op_data->A->val);
+	}
+	return OK_NULL;
+}
+
+/*
+ * point a sparse view operator at a private copy of its values, so that
+ * equilibration leaves the caller's buffer unchanged; pogs_work_free()
+ * frees the copy and restores the caller's values
+ */
+static ok_status pogs_work_detach_view(pogs_work * W)
+{
+	ok_status err = OPTKIT_SUCCESS;
+	size_t nnz = 0;
+	ok_float ** val = pogs_work_view_values(W, &nnz);
+	vector view_val;
+
+	if (!val)
+		return OPTKIT_SUCCESS;
+
+	view_val.data = OK_NULL;
+	ok_alloc(W->view_copy, sizeof(*(W->view_copy)));
+	OK_CHECK_ERR( err, vector_calloc(W->view_copy, nnz) );
+	OK_CHECK_ERR( err, vector_view_array(&view_val, *val, nnz) );
+	OK_CHECK_ERR( err, vector_memcpy_vv(W->view_copy, &view_val) );
+	if (!err) {
+		W->view_val = *val;
+		*val = W->view_copy->data;
+	}
+	return err;
+}
+
+static ok_status pogs_work_attach_view(pogs_work * W)
+{
+	ok_status err = OPTKIT_SUCCESS;
+	size_t nnz = 0;
+
+	if (!W->view_copy)
+		return OPTKIT_SUCCESS;
+	if (W->view_val)
+		*pogs_work_view_values(W, &nnz) = W->view_val;
+	if (W->view_copy->data)
+		err = vector_free(W->view_copy);
+	ok_free(W->view_copy);
+	W->view_val = OK_NULL;
+	return err;
+}
+
 POGS_PRIVATE ok_status pogs_work_alloc(pogs_work ** W, operator * A, int direct)
 {
 	ok_status err = OPTKIT_SUCCESS;
@@ -50,6 +115,8 @@ POGS_PRIVATE ok_status pogs_work_alloc(pogs_work ** W, operator * A, int direct)
 	W_->skinny = (A->size1 >= A->size2);
 	W_->normalized = 0;
 	W_->equilibrated = 0;
+	if (!err && A->kind != OkOperatorDense && dense_or_sparse)
+		OK_CHECK_ERR( err, pogs_work_detach_view(W_) );
 	if (err)
 		OK_MAX_ERR( err, pogs_work_free(W_) );
 	else
@@ -66,6 +133,7 @@ POGS_PRIVATE ok_status pogs_work_free(pogs_work * W)
 	ok_free(W->P);
 	OK_MAX_ERR( err, vector_free(W->d) );
 	OK_MAX_ERR( err, vector_free(W->e) );
+	OK_MAX_ERR( err, pogs_work_attach_view(W) );
 	ok_free(W);
 	return err;
 }
@@ -273,7 +341,7 @@ POGS_PRIVATE ok_status pogs_solver_loop(pogs_solver * solver, pogs_info * info)
 		return OK_SCAN_ERR( OPTKIT_ERROR_UNALLOCATED );
 
 	/* declare / get handles to all auxiliary types */
-	int converged = 0;
+	int converged = 0, status = OkPogsUnconverged;
 	uint k, PRINT_ITER = 10000u;
 	adapt_params rho_params = (adapt_params){kDELTAMIN, kZero, kZero, kOne};
 	pogs_settings * settings = solver->settings;
@@ -281,11 +349,21 @@ POGS_PRIVATE ok_status pogs_solver_loop(pogs_solver * solver, pogs_info * info)
 	pogs_objectives obj = (pogs_objectives){OK_NAN, OK_NAN, OK_NAN};
 	pogs_residuals res = (pogs_residuals){OK_NAN, OK_NAN, OK_NAN};
 	pogs_tolerances eps = (pogs_tolerances){0, 0, 0, 0, 0, 0, 0, 0};
+	anderson_work * aa = OK_NULL;
+	ok_float rho_prev;
 	ok_status err = initialize_conditions(&obj, &res, &eps, settings,
 		solver->z->m, solver->z->n);
 
 	void * linalg_handle = solver->linalg_handle;
 	ok_float tol_proj = kProjectorTolInitial;
+	/* certificates are checked against A when projections are inexact */
+	const operator * A_inexact =
+		(solver->W->P->kind == OkProjectorIndirect) ? solver->W->A :
+		OK_NULL;
+	OK_PROFILE_TIMER(t);
+#ifndef OK_NO_PROFILE
+	uint products = 0, cg_iters = 0;
+#endif
 
 	/* TODO: SET TOLPROJ!!!!!! */
 
@@ -299,42 +377,104 @@ POGS_PRIVATE ok_status pogs_solver_loop(pogs_solver * solver, pogs_info * info)
 	if (settings->verbose > 0)
 		print_header_string();
 
+	/* reset phase timers and work counters */
+	info->prox_time = info->project_time = info->dual_time = kZero;
+	info->check_time = info->adapt_time = info->anderson_time = kZero;
+	info->polish_time = kZero;
+	info->gemv_count = info->cg_iters = 0;
+	info->polished = 0;
+
+	if (!err && settings->anderson)
+		OK_CHECK_ERR( err,
+			anderson_work_alloc(&aa, z->m, z->n, settings->anderson) );
+
 	/* iterate until converged, or error/maxiter reached */
 	for (k = 1; !err && k <= settings->maxiter; ++k) {
+		if (aa)
+			OK_CHECK_ERR( err,
+				anderson_set_input(aa, z) );
 		OK_CHECK_ERR( err,
 			set_prev(z) );
+
+		OK_PROFILE_TIC(t);
 		OK_CHECK_ERR( err,
 			prox(linalg_handle, solver->f, solver->g, z,
 				solver->rho) );
+		OK_PROFILE_TOC(t, info->prox_time);
+
+		OK_PROFILE_TIC(t);
 		OK_CHECK_ERR( err,
 			project_primal(linalg_handle, solver->W->P, z,
 				settings->alpha, tol_proj) );
+		OK_PROFILE_TOC(t, info->project_time);
+#ifndef OK_NO_PROFILE
+		OK_CHECK_ERR( err,
+			projector_get_work(solver->W->P, &products, &cg_iters) );
+		info->gemv_count += products;
+		info->cg_iters += cg_iters;
+#endif
+
+		OK_PROFILE_TIC(t);
 		OK_CHECK_ERR( err,
 			update_dual(linalg_handle, z, settings->alpha) );
+		OK_PROFILE_TOC(t, info->dual_time);
 
+		/* residuals: one product each by A and A^T */
+		OK_PROFILE_TIC(t);
 		converged = check_convergence(linalg_handle, solver, &obj, &res,
 			&eps);
-
-		if ((k % PRINT_ITER == 0 || converged || k == settings->maxiter)
+		if (!converged)
+			OK_CHECK_ERR( err,
+				check_infeasibility(linalg_handle, A_inexact,
+					solver->f, solver->g, z, settings->alpha,
+					settings->infeastol, &status) );
+		OK_PROFILE_TOC(t, info->check_time);
+		OK_PROFILE_COUNT(info->gemv_count, 2);
+
+		if ((k % PRINT_ITER == 0 || converged || status ||
+			k == settings->maxiter)
 			&& settings->verbose)
 			print_iter_string(&res, &eps, &obj, k);
 
-		if (converged || k == settings->maxiter)
+		if (converged || status || k == settings->maxiter)
 			break;
 
+		if (aa) {
+			OK_PROFILE_TIC(t);
+			OK_CHECK_ERR( err,
+				anderson_step(linalg_handle, aa, z) );
+			OK_PROFILE_TOC(t, info->anderson_time);
+		}
+
+		OK_PROFILE_TIC(t);
+		rho_prev = solver->rho;
 		if (!err && settings->adaptiverho)
 			OK_CHECK_ERR( err,
 				adaptrho(z, settings, &solver->rho, &rho_params,
 					&res, &eps, k) );
+		OK_PROFILE_TOC(t, info->adapt_time);
+
+		/* G changes with rho: restart acceleration */
+		if (aa && solver->rho != rho_prev)
+			OK_CHECK_ERR( err,
+				anderson_reset(aa) );
 	}
 
-	if (!converged && k == settings->maxiter)
+	if (aa)
+		OK_MAX_ERR( err, anderson_work_free(aa) );
+
+	if (status == OkPogsPrimalInfeasible && settings->verbose)
+		printf("primal infeasible at iter = %u\n", k);
+	else if (status == OkPogsDualInfeasible && settings->verbose)
+		printf("dual infeasible at iter = %u\n", k);
+	else if (!converged && k == settings->maxiter)
 		printf("reached max iter = %u\n", k);
 
 	/* update info */
 	info->rho = solver->rho;
 	info->obj = obj.primal;
 	info->converged = converged;
+	info->status = converged ? OkPogsSolved : status;
 	info->err = err;
 	info->k = k;
 	return err;
@@ -386,8 +526,13 @@ ok_status pogs_solve(pogs_solver * solver, function_vector * f,
 	OK_CHECK_FNVECTOR(g);
 
 	ok_status err = OPTKIT_SUCCESS;
+	ok_threads threads_saved;
 	OK_TIMER t = tic();
 
+	/* limit OpenMP/BLAS threads for the duration of the solve */
+	OK_RETURNIF_ERR( ok_threads_limit(settings->num_threads,
+		&threads_saved) );
+
 	/* copy settings */
 	OK_CHECK_ERR( err,
 		update_settings(solver->settings, settings) );
@@ -417,6 +562,7 @@ ok_status pogs_solve(pogs_solver * solver, function_vector * f,
 	OK_CHECK_ERR( err,
 		copy_output(output, solver->z, solver->W->d, solver->W->e,
 			solver->rho, settings->suppress) );
+	OK_MAX_ERR( err, ok_threads_restore(&threads_saved) );
 	return err;
 }
 
@@ -486,6 +632,75 @@ operator * pogs_sparse_operator_gen(const ok_float * val, const ok_int * ind,
 	return o;
 }
 
+operator * pogs_sparse_operator_gen64(const ok_float * val,
+	const ok_int64 * ind, const ok_int64 * ptr, size_t m, size_t n,
+	size_t nnz, enum CBLAS_ORDER order)
+{
+	void * handle = OK_NULL;
+	operator * o = OK_NULL;
+	sp_matrix64 * A = OK_NULL;
+	ok_status err = OPTKIT_SUCCESS;
+
+	if (!val || !ind || !ptr)
+		err = OK_SCAN_ERR( OPTKIT_ERROR_UNALLOCATED );
+	else {
+		ok_alloc(A, sizeof(*A));
+		OK_CHECK_ERR( err,
+			sp_matrix64_calloc(A, m, n, nnz, order) );
+		OK_CHECK_ERR( err,
+			sp_make_handle(&handle) );
+		OK_CHECK_ERR( err,
+			sp_matrix64_memcpy_ma(handle, A, val, ind, ptr) );
+		OK_CHECK_ERR( err,
+			sp_destroy_handle(handle) );
+		if (!err)
+			o = sparse_operator64_alloc(A);
+	}
+	return o;
+}
+
+operator * pogs_sparse_operator_view(ok_float * val, ok_int * ind,
+	ok_int * ptr, size_t m, size_t n, size_t nnz, enum CBLAS_ORDER order)
+{
+	operator * o = OK_NULL;
+	sp_matrix * A = OK_NULL;
+	ok_status err = OPTKIT_SUCCESS;
+
+	if (!val || !ind || !ptr)
+		err = OK_SCAN_ERR( OPTKIT_ERROR_UNALLOCATED );
+	else {
+		ok_alloc(A, sizeof(*A));
+		OK_CHECK_ERR( err,
+			sp_matrix_view_array(A, m, n, nnz, val, ind, ptr, order) );
+		if (!err)
+			o = sparse_operator_alloc(A);
+		else
+			ok_free(A);
+	}
+	return o;
+}
+
+operator * pogs_sparse_operator_view64(ok_float * val, ok_int64 * ind,
+	ok_int64 * ptr, size_t m, size_t n, size_t nnz, enum CBLAS_ORDER order)
+{
+	operator * o = OK_NULL;
+	sp_matrix64 * A = OK_NULL;
+	ok_status err = OPTKIT_SUCCESS;
+
+	if (!val || !ind || !ptr)
+		err = OK_SCAN_ERR( OPTKIT_ERROR_UNALLOCATED );
+	else {
+		ok_alloc(A, sizeof(*A));
+		OK_CHECK_ERR( err,
+			sp_matrix64_view_array(A, m, n, nnz, val, ind, ptr, order) );
+		if (!err)
+			o = sparse_operator64_alloc(A);
+		else
+			ok_free(A);
+	}
+	return o;
+}
+
 ok_status pogs_dense_operator_free(operator * A)
 {
 	OK_CHECK_OPERATOR(A);
@@ -501,9 +716,15 @@ ok_status pogs_sparse_operator_free(operator * A)
 {
 	OK_CHECK_OPERATOR(A);
 	sp_matrix * A_mat = sparse_operator_get_matrix_pointer(A);
+	sp_matrix64 * A_mat64 = sparse_operator_get_matrix64_pointer(A);
 	ok_status err = A->free(A->data);
-	OK_MAX_ERR( err, sp_matrix_free(A_mat) );
-	ok_free(A_mat);
+	if (A_mat64) {
+		OK_MAX_ERR( err, sp_matrix64_free(A_mat64) );
+		ok_free(A_mat64);
+	} else {
+		OK_MAX_ERR( err, sp_matrix_free(A_mat) );
+		ok_free(A_mat);
+	}
 	ok_free(A);
 	return err;
 }
@@ -29,6 +29,10 @@ ok_status set_default_settings(pogs_settings * s)
 	s->resume = kRESUME;
 	s->x0 = OK_NULL;
 	s->nu0 = OK_NULL;
+	s->num_threads = kNUMTHREADS;
+	s->anderson = kANDERSON;
+	s->infeastol = kINFEASTOL;
+	s->polish = kPOLISH;
 	return OPTKIT_SUCCESS;
 }
 